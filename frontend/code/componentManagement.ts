@@ -67,6 +67,7 @@ import { TextComponent } from "./components/text";
 import { TextInputComponent } from "./components/textInput";
 import { ThemeContextSwitcherComponent } from "./components/themeContextSwitcher";
 import { TooltipComponent } from "./components/tooltip";
+import { VirtualListComponent } from "./components/virtualList";
 import { WebviewComponent } from "./components/webview";
 import { GraphEditorComponent } from "./components/graphEditor/graphEditor";
 import { KeyboardFocusableComponent } from "./components/keyboardFocusableComponent";
@@ -137,6 +138,7 @@ const COMPONENT_CLASSES = {
     "TextInput-builtin": TextInputComponent,
     "ThemeContextSwitcher-builtin": ThemeContextSwitcherComponent,
     "Tooltip-builtin": TooltipComponent,
+    "VirtualList-builtin": VirtualListComponent,
     "Webview-builtin": WebviewComponent,
 };
 
@@ -149,6 +151,10 @@ export const componentsByElement = new Map<HTMLElement, ComponentBase>();
 
 let fundamentalRootComponent: FundamentalRootComponent | null = null;
 
+// Styles (such as text styles and fills) which are shared by many components
+// are only sent once. Afterwards, the server refers to them by their id.
+const internedStyles = new Map<number, any>();
+
 export function getRootComponent(): FundamentalRootComponent {
     if (fundamentalRootComponent === null) {
         throw new Error("There is no root component yet");
@@ -252,10 +258,58 @@ export function getChildIds(state: DeltaStateFromBackend): ComponentId[] {
     return result;
 }
 
+/// Replaces all references to interned styles with the styles themselves, so
+/// components never get to see them.
+function resolveInternedStyles(deltaStates: {
+    [id: string]: DeltaStateFromBackend;
+}): void {
+    // Register the new styles first, since any component in the message may
+    // refer to them
+    for (let componentIdAsString in deltaStates) {
+        let deltaState = deltaStates[componentIdAsString] as {
+            [name: string]: any;
+        };
+        let styles = deltaState._styles_;
+
+        if (styles === undefined) {
+            continue;
+        }
+
+        for (let styleIdAsString in styles) {
+            internedStyles.set(
+                parseInt(styleIdAsString),
+                styles[styleIdAsString]
+            );
+        }
+
+        delete deltaState._styles_;
+    }
+
+    for (let componentIdAsString in deltaStates) {
+        let deltaState = deltaStates[componentIdAsString] as {
+            [name: string]: any;
+        };
+
+        for (let propertyName in deltaState) {
+            let value = deltaState[propertyName];
+
+            if (
+                value !== null &&
+                typeof value === "object" &&
+                value._style_ !== undefined
+            ) {
+                deltaState[propertyName] = internedStyles.get(value._style_);
+            }
+        }
+    }
+}
+
 export function updateComponentStates(
     deltaStates: { [id: string]: DeltaStateFromBackend },
     rootComponentId: ComponentId | null
 ): void {
+    resolveInternedStyles(deltaStates);
+
     // Modifying the DOM makes the keyboard focus get lost. Remember which
     // element had focus so we can restore it later.
     let focusedElement = document.activeElement;
@@ -338,10 +392,26 @@ export function updateComponentStates(
         let deltaState = deltaStates[id];
         let component: ComponentBase = componentsById[id]!;
 
+        // Text that has only grown is sent as just the appended suffix.
+        // Reconstruct the complete value, so components that can't make use
+        // of this don't have to care.
+        if (deltaState._appended_ !== undefined) {
+            let oldValues = component.state as { [name: string]: any };
+            let newValues = deltaState as { [name: string]: any };
+
+            for (let [attributeName, suffix] of Object.entries(
+                deltaState._appended_
+            )) {
+                newValues[attributeName] = oldValues[attributeName] + suffix;
+            }
+        }
+
         // Perform updates specific to this component type
         component.updateElement(deltaState, context);
 
-        // Update the component's state
+        // Update the component's state. (The suffixes are only relevant for
+        // this update.)
+        delete deltaState._appended_;
         Object.assign(component.state, deltaState);
     }
 
@@ -30,33 +30,6 @@ export function convertDivToCodeBlock(
     scrollX: "never" | "auto" | "always",
     scrollY: "never" | "auto" | "always"
 ) {
-    // Spawn the necessary HTML
-    div.classList.add("rio-code-block");
-    div.innerHTML = `
-        <div class="rio-code-block-header">
-            <div class="rio-code-block-language"></div>
-            <button class="rio-code-block-copy-button">Copy code</button>
-        </div>
-        <pre></pre>
-    `;
-
-    let headerElement = div.querySelector(
-        ".rio-code-block-header"
-    ) as HTMLDivElement;
-
-    let labelElement = headerElement.querySelector(
-        ".rio-code-block-language"
-    ) as HTMLDivElement;
-
-    let copyButton = headerElement.querySelector(
-        ".rio-code-block-copy-button"
-    ) as HTMLButtonElement;
-
-    let preElement = div.querySelector("pre") as HTMLPreElement;
-
-    div.dataset.scrollX = scrollX;
-    div.dataset.scrollY = scrollY;
-
     // Support additional language aliases
     if (language !== null && languageAliases[language] !== undefined) {
         language = languageAliases[language];
@@ -75,13 +48,13 @@ export function convertDivToCodeBlock(
     // From the end, any and all whitespace is removed.
     code = code ? code.replace(/^\n+|\s+$/g, "") : "";
 
-    // Add syntax highlighting and apply the source code. This will also detect
-    // the actual language.
+    // Add syntax highlighting. This will also detect the actual language.
+    let highlightedCode: string;
     let hljsLanguage: Language | undefined = undefined;
 
     if (language === null) {
         let hlResult = hljs.highlightAuto(code);
-        preElement.innerHTML = hlResult.value;
+        highlightedCode = hlResult.value;
 
         if (hlResult.language !== undefined) {
             hljsLanguage = hljs.getLanguage(hlResult.language);
@@ -91,16 +64,65 @@ export function convertDivToCodeBlock(
             language: language,
             ignoreIllegals: true,
         });
-        preElement.innerHTML = hlResult.value;
+        highlightedCode = hlResult.value;
 
         hljsLanguage = hljs.getLanguage(language);
     }
 
+    fillCodeBlockDiv(
+        div,
+        highlightedCode,
+        hljsLanguage?.name ?? "",
+        displayControls,
+        scrollX,
+        scrollY
+    );
+}
+
+// Converts a `<div>` element into a code block displaying code that has
+// already been highlighted, e.g. on the server.
+export function fillCodeBlockDiv(
+    div: HTMLDivElement,
+    highlightedCode: string,
+    languageName: string,
+    displayControls: boolean,
+    scrollX: "never" | "auto" | "always",
+    scrollY: "never" | "auto" | "always"
+) {
+    // Spawn the necessary HTML
+    div.classList.add("rio-code-block");
+    div.innerHTML = `
+        <div class="rio-code-block-header">
+            <div class="rio-code-block-language"></div>
+            <button class="rio-code-block-copy-button">Copy code</button>
+        </div>
+        <pre></pre>
+    `;
+
+    let headerElement = div.querySelector(
+        ".rio-code-block-header"
+    ) as HTMLDivElement;
+
+    let labelElement = headerElement.querySelector(
+        ".rio-code-block-language"
+    ) as HTMLDivElement;
+
+    let copyButton = headerElement.querySelector(
+        ".rio-code-block-copy-button"
+    ) as HTMLButtonElement;
+
+    let preElement = div.querySelector("pre") as HTMLPreElement;
+
+    div.dataset.scrollX = scrollX;
+    div.dataset.scrollY = scrollY;
+
+    // Apply the source code
+    preElement.innerHTML = highlightedCode;
+
     // Are controls enabled?
     if (displayControls) {
-        // What's the language's name?
-        let languageNiceName = hljsLanguage?.name ?? "";
-        labelElement.textContent = languageNiceName;
+        // Display the language's name
+        labelElement.textContent = languageName;
 
         // Initialize the copy button
         applyIcon(copyButton, "material/content_copy");
@@ -127,8 +149,11 @@ export function convertDivToCodeBlock(
 
 export type CodeBlockState = ComponentState & {
     _type_: "CodeBlock-builtin";
-    code: string;
+    code: string | null;
     language: string | null;
+    // Set if the code has been highlighted on the server
+    html: string | null;
+    languageName: string;
     show_controls: boolean;
     scroll_code_x: "never" | "auto" | "always";
     scroll_code_y: "never" | "auto" | "always";
@@ -146,10 +171,25 @@ export class CodeBlockComponent extends ComponentBase<CodeBlockState> {
     ): void {
         super.updateElement(deltaState, context);
 
-        // Re-create the code block
+        // Re-create the code block. If the server has already highlighted the
+        // code, just display the result.
+        let html = deltaState.html ?? this.state.html;
+
+        if (html !== null) {
+            fillCodeBlockDiv(
+                this.element as HTMLDivElement,
+                html,
+                deltaState.languageName ?? this.state.languageName,
+                deltaState.show_controls ?? this.state.show_controls,
+                deltaState.scroll_code_x ?? this.state.scroll_code_x,
+                deltaState.scroll_code_y ?? this.state.scroll_code_y
+            );
+            return;
+        }
+
         convertDivToCodeBlock(
             this.element as HTMLDivElement,
-            deltaState.code ?? this.state.code,
+            deltaState.code ?? this.state.code ?? "",
             deltaState.language ?? this.state.language,
             deltaState.show_controls ?? this.state.show_controls,
             deltaState.scroll_code_x ?? this.state.scroll_code_x,
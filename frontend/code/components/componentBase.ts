@@ -4,7 +4,10 @@ import {
     ComponentStatesUpdateContext,
     getComponentByElement,
 } from "../componentManagement";
-import { callRemoteMethodDiscardResponse } from "../rpc";
+import {
+    callRemoteMethodDiscardResponse,
+    sendComponentStateUpdate,
+} from "../rpc";
 import {
     EventHandler,
     DragHandler,
@@ -49,6 +52,10 @@ export type ComponentState = {
     _grow_: [boolean, boolean];
     // Whether this component requested resize events
     _report_resize_?: boolean;
+    // Text attributes which have only grown since they were last sent, mapped
+    // to the text that was appended. Their complete values are filled in
+    // before `updateElement` is called.
+    _appended_?: { [attributeName: string]: string };
     accessibility_role: string | null;
     // Debugging information: The dev tools may not display components to the
     // developer if they're considered internal
@@ -629,11 +636,8 @@ export abstract class ComponentBase<S extends ComponentState = ComponentState> {
         // Set the state. This also updates the component
         this._setStateDontNotifyBackend(deltaState);
 
-        // Notify the backend
-        callRemoteMethodDiscardResponse("componentStateUpdate", {
-            component_id: this.id,
-            delta_state: deltaState,
-        });
+        // Notify the backend. Updates are batched per animation frame.
+        sendComponentStateUpdate(this.id, deltaState);
     }
 
     addClickHandler(args: ClickHandlerArguments): ClickHandler {
@@ -14,6 +14,7 @@ export type CustomTreeItemState = ComponentState & {
     is_expanded: boolean;
     pressable: boolean;
     children: ComponentId[];
+    has_children: boolean;
     expand_button_open: ComponentId;
     expand_button_closed: ComponentId;
     expand_button_disabled: ComponentId;
@@ -112,15 +113,16 @@ export class CustomTreeItemComponent extends SelectableListItemComponent<CustomT
             this._applyExpansionStyle();
         }
 
-        // update children
-        if (deltaState.children !== undefined) {
-            this.replaceChildren(
-                context,
-                deltaState.children,
-                this.childrenContainerElement
-            );
+        // update children. (The children of collapsed items aren't sent, so
+        // `has_children` decides whether the item can be expanded.)
+        this.replaceChildren(
+            context,
+            deltaState.children,
+            this.childrenContainerElement
+        );
 
-            if (deltaState.children.length > 0) {
+        if (deltaState.has_children !== undefined) {
+            if (deltaState.has_children) {
                 this.expandButtonContainer.onPress =
                     this._toggleExpansion.bind(this);
             } else {
@@ -130,10 +132,10 @@ export class CustomTreeItemComponent extends SelectableListItemComponent<CustomT
 
         if (
             deltaState.is_expanded !== undefined ||
-            deltaState.children != undefined
+            deltaState.has_children !== undefined
         ) {
             let hasChildren =
-                (deltaState.children ?? this.state.children).length > 0;
+                deltaState.has_children ?? this.state.has_children;
 
             this._updateExpandButtonElement(hasChildren);
         }
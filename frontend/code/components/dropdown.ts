@@ -10,9 +10,22 @@ import {
 import { DropdownPositioner } from "../popupPositioners";
 import { ComponentStatesUpdateContext } from "../componentManagement";
 
+// How many options are requested at once from an option provider
+const OPTION_PAGE_SIZE = 50;
+
+type DropdownOptionPage = {
+    requestId: number;
+    search: string;
+    start: number;
+    optionNames: string[];
+    totalCount: number;
+};
+
 export type DropdownState = KeyboardFocusableComponentState & {
     _type_: "Dropdown-builtin";
     optionNames: string[];
+    hasOptionProvider: boolean;
+    optionPage: DropdownOptionPage | null;
     label: string;
     accessibility_label: string;
     style: InputBoxStyle;
@@ -34,6 +47,14 @@ export class DropdownComponent extends KeyboardFocusableComponent<DropdownState>
     // The currently highlighted option, if any
     private highlightedOptionElement: HTMLElement | null = null;
 
+    // If the options come from a provider, these keep track of the options
+    // that have been received for the current search text. Only the response
+    // to the most recent request is displayed.
+    private loadedOptionNames: string[] = [];
+    private totalOptionCount: number = 0;
+    private latestRequestId: number = 0;
+    private requestIsPending: boolean = false;
+
     createElement(context: ComponentStatesUpdateContext): HTMLElement {
         // Create root element
         let element = document.createElement("div");
@@ -76,6 +97,22 @@ export class DropdownComponent extends KeyboardFocusableComponent<DropdownState>
         popupScrollerElement.classList.add("rio-dropdown-popup-scroller");
         this.popupElement.appendChild(popupScrollerElement);
 
+        // Options from a provider are loaded page by page as the user scrolls
+        popupScrollerElement.addEventListener(
+            "scroll",
+            () => {
+                let distanceToEnd =
+                    popupScrollerElement.scrollHeight -
+                    popupScrollerElement.scrollTop -
+                    popupScrollerElement.clientHeight;
+
+                if (distanceToEnd < popupScrollerElement.clientHeight) {
+                    this._requestMoreOptions();
+                }
+            },
+            { passive: true }
+        );
+
         this.mobileLabelElement = document.createElement("div");
         this.mobileLabelElement.classList.add("rio-dropdown-mobile-label");
         popupScrollerElement.appendChild(this.mobileLabelElement);
@@ -342,7 +379,11 @@ export class DropdownComponent extends KeyboardFocusableComponent<DropdownState>
         }
 
         // If the given option is valid, tell python about the new value
-        if (this.state.optionNames.includes(newOptionName)) {
+        let optionNames = this.state.hasOptionProvider
+            ? this.loadedOptionNames
+            : this.state.optionNames;
+
+        if (optionNames.includes(newOptionName)) {
             this.inputBox.value = newOptionName;
             this.state.selectedName = newOptionName;
             this.sendMessageToBackend({
@@ -452,30 +493,59 @@ export class DropdownComponent extends KeyboardFocusableComponent<DropdownState>
     /// Rebuilds the popup options element, filtering the visible options to
     /// those matching the input text. This also updates the matches visually
     /// where appropriate.
+    ///
+    /// Options from a provider are searched on the server. In that case this
+    /// only requests the first page of matching options, and the popup is
+    /// updated once they arrive.
     _updatePopupOptionsElement(): void {
-        // Prepare
-        let needleLower = this.inputBox.value.toLowerCase();
+        if (this.state.hasOptionProvider) {
+            this._requestOptions(0);
+            return;
+        }
 
         // Clean up
         this.popupOptionsElement.innerHTML = "";
 
         // Find matching options
-        for (let optionName of this.state.optionNames) {
+        this._appendPopupOptions(this.state.optionNames, false);
+        this._finishPopupOptionsUpdate();
+    }
+
+    /// Adds the options with the given names to the popup. Unless
+    /// `matchedOnServer` is true, options that don't match the input text are
+    /// skipped.
+    _appendPopupOptions(optionNames: string[], matchedOnServer: boolean): void {
+        let needleLower = this.inputBox.value.toLowerCase();
+
+        // The popup may still display the "no matches" icon
+        if (this.popupOptionsElement.querySelector("svg") !== null) {
+            this.popupOptionsElement.innerHTML = "";
+        }
+
+        for (let optionName of optionNames) {
             let match = this._highlightMatches(optionName, needleLower);
 
             if (match === null) {
-                continue;
+                // The server may match options differently, e.g. ignoring
+                // accents. Display those without highlighting.
+                if (!matchedOnServer) {
+                    continue;
+                }
+
+                match = document.createElement("div");
+                match.textContent = optionName;
             }
 
-            match.classList.add("rio-dropdown-option");
-            match.role = "option";
-            this.popupOptionsElement.appendChild(match);
+            let optionElement = match;
+            optionElement.classList.add("rio-dropdown-option");
+            optionElement.role = "option";
+            this.popupOptionsElement.appendChild(optionElement);
 
-            match.addEventListener("pointerenter", () => {
-                this._highlightOption(match);
+            optionElement.addEventListener("pointerenter", () => {
+                this._highlightOption(optionElement);
             });
 
-            match.addEventListener(
+            optionElement.addEventListener(
                 this.getOptionSelectEvent(),
                 (event: Event) => {
                     this.hidePopupAndCommit(optionName);
@@ -483,7 +553,11 @@ export class DropdownComponent extends KeyboardFocusableComponent<DropdownState>
                 }
             );
         }
+    }
 
+    /// Highlights the only option, if there is only one, and displays an icon
+    /// if there are none.
+    _finishPopupOptionsUpdate(): void {
         // If only one option was found, highlight it
         if (this.popupOptionsElement.children.length === 1) {
             this._highlightOption(
@@ -508,12 +582,77 @@ export class DropdownComponent extends KeyboardFocusableComponent<DropdownState>
         }
     }
 
+    /// Asks the option provider for the options matching the input text,
+    /// starting at the given index.
+    _requestOptions(start: number): void {
+        this.latestRequestId += 1;
+        this.requestIsPending = true;
+
+        this.sendMessageToBackend({
+            type: "fetchOptions",
+            search: this.inputBox.value,
+            start: start,
+            count: OPTION_PAGE_SIZE,
+            requestId: this.latestRequestId,
+        });
+    }
+
+    /// Requests the next page of options from the option provider, if there
+    /// is one and it has more options.
+    _requestMoreOptions(): void {
+        if (
+            !this.state.hasOptionProvider ||
+            !this.popupManager.isOpen ||
+            this.requestIsPending ||
+            this.loadedOptionNames.length >= this.totalOptionCount
+        ) {
+            return;
+        }
+
+        this._requestOptions(this.loadedOptionNames.length);
+    }
+
+    /// Displays a page of options received from the option provider.
+    _applyOptionPage(page: DropdownOptionPage): void {
+        // Responses to outdated requests are of no interest
+        if (page.requestId !== this.latestRequestId) {
+            return;
+        }
+
+        this.requestIsPending = false;
+        this.totalOptionCount = page.totalCount;
+
+        // The first page replaces all options, the others are appended
+        if (page.start === 0) {
+            this.loadedOptionNames = page.optionNames;
+            this.popupOptionsElement.innerHTML = "";
+            this._highlightOption(null);
+        } else {
+            this.loadedOptionNames =
+                this.loadedOptionNames.concat(page.optionNames);
+        }
+
+        this._appendPopupOptions(page.optionNames, true);
+        this._finishPopupOptionsUpdate();
+    }
+
     updateElement(
         deltaState: DeltaState<DropdownState>,
         context: ComponentStatesUpdateContext
     ): void {
         super.updateElement(deltaState, context);
 
+        if (deltaState.hasOptionProvider !== undefined) {
+            this.state.hasOptionProvider = deltaState.hasOptionProvider;
+        }
+
+        if (
+            deltaState.optionPage !== undefined &&
+            deltaState.optionPage !== null
+        ) {
+            this._applyOptionPage(deltaState.optionPage);
+        }
+
         // If the options have changed update the options element, and also
         // store its width
         if (deltaState.optionNames !== undefined) {
@@ -523,8 +662,9 @@ export class DropdownComponent extends KeyboardFocusableComponent<DropdownState>
             // Update the hidden options element
             this._updateHiddenOptionsElement();
 
-            // Update the visible options element
-            if (this.popupManager.isOpen) {
+            // Update the visible options element. (Options from a provider
+            // aren't part of this list, they arrive page by page.)
+            if (this.popupManager.isOpen && !this.state.hasOptionProvider) {
                 this._updatePopupOptionsElement();
             }
         }
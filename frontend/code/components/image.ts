@@ -12,7 +12,9 @@ const FILL_MODE_TO_OBJECT_FIT = {
 export type ImageState = ComponentState & {
     _type_: "Image-builtin";
     fill_mode: keyof typeof FILL_MODE_TO_OBJECT_FIT;
-    imageUrl: string;
+    imageUrl: string | null;
+    imageFailed: boolean;
+    imageSrcset: [string, number][] | null;
     reportError: boolean;
     corner_radius: [number, number, number, number];
     accessibility_description: string;
@@ -52,20 +54,53 @@ export class ImageComponent extends ComponentBase<ImageState> {
     ): void {
         super.updateElement(deltaState, context);
 
-        if (
+        if (deltaState.imageFailed) {
+            // The server couldn't prepare the image. Display the same icon as
+            // for images which fail to load.
+            this.element.classList.remove("rio-loading");
+            this.imageElement.removeAttribute("srcset");
+            this.imageElement.removeAttribute("sizes");
+            this.imageElement.removeAttribute("src");
+            applyIcon(this.element, "material/broken_image");
+        } else if (deltaState.imageUrl === null) {
+            // The server is still preparing the image. Keep displaying the
+            // loading animation until it's available.
+            this.element.classList.add("rio-loading");
+            this.imageElement.removeAttribute("srcset");
+            this.imageElement.removeAttribute("sizes");
+            this.imageElement.removeAttribute("src");
+            this._showImageElement();
+            this._updateSize();
+        } else if (
             deltaState.imageUrl !== undefined &&
             this.imageElement.src !== deltaState.imageUrl
         ) {
             this.element.classList.add("rio-loading");
             this._updateSize();
 
-            this.imageElement.src = deltaState.imageUrl;
-
-            // If we're currently displaying an error icon, remove it
-            if (this.element.firstElementChild !== this.imageElement) {
-                this.element.firstElementChild!.remove();
-                this.element.appendChild(this.imageElement);
+            // If the server offers downscaled variants of the image, let the
+            // browser pick the one that fits best. The `sizes` attribute is
+            // kept up to date by `_updateSize`. (Note that both must be set
+            // before `src`, otherwise the browser may start loading the
+            // original image, or assume that the image spans the entire
+            // viewport and pick the largest variant.)
+            let srcset =
+                deltaState.imageSrcset !== undefined
+                    ? deltaState.imageSrcset
+                    : this.state.imageSrcset;
+
+            if (srcset) {
+                this.imageElement.srcset = srcset
+                    .map(([url, width]) => `${url} ${width}w`)
+                    .join(", ");
+                this._updateSizesAttribute();
+            } else {
+                this.imageElement.removeAttribute("srcset");
+                this.imageElement.removeAttribute("sizes");
             }
+
+            this.imageElement.src = deltaState.imageUrl;
+            this._showImageElement();
         }
 
         if (deltaState.fill_mode !== undefined) {
@@ -87,12 +122,22 @@ export class ImageComponent extends ComponentBase<ImageState> {
         }
     }
 
+    /// If we're currently displaying an error icon, replace it with the image
+    private _showImageElement(): void {
+        if (this.element.firstElementChild !== this.imageElement) {
+            this.element.firstElementChild?.remove();
+            this.element.appendChild(this.imageElement);
+        }
+    }
+
     private _onLoad(): void {
         this.element.classList.remove("rio-loading");
         this._updateSize();
     }
 
     private _updateSize(): void {
+        this._updateSizesAttribute();
+
         if (this.element.classList.contains("rio-loading")) {
             // Until the image is loaded and we get access to its resolution,
             // let it fill the entire space. This is the correct size for all
@@ -140,6 +185,43 @@ export class ImageComponent extends ComponentBase<ImageState> {
         }
     }
 
+    /// Tells the browser how wide the image will be displayed, so it can pick
+    /// the right variant from the `srcset`.
+    private _updateSizesAttribute(): void {
+        if (!this.imageElement.hasAttribute("srcset")) {
+            return;
+        }
+
+        let allocatedWidth = getAllocatedWidthInPx(this.element);
+        let allocatedHeight = getAllocatedHeightInPx(this.element);
+
+        // Once the image has loaded its aspect ratio is known, so the
+        // displayed width can be calculated exactly. Before that, make a
+        // conservative guess.
+        let displayedWidth: number;
+
+        if (this.imageElement.naturalHeight > 0) {
+            let aspectRatioImage =
+                this.imageElement.naturalWidth /
+                this.imageElement.naturalHeight;
+            let widthAtFullHeight = allocatedHeight * aspectRatioImage;
+
+            if (this.state.fill_mode === "fit") {
+                displayedWidth = Math.min(allocatedWidth, widthAtFullHeight);
+            } else if (this.state.fill_mode === "zoom") {
+                displayedWidth = Math.max(allocatedWidth, widthAtFullHeight);
+            } else {
+                displayedWidth = allocatedWidth;
+            }
+        } else if (this.state.fill_mode === "zoom") {
+            displayedWidth = Math.max(allocatedWidth, allocatedHeight);
+        } else {
+            displayedWidth = allocatedWidth;
+        }
+
+        this.imageElement.sizes = `${Math.max(1, Math.ceil(displayedWidth))}px`;
+    }
+
     private _onError(event: string | Event): void {
         applyIcon(this.element, "material/broken_image");
 
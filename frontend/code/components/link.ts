@@ -14,16 +14,76 @@ export type LinkState = ComponentState & {
     accessibility_relationship: string | null;
 };
 
+/// How long the pointer has to rest on a link before the server is asked to
+/// prepare the linked page, in milliseconds. This avoids prefetching every
+/// link the pointer merely passes over.
+const PREFETCH_DELAY = 80;
+
 export class LinkComponent extends ComponentBase<LinkState> {
+    private prefetchTimeout: number | null = null;
+
     createElement(context: ComponentStatesUpdateContext): HTMLElement {
         let element = document.createElement("a");
         element.classList.add("rio-link");
 
         hijackLinkElement(element);
 
+        // Let the server know which page the user is likely to visit next, so
+        // it can prepare it ahead of time
+        let schedulePrefetch = () => {
+            if (this.prefetchTimeout === null) {
+                this.prefetchTimeout = window.setTimeout(() => {
+                    this.prefetchTimeout = null;
+                    this.requestPrefetch();
+                }, PREFETCH_DELAY);
+            }
+        };
+
+        let cancelPrefetch = () => {
+            if (this.prefetchTimeout !== null) {
+                window.clearTimeout(this.prefetchTimeout);
+                this.prefetchTimeout = null;
+            }
+        };
+
+        element.addEventListener("pointerenter", schedulePrefetch);
+        element.addEventListener("pointerleave", cancelPrefetch);
+        element.addEventListener("focus", schedulePrefetch);
+        element.addEventListener("blur", cancelPrefetch);
+
         return element;
     }
 
+    onDestruction(): void {
+        super.onDestruction();
+
+        if (this.prefetchTimeout !== null) {
+            window.clearTimeout(this.prefetchTimeout);
+            this.prefetchTimeout = null;
+        }
+    }
+
+    private requestPrefetch(): void {
+        // Only pages of this app can be prefetched, and only if they'll be
+        // opened in this tab
+        if (this.state.open_in_new_tab) {
+            return;
+        }
+
+        let url: URL;
+        try {
+            url = new URL(this.state.targetUrl, window.location.href);
+        } catch {
+            return;
+        }
+
+        if (url.origin !== window.location.origin) {
+            return;
+        }
+
+        this.sendMessageToBackend({ type: "prefetch" });
+    }
+
     updateElement(
         deltaState: DeltaState<LinkState>,
         context: ComponentStatesUpdateContext
@@ -8,12 +8,14 @@ import { micromark } from "micromark";
 import hljs from "highlight.js/lib/common";
 
 import { firstDefined, hijackLinkElement } from "../utils";
-import { convertDivToCodeBlock } from "./codeBlock";
+import { convertDivToCodeBlock, fillCodeBlockDiv } from "./codeBlock";
 import { ComponentStatesUpdateContext } from "../componentManagement";
 
 export type MarkdownState = ComponentState & {
     _type_: "Markdown-builtin";
-    text: string;
+    text: string | null;
+    // Set if the text has been rendered on the server
+    html: string | null;
     default_language: null | string;
     selectable: boolean;
     justify: "left" | "right" | "center" | "justify";
@@ -47,6 +49,36 @@ function convertMarkdown(
     hijackLocalLinks(div);
 }
 
+// Render Markdown that has already been converted to HTML on the server in the
+// given div.
+function insertRenderedMarkdown(
+    html: string,
+    div: HTMLElement,
+    scrollCodeX: "never" | "auto" | "always",
+    scrollCodeY: "never" | "auto" | "always"
+) {
+    div.innerHTML = html;
+
+    // Code blocks have already been highlighted. They only need their controls.
+    div.querySelectorAll("pre").forEach((preElement) => {
+        let codeBlockElement = document.createElement("div");
+        preElement.parentNode!.insertBefore(codeBlockElement, preElement);
+
+        fillCodeBlockDiv(
+            codeBlockElement,
+            preElement.innerHTML,
+            preElement.dataset.languageName ?? "",
+            true,
+            scrollCodeX,
+            scrollCodeY
+        );
+
+        preElement.remove();
+    });
+
+    hijackLocalLinks(div);
+}
+
 function enhanceCodeBlocks(
     div: HTMLElement,
     defaultLanguage: string | null,
@@ -111,6 +143,52 @@ function highlightInlineCode(
     }
 }
 
+/// Returns the index of the line after the last blank line in `source` which
+/// isn't part of a fenced code block, searching from `start` onwards. Text
+/// appended to `source` can't change the blocks before that index, so they
+/// don't have to be parsed again. `start` must be such an index itself.
+///
+/// This doesn't account for all of Markdown. For example, a list containing a
+/// blank line is split into two lists, and reference links can't see
+/// definitions in a later block. That's fine while text is streaming in, since
+/// the complete text is parsed in one go once it stops growing.
+function findLastCompleteBlockEnd(source: string, start: number): number {
+    let result = start;
+    let openFence: string | null = null;
+    let lineStart = start;
+
+    while (true) {
+        // The last line may still be incomplete, so ignore it
+        let lineEnd = source.indexOf("\n", lineStart);
+
+        if (lineEnd === -1) {
+            break;
+        }
+
+        let line = source.slice(lineStart, lineEnd);
+        let fenceMatch = /^ {0,3}(`{3,}|~{3,})/.exec(line);
+
+        if (openFence === null) {
+            if (fenceMatch !== null) {
+                openFence = fenceMatch[1];
+            } else if (line.trim() === "") {
+                result = lineEnd + 1;
+            }
+        } else if (
+            fenceMatch !== null &&
+            fenceMatch[1][0] === openFence[0] &&
+            fenceMatch[1].length >= openFence.length &&
+            line.trim() === fenceMatch[1]
+        ) {
+            openFence = null;
+        }
+
+        lineStart = lineEnd + 1;
+    }
+
+    return result;
+}
+
 function hijackLocalLinks(div: HTMLElement): void {
     // Clicking a link makes the browser navigate to the URL, which is
     // unnecessary if the URL points to the rio app - there's no need to close
@@ -121,29 +199,61 @@ function hijackLocalLinks(div: HTMLElement): void {
     }
 }
 
+// How long the text must stop growing before it is parsed in one go again
+const FULL_RENDER_DELAY_MS = 500;
+
 export class MarkdownComponent extends ComponentBase<MarkdownState> {
+    // When text is appended, only the last block of the text has to be parsed
+    // again. These keep track of where that block starts, and which nodes it
+    // has been rendered to. `isSplit` is false if the text has been parsed in
+    // one go, in which case the nodes can't be split into blocks.
+    private isSplit: boolean = false;
+    private completeBlocksEnd: number = 0;
+    private lastBlockNodes: ChildNode[] = [];
+
+    // Pending timeout to parse streamed text in one go
+    private fullRenderTimeout: number | null = null;
+
     createElement(context: ComponentStatesUpdateContext): HTMLElement {
         const element = document.createElement("div");
         element.classList.add("rio-markdown");
         return element;
     }
 
+    onDestruction(): void {
+        super.onDestruction();
+
+        this._cancelFullRender();
+    }
+
     updateElement(
         deltaState: DeltaState<MarkdownState>,
         context: ComponentStatesUpdateContext
     ): void {
         super.updateElement(deltaState, context);
 
-        if (deltaState.text !== undefined) {
-            let defaultLanguage = firstDefined(
-                deltaState.default_language,
-                this.state.default_language
-            );
+        if (deltaState.html !== undefined && deltaState.html !== null) {
+            // The HTML is sent along with every update, but only needs to be
+            // inserted if it has changed
+            if (deltaState.html !== this.state.html) {
+                this._cancelFullRender();
+                this.isSplit = false;
 
-            convertMarkdown(
+                insertRenderedMarkdown(
+                    deltaState.html,
+                    this.element,
+                    deltaState.scroll_code_x ?? this.state.scroll_code_x,
+                    deltaState.scroll_code_y ?? this.state.scroll_code_y
+                );
+            }
+        } else if (deltaState.text !== undefined && deltaState.text !== null) {
+            this._renderMarkdown(
                 deltaState.text,
-                this.element,
-                defaultLanguage,
+                deltaState._appended_?.text !== undefined,
+                firstDefined(
+                    deltaState.default_language,
+                    this.state.default_language
+                ),
                 deltaState.scroll_code_x ?? this.state.scroll_code_x,
                 deltaState.scroll_code_y ?? this.state.scroll_code_y
             );
@@ -188,4 +298,86 @@ export class MarkdownComponent extends ComponentBase<MarkdownState> {
             }
         }
     }
+
+    /// Renders the Markdown source. Normally the whole text is parsed in one
+    /// go. If text has only been appended, only the last block is parsed
+    /// again, and the whole text once it stops growing.
+    private _renderMarkdown(
+        source: string,
+        appended: boolean,
+        defaultLanguage: null | string,
+        scrollCodeX: "never" | "auto" | "always",
+        scrollCodeY: "never" | "auto" | "always"
+    ): void {
+        this._cancelFullRender();
+
+        let renderChunk = (chunk: string): ChildNode[] => {
+            let div = document.createElement("div");
+            convertMarkdown(
+                chunk,
+                div,
+                defaultLanguage,
+                scrollCodeX,
+                scrollCodeY
+            );
+
+            let nodes = Array.from(div.childNodes);
+            this.element.append(...nodes);
+            return nodes;
+        };
+
+        if (!appended) {
+            this.element.innerHTML = "";
+            renderChunk(source);
+            this.isSplit = false;
+            return;
+        }
+
+        // The complete blocks are unaffected by appended text. (Unless the
+        // text was parsed in one go, in which case it has to be split first.)
+        let start = 0;
+
+        if (this.isSplit) {
+            start = this.completeBlocksEnd;
+
+            for (let node of this.lastBlockNodes) {
+                node.remove();
+            }
+        } else {
+            this.element.innerHTML = "";
+        }
+
+        let end = findLastCompleteBlockEnd(source, start);
+
+        if (end > start) {
+            renderChunk(source.slice(start, end));
+        }
+
+        this.lastBlockNodes = renderChunk(source.slice(end));
+        this.completeBlocksEnd = end;
+        this.isSplit = true;
+
+        // Splitting the text at blank lines doesn't account for all of
+        // Markdown, so parse the text in one go once it stops growing
+        this.fullRenderTimeout = window.setTimeout(() => {
+            this.fullRenderTimeout = null;
+
+            if (this.state.text !== null && this.state.html === null) {
+                this._renderMarkdown(
+                    this.state.text,
+                    false,
+                    this.state.default_language,
+                    this.state.scroll_code_x,
+                    this.state.scroll_code_y
+                );
+            }
+        }, FULL_RENDER_DELAY_MS);
+    }
+
+    private _cancelFullRender(): void {
+        if (this.fullRenderTimeout !== null) {
+            clearTimeout(this.fullRenderTimeout);
+            this.fullRenderTimeout = null;
+        }
+    }
 }
@@ -17,7 +17,7 @@ export type MediaPlayerState = KeyboardFocusableComponentState & {
     controls: boolean;
     muted: boolean;
     volume: number;
-    mediaUrl: string;
+    mediaUrl: string | null;
     background: AnyFill;
     reportError: boolean;
     reportPlaybackEnd: boolean;
@@ -270,11 +270,22 @@ export class MediaPlayerComponent extends KeyboardFocusableComponent<MediaPlayer
         let durationString = this._durationToString(duration);
         this.playtimeLabel.textContent = `${playedString} / ${durationString}`;
 
-        // Loaded Amount
-        let loadedFraction =
-            this.mediaPlayer.buffered.length > 0
-                ? this.mediaPlayer.buffered.end(0) / duration
-                : 0;
+        // Loaded Amount. Media is loaded in ranges, so after seeking there
+        // can be several of them. Show how far the one that's currently
+        // playing reaches.
+        let loadedFraction = progress;
+        let buffered = this.mediaPlayer.buffered;
+
+        for (let i = 0; i < buffered.length; i++) {
+            if (
+                buffered.start(i) <= currentTime &&
+                currentTime <= buffered.end(i)
+            ) {
+                loadedFraction = buffered.end(i) / duration;
+                break;
+            }
+        }
+
         this.timelineLoaded.style.width = `${loadedFraction * 100}%`;
 
         // If the playback time has decreased, the video may have looped
@@ -296,7 +307,7 @@ export class MediaPlayerComponent extends KeyboardFocusableComponent<MediaPlayer
         element.setAttribute("tabindex", "0");
 
         element.innerHTML = `
-            <video></video>
+            <video preload="metadata"></video>
             <div class="rio-media-player-alt-display" style="display: none"></div>
             <div class="rio-media-player-controls">
                 <!-- Timeline -->
@@ -574,7 +585,12 @@ export class MediaPlayerComponent extends KeyboardFocusableComponent<MediaPlayer
     ): void {
         super.updateElement(deltaState, context);
 
-        if (deltaState.mediaUrl !== undefined) {
+        if (deltaState.mediaUrl === null) {
+            // The server is still preparing the file. Don't play anything
+            // until it's available.
+            this.mediaPlayer.removeAttribute("src");
+            this._updateProgress();
+        } else if (deltaState.mediaUrl !== undefined) {
             let mediaUrl = new URL(deltaState.mediaUrl, document.location.href)
                 .href;
 
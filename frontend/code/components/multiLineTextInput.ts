@@ -138,7 +138,21 @@ export class MultiLineTextInputComponent extends KeyboardFocusableComponent<Mult
         super.updateElement(deltaState, context);
 
         if (deltaState.text !== undefined) {
-            this.inputBox.value = deltaState.text;
+            // If text was only appended (and the user hasn't changed the text
+            // in the meantime), insert just the new part. This keeps the
+            // user's selection intact.
+            let appendedText = deltaState._appended_?.text;
+            let inputElement = this.inputBox.inputElement;
+
+            if (
+                appendedText !== undefined &&
+                inputElement.value === this.state.text
+            ) {
+                let end = inputElement.value.length;
+                inputElement.setRangeText(appendedText, end, end, "preserve");
+            } else {
+                this.inputBox.value = deltaState.text;
+            }
 
             let autoAdjustHeight =
                 deltaState.auto_adjust_height ?? this.state.auto_adjust_height;
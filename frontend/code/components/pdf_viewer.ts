@@ -4,7 +4,7 @@ import { ComponentBase, ComponentState, DeltaState } from "./componentBase";
 
 export type PdfViewerState = ComponentState & {
     _type_: "PdfViewer-builtin";
-    pdfUrl: string;
+    pdfUrl: string | null;
 };
 
 export class PdfViewerComponent extends ComponentBase<PdfViewerState> {
@@ -43,7 +43,11 @@ export class PdfViewerComponent extends ComponentBase<PdfViewerState> {
     ): void {
         super.updateElement(deltaState, context);
 
-        if (
+        if (deltaState.pdfUrl === null) {
+            // The server is still preparing the file. Display nothing until
+            // it's available.
+            this.objectElement.removeAttribute("data");
+        } else if (
             deltaState.pdfUrl !== undefined &&
             this.objectElement.data !== deltaState.pdfUrl
         ) {
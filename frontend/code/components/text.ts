@@ -59,6 +59,8 @@ export class TextComponent extends ComponentBase<TextState> {
         super.updateElement(deltaState, context);
 
         // BEFORE WE DO ANYTHING ELSE, replace the inner HTML element
+        let innerWasReplaced = false;
+
         if (deltaState.style !== undefined) {
             // Change the element to <h1>, <h2>, <h3> or <span> as necessary
             let tagName: string = "SPAN";
@@ -77,6 +79,7 @@ export class TextComponent extends ComponentBase<TextState> {
                 this.inner.remove();
                 this.element.appendChild(newInner);
                 this.inner = newInner;
+                innerWasReplaced = true;
 
                 // Turn the whole state into a deltaState so that the new
                 // element is initialized correctly
@@ -166,8 +169,19 @@ export class TextComponent extends ComponentBase<TextState> {
             applyTextStyleCss(this.inner, textStyleCss);
         }
 
-        // Text content
-        if (deltaState.text !== undefined) {
+        // Text content. If text was only appended, there's no need to replace
+        // what's already there.
+        let appendedText = deltaState._appended_?.text;
+
+        if (appendedText !== undefined && !innerWasReplaced) {
+            let lastChild = this.inner.lastChild;
+
+            if (lastChild instanceof Text) {
+                lastChild.appendData(appendedText);
+            } else {
+                this.inner.append(appendedText);
+            }
+        } else if (deltaState.text !== undefined) {
             this.inner.textContent = deltaState.text;
         }
 
@@ -0,0 +1,145 @@
+import { pixelsPerRem } from "../app";
+import { ComponentStatesUpdateContext } from "../componentManagement";
+import { ComponentId } from "../dataModels";
+import { ComponentBase, ComponentState, DeltaState } from "./componentBase";
+
+export type VirtualListState = ComponentState & {
+    _type_: "VirtualList-builtin";
+    children: ComponentId[];
+    first_index: number;
+    item_count: number;
+    item_height: number;
+    overscan: number;
+};
+
+export class VirtualListComponent extends ComponentBase<VirtualListState> {
+    private contentElement: HTMLElement;
+    private itemsElement: HTMLElement;
+    private resizeObserver: ResizeObserver;
+
+    // The range of items last requested from the server, as `[start, end)`
+    private requestedRange: [number, number] | null = null;
+    private updateIsScheduled: boolean = false;
+
+    createElement(context: ComponentStatesUpdateContext): HTMLElement {
+        let element = document.createElement("div");
+        element.classList.add("rio-virtual-list");
+
+        this.contentElement = document.createElement("div");
+        this.contentElement.classList.add("rio-virtual-list-content");
+        element.appendChild(this.contentElement);
+
+        this.itemsElement = document.createElement("div");
+        this.itemsElement.classList.add("rio-virtual-list-items");
+        this.contentElement.appendChild(this.itemsElement);
+
+        element.addEventListener(
+            "scroll",
+            this._scheduleVisibleRangeUpdate.bind(this),
+            { passive: true }
+        );
+
+        this.resizeObserver = new ResizeObserver(
+            this._scheduleVisibleRangeUpdate.bind(this)
+        );
+        this.resizeObserver.observe(element);
+
+        return element;
+    }
+
+    onDestruction(): void {
+        super.onDestruction();
+        this.resizeObserver.disconnect();
+    }
+
+    updateElement(
+        deltaState: DeltaState<VirtualListState>,
+        context: ComponentStatesUpdateContext
+    ): void {
+        super.updateElement(deltaState, context);
+
+        this.replaceChildren(
+            context,
+            deltaState.children,
+            this.itemsElement,
+            true
+        );
+
+        let itemCount = deltaState.item_count ?? this.state.item_count;
+        let itemHeight = deltaState.item_height ?? this.state.item_height;
+        let firstIndex = deltaState.first_index ?? this.state.first_index;
+
+        this.itemsElement.style.setProperty(
+            "--rio-virtual-list-item-height",
+            `${itemHeight}rem`
+        );
+        this.contentElement.style.height = `${itemCount * itemHeight}rem`;
+        this.itemsElement.style.top = `${firstIndex * itemHeight}rem`;
+
+        this._scheduleVisibleRangeUpdate();
+    }
+
+    /// Checks which items are visible once per frame at most, and asks the
+    /// server for them if they aren't available yet.
+    private _scheduleVisibleRangeUpdate(): void {
+        if (this.updateIsScheduled) {
+            return;
+        }
+
+        this.updateIsScheduled = true;
+
+        requestAnimationFrame(() => {
+            this.updateIsScheduled = false;
+            this._updateVisibleRange();
+        });
+    }
+
+    private _updateVisibleRange(): void {
+        let itemHeightPx = this.state.item_height * pixelsPerRem;
+
+        if (itemHeightPx <= 0) {
+            return;
+        }
+
+        let firstVisible = Math.floor(this.element.scrollTop / itemHeightPx);
+        let lastVisible = Math.ceil(
+            (this.element.scrollTop + this.element.clientHeight) / itemHeightPx
+        );
+
+        // If all visible items are already built, there's nothing to do.
+        // (Unless the list has changed, in which case the server needs to
+        // know what's visible.)
+        let builtStart = this.state.first_index;
+        let builtEnd = builtStart + this.state.children.length;
+        let builtEndIsComplete =
+            builtEnd >= Math.min(lastVisible, this.state.item_count);
+
+        if (firstVisible >= builtStart && builtEndIsComplete) {
+            return;
+        }
+
+        let start = Math.max(0, firstVisible - this.state.overscan);
+        let end = Math.min(
+            this.state.item_count,
+            lastVisible + this.state.overscan
+        );
+
+        // Don't send the same request over and over while waiting for the
+        // response
+        if (
+            this.requestedRange !== null &&
+            this.requestedRange[0] === start &&
+            this.requestedRange[1] === end
+        ) {
+            return;
+        }
+
+        this.requestedRange = [start, end];
+
+        this.sendMessageToBackend({
+            type: "visibleRange",
+            start: start,
+            end: end,
+        });
+    }
+}
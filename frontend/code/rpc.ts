@@ -313,7 +313,71 @@ async function startTryingToReconnect() {
     console.warn(`Websocket connection closed. Giving up trying to reconnect.`);
 }
 
+// State updates are collected and sent at most once per animation frame.
+// Interactions like dragging a slider or typing can change a component's state
+// many times per frame, but only the latest values matter to the server.
+let pendingComponentStateUpdates: Map<number, object> = new Map();
+let componentStateUpdateFlushScheduled: boolean = false;
+
+export function sendComponentStateUpdate(
+    componentId: number,
+    deltaState: object
+): void {
+    // Merge the update with any others for the same component
+    let pendingDeltaState = pendingComponentStateUpdates.get(componentId);
+
+    if (pendingDeltaState === undefined) {
+        pendingComponentStateUpdates.set(componentId, { ...deltaState });
+    } else {
+        Object.assign(pendingDeltaState, deltaState);
+    }
+
+    if (componentStateUpdateFlushScheduled) {
+        return;
+    }
+
+    componentStateUpdateFlushScheduled = true;
+
+    // Animation frames don't fire in background tabs, so don't wait for one
+    // there
+    if (document.hidden) {
+        setTimeout(flushComponentStateUpdates, 0);
+    } else {
+        requestAnimationFrame(flushComponentStateUpdates);
+    }
+}
+
+function flushComponentStateUpdates(): void {
+    componentStateUpdateFlushScheduled = false;
+
+    if (pendingComponentStateUpdates.size === 0) {
+        return;
+    }
+
+    let updates = pendingComponentStateUpdates;
+    pendingComponentStateUpdates = new Map();
+
+    for (let [componentId, deltaState] of updates) {
+        sendMessageOverWebsocketNow({
+            jsonrpc: "2.0",
+            method: "componentStateUpdate",
+            params: {
+                component_id: componentId,
+                delta_state: deltaState,
+            },
+        });
+    }
+}
+
 export function sendMessageOverWebsocket(message: object) {
+    // Any queued state updates must reach the server before this message, or
+    // the message could be processed with outdated state
+    flushComponentStateUpdates();
+
+    sendMessageOverWebsocketNow(message);
+}
+
+function sendMessageOverWebsocketNow(message: object) {
     if (!websocket) {
         console.error(
             `Attempted to send message, but the websocket is not connected: ${message}`
@@ -26,7 +26,7 @@ from PIL import Image
 import __main__
 import rio.global_state
 
-from . import assets, global_state, maybes, routing, utils
+from . import assets, global_state, json_backends, maybes, routing, utils
 from .app_server import fastapi_server
 from .utils import ImageLike
 
@@ -91,6 +91,18 @@ def guard_against_rio_run(func: t.Callable[P, R]) -> t.Callable[P, R]:
     return wrapper
 
 
+def _convert_icon_to_png(icon: bytes | bytearray | Image.Image) -> bytes:
+    output_buffer = io.BytesIO()
+
+    if isinstance(icon, Image.Image):
+        icon.save(output_buffer, format="png")
+    else:
+        with Image.open(io.BytesIO(icon)) as image:
+            image.save(output_buffer, format="png")
+
+    return output_buffer.getvalue()
+
+
 @t.final
 class App:
     """
@@ -188,6 +200,11 @@ class App:
             [], rio.Component
         ] = make_default_connection_lost_component,
         meta_tags: dict[str, str] = {},
+        lazy_page_imports: bool = False,
+        prewarm_pages: bool = False,
+        refresh_time_slice: int | float | timedelta | None = None,
+        render_markdown_on_server: bool = False,
+        json_backend: json_backends.JsonBackendName = "stdlib",
     ) -> None:
         """
         ## Parameters
@@ -285,6 +302,40 @@ class App:
             HTML header of the app. These are used by search engines and social
             media sites to display information about your page, such as the
             title and a short description.
+
+        `lazy_page_imports`: Whether automatically detected pages should only
+            be imported when they're first visited. This speeds up the start
+            of apps with many pages, or pages with heavy dependencies. The
+            page's name, URL segment and so on are read from its `@rio.page`
+            decorator without running any code, which requires the
+            decorator's arguments to be literals. Files where that isn't the
+            case are imported right away.
+
+        `prewarm_pages`: If pages are imported lazily, import them all in the
+            background once the app has started, so the first visitors of a
+            page don't have to wait for it.
+
+        `refresh_time_slice`: All sessions share a single event loop, so a
+            session rebuilding a huge number of components (e.g. after
+            replacing a long list) stalls all other sessions until it's done.
+            If this is set, such rebuilds pause whenever they've been running
+            for this long, giving other sessions a chance to run. Changes are
+            still sent to the client all at once, and input from the client is
+            held back until they have been. `None` (the default) rebuilds
+            without interruption, which is slightly faster.
+
+        `render_markdown_on_server`: Whether `rio.Markdown` and
+            `rio.CodeBlock` are rendered to HTML on the server, rather than by
+            each client. The results are cached, so texts displayed to many
+            users are only rendered once, and clients on slow devices don't
+            have to do the work. This requires `markdown-it-py` and `Pygments`
+            (`pip install "rio-ui[markdown]"`).
+
+        `json_backend`: Which library encodes and decodes the messages
+            exchanged with the clients. `"stdlib"` (the default) uses Python's
+            built-in `json` module. `"orjson"` is considerably faster, which
+            pays off for apps with many components or many users, but requires
+            `orjson` to be installed (`pip install "rio-ui[fast-json]"`).
         """
         # A common mistake is to pass types instead of instances to
         # `default_attachments`. Catch that, scream and die.
@@ -315,10 +366,11 @@ class App:
             assets_dir = self._base_dir_for_relative_paths / assets_dir
 
         if pages is None:
-            pages = self._infer_pages()
+            pages = self._infer_pages(lazy=lazy_page_imports)
         elif isinstance(pages, (os.PathLike, str)):
             pages = routing.auto_detect_pages(
-                self._base_dir_for_relative_paths / pages
+                self._base_dir_for_relative_paths / pages,
+                lazy=lazy_page_imports,
             )
         else:
             pages = list(pages)
@@ -328,7 +380,13 @@ class App:
         self.assets_dir = assets_dir
         self.pages = pages
         self._build = build
-        self._icon = assets.Asset.from_image(icon)
+        # Encoding PIL images is slow, so that's put off until the icon is
+        # first requested, and then done in a worker thread
+        self._icon: assets.Asset | Image.Image = (
+            icon
+            if isinstance(icon, Image.Image)
+            else assets.Asset.from_image(icon)
+        )
         self._on_app_start = on_app_start
         self._on_app_close = on_app_close
         self._on_session_start = on_session_start
@@ -337,6 +395,18 @@ class App:
         self._theme = theme
         self._build_connection_lost_message = build_connection_lost_message
         self._custom_meta_tags = meta_tags
+        self._prewarm_pages = prewarm_pages
+        self._render_markdown_on_server = render_markdown_on_server
+        self._json_backend = json_backends.get_json_backend(json_backend)
+
+        self._refresh_time_slice: float | None
+
+        if isinstance(refresh_time_slice, timedelta):
+            self._refresh_time_slice = refresh_time_slice.total_seconds()
+        elif refresh_time_slice is not None:
+            self._refresh_time_slice = float(refresh_time_slice)
+        else:
+            self._refresh_time_slice = None
 
         if isinstance(ping_pong_interval, timedelta):
             self._ping_pong_interval = ping_pong_interval
@@ -431,15 +501,14 @@ class App:
 
         # Nope, get it
         try:
-            icon_blob = await self._icon.fetch_as_bytes()
-
-            input_buffer = io.BytesIO(icon_blob)
-            output_buffer = io.BytesIO()
-
-            with Image.open(input_buffer) as image:
-                image.save(output_buffer, format="png")
+            if isinstance(self._icon, Image.Image):
+                icon = self._icon
+            else:
+                icon = await self._icon.fetch_as_bytes()
 
-            self._icon_as_png_blob = output_buffer.getvalue()
+            self._icon_as_png_blob = await asyncio.to_thread(
+                _convert_icon_to_png, icon
+            )
 
         # Loading has failed. Use the default icon.
         except Exception as e:
@@ -556,7 +625,7 @@ class App:
 
         return name.replace("_", " ").title()
 
-    def _infer_pages(self) -> list[rio.ComponentPage]:
+    def _infer_pages(self, *, lazy: bool) -> list[rio.ComponentPage]:
         pages_dir = self._base_dir_for_relative_paths / "pages"
 
         # No `pages` folder exists? No pages, then.
@@ -588,7 +657,11 @@ class App:
         else:
             package_name = "pages"
 
-        return routing.auto_detect_pages(pages_dir, package=package_name)
+        return routing.auto_detect_pages(
+            pages_dir,
+            package=package_name,
+            lazy=lazy,
+        )
 
     def _iter_page_urls(
         self,
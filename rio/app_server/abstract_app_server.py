@@ -5,6 +5,8 @@ import asyncio
 import inspect
 import json
 import logging
+import random
+import string
 import time
 import traceback
 import typing as t
@@ -23,11 +25,14 @@ import rio
 from .. import (
     assets,
     data_models,
+    font_optimization,
     language_info,
+    loop_watchdog,
     nice_traceback,
     routing,
     session,
     text_style,
+    theme,
     user_settings_module,
     utils,
 )
@@ -83,11 +88,31 @@ class AbstractAppServer(abc.ABC):
             rio.Font, asyncio.Task[t.Iterable[text_style.FontFace]]
         ] = {}
 
+        # The name each font is registered under on the client. The names are
+        # shared by all sessions, which makes the CSS generated for a theme
+        # independent of the session.
+        self._font_names: dict[rio.Font, str] = {}
+
+        # The CSS variables of the app's themes, along with the fonts they
+        # reference. Computing these is a significant part of setting up a
+        # session, and almost all sessions use one of the app's themes. Themes
+        # aren't hashable, so they're keyed by `id`. The theme itself is stored
+        # alongside the result to make sure the `id` can't be reused.
+        self._theme_css_cache: dict[
+            int,
+            tuple[theme.Theme, dict[str, str], tuple[rio.Font, ...]],
+        ] = {}
+
+        # Reports code which blocks the event loop, and thus all sessions
+        self.loop_watchdog = loop_watchdog.LoopWatchdog()
+
     @property
     def sessions(self) -> list[rio.Session]:
         return list(self._session_serve_tasks)
 
     async def _on_start(self) -> None:
+        self.loop_watchdog.start()
+
         # Trigger the app's startup event
         #
         # This will be done blockingly, so the user can prepare any state before
@@ -107,7 +132,19 @@ class AbstractAppServer(abc.ABC):
             self._background_tasks.add(cleanup_task)
             cleanup_task.add_done_callback(self._background_tasks.discard)
 
+        # Import any lazily loaded pages in the background, so visitors don't
+        # have to wait for them
+        if self.app._prewarm_pages:
+            prewarm_task = asyncio.create_task(
+                routing.prewarm_pages(self.app.pages),
+                name="Pre-warm pages",
+            )
+            self._background_tasks.add(prewarm_task)
+            prewarm_task.add_done_callback(self._background_tasks.discard)
+
     async def _on_close(self) -> None:
+        self.loop_watchdog.stop()
+
         # Close all sessions
         rio._logger.debug(
             f"App server shutting down; closing {len(self.sessions)} active session(s)"
@@ -324,6 +361,28 @@ class AbstractAppServer(abc.ABC):
         # Clean house
         del self._session_serve_tasks[session]
 
+    def get_font_name(self, font: text_style.Font) -> str:
+        """
+        Returns the name under which the given font is registered on the
+        client. All sessions use the same name for the same font.
+        """
+        try:
+            return self._font_names[font]
+        except KeyError:
+            pass
+
+        # Generate a random name for the font
+        while True:
+            font_name = "".join(
+                random.choice(string.ascii_letters) for _ in range(10)
+            )
+
+            if font_name not in self._font_names.values():
+                break
+
+        self._font_names[font] = font_name
+        return font_name
+
     def register_font(
         self,
         font: text_style.Font,
@@ -346,8 +405,16 @@ class AbstractAppServer(abc.ABC):
 
         try:
             async for font_face in font._get_faces():
-                self.weakly_host_asset(font_face.file)
-                font_faces.append(font_face)
+                # Convert the face to WOFF2 and split it into subsets, if
+                # possible
+                optimized_faces = await font_optimization.optimize_font_face(
+                    font_face,
+                    subsets=font._subsets,
+                )
+
+                for optimized_face in optimized_faces:
+                    self.weakly_host_asset(optimized_face.file)
+                    font_faces.append(optimized_face)
         except Exception as error:
             revel.error(f"Failed to load font faces of {font!r}:")
             nice_traceback.print_exception(error)
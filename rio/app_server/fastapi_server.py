@@ -19,6 +19,7 @@ from xml.etree import ElementTree as ET
 import crawlerdetect
 import fastapi
 import multipart
+import starlette.background
 import timer_dict
 from uniserde import Jsonable, JsonDoc
 
@@ -26,11 +27,13 @@ import rio
 
 from .. import (
     app,
+    arequests,
     assets,
     byte_serving,
     data_models,
     errors,
     icon_registry,
+    image_pipeline,
     inspection,
     routing,
     serialization,
@@ -776,6 +779,27 @@ Sitemap: {base_url / "rio/sitemap.xml"}
         except KeyError:
             return fastapi.responses.Response(status_code=404)
 
+        # Images may be requested at a lower resolution
+        try:
+            variant_width = int(request.query_params["w"])
+        except (KeyError, ValueError):
+            pass
+        else:
+            variant = await image_pipeline.IMAGE_PIPELINE.get_variant(
+                asset,
+                variant_width,
+                request.headers.get("accept", ""),
+            )
+
+            if variant is not None:
+                data, media_type = variant
+
+                return fastapi.responses.Response(
+                    content=data,
+                    media_type=media_type,
+                    headers={"vary": "accept"},
+                )
+
         # Fetch the asset's content and respond
         if isinstance(asset, assets.BytesAsset):
             return byte_serving.range_requests_response(
@@ -789,17 +813,39 @@ Sitemap: {base_url / "rio/sitemap.xml"}
                 asset.path,
                 media_type=asset.media_type,
             )
+        elif isinstance(asset, assets.ByteRangeAsset):
+            return byte_serving.range_requests_response(
+                request,
+                asset.source,
+                media_type=asset.media_type,
+            )
         elif isinstance(asset, assets.RehostedUrlAsset):
-            file_path = asset.local_cache_path
+            # Assets which aren't cached are streamed straight through from
+            # the remote server
+            if asset.local_cache_path is None:
+                return await self._proxy_url_asset(request, asset)
 
-            if file_path is not None and file_path.exists():
+            # Make sure the cached file exists and is up to date. If the data
+            # was downloaded just now it's used directly, since it may not
+            # have been stored (e.g. because of `Cache-Control: no-store`).
+            url = str(asset.url)
+
+            try:
+                cache_entry, data = await assets.URL_ASSET_CACHE.fetch(url)
+
+                if data is None and not cache_entry.path.exists():
+                    # The file has been evicted in the meantime
+                    data, _ = await assets.URL_ASSET_CACHE.read(url)
+            except ValueError:
+                return fastapi.responses.Response(status_code=502)
+
+            if data is None:
                 return byte_serving.range_requests_response(
                     request,
-                    file_path,
+                    cache_entry.path,
                     media_type=asset.media_type,
                 )
 
-            data = await asset.fetch_as_bytes()
             return byte_serving.range_requests_response(
                 request,
                 data,
@@ -808,6 +854,63 @@ Sitemap: {base_url / "rio/sitemap.xml"}
         else:
             raise NotImplementedError(f"Unexpected asset type: {type(asset)}")
 
+    async def _proxy_url_asset(
+        self,
+        request: fastapi.Request,
+        asset: assets.RehostedUrlAsset,
+    ) -> fastapi.responses.Response:
+        """
+        Serves an asset by streaming it from its original URL. Range requests
+        are forwarded to the remote server, so seeking in large media files
+        doesn't require downloading them in their entirety.
+        """
+        headers = {}
+
+        if "range" in request.headers:
+            headers["range"] = request.headers["range"]
+
+        # The upstream response must stay open until the body has been sent,
+        # so its context is closed manually
+        exit_stack = contextlib.AsyncExitStack()
+
+        try:
+            upstream = await exit_stack.enter_async_context(
+                arequests.stream("get", str(asset.url), headers=headers)
+            )
+        except arequests.HttpError as error:
+            return fastapi.responses.Response(
+                status_code=error.status_code or 502
+            )
+
+        # Forward the headers relevant for the browser
+        response_headers = {
+            name: upstream.headers[name]
+            for name in (
+                "content-length",
+                "content-range",
+                "accept-ranges",
+                "content-type",
+            )
+            if name in upstream.headers
+        }
+
+        if asset.media_type is not None:
+            response_headers["content-type"] = asset.media_type
+
+        async def stream_body() -> t.AsyncIterator[bytes]:
+            try:
+                async for chunk in upstream.iter_bytes():
+                    yield chunk
+            finally:
+                await exit_stack.aclose()
+
+        return fastapi.responses.StreamingResponse(
+            stream_body(),
+            status_code=upstream.status_code,
+            headers=response_headers,
+            background=starlette.background.BackgroundTask(exit_stack.aclose),
+        )
+
     @add_cache_headers
     async def _serve_file_from_directory(
         self,
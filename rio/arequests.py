@@ -3,28 +3,48 @@ A teeny-weeny synchronous/asynchronous HTTP library. This is not intended to
 rival `httpx` or `aiohttp`, but rather to provide a simple interface and be
 small. Use it if you just need to make the occasional HTTP request and don't
 want to depend on a large library.
+
+The asynchronous functions are backed by a small HTTP/1.1 client running
+directly on the event loop. It keeps connections alive and reuses them for
+subsequent requests to the same host. Just like `urllib`, it honors the proxy
+configured via the `HTTP_PROXY`, `HTTPS_PROXY` and `NO_PROXY` environment
+variables.
 """
 
+from __future__ import annotations
+
 import asyncio
+import base64
+import collections
+import contextlib
 import json as json_module
+import socket
 import ssl
+import time
 import typing as t
 import urllib.error
 import urllib.parse
 import urllib.request
+import weakref
 
 # Re-export JSONDecodeError, since it can be raised by this module
 from json import JSONDecodeError as JSONDecodeError
 
 __all__ = [
+    "HttpClient",
     "HttpError",
     "HttpResponse",
     "JSONDecodeError",
+    "StreamingHttpResponse",
     "request",
     "request_sync",
+    "stream",
 ]
 
 
+T = t.TypeVar("T")
+
+
 HttpMethod = t.Literal[
     "get",
     "GET",
@@ -50,6 +70,12 @@ HttpMethod = t.Literal[
 HTTP_METHOD_VALUES = t.get_args(HttpMethod)
 
 
+# Requests which may safely be sent twice. If a reused connection turns out to
+# be dead, only these are retried, since the server may already have received
+# the request.
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "TRACE", "PUT", "DELETE"}
+
+
 class HttpError(Exception):
     """
     Raised when an HTTP request fails.
@@ -156,6 +182,54 @@ class HttpResponse:
             )
 
 
+def _prepare_request(
+    method: HttpMethod,
+    url: str,
+    *,
+    content: str | bytes | None,
+    json: dict[str, t.Any] | None,
+    headers: dict[str, str] | None,
+) -> tuple[urllib.parse.SplitResult, bytes | None, dict[str, str]]:
+    """
+    Validates the parameters of a request, and returns the parsed URL, the
+    request body and all headers to send.
+    """
+    # Verify the method
+    if method not in HTTP_METHOD_VALUES:
+        raise ValueError("Invalid method")
+
+    # Verify the URL
+    parsed_url = _parse_url(url)
+
+    # Prepare a set of default headers
+    all_headers = {
+        "user-agent": "rio.arequests/0.1",
+        "content-type": "application/octet-stream",
+    }
+
+    # If a JSON object was provided, use it as content and also set the
+    # content-type header
+    if json:
+        if content is not None:
+            raise ValueError("Cannot specify both `content` and `json`")
+
+        content = json_module.dumps(json)
+        all_headers["content-type"] = "application/json"
+
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+
+    # Add the headers
+    #
+    # User-provided headers override the default headers. Take care to do this
+    # late so that the logic above (e.g. JSON) can modify the default headers.
+    if headers:
+        for header, value in headers.items():
+            all_headers[header.lower()] = value
+
+    return parsed_url, content or None, all_headers
+
+
 def request_sync(
     method: HttpMethod,
     url: str,
@@ -197,53 +271,21 @@ def request_sync(
     `HttpError`: If the request fails for any reason. This includes external
         errors such as network issues, as well as any non-200 status codes.
     """
-    # Verify the method
-    if method not in HTTP_METHOD_VALUES:
-        raise ValueError("Invalid method")
-
-    # Verify the URL scheme. Only HTTP and HTTPS are allowed.
-    parsed_url = urllib.parse.urlparse(url)
-    if parsed_url.scheme not in ("http", "https"):
-        raise ValueError(
-            f"Invalid URL scheme `{parsed_url.scheme}`. Only `http` and `https` are supported."
-        )
-
-    # Prepare a set of default headers
-    all_headers = {
-        "user-agent": "rio.arequests/0.1",
-        "content-type": "application/octet-stream",
-    }
+    _, body, all_headers = _prepare_request(
+        method,
+        url,
+        content=content,
+        json=json,
+        headers=headers,
+    )
 
     # Prepare the request
     req = urllib.request.Request(
         url,
+        data=body,
         method=method.upper(),
     )
 
-    # If a JSON object was provided, use it as content and also set the
-    # content-type header
-    if json:
-        if content is not None:
-            raise ValueError("Cannot specify both `content` and `json`")
-
-        content = json_module.dumps(json)
-        all_headers["content-type"] = "application/json"
-
-    # If content was provided add it to the request
-    if content:
-        if isinstance(content, str):
-            content = content.encode("utf-8")
-
-        req.data = content
-
-    # Add the headers
-    #
-    # User-provided headers override the default headers. Take care to do this
-    # late so that the logic above (e.g. JSON) can modify the default headers.
-    if headers:
-        for header, value in headers.items():
-            all_headers[header.lower()] = value
-
     for key, value in all_headers.items():
         req.add_header(key, value)
 
@@ -295,11 +337,956 @@ def request_sync(
         ) from None
 
 
+class StreamingHttpResponse:
+    """
+    A response received from a server, whose body hasn't been read yet.
+
+    These are returned by `stream` and `HttpClient.stream`. The body can be read
+    exactly once, either all at once using `read`, or piece by piece using
+    `iter_bytes`.
+
+
+    ## Attributes
+
+    `status_code`: The HTTP status code of the response
+
+    `reason`: The reason phrase sent along with the status code
+
+    `headers`: A dictionary of headers received in the response. These are all
+        lowercase so you can access them without worrying about casing.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: HttpClient,
+        connection: _Connection,
+        pool: _HostPool,
+        method: HttpMethod,
+        url: str,
+        status_code: int,
+        reason: str,
+        headers: dict[str, str],
+    ) -> None:
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+
+        self._client = client
+        self._connection = connection
+        self._pool = pool
+        self._method = method
+        self._url = url
+
+        self._body_consumed = False
+        self._body_complete = False
+        self._released = False
+
+        # Figure out how the body is delimited
+        self._keep_alive = headers.get("connection", "").lower() != "close"
+        self._chunked = False
+        self._content_length: int | None = None
+
+        if (
+            method.upper() == "HEAD"
+            or status_code in (204, 304)
+            or 100 <= status_code < 200
+        ):
+            self._content_length = 0
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            self._chunked = True
+        else:
+            try:
+                self._content_length = int(headers["content-length"])
+            except (KeyError, ValueError):
+                # The body extends until the server closes the connection
+                self._keep_alive = False
+
+        # Responses without a body are complete right away
+        if self._content_length == 0:
+            self._body_complete = True
+            self._release()
+
+    def _error(self, message: str) -> HttpError:
+        return HttpError(
+            method=self._method,
+            url=self._url,
+            status_code=None,
+            message=message,
+        )
+
+    async def _read(self, awaitable: t.Awaitable[T]) -> T:
+        return await asyncio.wait_for(awaitable, self._client.read_timeout)
+
+    def _release(self) -> None:
+        if self._released:
+            return
+
+        self._released = True
+        self._client._release_connection(
+            self._pool,
+            self._connection,
+            reusable=self._body_complete and self._keep_alive,
+        )
+
+    async def iter_bytes(
+        self,
+        chunk_size: int = 64 * 1024,
+    ) -> t.AsyncIterator[bytes]:
+        """
+        Yields the response body piece by piece, as it is received.
+
+
+        ## Raises
+
+        `RuntimeError`: If the body has already been read.
+
+        `HttpError`: If the connection fails while reading the body.
+        """
+        if self._body_consumed:
+            raise RuntimeError("The response body has already been read")
+
+        self._body_consumed = True
+
+        if self._body_complete:
+            return
+
+        reader = self._connection.reader
+
+        try:
+            if self._chunked:
+                while True:
+                    size_line = await self._read(reader.readline())
+                    chunk_length = int(size_line.split(b";", 1)[0], 16)
+
+                    if chunk_length == 0:
+                        break
+
+                    while chunk_length > 0:
+                        chunk = await self._read(
+                            reader.read(min(chunk_size, chunk_length))
+                        )
+
+                        if not chunk:
+                            raise asyncio.IncompleteReadError(b"", None)
+
+                        chunk_length -= len(chunk)
+                        yield chunk
+
+                    await self._read(reader.readexactly(2))
+
+                # Skip any trailers
+                while (await self._read(reader.readline())).strip():
+                    pass
+
+            elif self._content_length is not None:
+                remaining = self._content_length
+
+                while remaining > 0:
+                    chunk = await self._read(
+                        reader.read(min(chunk_size, remaining))
+                    )
+
+                    if not chunk:
+                        raise asyncio.IncompleteReadError(b"", remaining)
+
+                    remaining -= len(chunk)
+                    yield chunk
+
+            else:
+                while True:
+                    chunk = await self._read(reader.read(chunk_size))
+
+                    if not chunk:
+                        break
+
+                    yield chunk
+
+        except asyncio.TimeoutError:
+            self._release()
+            raise self._error("Timed out while reading the response") from None
+
+        except (OSError, ValueError, asyncio.IncompleteReadError) as error:
+            self._release()
+            raise self._error(
+                f"Failed to read the response body: {error}"
+            ) from None
+
+        # The connection can be reused for another request now
+        self._body_complete = True
+        self._release()
+
+    async def read(self) -> bytes:
+        """
+        Reads the entire response body and returns it as bytes.
+
+
+        ## Raises
+
+        `RuntimeError`: If the body has already been read.
+
+        `HttpError`: If the connection fails while reading the body.
+        """
+        chunks = [chunk async for chunk in self.iter_bytes()]
+        return b"".join(chunks)
+
+    async def aclose(self) -> None:
+        """
+        Releases the underlying connection. If the body hasn't been read
+        completely, the connection is closed rather than being reused.
+        """
+        self._release()
+
+
+class _Connection:
+    """
+    A single HTTP/1.1 connection, which may be reused for multiple requests.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+
+    def is_usable(self, keepalive_expiry: float) -> bool:
+        if self.writer.is_closing() or self.reader.at_eof():
+            return False
+
+        return time.monotonic() - self.last_used < keepalive_expiry
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _HostPool:
+    """
+    The connections to a single host, as well as the semaphore limiting how
+    many of them may be in use at once.
+    """
+
+    def __init__(self, max_connections: int) -> None:
+        self.semaphore = asyncio.Semaphore(max_connections)
+
+        # Idle connections, with the most recently used ones at the end
+        self.idle_connections = collections.deque[_Connection]()
+
+
+class HttpClient:
+    """
+    An asynchronous HTTP/1.1 client with connection pooling.
+
+    Connections are kept alive after a request finishes and reused for later
+    requests to the same host. The number of simultaneous connections per host
+    is limited; additional requests wait until a connection becomes free.
+
+    Most code doesn't need to create a client explicitly - the module-level
+    `request` and `stream` functions share a default client.
+
+
+    ## Attributes
+
+    `max_connections_per_host`: How many requests to the same host may be in
+        flight at the same time.
+
+    `keepalive_expiry`: How long idle connections are kept around, in seconds.
+
+    `connect_timeout`: How long to wait for a connection to be established, in
+        seconds.
+
+    `read_timeout`: How long to wait for the server when sending a request or
+        reading a response, in seconds. This applies to each individual
+        operation, not the request as a whole.
+
+    `max_redirects`: How many redirects to follow before giving up.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections_per_host: int = 8,
+        keepalive_expiry: float = 30,
+        connect_timeout: float = 10,
+        read_timeout: float = 60,
+        max_redirects: int = 10,
+    ) -> None:
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_expiry = keepalive_expiry
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_redirects = max_redirects
+
+        # Maps (scheme, host, port, verify_ssl, proxy) to the connections for
+        # that host
+        self._pools: dict[
+            tuple[str, str, int, bool, str | None], _HostPool
+        ] = {}
+        self._ssl_contexts: dict[bool, ssl.SSLContext] = {}
+        self._is_closed = False
+
+    async def request(
+        self,
+        method: HttpMethod,
+        url: str,
+        *,
+        content: str | bytes | None = None,
+        json: dict[str, t.Any] | None = None,
+        headers: dict[str, str] | None = None,
+        verify_ssl: bool = True,
+    ) -> HttpResponse:
+        """
+        Makes an HTTP request and reads the entire response. See the
+        module-level `request` function for details.
+        """
+        async with self.stream(
+            method,
+            url,
+            content=content,
+            json=json,
+            headers=headers,
+            verify_ssl=verify_ssl,
+        ) as response:
+            body = await response.read()
+
+        return HttpResponse(
+            status_code=response.status_code,
+            headers=response.headers,
+            content=body,
+        )
+
+    @contextlib.asynccontextmanager
+    async def stream(
+        self,
+        method: HttpMethod,
+        url: str,
+        *,
+        content: str | bytes | None = None,
+        json: dict[str, t.Any] | None = None,
+        headers: dict[str, str] | None = None,
+        verify_ssl: bool = True,
+    ) -> t.AsyncIterator[StreamingHttpResponse]:
+        """
+        Makes an HTTP request without reading the response body. See the
+        module-level `stream` function for details.
+        """
+        response = await self.send(
+            method,
+            url,
+            content=content,
+            json=json,
+            headers=headers,
+            verify_ssl=verify_ssl,
+        )
+
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    async def send(
+        self,
+        method: HttpMethod,
+        url: str,
+        *,
+        content: str | bytes | None = None,
+        json: dict[str, t.Any] | None = None,
+        headers: dict[str, str] | None = None,
+        verify_ssl: bool = True,
+    ) -> StreamingHttpResponse:
+        """
+        Like `stream`, but returns the response directly rather than as context
+        manager. The caller is responsible for calling `aclose` on the
+        response, or reading its body completely.
+        """
+        if self._is_closed:
+            raise RuntimeError("The HTTP client has been closed")
+
+        parsed_url, body, all_headers = _prepare_request(
+            method,
+            url,
+            content=content,
+            json=json,
+            headers=headers,
+        )
+
+        for _ in range(self.max_redirects + 1):
+            response = await self._send_single_request(
+                method,
+                url,
+                parsed_url,
+                body,
+                all_headers,
+                verify_ssl,
+            )
+
+            # Follow redirects
+            location = response.headers.get("location")
+
+            if response.status_code in (301, 302, 303, 307, 308) and location:
+                await response.aclose()
+
+                url = urllib.parse.urljoin(url, location)
+                parsed_url = _parse_url(url)
+
+                # Like browsers, switch to `GET` for anything but the
+                # redirects that explicitly preserve the method
+                if response.status_code == 303 or (
+                    response.status_code in (301, 302)
+                    and method.upper() not in ("GET", "HEAD")
+                ):
+                    method = "GET"
+                    body = None
+                    all_headers.pop("content-type", None)
+
+                continue
+
+            # Fail on errors
+            if response.status_code >= 300:
+                await response.aclose()
+
+                raise HttpError(
+                    method=method,
+                    url=url,
+                    status_code=response.status_code,
+                    message=response.reason,
+                )
+
+            return response
+
+        raise HttpError(
+            method=method,
+            url=url,
+            status_code=None,
+            message="Too many redirects",
+        )
+
+    async def aclose(self) -> None:
+        """
+        Closes all idle connections. The client can't be used afterwards.
+        Connections which are still in use are closed once their response has
+        been read.
+        """
+        self._is_closed = True
+
+        for pool in self._pools.values():
+            while pool.idle_connections:
+                pool.idle_connections.pop().close()
+
+    async def __aenter__(self) -> HttpClient:
+        return self
+
+    async def __aexit__(self, *args: t.Any) -> None:
+        await self.aclose()
+
+    def _get_ssl_context(self, verify_ssl: bool) -> ssl.SSLContext:
+        try:
+            return self._ssl_contexts[verify_ssl]
+        except KeyError:
+            pass
+
+        ssl_context = ssl.create_default_context()
+
+        # The default context verifies SSL. If that is not desired, override
+        # it.
+        if not verify_ssl:
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+
+        self._ssl_contexts[verify_ssl] = ssl_context
+        return ssl_context
+
+    async def _acquire_connection(
+        self,
+        pool: _HostPool,
+        parsed_url: urllib.parse.SplitResult,
+        proxy_url: urllib.parse.SplitResult | None,
+        verify_ssl: bool,
+    ) -> tuple[_Connection, bool]:
+        """
+        Returns an idle connection from the pool, or opens a new one. The
+        second return value indicates whether the connection was reused.
+        """
+        while pool.idle_connections:
+            connection = pool.idle_connections.pop()
+
+            if connection.is_usable(self.keepalive_expiry):
+                return connection, True
+
+            connection.close()
+
+        host = t.cast(str, parsed_url.hostname)
+        port = _get_port(parsed_url)
+
+        if parsed_url.scheme == "https":
+            ssl_context = self._get_ssl_context(verify_ssl)
+            server_hostname = host
+        else:
+            ssl_context = None
+            server_hostname = None
+
+        # Connect directly
+        if proxy_url is None:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(
+                    host,
+                    port,
+                    ssl=ssl_context,
+                    server_hostname=server_hostname,
+                ),
+                self.connect_timeout,
+            )
+
+        # Plain HTTP requests are sent to the proxy, which forwards them
+        elif parsed_url.scheme == "http":
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(
+                    proxy_url.hostname,
+                    _get_port(proxy_url),
+                ),
+                self.connect_timeout,
+            )
+
+        # HTTPS requests are tunneled through the proxy, so it can't read them
+        else:
+            sock = await asyncio.to_thread(
+                _open_tunnel, proxy_url, host, port, self.connect_timeout
+            )
+
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(
+                        sock=sock,
+                        ssl=ssl_context,
+                        server_hostname=server_hostname,
+                    ),
+                    self.connect_timeout,
+                )
+            except BaseException:
+                sock.close()
+                raise
+
+        return _Connection(reader, writer), False
+
+    def _release_connection(
+        self,
+        pool: _HostPool,
+        connection: _Connection,
+        *,
+        reusable: bool,
+    ) -> None:
+        pool.semaphore.release()
+
+        if reusable and not self._is_closed:
+            connection.last_used = time.monotonic()
+            pool.idle_connections.append(connection)
+        else:
+            connection.close()
+
+    async def _send_single_request(
+        self,
+        method: HttpMethod,
+        url: str,
+        parsed_url: urllib.parse.SplitResult,
+        body: bytes | None,
+        headers: dict[str, str],
+        verify_ssl: bool,
+    ) -> StreamingHttpResponse:
+        """
+        Sends a request and reads the response's status line and headers.
+        Doesn't follow redirects.
+        """
+        try:
+            proxy_url = _get_proxy_url(parsed_url)
+        except ValueError as error:
+            raise HttpError(
+                method=method,
+                url=url,
+                status_code=None,
+                message=str(error),
+            ) from None
+
+        host = t.cast(str, parsed_url.hostname)
+        pool_key = (
+            parsed_url.scheme,
+            host,
+            _get_port(parsed_url),
+            verify_ssl,
+            None if proxy_url is None else proxy_url.geturl(),
+        )
+
+        try:
+            pool = self._pools[pool_key]
+        except KeyError:
+            pool = self._pools[pool_key] = _HostPool(
+                self.max_connections_per_host
+            )
+
+        # Requests sent to a proxy must contain the entire URL, so the proxy
+        # knows where to forward them
+        sent_to_proxy = proxy_url is not None and parsed_url.scheme == "http"
+
+        if sent_to_proxy:
+            assert proxy_url is not None
+            headers = {**headers, **_get_proxy_headers(proxy_url)}
+
+        request_bytes = _serialize_request_head(
+            method,
+            parsed_url,
+            body,
+            headers,
+            absolute_target=sent_to_proxy,
+        )
+
+        await pool.semaphore.acquire()
+
+        try:
+            while True:
+                try:
+                    connection, is_reused = await self._acquire_connection(
+                        pool, parsed_url, proxy_url, verify_ssl
+                    )
+                except asyncio.TimeoutError:
+                    raise HttpError(
+                        method=method,
+                        url=url,
+                        status_code=None,
+                        message="Timed out while connecting",
+                    ) from None
+                except (OSError, ssl.SSLError) as error:
+                    raise HttpError(
+                        method=method,
+                        url=url,
+                        status_code=None,
+                        message=str(error),
+                    ) from None
+
+                try:
+                    (
+                        status_code,
+                        reason,
+                        response_headers,
+                    ) = await self._exchange_head(
+                        connection,
+                        request_bytes,
+                        body,
+                    )
+                except (OSError, asyncio.IncompleteReadError) as error:
+                    connection.close()
+
+                    # The server may have closed an idle connection just as
+                    # it was being reused. Try again on a fresh one, unless
+                    # the server may already have acted on the request.
+                    if is_reused and method.upper() in _IDEMPOTENT_METHODS:
+                        continue
+
+                    raise HttpError(
+                        method=method,
+                        url=url,
+                        status_code=None,
+                        message=f"Connection failed: {error}",
+                    ) from None
+                except asyncio.TimeoutError:
+                    connection.close()
+
+                    raise HttpError(
+                        method=method,
+                        url=url,
+                        status_code=None,
+                        message="Timed out while waiting for a response",
+                    ) from None
+                except (ValueError, asyncio.LimitOverrunError) as error:
+                    connection.close()
+
+                    raise HttpError(
+                        method=method,
+                        url=url,
+                        status_code=None,
+                        message=f"Invalid response: {error}",
+                    ) from None
+
+                break
+
+        except BaseException:
+            pool.semaphore.release()
+            raise
+
+        return StreamingHttpResponse(
+            client=self,
+            connection=connection,
+            pool=pool,
+            method=method,
+            url=url,
+            status_code=status_code,
+            reason=reason,
+            headers=response_headers,
+        )
+
+    async def _exchange_head(
+        self,
+        connection: _Connection,
+        request_head: bytes,
+        body: bytes | None,
+    ) -> tuple[int, str, dict[str, str]]:
+        """
+        Sends the request and reads the status line and headers of the
+        response.
+        """
+        connection.writer.write(request_head)
+
+        if body:
+            connection.writer.write(body)
+
+        await asyncio.wait_for(connection.writer.drain(), self.read_timeout)
+
+        while True:
+            head = await asyncio.wait_for(
+                connection.reader.readuntil(b"\r\n\r\n"),
+                self.read_timeout,
+            )
+
+            status_line, *header_lines = (
+                head.decode("latin-1").rstrip("\r\n").split("\r\n")
+            )
+
+            version, status_code_str, *reason = status_line.split(" ", 2)
+
+            if not version.startswith("HTTP/"):
+                raise ValueError(f"Invalid status line {status_line!r}")
+
+            status_code = int(status_code_str)
+
+            # Skip informational responses like `100 Continue`
+            if 100 <= status_code < 200 and status_code != 101:
+                continue
+
+            break
+
+        headers = dict[str, str]()
+
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            name = name.strip().lower()
+            value = value.strip()
+
+            if name in headers:
+                headers[name] += ", " + value
+            else:
+                headers[name] = value
+
+        return status_code, reason[0] if reason else "", headers
+
+
+def _parse_url(url: str) -> urllib.parse.SplitResult:
+    """
+    Parses the URL, making sure it uses a supported scheme.
+    """
+    parsed_url = urllib.parse.urlsplit(url)
+
+    # Verify the URL scheme. Only HTTP and HTTPS are allowed.
+    if parsed_url.scheme not in ("http", "https"):
+        raise ValueError(
+            f"Invalid URL scheme `{parsed_url.scheme}`. Only `http` and `https` are supported."
+        )
+
+    if not parsed_url.hostname:
+        raise ValueError(f"The URL `{url}` doesn't contain a host")
+
+    return parsed_url
+
+
+def _get_port(parsed_url: urllib.parse.SplitResult) -> int:
+    if parsed_url.port is not None:
+        return parsed_url.port
+
+    return 443 if parsed_url.scheme == "https" else 80
+
+
+def _get_proxy_url(
+    parsed_url: urllib.parse.SplitResult,
+) -> urllib.parse.SplitResult | None:
+    """
+    Returns the proxy to send the request through, or `None` if it should be
+    sent directly. The proxy is configured the same way as for `urllib`, i.e.
+    via the `HTTP_PROXY`, `HTTPS_PROXY` and `NO_PROXY` environment variables or
+    the system's settings.
+
+    Raises a `ValueError` if the proxy isn't supported.
+    """
+    proxy = urllib.request.getproxies().get(parsed_url.scheme)
+
+    if not proxy:
+        return None
+
+    if urllib.request.proxy_bypass(_format_host(parsed_url)):
+        return None
+
+    # Proxies are commonly given without a scheme
+    if "://" not in proxy:
+        proxy = "http://" + proxy
+
+    proxy_url = urllib.parse.urlsplit(proxy)
+
+    if proxy_url.scheme != "http" or not proxy_url.hostname:
+        raise ValueError(
+            f"Unsupported proxy `{proxy}`. Only `http` proxies are supported."
+        )
+
+    return proxy_url
+
+
+def _get_proxy_headers(proxy_url: urllib.parse.SplitResult) -> dict[str, str]:
+    """
+    Returns the headers needed to authenticate with the proxy, if any.
+    """
+    if proxy_url.username is None:
+        return {}
+
+    credentials = urllib.parse.unquote(proxy_url.username)
+
+    if proxy_url.password is not None:
+        credentials += ":" + urllib.parse.unquote(proxy_url.password)
+
+    encoded_credentials = base64.b64encode(credentials.encode()).decode()
+    return {"proxy-authorization": f"Basic {encoded_credentials}"}
+
+
+def _open_tunnel(
+    proxy_url: urllib.parse.SplitResult,
+    host: str,
+    port: int,
+    timeout: float,
+) -> socket.socket:
+    """
+    Connects to the host through the proxy, using a `CONNECT` request. Returns
+    the socket, over which the connection can then be encrypted.
+
+    This uses a blocking socket and is meant to run in a worker thread.
+    """
+    address = f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+
+    lines = [f"CONNECT {address} HTTP/1.1", f"host: {address}"]
+    lines.extend(
+        f"{name}: {value}"
+        for name, value in _get_proxy_headers(proxy_url).items()
+    )
+    lines.append("\r\n")
+
+    sock = socket.create_connection(
+        (proxy_url.hostname, _get_port(proxy_url)),
+        timeout,
+    )
+
+    try:
+        sock.sendall("\r\n".join(lines).encode("latin-1"))
+
+        # Read the response. The proxy doesn't send anything else until the
+        # connection to the host is used.
+        response = b""
+
+        while b"\r\n\r\n" not in response:
+            chunk = sock.recv(4096)
+
+            if not chunk:
+                raise OSError("The proxy closed the connection")
+
+            response += chunk
+
+            if len(response) > 64 * 1024:
+                raise OSError("The proxy's response is too large")
+
+        status_line = response.split(b"\r\n", 1)[0].decode("latin-1")
+        status_parts = status_line.split(" ")
+
+        if len(status_parts) < 2 or not status_parts[1].startswith("2"):
+            raise OSError(f"The proxy refused to connect: {status_line}")
+
+    except BaseException:
+        sock.close()
+        raise
+
+    sock.settimeout(None)
+    return sock
+
+
+def _format_host(parsed_url: urllib.parse.SplitResult) -> str:
+    """
+    Returns the host and (if given) port of the URL, as used in the `Host`
+    header.
+    """
+    host = t.cast(str, parsed_url.hostname)
+
+    if ":" in host:
+        host = f"[{host}]"
+
+    if parsed_url.port is not None:
+        host += f":{parsed_url.port}"
+
+    return host
+
+
+def _serialize_request_head(
+    method: HttpMethod,
+    parsed_url: urllib.parse.SplitResult,
+    body: bytes | None,
+    headers: dict[str, str],
+    *,
+    absolute_target: bool = False,
+) -> bytes:
+    target = parsed_url.path or "/"
+
+    if parsed_url.query:
+        target += "?" + parsed_url.query
+
+    host = _format_host(parsed_url)
+
+    if absolute_target:
+        target = f"{parsed_url.scheme}://{host}{target}"
+
+    all_headers = {
+        "host": host,
+        "accept-encoding": "identity",
+        **headers,
+    }
+
+    if body:
+        all_headers["content-length"] = str(len(body))
+    elif method.upper() in ("POST", "PUT", "PATCH"):
+        all_headers["content-length"] = "0"
+
+    lines = [f"{method.upper()} {target} HTTP/1.1"]
+    lines.extend(f"{name}: {value}" for name, value in all_headers.items())
+    lines.append("\r\n")
+
+    return "\r\n".join(lines).encode("latin-1")
+
+
+# Each event loop gets its own default client, since connections can't be
+# shared between loops
+_default_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, HttpClient
+] = weakref.WeakKeyDictionary()
+
+
+def _get_default_client() -> HttpClient:
+    loop = asyncio.get_running_loop()
+
+    try:
+        return _default_clients[loop]
+    except KeyError:
+        pass
+
+    client = _default_clients[loop] = HttpClient()
+    return client
+
+
 async def request(
     method: HttpMethod,
     url: str,
     *,
-    content: bytes | None = None,
+    content: str | bytes | None = None,
     json: dict[str, t.Any] | None = None,
     headers: dict[str, str] | None = None,
     verify_ssl: bool = True,
@@ -308,6 +1295,9 @@ async def request(
     Makes an asynchronous HTTP request with the specified parameters, returning
     the response.
 
+    Connections are kept alive and reused for subsequent requests to the same
+    host. Redirects are followed automatically.
+
 
     ## Parameters
 
@@ -334,9 +1324,47 @@ async def request(
     `HttpError`: If the request fails for any reason. This includes external
         errors such as network issues, as well as any non-200 status codes.
     """
+    return await _get_default_client().request(
+        method,
+        url,
+        content=content,
+        json=json,
+        headers=headers,
+        verify_ssl=verify_ssl,
+    )
+
+
+def stream(
+    method: HttpMethod,
+    url: str,
+    *,
+    content: str | bytes | None = None,
+    json: dict[str, t.Any] | None = None,
+    headers: dict[str, str] | None = None,
+    verify_ssl: bool = True,
+) -> t.AsyncContextManager[StreamingHttpResponse]:
+    """
+    Makes an asynchronous HTTP request, without reading the response body right
+    away. This is useful for large responses, which can then be processed piece
+    by piece:
+
+    ```python
+    async with arequests.stream("get", url) as response:
+        async for chunk in response.iter_bytes():
+            ...
+    ```
 
-    return await asyncio.to_thread(
-        request_sync,
+    The parameters are the same as for `request`.
+
+
+    ## Raises
+
+    `ValueError`: If the `method` is not one of `"get"` or `"post"`
+
+    `HttpError`: If the request fails for any reason. This includes external
+        errors such as network issues, as well as any non-200 status codes.
+    """
+    return _get_default_client().stream(
         method,
         url,
         content=content,
@@ -0,0 +1,578 @@
+"""
+A bounded on-disk cache for assets downloaded from the internet.
+
+This backs `UrlAsset`s created with `cache_locally=True`. Entries are evicted
+once they haven't been used for a while, or when the cache grows beyond its
+maximum size (least recently used entries go first). Stale entries are
+revalidated with the origin server using `ETag` and `Last-Modified` headers,
+and `Cache-Control` is honored.
+
+All disk I/O happens in worker threads, so the cache never blocks the event
+loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import dataclasses
+import hashlib
+import json
+import logging
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+from . import arequests, utils
+
+__all__ = [
+    "AssetCache",
+    "AssetCacheStats",
+    "CacheEntry",
+]
+
+
+# Bump this whenever the format of the metadata files changes. Entries written
+# with a different version are discarded.
+_METADATA_VERSION = 1
+
+
+@dataclasses.dataclass
+class CacheEntry:
+    """
+    Metadata about a single cached URL.
+
+    ## Attributes
+
+    `url`: The URL the data was downloaded from.
+
+    `path`: Where the data is stored on disk.
+
+    `size`: The size of the data, in bytes.
+
+    `encoding`: The text encoding reported by the server, if any.
+
+    `etag`: The `ETag` header sent by the server, used for revalidation.
+
+    `last_modified`: The `Last-Modified` header sent by the server, used for
+        revalidation.
+
+    `ttl`: How many seconds the entry stays fresh after being downloaded or
+        revalidated.
+
+    `expires_at`: Unix timestamp after which the entry must be revalidated
+        before it is used again.
+
+    `last_used_at`: Unix timestamp of the last time the entry was read.
+    """
+
+    url: str
+    path: Path
+    size: int
+    encoding: str | None
+    etag: str | None
+    last_modified: str | None
+    ttl: float
+    expires_at: float
+    last_used_at: float
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def _to_json(self) -> dict[str, t.Any]:
+        return {
+            "version": _METADATA_VERSION,
+            "url": self.url,
+            "size": self.size,
+            "encoding": self.encoding,
+            "etag": self.etag,
+            "lastModified": self.last_modified,
+            "ttl": self.ttl,
+            "expiresAt": self.expires_at,
+        }
+
+
+@dataclasses.dataclass(frozen=True)
+class AssetCacheStats:
+    """
+    A snapshot of an `AssetCache`'s state and counters.
+
+    ## Attributes
+
+    `hits`: Lookups which were answered from disk without contacting the
+        origin server.
+
+    `misses`: Lookups which required downloading the data.
+
+    `revalidations`: Stale entries which the origin server confirmed to still
+        be up to date.
+
+    `evictions`: Entries which were removed, either due to age or because the
+        cache was full.
+
+    `entry_count`: How many entries are currently in the cache.
+
+    `size`: The combined size of all entries, in bytes.
+    """
+
+    hits: int
+    misses: int
+    revalidations: int
+    evictions: int
+    entry_count: int
+    size: int
+
+
+class AssetCache:
+    """
+    A size-limited cache of downloaded files.
+
+    ## Parameters
+
+    `directory`: Where to store the cached files. It is created if necessary.
+
+    `max_size`: The maximum combined size of all entries, in bytes. If adding
+        an entry exceeds this, the least recently used entries are evicted.
+
+    `max_idle_time`: Entries which haven't been used for this many seconds are
+        evicted.
+
+    `default_ttl`: How many seconds an entry stays fresh if the server doesn't
+        specify it via `Cache-Control`. Stale entries are revalidated before
+        being used.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_size: int = 512 * 1024 * 1024,
+        max_idle_time: float = 30 * 24 * 60 * 60,
+        default_ttl: float = 24 * 60 * 60,
+    ) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self.max_idle_time = max_idle_time
+        self.default_ttl = default_ttl
+
+        # All entries, ordered from least to most recently used. This is
+        # loaded from disk the first time it's needed.
+        self._entries: collections.OrderedDict[str, CacheEntry] | None = None
+        self._size = 0
+
+        # The index is accessed from worker threads
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._revalidations = 0
+        self._evictions = 0
+
+        self._pending_lookups: dict[
+            str, asyncio.Task[tuple[CacheEntry, bytes | None]]
+        ] = {}
+
+    def path_for(self, url: str) -> Path:
+        """
+        Returns the path where the data for the given URL is stored. The file
+        may or may not exist.
+        """
+        return self.directory / hashlib.sha256(url.encode()).hexdigest()
+
+    def stats(self) -> AssetCacheStats:
+        """
+        Returns the cache's current counters.
+        """
+        with self._lock:
+            entries = self._load_index()
+
+            return AssetCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                revalidations=self._revalidations,
+                evictions=self._evictions,
+                entry_count=len(entries),
+                size=self._size,
+            )
+
+    async def get(self, url: str) -> CacheEntry:
+        """
+        Returns the cache entry for the given URL, downloading or revalidating
+        it if necessary.
+
+        Note that the returned entry's file can be evicted at any time. Use
+        `read` to get its contents safely.
+
+        ## Raises
+
+        `ValueError`: If the data isn't cached and can't be downloaded.
+        """
+        entry, _ = await self._get(url)
+        return entry
+
+    async def fetch(self, url: str) -> tuple[CacheEntry, bytes | None]:
+        """
+        Like `get`, but if the data had to be downloaded, it is returned as
+        well. This is the only way to access data which wasn't stored, e.g.
+        because of `Cache-Control: no-store`, without downloading it again.
+
+        ## Raises
+
+        `ValueError`: If the data isn't cached and can't be downloaded.
+        """
+        return await self._get(url)
+
+    async def read(self, url: str) -> tuple[bytes, str | None]:
+        """
+        Returns the data for the given URL, along with its text encoding (if
+        known). The data is downloaded if necessary.
+
+        ## Raises
+
+        `ValueError`: If the data isn't cached and can't be downloaded.
+        """
+        entry, data = await self._get(url)
+
+        if data is None:
+            try:
+                data = await asyncio.to_thread(entry.path.read_bytes)
+            except OSError:
+                # The file was evicted in the meantime
+                data, entry = await self._download(url)
+                await asyncio.to_thread(self._store_sync, entry, data)
+
+        return data, entry.encoding
+
+    async def prewarm(self, urls: t.Iterable[str]) -> None:
+        """
+        Makes sure all of the given URLs are cached and fresh, downloading them
+        concurrently if necessary. URLs which can't be downloaded are logged
+        and skipped.
+        """
+
+        async def prewarm_one(url: str) -> None:
+            try:
+                await self.get(url)
+            except ValueError as error:
+                logging.warning(f"Could not pre-warm asset cache: {error}")
+
+        await asyncio.gather(*(prewarm_one(url) for url in urls))
+
+    async def purge(self, url: str | None = None) -> None:
+        """
+        Removes the entry for the given URL from the cache. If no URL is given,
+        the entire cache is cleared.
+        """
+        await asyncio.to_thread(self._purge_sync, url)
+
+    async def _get(self, url: str) -> tuple[CacheEntry, bytes | None]:
+        """
+        Returns the entry for the given URL. If the data had to be downloaded,
+        it is returned as well, since it may not have been stored on disk.
+        """
+        # If somebody else is already looking up this URL, wait for their
+        # result instead of downloading it twice
+        task = self._pending_lookups.get(url)
+
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(
+                self._get_without_deduplication(url),
+                name=f"Asset cache lookup {url}",
+            )
+            self._pending_lookups[url] = task
+
+            def forget_task(_: asyncio.Task) -> None:
+                if self._pending_lookups.get(url) is task:
+                    del self._pending_lookups[url]
+
+            task.add_done_callback(forget_task)
+
+        return await asyncio.shield(task)
+
+    async def _get_without_deduplication(
+        self, url: str
+    ) -> tuple[CacheEntry, bytes | None]:
+        entry = await asyncio.to_thread(self._lookup_sync, url)
+
+        if entry is None:
+            data, entry = await self._download(url)
+        elif entry.is_fresh:
+            with self._lock:
+                self._hits += 1
+            return entry, None
+        else:
+            result = await self._revalidate(entry)
+
+            if result is None:
+                with self._lock:
+                    self._revalidations += 1
+                return entry, None
+
+            data, entry = result
+
+        with self._lock:
+            self._misses += 1
+
+        await asyncio.to_thread(self._store_sync, entry, data)
+
+        return entry, data
+
+    async def _revalidate(
+        self, entry: CacheEntry
+    ) -> tuple[bytes, CacheEntry] | None:
+        """
+        Asks the origin server whether the cached entry is still up to date.
+        If so, the entry's expiration time is updated and `None` is returned.
+        Otherwise the current data is returned, along with its new entry.
+
+        ## Raises
+
+        `ValueError`: If the entry is outdated and can't be downloaded.
+        """
+        headers = dict[str, str]()
+
+        if entry.etag is not None:
+            headers["if-none-match"] = entry.etag
+
+        if entry.last_modified is not None:
+            headers["if-modified-since"] = entry.last_modified
+
+        if not headers:
+            return await self._download(entry.url)
+
+        try:
+            async with arequests.stream(
+                "get", entry.url, headers=headers
+            ) as response:
+                # The server sent the full file, so it has changed
+                data = await response.read()
+                return data, self._create_entry(
+                    entry.url, response.headers, data
+                )
+        except arequests.HttpError as error:
+            if error.status_code != 304:
+                return await self._download(entry.url)
+
+        # The entry stays fresh for as long as the original response said
+        entry.expires_at = time.time() + entry.ttl
+        await asyncio.to_thread(self._write_metadata_sync, entry)
+        return None
+
+    async def _download(self, url: str) -> tuple[bytes, CacheEntry]:
+        try:
+            response = await arequests.request("get", url)
+        except arequests.HttpError:
+            raise ValueError(f"Could not fetch asset from {url}")
+
+        data = response.read()
+        return data, self._create_entry(url, response.headers, data)
+
+    def _create_entry(
+        self,
+        url: str,
+        headers: dict[str, str],
+        data: bytes,
+    ) -> CacheEntry:
+        encoding = headers.get("content-type")
+        if encoding:
+            _, _, encoding = encoding.partition("charset=")
+
+            if not encoding:
+                encoding = None
+
+        now = time.time()
+        ttl = self._get_ttl(headers)
+
+        return CacheEntry(
+            url=url,
+            path=self.path_for(url),
+            size=len(data),
+            encoding=encoding,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+            ttl=ttl,
+            expires_at=now + ttl,
+            last_used_at=now,
+        )
+
+    def _get_ttl(self, headers: dict[str, str]) -> float:
+        """
+        Determines how long a response stays fresh, based on its
+        `Cache-Control` header. Returns a negative number if the response
+        mustn't be stored at all.
+        """
+        directives = dict[str, str]()
+
+        for directive in headers.get("cache-control", "").split(","):
+            name, _, value = directive.strip().partition("=")
+            directives[name.lower()] = value.strip('"')
+
+        if "no-store" in directives:
+            return -1
+
+        if "no-cache" in directives:
+            return 0
+
+        try:
+            return float(directives["max-age"])
+        except (KeyError, ValueError):
+            return self.default_ttl
+
+    def _load_index(self) -> collections.OrderedDict[str, CacheEntry]:
+        """
+        Returns the index of all entries, scanning the cache directory if it
+        hasn't been loaded yet. Must be called with the lock held.
+        """
+        if self._entries is not None:
+            return self._entries
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        entries = list[CacheEntry]()
+
+        for metadata_path in self.directory.glob("*.json"):
+            data_path = metadata_path.with_suffix("")
+
+            try:
+                metadata = json.loads(metadata_path.read_text("utf-8"))
+
+                if metadata["version"] != _METADATA_VERSION:
+                    raise ValueError("Outdated metadata")
+
+                entry = CacheEntry(
+                    url=metadata["url"],
+                    path=data_path,
+                    size=metadata["size"],
+                    encoding=metadata["encoding"],
+                    etag=metadata["etag"],
+                    last_modified=metadata["lastModified"],
+                    ttl=metadata["ttl"],
+                    expires_at=metadata["expiresAt"],
+                    # The data file's modification time is bumped whenever the
+                    # entry is used
+                    last_used_at=data_path.stat().st_mtime,
+                )
+            except (OSError, ValueError, KeyError, TypeError):
+                metadata_path.unlink(missing_ok=True)
+                data_path.unlink(missing_ok=True)
+                continue
+
+            entries.append(entry)
+
+        entries.sort(key=lambda entry: entry.last_used_at)
+
+        self._entries = collections.OrderedDict(
+            (entry.url, entry) for entry in entries
+        )
+        self._size = sum(entry.size for entry in entries)
+        self._evict()
+
+        return self._entries
+
+    def _lookup_sync(self, url: str) -> CacheEntry | None:
+        with self._lock:
+            entries = self._load_index()
+
+            try:
+                entry = entries[url]
+            except KeyError:
+                return None
+
+            entry.last_used_at = time.time()
+            entries.move_to_end(url)
+
+        try:
+            entry.path.touch()
+        except OSError:
+            # The file has vanished. Forget about the entry.
+            with self._lock:
+                self._remove_entry(entry)
+
+            return None
+
+        return entry
+
+    def _store_sync(self, entry: CacheEntry, data: bytes) -> None:
+        # Responses which mustn't be stored are simply not cached. The caller
+        # still has the data in memory.
+        if entry.expires_at < entry.last_used_at or entry.size > self.max_size:
+            return
+
+        try:
+            utils.write_file_atomically(entry.path, data)
+            self._write_metadata_sync(entry)
+        except OSError as error:
+            logging.warning(f"Could not cache asset {entry.url}: {error}")
+            return
+
+        with self._lock:
+            entries = self._load_index()
+
+            previous_entry = entries.pop(entry.url, None)
+            if previous_entry is not None:
+                self._size -= previous_entry.size
+
+            entries[entry.url] = entry
+            self._size += entry.size
+
+            self._evict()
+
+    def _write_metadata_sync(self, entry: CacheEntry) -> None:
+        utils.write_file_atomically(
+            entry.path.with_suffix(".json"),
+            json.dumps(entry._to_json()).encode("utf-8"),
+        )
+
+    def _purge_sync(self, url: str | None) -> None:
+        with self._lock:
+            entries = self._load_index()
+
+            if url is None:
+                to_remove = list(entries.values())
+            elif url in entries:
+                to_remove = [entries[url]]
+            else:
+                to_remove = []
+
+            for entry in to_remove:
+                self._remove_entry(entry)
+
+    def _evict(self) -> None:
+        """
+        Removes entries which haven't been used in a long time, as well as the
+        least recently used entries until the cache is within its size limit.
+        Must be called with the lock held.
+        """
+        assert self._entries is not None
+        idle_threshold = time.time() - self.max_idle_time
+
+        while self._entries:
+            entry = next(iter(self._entries.values()))
+
+            if (
+                self._size <= self.max_size
+                and entry.last_used_at >= idle_threshold
+            ):
+                break
+
+            self._remove_entry(entry)
+            self._evictions += 1
+
+    def _remove_entry(self, entry: CacheEntry) -> None:
+        """
+        Deletes an entry from the index and disk. Must be called with the lock
+        held.
+        """
+        assert self._entries is not None
+
+        if self._entries.get(entry.url) is entry:
+            del self._entries[entry.url]
+            self._size -= entry.size
+
+        try:
+            entry.path.with_suffix(".json").unlink(missing_ok=True)
+            entry.path.unlink(missing_ok=True)
+        except OSError:
+            pass
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import abc
+import asyncio
+import dataclasses
 import hashlib
 import io
 import os
+import secrets
+import weakref
 from pathlib import Path
 
 import platformdirs
@@ -14,8 +18,9 @@ from yarl import URL
 import rio
 import rio.arequests as arequests
 
+from .asset_cache import AssetCache
 from .self_serializing import SelfSerializing
-from .utils import ImageLike
+from .utils import ByteRangeSource, ImageLike
 
 
 def _securely_hash_bytes_changes_between_runs(
@@ -34,12 +39,116 @@ def _securely_hash_bytes_changes_between_runs(
     return hasher.digest()
 
 
-_ASSETS: dict[tuple[bytes | str | Path | URL, str | None], Asset] = {}
-
 CACHE_DIR = platformdirs.user_cache_path(
     appname="rio", appauthor="rio-labs", ensure_exists=True
 )
 
+# Where `UrlAsset`s with `cache_locally=True` store their data. Adjust its
+# limits or use it to pre-warm and purge entries.
+URL_ASSET_CACHE = AssetCache(CACHE_DIR / "url-assets")
+
+
+@dataclasses.dataclass(frozen=True)
+class AssetRegistryStats:
+    """
+    Statistics about the assets currently known to an `AssetRegistry`.
+
+    ## Attributes
+
+    `asset_count`: How many assets are registered.
+
+    `bytes_held`: The combined size of the data of all registered in-memory
+        assets. Strings are counted as one byte per character.
+    """
+
+    asset_count: int
+    bytes_held: int
+
+
+class AssetRegistry:
+    """
+    Deduplicates the assets created by `Asset.new`.
+
+    Assets are only held weakly. The registry never keeps an asset (and its
+    potentially large data) alive by itself, so once nothing references an
+    asset anymore it is dropped from the registry and stops being hosted.
+    """
+
+    def __init__(self) -> None:
+        self._assets: weakref.WeakValueDictionary[t.Hashable, Asset] = (
+            weakref.WeakValueDictionary()
+        )
+
+        # In-memory assets, keyed by the `id` of their data. Passing the same
+        # `bytes` object over and over is common, and this finds the asset
+        # without hashing or comparing the data. The asset keeps its data
+        # alive, so the `id` can't be reused while the entry exists.
+        self._assets_by_data_id: weakref.WeakValueDictionary[
+            tuple[int, str | None], BytesAsset | StringAsset
+        ] = weakref.WeakValueDictionary()
+
+    def get(
+        self,
+        data: object,
+        key: t.Hashable,
+        media_type: str | None,
+    ) -> Asset | None:
+        """
+        Returns the registered asset for the given data, or `None` if there
+        isn't one.
+        """
+        if isinstance(data, (bytes, str)):
+            asset = self._assets_by_data_id.get((id(data), media_type))
+
+            if asset is not None and asset.data is data:
+                return asset
+
+        return self._assets.get(key)
+
+    def add(
+        self,
+        data: object,
+        key: t.Hashable,
+        media_type: str | None,
+        asset: Asset,
+    ) -> None:
+        self._assets[key] = asset
+
+        if isinstance(asset, (BytesAsset, StringAsset)):
+            self._assets_by_data_id[id(data), media_type] = asset
+
+    def stats(self) -> AssetRegistryStats:
+        """
+        Returns statistics about the currently registered assets.
+        """
+        assets = list(self._assets.values())
+
+        return AssetRegistryStats(
+            asset_count=len(assets),
+            bytes_held=sum(
+                len(asset.data)
+                for asset in assets
+                if isinstance(asset, (BytesAsset, StringAsset))
+            ),
+        )
+
+
+# The registry used by `Asset.new`
+ASSET_REGISTRY = AssetRegistry()
+
+# In-memory assets at least this large (in bytes) are hashed in a worker
+# thread, rather than blocking the event loop.
+BACKGROUND_HASHING_SIZE = 1024 * 1024
+
+# If set, in-memory assets at least this large (in bytes) get a random id
+# instead of one derived from their data. This skips hashing entirely, at the
+# cost of browsers not being able to cache them across server restarts.
+RANDOM_ID_SIZE: int | None = None
+
+# `UrlAsset` fetches which are currently in progress, keyed by URL. Concurrent
+# fetches of the same URL share a single request.
+_PENDING_FETCHES: dict[str, asyncio.Task[tuple[bytes, str | None]]] = {}
+
 
 class Asset(SelfSerializing):
     """
@@ -47,10 +156,11 @@ class Asset(SelfSerializing):
     access. Assets can be hosted locally or remotely.
 
     Assets are "singletons", i.e. if you create two assets with the same input,
-    they will be the same object:
+    they will be the same object (as long as the first one is still alive):
 
     ```python
-    >>> Asset.new(Path("foo.png")) is Asset.new(Path("foo.png"))
+    >>> asset = Asset.new(Path("foo.png"))
+    >>> Asset.new(Path("foo.png")) is asset
     True
     ```
 
@@ -66,7 +176,7 @@ class Asset(SelfSerializing):
     @t.overload
     @staticmethod
     def new(
-        data: bytes | str | Path,
+        data: bytes | str | Path | ByteRangeSource,
         media_type: str | None = None,
         *,
         allow_str: bool = False,
@@ -77,7 +187,7 @@ class Asset(SelfSerializing):
     @t.overload
     @staticmethod
     def new(
-        data: bytes | str | Path | URL,
+        data: bytes | str | Path | URL | ByteRangeSource,
         media_type: str | None = None,
         *,
         allow_str: bool = False,
@@ -88,7 +198,7 @@ class Asset(SelfSerializing):
     @t.overload
     @staticmethod
     def new(
-        data: bytes | str | Path | URL,
+        data: bytes | str | Path | URL | ByteRangeSource,
         media_type: str | None = None,
         *,
         allow_str: bool = False,
@@ -98,18 +208,28 @@ class Asset(SelfSerializing):
 
     @staticmethod
     def new(
-        data: bytes | str | Path | URL,
+        data: bytes | str | Path | URL | ByteRangeSource,
         media_type: str | None = None,
         *,
         allow_str: bool = False,
         rehost: bool = False,
         cache_locally: bool = False,
     ) -> Asset:
-        key = (data, media_type)
-        try:
-            return _ASSETS[key]
-        except KeyError:
-            pass
+        # `bytearray`s are mutable, and thus can't be deduplicated
+        key: t.Hashable | None
+
+        if isinstance(data, bytearray):
+            key = None
+        elif isinstance(data, URL):
+            key = (data, media_type, rehost, cache_locally)
+        else:
+            key = (data, media_type)
+
+        if key is not None:
+            asset = ASSET_REGISTRY.get(data, key, media_type)
+
+            if asset is not None:
+                return asset
 
         if isinstance(data, Path):
             asset = PathAsset(data, media_type)
@@ -122,6 +242,8 @@ class Asset(SelfSerializing):
                 asset = UrlAsset(data, media_type, cache_locally=cache_locally)
         elif isinstance(data, (bytes, bytearray)):
             asset = BytesAsset(data, media_type)
+        elif isinstance(data, ByteRangeSource):
+            asset = ByteRangeAsset(data, media_type)
         elif isinstance(data, str):
             if not allow_str:
                 raise TypeError(
@@ -133,7 +255,9 @@ class Asset(SelfSerializing):
         else:
             raise TypeError(f"Cannot create asset from input {data!r}")
 
-        _ASSETS[key] = asset
+        if key is not None:
+            ASSET_REGISTRY.add(data, key, media_type, asset)
+
         return asset
 
     @classmethod
@@ -143,9 +267,7 @@ class Asset(SelfSerializing):
         media_type: str | None = None,
     ) -> Asset:
         if isinstance(image, Image):
-            file = io.BytesIO()
-            image.save(file, format="PNG")
-            image = file.getvalue()
+            image = _encode_image_as_png(image)
             media_type = "image/png"
         elif media_type is None:
             # For some image formats, browsers are too stupid to display the
@@ -155,6 +277,39 @@ class Asset(SelfSerializing):
 
         return Asset.new(image, media_type)
 
+    @classmethod
+    async def from_image_in_background(
+        cls,
+        image: ImageLike,
+        media_type: str | None = None,
+    ) -> Asset:
+        """
+        Like `from_image`, but PIL images are encoded and large data is hashed
+        in a worker thread, so the event loop isn't blocked.
+        """
+        if isinstance(image, Image):
+            image = await asyncio.to_thread(_encode_image_as_png, image)
+            media_type = "image/png"
+
+        asset = cls.from_image(image, media_type)
+        await asset.prepare()
+        return asset
+
+    @property
+    def is_prepared(self) -> bool:
+        """
+        Whether the asset can be serialized without blocking the event loop
+        for a noticeable amount of time. If not, call `prepare` first.
+        """
+        return True
+
+    async def prepare(self) -> None:
+        """
+        Does any expensive work needed to serialize the asset in a worker
+        thread.
+        """
+        pass
+
     @abc.abstractmethod
     async def fetch_as_bytes(self) -> bytes | bytearray:
         """
@@ -222,6 +377,27 @@ class HostedAsset(Asset):
     def _get_secret_id(self) -> str:
         raise NotImplementedError
 
+    def _is_secret_id_expensive(self) -> bool:
+        return False
+
+    @property
+    def is_prepared(self) -> bool:
+        return hasattr(self, "_secret_id") or not self._is_secret_id_expensive()
+
+    async def prepare(self) -> None:
+        if self.is_prepared:
+            return
+
+        # Share the work between everyone waiting for this asset
+        try:
+            task = self._secret_id_task
+        except AttributeError:
+            task = self._secret_id_task = asyncio.ensure_future(
+                asyncio.to_thread(self._get_secret_id)
+            )
+
+        self._secret_id = await asyncio.shield(task)
+
     def __hash__(self) -> int:
         return hash(self.secret_id)
 
@@ -248,9 +424,13 @@ class BytesAsset(HostedAsset):
     async def fetch_as_text(self) -> str:
         return self.data.decode("utf-8")
 
+    def _is_secret_id_expensive(self) -> bool:
+        return _is_hashing_expensive(len(self.data))
+
     def _get_secret_id(self) -> str:
-        # TODO: Consider only hashing part of the data + media type + size
-        # rather than processing everything
+        if RANDOM_ID_SIZE is not None and len(self.data) >= RANDOM_ID_SIZE:
+            return "r-" + secrets.token_hex(32)
+
         return "b-" + _securely_hash_bytes_changes_between_runs(self.data).hex()
 
     def __repr__(self) -> str:
@@ -279,9 +459,13 @@ class StringAsset(HostedAsset):
     async def fetch_as_text(self) -> str:
         return self.data
 
+    def _is_secret_id_expensive(self) -> bool:
+        return _is_hashing_expensive(len(self.data))
+
     def _get_secret_id(self) -> str:
-        # TODO: Consider only hashing part of the data + media type + size
-        # rather than processing everything
+        if RANDOM_ID_SIZE is not None and len(self.data) >= RANDOM_ID_SIZE:
+            return "r-" + secrets.token_hex(32)
+
         return (
             "s-"
             + _securely_hash_bytes_changes_between_runs(
@@ -336,6 +520,45 @@ class PathAsset(HostedAsset):
         return f'<PathAsset "{self.path}">'
 
 
+class ByteRangeAsset(HostedAsset):
+    """
+    An asset whose data is read on demand, one range at a time. It is never
+    held in memory as a whole, unless explicitly fetched.
+    """
+
+    def __init__(
+        self,
+        source: ByteRangeSource,
+        media_type: str | None = None,
+    ):
+        super().__init__(media_type)
+
+        self.source = source
+
+    async def fetch_as_bytes(self) -> bytes:
+        try:
+            return await self.source.read_range(0, self.source.size_in_bytes)
+        except Exception as err:
+            raise ValueError(
+                f"Could not load asset from {self.source}"
+            ) from err
+
+    async def fetch_as_text(self) -> str:
+        data = await self.fetch_as_bytes()
+
+        try:
+            return data.decode("utf-8")
+        except UnicodeDecodeError:
+            raise ValueError(f"Could not load asset from {self.source} as text")
+
+    def _get_secret_id(self) -> str:
+        # The data can't be hashed without reading all of it
+        return "r-" + secrets.token_hex(32)
+
+    def __repr__(self) -> str:
+        return f"<ByteRangeAsset of size {self.source.size_in_bytes}>"
+
+
 class UrlAsset(Asset):
     def __init__(
         self,
@@ -349,12 +572,6 @@ class UrlAsset(Asset):
         self._url = url
         self._cache_locally = cache_locally
 
-        if cache_locally:
-            file_name = hashlib.sha256(str(self._url).encode()).hexdigest()
-            self.local_cache_path = CACHE_DIR / file_name
-        else:
-            self.local_cache_path = None
-
     async def fetch_as_bytes(self) -> bytes:
         data, encoding = await self._fetch()
         return data
@@ -368,20 +585,33 @@ class UrlAsset(Asset):
         return data.decode(encoding)
 
     async def _fetch(self) -> tuple[bytes, str | None]:
-        cache_path = self.local_cache_path
+        # If somebody else is already fetching this URL, wait for their result
+        # instead of making another request
+        key = str(self._url)
+        task = _PENDING_FETCHES.get(key)
 
-        if cache_path is None:
-            return await self._fetch_from_internet()
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(
+                self._fetch_without_deduplication(),
+                name=f"Fetch {self._url}",
+            )
+            _PENDING_FETCHES[key] = task
 
-        try:
-            data = cache_path.read_bytes()
-        except FileNotFoundError:
-            data, encoding = await self._fetch_from_internet()
-            cache_path.write_bytes(data)
-        else:
-            encoding = None
+            def forget_task(_: asyncio.Task) -> None:
+                if _PENDING_FETCHES.get(key) is task:
+                    del _PENDING_FETCHES[key]
+
+            task.add_done_callback(forget_task)
+
+        # Shield the task, so a cancelled caller doesn't cancel the fetch for
+        # everyone else
+        return await asyncio.shield(task)
+
+    async def _fetch_without_deduplication(self) -> tuple[bytes, str | None]:
+        if self._cache_locally:
+            return await URL_ASSET_CACHE.read(str(self._url))
 
-        return data, encoding
+        return await self._fetch_from_internet()
 
     async def _fetch_from_internet(
         self,
@@ -404,6 +634,17 @@ class UrlAsset(Asset):
     def url(self) -> URL:
         return self._url
 
+    @property
+    def local_cache_path(self) -> Path | None:
+        """
+        Where the asset is stored if it is cached locally. The file only exists
+        once the asset has been fetched, and may be evicted at any time.
+        """
+        if not self._cache_locally:
+            return None
+
+        return URL_ASSET_CACHE.path_for(str(self._url))
+
     def __hash__(self) -> int:
         return hash(self._url)
 
@@ -423,6 +664,19 @@ class RehostedUrlAsset(HostedAsset, UrlAsset):
         return "u-" + _securely_hash_bytes_changes_between_runs(bytes_url).hex()
 
 
+def _is_hashing_expensive(size: int) -> bool:
+    if RANDOM_ID_SIZE is not None and size >= RANDOM_ID_SIZE:
+        return False
+
+    return size >= BACKGROUND_HASHING_SIZE
+
+
+def _encode_image_as_png(image: Image) -> bytes:
+    file = io.BytesIO()
+    image.save(file, format="PNG")
+    return file.getvalue()
+
+
 def detect_important_image_types(image: ImageLike) -> str | None:
     if isinstance(image, Path):
         if image.suffix == ".svg":
@@ -14,6 +14,8 @@ from pathlib import Path
 import fastapi
 from fastapi import HTTPException
 
+from .utils import ByteRangeSource
+
 __all__ = [
     "range_requests_response",
 ]
@@ -21,7 +23,7 @@ __all__ = [
 
 def range_requests_response(
     request: fastapi.Request,
-    data: bytes | bytearray | Path,
+    data: bytes | bytearray | Path | ByteRangeSource,
     *,
     media_type: str | None = None,
 ) -> fastapi.responses.Response:
@@ -29,6 +31,9 @@ def range_requests_response(
     Returns a fastapi response which serves the given file, supporting Range
     Requests as per RFC7233 ("HTTP byte serving").
 
+    Files from a `ByteRangeSource` are read one chunk at a time, so only the
+    requested range is ever loaded, and never all of it at once.
+
     Returns a 404 if the file does not exist. In this case a warning is also
     shown in the console.
     """
@@ -40,6 +45,8 @@ def range_requests_response(
         except FileNotFoundError:
             warnings.warn(f"Cannot find file at {data.absolute()}")
             return fastapi.responses.Response(status_code=404)
+    elif isinstance(data, ByteRangeSource):
+        file_size_in_bytes = data.size_in_bytes
     else:
         file_size_in_bytes = len(data)
 
@@ -83,8 +90,13 @@ def range_requests_response(
         status_code = fastapi.status.HTTP_206_PARTIAL_CONTENT
 
     # Construct the response
+    if isinstance(data, ByteRangeSource):
+        body = send_source_range_requests(data, start, end)
+    else:
+        body = send_bytes_range_requests(data, start, end)
+
     return fastapi.responses.StreamingResponse(
-        send_bytes_range_requests(data, start, end),
+        body,
         headers=headers,
         status_code=status_code,
     )
@@ -119,11 +131,50 @@ def send_bytes_range_requests(
             remaining -= len(chunk)
 
 
+async def send_source_range_requests(
+    source: ByteRangeSource,
+    start: int,
+    end: int,
+    chunk_size: int = 1024 * 1024,
+) -> t.AsyncIterator[bytes]:
+    """
+    Like `send_bytes_range_requests`, but reads the data from a
+    `ByteRangeSource`. The chunks are smaller, since they're typically fetched
+    from a remote service and have to be held in memory.
+    """
+    position = start
+
+    while position <= end:
+        chunk_end = min(position + chunk_size, end + 1)
+        chunk = await source.read_range(position, chunk_end)
+
+        # A source returning less data than requested would make the
+        # response shorter than its `content-length`
+        if len(chunk) != chunk_end - position:
+            raise IOError(
+                f"{source} returned {len(chunk)} bytes for the range"
+                f" [{position}, {chunk_end})"
+            )
+
+        yield chunk
+
+        position = chunk_end
+
+
 def parse_range_header(range_header: str, file_size: int) -> tuple[int, int]:
     try:
-        h = range_header.removeprefix("bytes=").split("-")
-        start = int(h[0]) if h[0] != "" else 0
-        end = int(h[1]) if h[1] != "" else file_size - 1
+        first, last = range_header.removeprefix("bytes=").split("-")
+
+        # Suffix ranges ("bytes=-500") select the last bytes of the file
+        if first == "":
+            start = max(file_size - int(last), 0)
+            end = file_size - 1
+        else:
+            start = int(first)
+            end = int(last) if last != "" else file_size - 1
+
+        # Ranges may extend past the end of the file. They're cut short.
+        end = min(end, file_size - 1)
     except ValueError:
         raise HTTPException(
             fastapi.status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
@@ -100,7 +100,10 @@ class ComponentMeta(RioDataclassMeta):
         **kwargs: object,
     ) -> C:
         # Fetch the session this component is part of
-        if global_state.currently_building_session is None:
+        if (
+            global_state.currently_building_session is None
+            or global_state.handler_thread_state.event_loop is not None
+        ):
             raise RuntimeError(
                 "Components can only be created inside of `build` methods."
             )
@@ -65,6 +65,7 @@ from .theme_context_switcher import *
 from .tooltip import *
 from .tree_items import *
 from .tree_view import *
+from .virtual_list import *
 from .website import *
 from .webview import *
 
@@ -117,7 +117,10 @@ class Card(FundamentalComponent):
 
     def _custom_serialize_(self) -> JsonDoc:
         thm = self.session.theme
-        color = thm._serialize_colorset(self.color)
+        color = self.session._intern_style(
+            ("colorset", self.color),
+            lambda: thm._serialize_colorset(self.color),
+        )
 
         report_press = self.on_press is not None
 
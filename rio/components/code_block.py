@@ -1,7 +1,9 @@
 import dataclasses
 import typing as t
 
-from .. import deprecations
+from uniserde import JsonDoc
+
+from .. import deprecations, markdown_rendering
 from .fundamental_component import FundamentalComponent
 
 __all__ = [
@@ -67,5 +69,27 @@ class CodeBlock(FundamentalComponent):
     scroll_code_x: t.Literal["auto", "always", "never"] = "never"
     scroll_code_y: t.Literal["auto", "always", "never"] = "never"
 
+    def _custom_serialize_(self) -> JsonDoc:
+        # If the app wants it, highlight the code here, rather than having
+        # every client do it
+        if self.session.app._render_markdown_on_server:
+            rendered = markdown_rendering.MARKDOWN_RENDERER.render_code(
+                self.code,
+                self.language,
+            )
+
+            if rendered is not None:
+                html, language_name = rendered
+
+                return {
+                    "code": None,
+                    "html": html,
+                    "languageName": language_name,
+                }
+
+        return {
+            "html": None,
+        }
+
 
 CodeBlock._unique_id_ = "CodeBlock-builtin"
@@ -10,7 +10,7 @@ from uniserde import Jsonable, JsonDoc
 
 import rio
 
-from .. import deprecations, inspection, utils
+from .. import deprecations, global_state, inspection, utils
 from ..component_meta import ComponentMeta
 from ..data_models import BuildData
 from ..observables.component_property import ComponentProperty
@@ -750,6 +750,14 @@ class Component(abc.ABC, metaclass=ComponentMeta):
         return BackwardsCompat()  # type: ignore
 
     def _mark_all_properties_as_changed_(self) -> None:
+        # Event handlers running in worker threads must leave the session's
+        # bookkeeping to the event loop
+        loop = global_state.handler_thread_state.event_loop
+
+        if loop is not None:
+            loop.call_soon_threadsafe(self._mark_all_properties_as_changed_)
+            return
+
         properties = all_property_names(type(self))
         self.session._changed_attributes[self].update(properties)
         self.session._refresh_required_event.set()
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import collections
 import dataclasses
+import inspect
 import typing as t
 
 import imy.docstrings
@@ -15,11 +18,21 @@ from .keyboard_focusable_components import KeyboardFocusableFundamentalComponent
 __all__ = [
     "Dropdown",
     "DropdownChangeEvent",
+    "DropdownOptionPage",
 ]
 
 T = t.TypeVar("T")
 
 
+# How long to wait for the user to stop typing before asking an option provider
+# for matching options
+SEARCH_DEBOUNCE_DELAY = 0.15
+
+# How many pages of options each dropdown remembers. Pages are only requested
+# again once they've dropped out of the cache.
+OPTION_PAGE_CACHE_SIZE = 32
+
+
 @t.final
 @imy.docstrings.mark_constructor_as_private
 @dataclasses.dataclass
@@ -39,6 +52,37 @@ class DropdownChangeEvent(t.Generic[T]):
     value: T
 
 
+@t.final
+@dataclasses.dataclass(frozen=True)
+class DropdownOptionPage(t.Generic[T]):
+    """
+    A page of options, as returned by a `Dropdown`'s option provider.
+
+    If a `Dropdown` has too many options to send all of them to the client, its
+    `options` can be a function instead. The function receives the text the
+    user has typed, the index of the first option to return, and how many
+    options to return. It returns a `DropdownOptionPage` with the matching
+    options.
+
+    ## Attributes
+
+    `options`: The options on this page, as a mapping from option names to
+        values. The names must be unique across all pages.
+
+    `total_count`: How many options match the search text in total. This lets
+        the dropdown know whether more pages can be loaded.
+    """
+
+    options: t.Mapping[str, T]
+    total_count: int
+
+
+OptionProvider: t.TypeAlias = t.Callable[
+    [str, int, int],
+    t.Awaitable[DropdownOptionPage[T]] | DropdownOptionPage[T],
+]
+
+
 @t.final
 class Dropdown(KeyboardFocusableFundamentalComponent, t.Generic[T]):
     """
@@ -55,6 +99,16 @@ class Dropdown(KeyboardFocusableFundamentalComponent, t.Generic[T]):
         in the dropdown menu, and the corresponding value is returned when
         the user selects the option. The values must be comparable.
 
+        For very many options, pass a function instead. It is called with the
+        text the user has typed, the index of the first option and the number
+        of options to return, and returns a `DropdownOptionPage`. This way
+        only the options the user actually scrolls to are sent to the client.
+
+        Fetched pages are cached for as long as the function stays the same.
+        Pass the same function every time (e.g. a method, or a function defined
+        at module level), rather than a new `lambda` or nested function, so the
+        pages aren't fetched again whenever the parent is rebuilt.
+
     `label`: A short text to display next to the dropdown.
 
     `style`: Changes the visual appearance of the text input.
@@ -124,9 +178,48 @@ class Dropdown(KeyboardFocusableFundamentalComponent, t.Generic[T]):
                 on_change=self.on_value_change,
             )
     ```
+
+    If there are too many options to send them all to the client, let the
+    dropdown fetch them page by page instead. The search happens on the
+    server, so it could just as well query a database:
+
+    ```python
+    CUSTOMER_NAMES = [f"Customer {index}" for index in range(50_000)]
+
+
+    async def find_customers(
+        search: str,
+        start: int,
+        count: int,
+    ) -> rio.DropdownOptionPage[int]:
+        matches = [
+            index
+            for index, name in enumerate(CUSTOMER_NAMES)
+            if search.lower() in name.lower()
+        ]
+
+        return rio.DropdownOptionPage(
+            options={
+                CUSTOMER_NAMES[index]: index
+                for index in matches[start : start + count]
+            },
+            total_count=len(matches),
+        )
+
+
+    class MyComponent(rio.Component):
+        customer_id: int | None = None
+
+        def build(self) -> rio.Component:
+            return rio.Dropdown(
+                options=find_customers,
+                selected_value=self.bind().customer_id,
+                label="Customer",
+            )
+    ```
     """
 
-    options: t.Mapping[str, T]
+    options: t.Mapping[str, T] | OptionProvider[T]
     _: dataclasses.KW_ONLY
     label: str
     style: t.Literal["underlined", "rounded", "pill"]
@@ -137,7 +230,7 @@ class Dropdown(KeyboardFocusableFundamentalComponent, t.Generic[T]):
 
     def __init__(
         self,
-        options: t.Mapping[str, T] | t.Sequence[T],
+        options: t.Mapping[str, T] | t.Sequence[T] | OptionProvider[T],
         *,
         label: str = "",
         style: t.Literal["underlined", "rounded", "pill"] = "underlined",
@@ -165,7 +258,7 @@ class Dropdown(KeyboardFocusableFundamentalComponent, t.Generic[T]):
         # SCROLLING-REWORK scroll_y: t.Literal["never", "auto", "always"] = "never",
         accessibility_role: AccessibilityRole | None = None,
     ):
-        if len(options) == 0:
+        if not callable(options) and len(options) == 0:
             raise ValueError("`Dropdown` must have at least one option.")
 
         super().__init__(
@@ -190,7 +283,7 @@ class Dropdown(KeyboardFocusableFundamentalComponent, t.Generic[T]):
             accessibility_role=accessibility_role,
         )
 
-        if not isinstance(options, t.Mapping):
+        if not callable(options) and not isinstance(options, t.Mapping):
             options = {str(value): value for value in options}
 
         self.options = options
@@ -205,10 +298,54 @@ class Dropdown(KeyboardFocusableFundamentalComponent, t.Generic[T]):
         # have been initialized.
         self.selected_value = selected_value  # type: ignore
 
+        # If the options come from a provider, these keep track of the pages
+        # that have been fetched. The most recently requested page is sent to
+        # the client.
+        self._option_page_cache: collections.OrderedDict[
+            tuple[str, int, int], DropdownOptionPage[T]
+        ] = collections.OrderedDict()
+        self._option_provider_for_cache: OptionProvider[T] | None = None
+        self._option_fetch_task: asyncio.Task[None] | None = None
+        self._option_page: JsonDoc | None = None
+
+        # The options of the page that was last sent to the client. The user
+        # picks from these, even if the provider has changed since.
+        self._sent_page_options: t.Mapping[str, T] = {}
+
+        # The most recently selected option, so its name can still be
+        # displayed once its page has dropped out of the cache
+        self._selected_option: tuple[str, T] | None = None
+
     def __post_init__(self) -> None:
-        # Make sure a value is selected
+        # Make sure a value is selected. (Option providers can't be queried
+        # this early, so those dropdowns start out empty instead.)
         if isinstance(self.selected_value, utils.NotGiven):
-            self.selected_value = next(iter(self.options.values()))
+            if callable(self.options):
+                self.selected_value = None  # type: ignore
+            else:
+                self.selected_value = next(iter(self.options.values()))
+
+    def _iter_known_options(self) -> t.Iterable[tuple[str, T]]:
+        """
+        Yields all options that are known without calling the option provider.
+        """
+        options = self.options
+
+        if not callable(options):
+            yield from options.items()
+            return
+
+        if self._selected_option is not None:
+            yield self._selected_option
+
+        yield from self._sent_page_options.items()
+
+        # Only pages of the current provider are valid. Providers are compared
+        # by equality rather than identity, since bound methods are recreated
+        # every time the parent component is built.
+        if self._option_provider_for_cache == options:
+            for page in self._option_page_cache.values():
+                yield from page.options.items()
 
     def _fetch_selected_name(self) -> str:
         # The frontend works with names, not values. Get the corresponding
@@ -218,33 +355,156 @@ class Dropdown(KeyboardFocusableFundamentalComponent, t.Generic[T]):
         selected_value = self.selected_value
 
         # Fetch the name
-        for name, value in self.options.items():
+        for name, value in self._iter_known_options():
             if value == selected_value:
                 return name
-        else:
-            # If nothing matches, just select the first option
-            return next(iter(self.options.keys()))
+
+        # Options from a provider might not have been fetched yet. Fall back to
+        # displaying the value itself.
+        if callable(self.options):
+            return "" if selected_value is None else str(selected_value)
+
+        # If nothing matches, just select the first option
+        return next(iter(self.options.keys()))
 
     def _custom_serialize_(self) -> JsonDoc:
+        if callable(self.options):
+            return {
+                "optionNames": [],
+                "hasOptionProvider": True,
+                "optionPage": self._option_page,
+                "selectedName": self._fetch_selected_name(),
+            }
+
         result: JsonDoc = {
             "optionNames": list(self.options.keys()),
+            "hasOptionProvider": False,
+            "optionPage": None,
             "selectedName": self._fetch_selected_name(),
         }
 
         return result
 
+    def _request_option_page(
+        self,
+        search: str,
+        start: int,
+        count: int,
+        request_id: int,
+    ) -> None:
+        """
+        Fetches the options matching the search text and sends them to the
+        client. Only the most recent request is answered - any earlier ones
+        still in progress are cancelled.
+        """
+        if self._option_fetch_task is not None:
+            self._option_fetch_task.cancel()
+
+        self._option_fetch_task = self.session.create_task(
+            self._fetch_option_page(search, start, count, request_id),
+            name=f"Fetch options for {self!r}",
+        )
+
+    async def _fetch_option_page(
+        self,
+        search: str,
+        start: int,
+        count: int,
+        request_id: int,
+    ) -> None:
+        cache_key = (search, start, count)
+
+        # The provider may be replaced while its page is being fetched, e.g.
+        # because the parent was rebuilt. The client is waiting for an answer
+        # though, so ask the new provider in that case.
+        while True:
+            provider = self.options
+
+            if not callable(provider):
+                return
+
+            # Pages of a different provider are of no use anymore
+            if self._option_provider_for_cache != provider:
+                self._option_page_cache.clear()
+                self._option_provider_for_cache = provider
+
+            try:
+                page = self._option_page_cache[cache_key]
+            except KeyError:
+                # Don't query the provider for every single keystroke. If
+                # another request arrives in the meantime, this task is
+                # cancelled.
+                await asyncio.sleep(SEARCH_DEBOUNCE_DELAY)
+
+                page = provider(search, start, count)
+
+                if inspect.isawaitable(page):
+                    page = await page
+
+                self._option_page_cache[cache_key] = page
+
+                if len(self._option_page_cache) > OPTION_PAGE_CACHE_SIZE:
+                    self._option_page_cache.popitem(last=False)
+            else:
+                self._option_page_cache.move_to_end(cache_key)
+
+            if self.options == provider:
+                break
+
+        self._sent_page_options = page.options
+
+        self._option_page = {
+            "requestId": request_id,
+            "search": search,
+            "start": start,
+            "optionNames": list(page.options.keys()),
+            "totalCount": page.total_count,
+        }
+
+        # Send the page to the client
+        self.session._changed_attributes[self].add("options")
+        self.session._refresh_required_event.set()
+
     async def _on_message_(self, msg: t.Any) -> None:
         # Parse the message
         assert isinstance(msg, dict), msg
 
+        # Option providers are queried on behalf of the client
+        if msg.get("type") == "fetchOptions":
+            search = msg["search"]
+            start = msg["start"]
+            count = msg["count"]
+            request_id = msg["requestId"]
+            assert isinstance(search, str), msg
+            assert isinstance(start, int) and isinstance(count, int), msg
+            assert isinstance(request_id, int), msg
+
+            if callable(self.options):
+                self._request_option_page(search, start, count, request_id)
+
+            return
+
         # The frontend works with names, not values. Get the corresponding
         # value.
-        try:
-            selected_value = self.options[msg["name"]]
-        except KeyError:
-            # Invalid names may be sent due to lag between the frontend and
-            # backend. Ignore them.
-            return
+        name = msg["name"]
+
+        if callable(self.options):
+            # Options from a provider are looked up in the pages that have been
+            # sent to the client
+            for option_name, selected_value in self._iter_known_options():
+                if option_name == name:
+                    break
+            else:
+                return
+
+            self._selected_option = (name, selected_value)
+        else:
+            try:
+                selected_value = self.options[name]
+            except KeyError:
+                # Invalid names may be sent due to lag between the frontend and
+                # backend. Ignore them.
+                return
 
         self._apply_delta_state_from_frontend(
             {"selected_value": selected_value}
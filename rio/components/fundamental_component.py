@@ -68,6 +68,11 @@ class FundamentalComponent(Component):
     # in `__init_subclass__`.
     _unique_id_: t.ClassVar[str]
 
+    # Text attributes which often grow at the end, e.g. while a chat message is
+    # being streamed in. If such an attribute has only grown since it was last
+    # sent to the client, just the new suffix is sent.
+    _appendable_attributes_: t.ClassVar[tuple[str, ...]] = ()
+
     def build(self) -> rio.Component:
         raise RuntimeError(
             f"Attempted to call `build` on `FundamentalComponent` {self}"
@@ -176,3 +181,22 @@ class FundamentalComponent(Component):
             setattr(self, attr_name, attr_value)
 
         self.session._changed_attributes[self] = dirty_properties
+
+        # The client now has these values, so future suffixes must be relative
+        # to them
+        for attr_name in self._appendable_attributes_:
+            if attr_name in delta_state:
+                self._get_values_sent_to_client()[attr_name] = delta_state[
+                    attr_name
+                ]
+
+    def _get_values_sent_to_client(self) -> dict[str, str]:
+        """
+        Returns the values of the `_appendable_attributes_` which the client
+        currently has.
+        """
+        try:
+            return self._values_sent_to_client
+        except AttributeError:
+            self._values_sent_to_client: dict[str, str] = {}
+            return self._values_sent_to_client
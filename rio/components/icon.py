@@ -112,12 +112,16 @@ class Icon(FundamentalComponent):
 
         There must not already be a set with the given name.
 
-        The icon set must be a `.tar.xz` compressed archive containing exactly
+        The icon set must be a `.zip` or `.tar.xz` archive containing exactly
         one directory, which must be named identically to the icon set. Files
         located in the root of that directory can be accessed as
         `"icon_set/icon_name"`. Files located in a subdirectory can be accessed
         as `"icon_set/icon_name:variant"`.
 
+        `.zip` archives are preferable, since Rio can read individual icons
+        from them directly. `.tar.xz` archives have to be extracted to disk in
+        their entirety before any icon can be used.
+
         For SVG files to work as icons...
 
         - They must have a `viewBox` attribute, but no height or width
@@ -132,8 +136,8 @@ class Icon(FundamentalComponent):
         `set_name`: The name of the new icon set. This will be used to access
             the icons.
 
-        `set_archive_path`: The path to the `.tar.xz` archive containing the
-            icon set.
+        `set_archive_path`: The path to the `.zip` or `.tar.xz` archive
+            containing the icon set.
         """
 
         icon_registry.register_icon_set(set_name, set_archive_path)
@@ -241,7 +245,10 @@ class Icon(FundamentalComponent):
         # Union.
         fill = self.fill
         if not isinstance(fill, str):
-            fill = self.session._serialize_fill(fill)
+            fill = self.session._intern_style(
+                ("fill", fill),
+                lambda: self.session._serialize_fill(fill),
+            )
 
         # Serialize
         return {
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import dataclasses
+import logging
 import typing as t
 
+import PIL.Image
 from uniserde import Jsonable, JsonDoc
 
-from .. import assets
+import rio
+
+from .. import assets, image_pipeline
 from ..utils import EventHandler, ImageLike
 from .component import AccessibilityRole, Key
 from .fundamental_component import FundamentalComponent
@@ -21,6 +25,10 @@ class Image(FundamentalComponent):
     `Image` does just what you'd expect: it displays a single image. The image
     can be loaded from a URL or a local file.
 
+    Large raster images which are hosted by Rio (i.e. local files, `bytes` and
+    `PIL.Image` objects) are automatically served at a resolution matching
+    their size on screen, in a format the browser can display efficiently.
+
     The resolution of the image does not affect the size at which it is
     displayed. The `Image` component is flexible with its space requirements and
     adapts to any space allocated by its parent component.
@@ -179,23 +187,104 @@ class Image(FundamentalComponent):
         self.corner_radius = corner_radius
         self.accessibility_description = accessibility_description
 
-    def _get_image_asset(self) -> assets.Asset:
-        image = self.image
+    def _get_image_asset(self) -> assets.Asset | None:
+        """
+        Returns the asset for the image, or `None` if it isn't ready yet.
 
-        if getattr(self, "_image_for_cached_asset", None) != image:
-            self._cached_image_asset = assets.Asset.from_image(image)
+        Encoding PIL images and hashing large files can take a while, so that
+        happens in a worker thread. The client displays a placeholder until
+        then.
+        """
+        image = self.image
+        cached_image = getattr(self, "_image_for_cached_asset", None)
+
+        # PIL images are compared by identity. Their `==` compares all pixels,
+        # which would block the event loop just the same.
+        if cached_image is not image and (
+            isinstance(image, PIL.Image.Image)
+            or isinstance(cached_image, PIL.Image.Image)
+            or cached_image != image
+        ):
             self._image_for_cached_asset = image
+            self._cached_image_asset = None
+            self._image_preparation_failed = False
+
+            if isinstance(image, PIL.Image.Image):
+                self.session.create_task(self._prepare_image_asset(image))
+            else:
+                asset = assets.Asset.from_image(image)
+
+                if asset.is_prepared:
+                    self._cached_image_asset = asset
+                else:
+                    self.session.create_task(self._prepare_image_asset(image))
 
         return self._cached_image_asset
 
+    async def _prepare_image_asset(self, image: ImageLike) -> None:
+        try:
+            asset = await assets.Asset.from_image_in_background(image)
+        except Exception:
+            if self._image_for_cached_asset is not image:
+                return
+
+            logging.exception(f"Could not prepare the image of {self!r}")
+            self._image_preparation_failed = True
+
+            # Display the error on the client, just like an image that failed
+            # to load
+            self.session._changed_attributes[self].add("image")
+            self.session._refresh_required_event.set()
+            await self.call_event_handler(self.on_error)
+            return
+
+        # The image may have been replaced in the meantime
+        if self._image_for_cached_asset is not image:
+            return
+
+        self._cached_image_asset = asset
+
+        # Send the URL to the client
+        self.session._changed_attributes[self].add("image")
+        self.session._refresh_required_event.set()
+
     def _custom_serialize_(self) -> JsonDoc:
         if isinstance(self.corner_radius, (int, float)):
             corner_radius = (self.corner_radius,) * 4
         else:
             corner_radius = self.corner_radius
 
+        asset = self._get_image_asset()
+
+        if asset is None:
+            image_url = None
+        else:
+            image_url = asset._serialize(self.session)
+
+        # Let the browser choose a downscaled variant of the image, if
+        # possible. Only variants smaller than the image itself are offered,
+        # alongside the original.
+        image_srcset: list[tuple[str, int]] | None = None
+
+        if asset is not None and image_pipeline.is_resizable(asset):
+            original_width = image_pipeline.get_original_width(asset)
+
+            if original_width is not None:
+                image_srcset = [
+                    (str(rio.URL(image_url).update_query(w=width)), width)
+                    for width in image_pipeline.VARIANT_WIDTHS
+                    if width < original_width
+                ]
+
+                if image_srcset:
+                    image_srcset.append((image_url, original_width))
+                else:
+                    image_srcset = None
+
         return {
-            "imageUrl": self._get_image_asset()._serialize(self.session),
+            "imageUrl": image_url,
+            "imageFailed": self._image_preparation_failed,
+            "imageSrcset": image_srcset,
             "reportError": self.on_error is not None,
             "corner_radius": corner_radius,
         }
@@ -177,5 +177,14 @@ class Link(FundamentalComponent):
             "targetUrl": str(target_url_absolute),
         }
 
+    async def _on_message_(self, msg: t.Any) -> None:
+        # Parse the message
+        assert isinstance(msg, dict), msg
+        assert msg["type"] == "prefetch", msg
+
+        # The user is hovering over the link, so they're likely to click it
+        # soon. Prepare the page in the background.
+        self.session._prefetch(self.target_url)
+
 
 Link._unique_id_ = "Link-builtin"
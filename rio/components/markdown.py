@@ -3,7 +3,7 @@ import typing as t
 
 from uniserde import JsonDoc
 
-from .. import deprecations
+from .. import deprecations, markdown_rendering
 from .fundamental_component import FundamentalComponent
 
 __all__ = [
@@ -87,6 +87,8 @@ class Markdown(FundamentalComponent):
     scroll_code_x: t.Literal["auto", "always", "never"] = "never"
     scroll_code_y: t.Literal["auto", "always", "never"] = "never"
 
+    _appendable_attributes_ = ("text",)
+
     def _custom_serialize_(self) -> JsonDoc:
         # The old `wrap` attribute has been replaced with `overflow`. Remap the
         # value.
@@ -106,9 +108,24 @@ class Markdown(FundamentalComponent):
             overflow = self.overflow
 
         # Build the result
-        return {
+        result: JsonDoc = {
             "overflow": overflow,
+            "html": None,
         }
 
+        # If the app wants it, render the text here, rather than having every
+        # client do it. The source isn't needed by the client in that case.
+        if self.session.app._render_markdown_on_server:
+            html = markdown_rendering.MARKDOWN_RENDERER.render_markdown(
+                self.text,
+                self.default_language,
+            )
+
+            if html is not None:
+                result["html"] = html
+                result["text"] = None
+
+        return result
+
 
 Markdown._unique_id_ = "Markdown-builtin"
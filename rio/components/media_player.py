@@ -30,7 +30,9 @@ class MediaPlayer(KeyboardFocusableFundamentalComponent):
 
     ## Attributes
 
-    `media`: The media to play. This can be a file path, URL, or bytes.
+    `media`: The media to play. This can be a file path, URL, or bytes. Large
+        files that aren't stored locally can be passed as a
+        `rio.ByteRangeSource`, so they're loaded piece by piece as they play.
 
     `media_type`: The mime type of the media file. May help the browser play the
         file correctly.
@@ -84,7 +86,7 @@ class MediaPlayer(KeyboardFocusableFundamentalComponent):
     ```
     """
 
-    media: pathlib.Path | rio.URL | bytes
+    media: pathlib.Path | rio.URL | bytes | rio.ByteRangeSource
     media_type: str | None
     loop: bool
     autoplay: bool
@@ -97,7 +99,7 @@ class MediaPlayer(KeyboardFocusableFundamentalComponent):
 
     def __init__(
         self,
-        media: pathlib.Path | rio.URL | bytes,
+        media: pathlib.Path | rio.URL | bytes | rio.ByteRangeSource,
         *,
         media_type: str | None = None,
         loop: bool = False,
@@ -161,10 +163,58 @@ class MediaPlayer(KeyboardFocusableFundamentalComponent):
         self.on_playback_end = on_playback_end
         self.on_error = on_error
 
+    def _get_media_asset(self) -> assets.Asset | None:
+        """
+        Returns the asset for the media, or `None` if it isn't ready yet.
+
+        Large files are hashed in a worker thread. The client doesn't play
+        anything until then.
+        """
+        source = (self.media, self.media_type)
+
+        # The asset is only hosted for as long as it is alive, so keep a
+        # reference to it
+        if getattr(self, "_media_for_cached_asset", None) != source:
+            self._media_for_cached_asset = source
+
+            asset = assets.Asset.new(*source)
+
+            if asset.is_prepared:
+                self._cached_media_asset = asset
+            else:
+                self._cached_media_asset = None
+                self.session.create_task(
+                    self._prepare_media_asset(source, asset)
+                )
+
+        return self._cached_media_asset
+
+    async def _prepare_media_asset(
+        self,
+        source: tuple[
+            pathlib.Path | rio.URL | bytes | rio.ByteRangeSource, str | None
+        ],
+        asset: assets.Asset,
+    ) -> None:
+        await asset.prepare()
+
+        # The media may have been replaced in the meantime
+        if self._media_for_cached_asset is not source:
+            return
+
+        self._cached_media_asset = asset
+
+        # Send the URL to the client
+        self.session._changed_attributes[self].add("media")
+        self.session._refresh_required_event.set()
+
     def _custom_serialize_(self) -> JsonDoc:
-        media_asset = assets.Asset.new(self.media, self.media_type)
+        asset = self._get_media_asset()
+
         return {
-            "mediaUrl": media_asset._serialize(self.session),
+            "mediaUrl": None
+            if asset is None
+            else asset._serialize(self.session),
             "reportError": self.on_error is not None,
             "reportPlaybackEnd": self.on_playback_end is not None,
         }
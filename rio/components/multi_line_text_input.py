@@ -200,6 +200,8 @@ class MultiLineTextInput(KeyboardFocusableFundamentalComponent):
     # so is intentionally omitted here.
     style: t.Literal["underlined", "rounded"] = "underlined"
 
+    _appendable_attributes_ = ("text",)
+
     def _custom_serialize_(self) -> JsonDoc:
         # The other events have the secondary effect of updating the TextInput's
         # value, so `on_gain_focus` is the only one that can be omitted
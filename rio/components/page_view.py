@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import collections
 import dataclasses
 import typing as t
 
@@ -13,6 +14,11 @@ __all__ = [
 ]
 
 
+# How many prefetched pages each `PageView` holds on to. Older ones are
+# discarded.
+_MAX_PREFETCHED_PAGES = 3
+
+
 def default_fallback_build(
     sess: rio.Session,
 ) -> rio.Component:
@@ -93,6 +99,17 @@ class PageView(Component):
         component that is displayed instead. If not specified Rio will
         display a default error page.
 
+    `keep_alive`: How many recently visited pages to keep around after
+        navigating away from them. When navigating back to such a page, it is
+        displayed exactly as it was left, without being built again (and
+        without triggering its `on_populate` event). Pages are kept separately
+        for each set of path and query parameters. Pages with
+        `keep_alive=False` are never kept.
+
+        Kept pages are unmounted while they aren't displayed, and continue to
+        use memory. Once the limit is reached, the least recently visited page
+        is discarded.
+
 
     ## Examples
 
@@ -134,10 +151,22 @@ class PageView(Component):
     _: dataclasses.KW_ONLY
 
     fallback_build: t.Callable[[], rio.Component] | None = None
+    keep_alive: int = 0
 
     def __post_init__(self) -> None:
         self._level = self._find_nesting_level()
 
+        # Recently visited pages, ordered from least to most recently visited
+        self._kept_alive_pages: collections.OrderedDict[
+            tuple[object, ...], rio.Component
+        ] = collections.OrderedDict()
+
+        # Pages which were built ahead of time, because the user is likely to
+        # visit them soon
+        self._prefetched_pages: collections.OrderedDict[
+            tuple[object, ...], rio.Component
+        ] = collections.OrderedDict()
+
         self.session._page_views.add(self)
 
     def _find_nesting_level(self) -> int:
@@ -187,9 +216,140 @@ class PageView(Component):
 
         # Otherwise build the active page
         else:
+            keep_alive = self.keep_alive > 0 and page.keep_alive
+            cache_key = _make_cache_key(
+                page, page_path_parameters, self.session.active_page_url.query
+            )
+
+            # Only pages that are kept alive or were prefetched have to be kept
+            # apart from the previous page. Everything else is reconciled as
+            # usual.
+            if keep_alive or cache_key in self._prefetched_pages:
+                return self._build_separate_page(
+                    page, page_path_parameters, keep_alive=keep_alive
+                )
+
             result = page._safe_build_with_url_parameters(
                 path_params=page_path_parameters,
                 raw_query_params=self.session.active_page_url.query,
             )
 
         return result
+
+    def _build_separate_page(
+        self,
+        page: rio.ComponentPage,
+        path_parameters: t.Mapping[str, object],
+        *,
+        keep_alive: bool,
+    ) -> rio.Component:
+        """
+        Builds the active page in a way that it's never reconciled with the
+        previously displayed page, reusing a prefetched or kept alive page if
+        possible.
+        """
+        raw_query_parameters = self.session.active_page_url.query
+        cache_key = _make_cache_key(page, path_parameters, raw_query_parameters)
+
+        # Prefetched pages are only used once
+        page_component = self._prefetched_pages.pop(cache_key, None)
+
+        if page_component is None and keep_alive:
+            page_component = self._kept_alive_pages.get(cache_key)
+
+        if page_component is None:
+            page_component = self._build_page_without_keys(
+                page, path_parameters, raw_query_parameters
+            )
+
+        if keep_alive:
+            self._kept_alive_pages[cache_key] = page_component
+            self._kept_alive_pages.move_to_end(cache_key)
+
+            # Discard the least recently visited pages
+            while len(self._kept_alive_pages) > self.keep_alive:
+                self._kept_alive_pages.popitem(last=False)
+
+        # Components of the same type would be reconciled with the previously
+        # displayed page, merging the two. Wrapping the page in a container
+        # with a key unique to it prevents that.
+        return rio.Container(
+            page_component,
+            key=f"rio-separate-page-{id(page_component)}",
+        )
+
+    def _build_page_without_keys(
+        self,
+        page: rio.ComponentPage,
+        path_parameters: t.Mapping[str, object],
+        raw_query_parameters: t.Mapping[str, str],
+    ) -> rio.Component:
+        # The reconciler would pair up keyed components in the new page with
+        # those in the previously displayed page, merging the two. Pages that
+        # are kept separately must stay separate, so hide their keys.
+        outer_key_to_component = global_state.key_to_component
+        global_state.key_to_component = {}
+
+        try:
+            return page._safe_build_with_url_parameters(
+                path_params=path_parameters,
+                raw_query_params=raw_query_parameters,
+            )
+        finally:
+            global_state.key_to_component = outer_key_to_component
+
+    def _prefetch_page(
+        self,
+        page: rio.ComponentPage,
+        path_parameters: t.Mapping[str, object],
+        raw_query_parameters: t.Mapping[str, str],
+    ) -> rio.Component | None:
+        """
+        Creates the page component for a page that is likely to be visited
+        soon, so it's ready once the user navigates there. Returns the new
+        component, or `None` if there already is one.
+
+        The caller is responsible for building the component.
+        """
+        cache_key = _make_cache_key(page, path_parameters, raw_query_parameters)
+
+        if cache_key in self._prefetched_pages or (
+            self.keep_alive > 0 and cache_key in self._kept_alive_pages
+        ):
+            return None
+
+        # Create the component as if this `PageView` were being built
+        outer_building_component = global_state.currently_building_component
+        outer_building_session = global_state.currently_building_session
+        global_state.currently_building_component = self
+        global_state.currently_building_session = self.session
+
+        try:
+            page_component = self._build_page_without_keys(
+                page, path_parameters, raw_query_parameters
+            )
+        finally:
+            global_state.currently_building_component = outer_building_component
+            global_state.currently_building_session = outer_building_session
+
+        self._prefetched_pages[cache_key] = page_component
+
+        while len(self._prefetched_pages) > _MAX_PREFETCHED_PAGES:
+            self._prefetched_pages.popitem(last=False)
+
+        return page_component
+
+
+def _make_cache_key(
+    page: rio.ComponentPage,
+    path_parameters: t.Mapping[str, object],
+    raw_query_parameters: t.Mapping[str, str],
+) -> tuple[object, ...]:
+    query_parameters = page._parse_query_parameters(raw_query_parameters)
+
+    # Parameter names are unique, so sorting never has to compare the values
+    return (
+        page,
+        tuple(sorted(path_parameters.items())),
+        tuple(sorted(query_parameters.items())),
+    )
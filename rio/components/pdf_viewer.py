@@ -7,6 +7,7 @@ from uniserde import JsonDoc
 from yarl import URL
 
 from .. import assets
+from ..utils import ByteRangeSource
 from .component import AccessibilityRole, Key
 from .fundamental_component import FundamentalComponent
 
@@ -25,9 +26,11 @@ class PdfViewer(FundamentalComponent):
 
     The document can be loaded from any source supported by Rio's asset system.
     If the document is hosted somewhere, you can provide a `rio.URL` for easy
-    access. To display a local file use a `pathlib.Path` object. Finally, if you
+    access. To display a local file use a `pathlib.Path` object. If you
     already have the document data in memory you can pass it as a `bytes`
-    object.
+    object. Finally, documents stored elsewhere (e.g. in a database) can be
+    passed as a `rio.ByteRangeSource`. The browser then only loads the parts of
+    the document it needs, rather than the whole file.
 
     Warning: Unlike most components in Rio, the `PdfViewer` component does not
         have a large `natural` size, but instead only displays part of the
@@ -76,11 +79,11 @@ class PdfViewer(FundamentalComponent):
     `experimental`: True
     """
 
-    pdf: Path | URL | bytes
+    pdf: Path | URL | bytes | ByteRangeSource
 
     def __init__(
         self,
-        pdf: Path | URL | bytes,
+        pdf: Path | URL | bytes | ByteRangeSource,
         *,
         key: Key | None = None,
         margin: float | None = None,
@@ -126,21 +129,50 @@ class PdfViewer(FundamentalComponent):
 
         self.pdf = pdf
 
-    def _get_pdf_asset(self) -> assets.Asset:
+    def _get_pdf_asset(self) -> assets.Asset | None:
+        """
+        Returns the asset for the PDF, or `None` if it isn't ready yet.
+
+        Large files are hashed in a worker thread. The client displays a
+        placeholder until then.
+        """
         pdf = self.pdf
 
         if getattr(self, "_pdf_for_cached_asset", None) != pdf:
-            self._cached_pdf_asset = assets.Asset.new(
-                pdf,
-                media_type="application/pdf",
-            )
             self._pdf_for_cached_asset = pdf
 
+            asset = assets.Asset.new(pdf, media_type="application/pdf")
+
+            if asset.is_prepared:
+                self._cached_pdf_asset = asset
+            else:
+                self._cached_pdf_asset = None
+                self.session.create_task(self._prepare_pdf_asset(pdf, asset))
+
         return self._cached_pdf_asset
 
+    async def _prepare_pdf_asset(
+        self,
+        pdf: Path | URL | bytes | ByteRangeSource,
+        asset: assets.Asset,
+    ) -> None:
+        await asset.prepare()
+
+        # The PDF may have been replaced in the meantime
+        if self._pdf_for_cached_asset is not pdf:
+            return
+
+        self._cached_pdf_asset = asset
+
+        # Send the URL to the client
+        self.session._changed_attributes[self].add("pdf")
+        self.session._refresh_required_event.set()
+
     def _custom_serialize_(self) -> JsonDoc:
+        asset = self._get_pdf_asset()
+
         return {
-            "pdfUrl": self._get_pdf_asset()._serialize(self.session),
+            "pdfUrl": None if asset is None else asset._serialize(self.session),
         }
 
 
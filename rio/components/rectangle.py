@@ -205,7 +205,10 @@ class Rectangle(FundamentalComponent):
         # Serialize
         return {
             # Regular
-            "fill": self._session_._serialize_fill(self.fill),
+            "fill": self._session_._intern_style(
+                ("fill", self.fill),
+                lambda: self._session_._serialize_fill(self.fill),
+            ),
             "corner_radius": (
                 self.corner_radius
                 if self.corner_radius is None
@@ -214,7 +217,10 @@ class Rectangle(FundamentalComponent):
             ),
             "shadow_color": shadow_color._serialize(self._session_),
             # Hover
-            "hover_fill": self._session_._serialize_fill(self.hover_fill),
+            "hover_fill": self._session_._intern_style(
+                ("fill", self.hover_fill),
+                lambda: self._session_._serialize_fill(self.hover_fill),
+            ),
             "hover_corner_radius": (
                 self.hover_corner_radius
                 if self.hover_corner_radius is None
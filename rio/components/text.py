@@ -118,13 +118,18 @@ class Text(FundamentalComponent):
     strikethrough: bool | None = None
     all_caps: bool | None = None
 
+    _appendable_attributes_ = ("text",)
+
     def _custom_serialize_(self) -> JsonDoc:
         # Serialization doesn't handle unions. Hence the custom serialization
         # here
         if isinstance(self.style, str):
             style = self.style
         else:
-            style = self.style._serialize(self.session)
+            style = self.session._intern_style(
+                ("text-style", self.style),
+                lambda: self.style._serialize(self.session),
+            )
 
         # The old `wrap` attribute has been replaced with `overflow`. Remap the
         # value.
@@ -147,7 +152,10 @@ class Text(FundamentalComponent):
         return {
             "style": style,
             "overflow": overflow,
-            "fill": self.session._serialize_fill(self.fill),
+            "fill": self.session._intern_style(
+                ("fill", self.fill),
+                lambda: self.session._serialize_fill(self.fill),
+            ),
         }
 
     def __repr__(self) -> str:
@@ -265,9 +265,26 @@ class CustomTreeItem(_TreeItemBase, FundamentalComponent):
 
         self.content = content
 
+    def _iter_direct_children_in_attributes_(self) -> t.Iterable[Component]:
+        # The children of collapsed items aren't part of the component tree.
+        # That way they aren't built until the item is expanded.
+        if self.is_expanded:
+            yield from super()._iter_direct_children_in_attributes_()
+            return
+
+        collapsed_children = {id(child) for child in self.children}
+
+        for child in super()._iter_direct_children_in_attributes_():
+            if id(child) not in collapsed_children:
+                yield child
+
     def _custom_serialize_(self) -> JsonDoc:
         return {
             "pressable": self.on_press is not None,
+            "children": [child._id_ for child in self.children]
+            if self.is_expanded
+            else [],
+            "has_children": bool(self.children),
         }
 
     async def _on_message_(self, msg: t.Any) -> None:
@@ -295,6 +312,10 @@ class CustomTreeItem(_TreeItemBase, FundamentalComponent):
                 )
 
             self._apply_delta_state_from_frontend({"is_expanded": is_expanded})
+
+            # The children are only part of the component tree while the item
+            # is expanded, so they have to be (un)mounted
+            self.session._changed_attributes[self].add("children")
         else:
             assert False, f"Unexpected message type: {msg.get('type')}"
 
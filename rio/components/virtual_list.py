@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import dataclasses
+import typing as t
+
+import rio
+
+from .component import Component
+from .fundamental_component import FundamentalComponent
+
+__all__ = ["VirtualList"]
+
+
+# How many items are built before the client has reported which part of the
+# list is actually visible
+INITIAL_ITEM_COUNT = 50
+
+
+@t.final
+class VirtualList(Component):
+    """
+    A scrollable list which only builds the items that are visible.
+
+    Displaying thousands of components at once is slow, both on the server
+    and in the browser. `VirtualList` avoids this by asking for the items
+    through a function, and only calling it for the items that are currently
+    scrolled into view (plus a few above and below). As the user scrolls,
+    items that leave the view are discarded and new ones are built.
+
+    For this to work, all items must have the same height. The list scrolls
+    on its own, so it shouldn't be placed inside of a `ScrollContainer`.
+
+    Items are matched up by their position in the visible range when
+    scrolling. Give them a `key` (e.g. their index) so that each item keeps
+    its state, and doesn't have to be updated when the list scrolls.
+
+
+    ## Attributes
+
+    `item_count`: The total number of items in the list.
+
+    `build_item`: A function that receives the index of an item and returns
+        the component to display for it. It's only called for items that are
+        visible.
+
+    `item_height`: The height of every item, in font-heights.
+
+    `overscan`: How many items above and below the visible ones are built as
+        well, so that scrolling doesn't reveal empty space while the new items
+        are on their way.
+
+
+    ## Examples
+
+    A list of 100,000 items, of which only a few dozen exist at any time:
+
+    ```python
+    rio.VirtualList(
+        item_count=100_000,
+        build_item=lambda index: rio.SimpleListItem(
+            f"Item {index}",
+            key=index,
+        ),
+        item_height=3.5,
+        min_height=20,
+    )
+    ```
+
+
+    ## Metadata
+
+    `experimental`: True
+    """
+
+    item_count: int
+    build_item: t.Callable[[int], rio.Component]
+    _: dataclasses.KW_ONLY
+    item_height: float = 2.5
+    overscan: int = 10
+
+    # The range of items which are built, as reported by the client
+    _visible_range: tuple[int, int] = dataclasses.field(
+        default=(0, INITIAL_ITEM_COUNT),
+        init=False,
+    )
+
+    def _on_visible_range_change(self, start: int, end: int) -> None:
+        self._visible_range = (start, end)
+
+    def build(self) -> rio.Component:
+        start, end = self._visible_range
+        end = max(0, min(end, self.item_count))
+        start = max(0, min(start, end))
+
+        return _VirtualListInternal(
+            children=[self.build_item(index) for index in range(start, end)],
+            first_index=start,
+            item_count=self.item_count,
+            item_height=self.item_height,
+            overscan=self.overscan,
+            on_visible_range_change=self._on_visible_range_change,
+            grow_x=True,
+            grow_y=True,
+        )
+
+
+class _VirtualListInternal(FundamentalComponent):
+    _: dataclasses.KW_ONLY
+    children: list[rio.Component]
+    first_index: int
+    item_count: int
+    item_height: float
+    overscan: int
+    on_visible_range_change: t.Callable[[int, int], None]
+
+    async def _on_message_(self, msg: t.Any) -> None:
+        assert isinstance(msg, dict), msg
+        assert msg["type"] == "visibleRange", msg
+
+        start = msg["start"]
+        end = msg["end"]
+        assert isinstance(start, int) and isinstance(end, int), msg
+
+        self.on_visible_range_change(start, end)
+
+
+_VirtualListInternal._unique_id_ = "VirtualList-builtin"
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import enum
+import inspect
 import typing as t
 from datetime import timedelta
 
@@ -13,6 +14,7 @@ __all__ = [
     "on_unmount",
     "on_window_size_change",
     "periodic",
+    "run_in_thread",
 ]
 
 
@@ -407,3 +409,62 @@ def on_resize(handler: OnResizeMethodVar) -> OnResizeMethodVar:
     """
     _tag_as_event_handler(handler, EventTag.ON_RESIZE, None)
     return handler
+
+
+def run_in_thread(handler: Func) -> Func:
+    """
+    Runs a synchronous event handler in a worker thread.
+
+    All sessions share a single event loop, so a slow synchronous event
+    handler (e.g. one running a database query or crunching numbers) doesn't
+    just freeze its own session, but every session on the server. Decorating
+    it with `run_in_thread` moves it off the event loop, so other sessions can
+    continue to be served in the meantime.
+
+    The handler may freely change the state of components. The session isn't
+    refreshed until the handler has finished, so users never see a
+    half-finished state. The handler can't create components though, and must
+    not be `async` (async handlers don't block the event loop anyway).
+
+    This decorator can be combined with the other decorators in `rio.event`,
+    as well as used on handlers passed to components, like a button's
+    `on_press`.
+
+
+    ## Example
+
+    ```python
+    import time
+
+
+    class SalesReport(rio.Component):
+        summary: str = ""
+
+        @rio.event.run_in_thread
+        def _on_refresh(self) -> None:
+            # This is slow, but won't affect any other sessions
+            time.sleep(5)
+            self.summary = "Sales are up 5%"
+
+        def build(self) -> rio.Component:
+            return rio.Column(
+                rio.Text(self.summary),
+                rio.Button("Refresh", on_press=self._on_refresh),
+            )
+    ```
+
+
+    ## Metadata
+
+    `decorator`: True
+
+    `experimental`: True
+    """
+    if inspect.iscoroutinefunction(handler):
+        raise TypeError(
+            f"`rio.event.run_in_thread` can only be used on synchronous"
+            f" functions, but {handler!r} is async"
+        )
+
+    handler._rio_run_in_thread_ = True  # type: ignore
+    return handler
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import abc
+import asyncio
 import dataclasses
+import logging
 import typing as t
 
+import PIL.Image
 import typing_extensions as te
 from uniserde import Jsonable
 
@@ -176,14 +179,67 @@ class ImageFill(Fill):
             ignored if `fill_mode` is not `"tile"`.
 
         """
-        self._image_asset = assets.Asset.from_image(image)
+        # Encoding PIL images is slow, so that is put off until the fill is
+        # displayed, and then done in a worker thread
+        self._image = image
+        self._image_asset: assets.Asset | None = (
+            None
+            if isinstance(image, PIL.Image.Image)
+            else assets.Asset.from_image(image)
+        )
+        self._preparation: asyncio.Future[None] | None = None
+        self._preparation_failed = False
         self._fill_mode = fill_mode
         self._tile_size = tile_size
 
+    def _is_prepared(self) -> bool:
+        return self._image_asset is not None and self._image_asset.is_prepared
+
+    async def _prepare(self) -> None:
+        try:
+            if self._image_asset is None:
+                self._image_asset = await assets.Asset.from_image_in_background(
+                    self._image
+                )
+            else:
+                await self._image_asset.prepare()
+        except Exception:
+            logging.exception(f"Could not prepare the image of {self!r}")
+            self._preparation_failed = True
+
+    def _get_image_asset(self) -> assets.Asset:
+        """
+        Returns the image's asset, encoding the image right away if that hasn't
+        happened yet.
+        """
+        if self._image_asset is None:
+            self._image_asset = assets.Asset.from_image(self._image)
+
+        return self._image_asset
+
     def _serialize(self, sess: rio.Session) -> Jsonable:
+        transparent_fill: Jsonable = {
+            "type": "solid",
+            "color": Color.TRANSPARENT.srgba,
+        }
+
+        # If the image can't be displayed, display nothing at all
+        if self._preparation_failed:
+            return transparent_fill
+
+        # Display nothing until the image has been encoded and hashed in the
+        # background
+        if not self._is_prepared():
+            if self._preparation is None:
+                self._preparation = asyncio.ensure_future(self._prepare())
+
+            return sess._serialize_placeholder(
+                self._preparation, transparent_fill
+            )
+
         return {
             "type": "image",
-            "imageUrl": self._image_asset._serialize(sess),
+            "imageUrl": self._get_image_asset()._serialize(sess),
             "fillMode": self._fill_mode,
             "tileSize": self._tile_size,
         }
@@ -192,17 +248,31 @@ class ImageFill(Fill):
         if not isinstance(other, ImageFill):
             return NotImplemented
 
-        return (
-            self._image_asset == other._image_asset
-            and self._fill_mode == other._fill_mode
-        )
+        if self._fill_mode != other._fill_mode:
+            return False
+
+        if self._image is other._image:
+            return True
+
+        # Comparing the assets hashes their data. Don't do that on the event
+        # loop unless it's already been done.
+        if not (self._is_prepared() and other._is_prepared()):
+            return False
+
+        return self._image_asset == other._image_asset
 
     def __hash__(self) -> int:
-        return hash((self._image_asset, self._fill_mode))
+        # Equal fills may have different images, as long as their data is the
+        # same. Hashing the data is too expensive, so only the fill mode is
+        # considered.
+        return hash(self._fill_mode)
 
     def _as_css_background(self, sess: rio.Session) -> str:
+        if self._preparation_failed:
+            return "none"
+
         # Fetch the escaped URL. That way it cannot interfere with the CSS syntax
-        image_url = self._image_asset._serialize(sess)
+        image_url = self._get_image_asset()._serialize(sess)
         css_url = f"url('{image_url}')"
 
         if self._fill_mode == "fit":
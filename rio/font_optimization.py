@@ -0,0 +1,336 @@
+"""
+Converts font faces into a more efficient form before they're served to
+clients.
+
+TrueType and OpenType files are converted to WOFF2, and optionally split into
+several files, each covering only a specific unicode range. Browsers only
+download the ranges a page actually uses.
+
+All of this requires `fontTools` (with brotli support) to be installed. If it
+isn't available, fonts are served as-is.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import logging
+import typing as t
+from pathlib import Path
+
+from . import utils
+from .assets import Asset, RehostedUrlAsset
+from .text_style import FontFace
+
+__all__ = [
+    "UNICODE_RANGES",
+    "optimize_font_face",
+]
+
+
+# Named unicode ranges which can be used for subsetting. These match the ranges
+# used by Google Fonts, so browsers are likely to already be good at dealing
+# with them.
+UNICODE_RANGES: dict[str, str] = {
+    "latin": "U+0000-00FF, U+0131, U+0152-0153, U+02BB-02BC, U+02C6, U+02DA, U+02DC, U+0304, U+0308, U+0329, U+2000-206F, U+20AC, U+2122, U+2191, U+2193, U+2212, U+2215, U+FEFF, U+FFFD",
+    "latin-ext": "U+0100-02BA, U+02BD-02C5, U+02C7-02CC, U+02CE-02D7, U+02DD-02FF, U+0304, U+0308, U+0329, U+1D00-1DBF, U+1E00-1E9F, U+1EF2-1EFF, U+2020, U+20A0-20AB, U+20AD-20C0, U+2113, U+2C60-2C7F, U+A720-A7FF",
+    "cyrillic": "U+0301, U+0400-045F, U+0490-0491, U+04B0-04B1, U+2116",
+    "cyrillic-ext": "U+0460-052F, U+1C80-1C8A, U+20B4, U+2DE0-2DFF, U+A640-A69F, U+FE2E-FE2F",
+    "greek": "U+0370-0377, U+037A-037F, U+0384-038A, U+038C, U+038E-03A1, U+03A3-03FF",
+    "greek-ext": "U+1F00-1FFF",
+    "vietnamese": "U+0102-0103, U+0110-0111, U+0128-0129, U+0168-0169, U+01A0-01A1, U+01AF-01B0, U+0300-0301, U+0303-0304, U+0308-0309, U+0323, U+0329, U+1EA0-1EF9, U+20AB",
+}
+
+# Magic numbers of font files which can be converted to WOFF2
+_CONVERTIBLE_FONT_SIGNATURES = (
+    b"\x00\x01\x00\x00",  # TrueType
+    b"true",  # TrueType (Apple)
+    b"OTTO",  # OpenType with CFF outlines
+)
+
+# Bump this whenever the output of the pipeline changes, to invalidate the
+# files cached on disk.
+_CACHE_VERSION = 1
+
+_warned_about_missing_font_tools = False
+
+
+def _font_tools_is_available() -> bool:
+    """
+    Returns whether `fontTools` is installed, including brotli support, which is
+    required for writing WOFF2 files. Warns once if it isn't.
+    """
+    global _warned_about_missing_font_tools
+
+    try:
+        import brotli  # type: ignore  # noqa: F401
+        import fontTools.ttLib  # type: ignore  # noqa: F401
+    except ImportError:
+        if not _warned_about_missing_font_tools:
+            _warned_about_missing_font_tools = True
+            logging.info(
+                "Fonts are served unoptimized because `fontTools` isn't"
+                """ installed. Run `pip install "rio-ui[fonts]"` to enable WOFF2"""
+                " conversion and subsetting."
+            )
+
+        return False
+
+    return True
+
+
+def parse_unicode_range(unicode_range: str) -> set[int]:
+    """
+    Parses a CSS `unicode-range` descriptor, such as `"U+0000-00FF, U+0131"`,
+    into the set of code points it contains. Wildcard ranges like `"U+4??"`
+    are supported as well.
+
+    ## Raises
+
+    `ValueError`: If the string isn't a valid unicode range.
+    """
+    result = set[int]()
+
+    for part in unicode_range.split(","):
+        part = part.strip()
+
+        if not part.upper().startswith("U+"):
+            raise ValueError(f"Invalid unicode range: {unicode_range!r}")
+
+        part = part[2:]
+
+        if "?" in part:
+            start = int(part.replace("?", "0"), 16)
+            end = int(part.replace("?", "F"), 16)
+        elif "-" in part:
+            start_str, end_str = part.split("-", 1)
+            start = int(start_str, 16)
+            end = int(end_str, 16)
+        else:
+            start = end = int(part, 16)
+
+        result.update(range(start, end + 1))
+
+    return result
+
+
+def format_unicode_range(code_points: t.Iterable[int]) -> str:
+    """
+    Formats a set of code points as a CSS `unicode-range` descriptor, merging
+    consecutive code points into ranges.
+    """
+    parts = list[str]()
+    sorted_code_points = sorted(code_points)
+    ii = 0
+
+    while ii < len(sorted_code_points):
+        start = end = sorted_code_points[ii]
+        ii += 1
+
+        while (
+            ii < len(sorted_code_points) and sorted_code_points[ii] == end + 1
+        ):
+            end = sorted_code_points[ii]
+            ii += 1
+
+        if start == end:
+            parts.append(f"U+{start:04X}")
+        else:
+            parts.append(f"U+{start:04X}-{end:04X}")
+
+    return ", ".join(parts)
+
+
+def resolve_subsets(subsets: t.Iterable[str]) -> list[tuple[str, set[int]]]:
+    """
+    Given subsets as passed to `rio.Font`, return the name and code points of
+    each one. Each subset can either be the name of one of the
+    `UNICODE_RANGES`, or a CSS `unicode-range` string.
+    """
+    result = list[tuple[str, set[int]]]()
+
+    for subset in subsets:
+        try:
+            unicode_range = UNICODE_RANGES[subset]
+        except KeyError:
+            if not subset.upper().startswith("U+"):
+                raise ValueError(
+                    f"Unknown font subset {subset!r}. Valid subsets are"
+                    f" {', '.join(map(repr, UNICODE_RANGES))}, or a CSS"
+                    " unicode range like `U+0000-00FF`."
+                ) from None
+
+            unicode_range = subset
+            subset = hashlib.sha256(subset.encode()).hexdigest()[:16]
+
+        result.append((subset, parse_unicode_range(unicode_range)))
+
+    return result
+
+
+def _convert_font(
+    font_data: bytes,
+    code_points: set[int] | None,
+) -> bytes:
+    """
+    Converts the font to WOFF2. If `code_points` is given, the result only
+    contains glyphs needed for those code points.
+
+    This is CPU heavy and should be run in a worker thread.
+    """
+    from fontTools import subset as font_subset  # type: ignore
+    from fontTools.ttLib import TTFont  # type: ignore
+
+    font = TTFont(io.BytesIO(font_data))
+
+    if code_points is not None:
+        options = font_subset.Options()
+        options.layout_features = ["*"]
+        options.name_IDs = ["*"]
+        options.name_languages = ["*"]
+        options.notdef_outline = True
+        options.glyph_names = True
+
+        subsetter = font_subset.Subsetter(options)
+        subsetter.populate(unicodes=code_points)
+        subsetter.subset(font)
+
+    font.flavor = "woff2"
+
+    result = io.BytesIO()
+    font.save(result)
+    return result.getvalue()
+
+
+def _optimize_font_data(
+    font_data: bytes,
+    subsets: list[tuple[str, set[int]]],
+) -> list[tuple[Path, str | None]]:
+    """
+    Converts the font to WOFF2 and splits it into the given subsets. Returns
+    the paths of the resulting files, along with the unicode range each one
+    covers. (`None` means the file covers the entire font.)
+
+    Results are cached on disk, so this is only slow the first time any given
+    font is optimized.
+
+    This is CPU heavy and should be run in a worker thread.
+    """
+    from fontTools.ttLib import TTFont  # type: ignore
+
+    cache_dir = utils.ASSET_MANAGER.get_cache_path(Path("fonts"))
+    font_hash = hashlib.sha256(font_data).hexdigest()
+
+    def get_file(name: str, code_points: set[int] | None) -> Path:
+        path = cache_dir / f"{font_hash}-v{_CACHE_VERSION}-{name}.woff2"
+
+        if not path.exists():
+            utils.write_file_atomically(
+                path, _convert_font(font_data, code_points)
+            )
+
+        return path
+
+    # Without subsetting there's only one file
+    if not subsets:
+        return [(get_file("full", None), None)]
+
+    # Only create subsets for which the font actually has glyphs. Any glyphs
+    # which aren't part of a named subset go into an extra file, so that no
+    # characters are lost.
+    available_code_points = set(TTFont(io.BytesIO(font_data)).getBestCmap())
+    remaining_code_points = set(available_code_points)
+    result = list[tuple[Path, str | None]]()
+
+    for name, code_points in subsets:
+        code_points = code_points & available_code_points
+        remaining_code_points -= code_points
+
+        if not code_points:
+            continue
+
+        result.append(
+            (get_file(name, code_points), format_unicode_range(code_points))
+        )
+
+    if remaining_code_points:
+        result.append(
+            (
+                get_file("other", remaining_code_points),
+                format_unicode_range(remaining_code_points),
+            )
+        )
+
+    return result
+
+
+async def optimize_font_face(
+    face: FontFace,
+    *,
+    subsets: t.Sequence[str] = (),
+) -> list[FontFace]:
+    """
+    Converts a font face into WOFF2 and optionally splits it into several faces,
+    one per unicode subset. The conversion runs in a worker thread and its
+    results are cached on disk.
+
+    Faces which can't be optimized are returned unchanged. This includes faces
+    loaded from CSS files (which usually are optimized already), fonts in
+    formats other than TrueType/OpenType, and all fonts if `fontTools` isn't
+    installed.
+
+    ## Parameters
+
+    `face`: The font face to optimize.
+
+    `subsets`: The unicode subsets to split the font into. Each subset can be
+        the name of one of the `UNICODE_RANGES`, or a CSS unicode range string.
+    """
+    # Faces which already specify their unicode range have been optimized by
+    # somebody else. Same for fonts that are downloaded from the internet.
+    if "unicode-range" in face.descriptors or isinstance(
+        face.file, RehostedUrlAsset
+    ):
+        return [face]
+
+    if not _font_tools_is_available():
+        return [face]
+
+    resolved_subsets = resolve_subsets(subsets)
+
+    try:
+        font_data = bytes(await face.file.fetch_as_bytes())
+    except ValueError:
+        return [face]
+
+    if not font_data.startswith(_CONVERTIBLE_FONT_SIGNATURES):
+        return [face]
+
+    try:
+        files = await asyncio.to_thread(
+            _optimize_font_data, font_data, resolved_subsets
+        )
+    except Exception as error:
+        logging.warning(
+            f"Could not optimize font face {face.file!r}, serving it as-is: {error}"
+        )
+        return [face]
+
+    result = list[FontFace]()
+
+    for path, unicode_range in files:
+        descriptors = dict(face.descriptors)
+
+        if unicode_range is not None:
+            descriptors["unicode-range"] = unicode_range
+
+        result.append(
+            FontFace(
+                file=Asset.new(path, "font/woff2"),
+                file_meta='format("woff2")',
+                descriptors=descriptors,
+            )
+        )
+
+    return result
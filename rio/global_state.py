@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import threading
 from pathlib import Path
 
 from identity_containers import IdentityDefaultDict, IdentitySet
@@ -36,6 +38,20 @@ currently_building_component: rio.Component | None = None
 currently_building_session: rio.Session | None = None
 
 
+class _HandlerThreadState(threading.local):
+    # The event loop which the current thread's event handler belongs to. This
+    # is only set in worker threads running event handlers decorated with
+    # `rio.event.run_in_thread`, and `None` everywhere else.
+    #
+    # Such threads run concurrently with `build` functions on the event loop,
+    # so they must never be mistaken for being part of a build. And any
+    # interactions with asyncio must be forwarded to the event loop.
+    event_loop: asyncio.AbstractEventLoop | None = None
+
+
+handler_thread_state = _HandlerThreadState()
+
+
 # When a component is instantiated, its `_rio_internal_` attribute is set to
 # this value. Set it accordingly before calling a `build` function.
 rio_internal: bool = False
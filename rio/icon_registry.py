@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import functools
 import logging
 import tarfile
+import threading
 import typing as t
+import zipfile
 from pathlib import Path
 
 from . import utils
@@ -10,16 +13,33 @@ from .errors import AssetError
 
 # Maps icon names (set/icon:variant) to the icon's SVG string. The icon
 # names are canonical form.
+#
+# This only contains icons which have been registered explicitly. Icons loaded
+# from icon set archives are kept in a bounded LRU cache instead, see
+# `_load_icon_svg`.
 cached_icons: dict[str, str] = {}
 
-# Maps icon set names to the path of the archive file containing the icons
+# Maps icon set names to the path of the archive file containing the icons.
+#
+# Archives can either be indexed `.zip` files, which allow reading individual
+# icons without unpacking anything, or `.tar.xz` files, which are extracted into
+# the cache directory the first time any of their icons is needed.
 icon_set_archives: dict[str, Path] = {
-    "material": utils.RIO_ASSETS_DIR / "icon_sets" / "material.tar.xz",
-    "rio": utils.RIO_ASSETS_DIR / "icon_sets" / "rio.tar.xz",
-    "styling": utils.RIO_ASSETS_DIR / "icon_sets" / "styling.tar.xz",
-    "brand": utils.RIO_ASSETS_DIR / "icon_sets" / "brand.tar.xz",
+    "material": utils.RIO_ASSETS_DIR / "icon_sets" / "material.zip",
+    "rio": utils.RIO_ASSETS_DIR / "icon_sets" / "rio.zip",
+    "styling": utils.RIO_ASSETS_DIR / "icon_sets" / "styling.zip",
+    "brand": utils.RIO_ASSETS_DIR / "icon_sets" / "brand.zip",
 }
 
+# How many icons loaded from icon set archives are kept in memory
+ICON_CACHE_SIZE = 2048
+
+# Maps icon set names to their opened `.zip` archives. `ZipFile` reads the
+# archive's central directory once when opened, which serves as the index from
+# member names to their offsets in the file.
+_open_zip_archives: dict[str, zipfile.ZipFile] = {}
+_open_zip_archives_lock = threading.Lock()
+
 
 def parse_icon_name(icon_name: str) -> tuple[str, str, str | None]:
     """
@@ -119,78 +139,137 @@ def _ensure_icon_set_is_extracted(icon_set: str) -> None:
         )
 
 
-def _get_icon_svg_path(icon_name: str) -> Path:
+def _get_zip_archive(icon_set: str) -> zipfile.ZipFile | None:
     """
-    Given an icon name, return the path to the SVG file for that icon. This
-    will extract the icon if necessary.
+    Given the name of an icon set, return the opened `.zip` archive containing
+    its icons. Returns `None` if the icon set isn't stored in an indexed
+    archive. Raises a `KeyError` if no icon set with the given name has been
+    registered.
     """
-    # Prepare some paths
-    icon_set, icon_name, variant = parse_icon_name(icon_name)
+    # Get the path to the icon set's archive. If there is no icon set with
+    # the given name, this will raise a `KeyError`. That's fine.
+    archive_path = icon_set_archives[icon_set]
 
-    icon_set_dir = _icon_set_extraction_dir(icon_set)
+    if archive_path.suffix != ".zip":
+        return None
+
+    with _open_zip_archives_lock:
+        try:
+            return _open_zip_archives[icon_set]
+        except KeyError:
+            pass
 
+        logging.debug(f"Opening icon set `{icon_set}` from `{archive_path}`")
+        archive = zipfile.ZipFile(archive_path, "r")
+        _open_zip_archives[icon_set] = archive
+        return archive
+
+
+def _icon_member_name(
+    icon_set: str, icon_name: str, variant: str | None
+) -> str:
+    """
+    Returns the path of an icon's SVG file, relative to the root of its icon set
+    archive.
+    """
     if variant is None:
-        svg_path = icon_set_dir / f"{icon_name}.svg"
-    else:
-        svg_path = icon_set_dir / variant / f"{icon_name}.svg"
+        return f"{icon_set}/{icon_name}.svg"
+
+    return f"{icon_set}/{variant}/{icon_name}.svg"
+
+
+@functools.lru_cache(maxsize=ICON_CACHE_SIZE)
+def _load_icon_svg(icon_set: str, icon_name: str, variant: str | None) -> str:
+    """
+    Given the parts of a canonical icon name, load the icon's SVG string from
+    its icon set. Results are cached. If there is no matching icon, raise an
+    `AssetError`.
+    """
+    member_name = _icon_member_name(icon_set, icon_name, variant)
 
-    # Extract the icon set if necessary
     try:
-        _ensure_icon_set_is_extracted(icon_set)
+        archive = _get_zip_archive(icon_set)
     except KeyError:
         raise AssetError(
-            f"No icon set with the name {icon_set!r} is registered"
-        )
+            f"Unknown icon set `{icon_set}`. Known icon sets are: `{'`, `'.join(icon_set_archives.keys())}`"
+        ) from None
 
-    if not svg_path.exists():
-        raise AssetError(f"There is no icon named {icon_name!r}")
+    # Indexed archives can serve the icon directly
+    if archive is not None:
+        try:
+            svg_bytes = archive.read(member_name)
+        except KeyError:
+            raise AssetError(
+                f"There is no icon named `{icon_name}` in the `{icon_set}` icon set"
+            ) from None
+
+        return svg_bytes.decode("utf-8")
+
+    # Other archives have to be extracted first
+    _ensure_icon_set_is_extracted(icon_set)
+    svg_path = _icon_set_extraction_dir(icon_set).parent / member_name
 
-    return svg_path
+    try:
+        return svg_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        raise AssetError(
+            f"There is no icon named `{icon_name}` in the `{icon_set}` icon set"
+        ) from None
 
 
 def get_icon_svg(icon_name: str) -> str:
     """
     Given an icon name, return the SVG string for that icon. This will
-    extract the icon if necessary. If the icon name is invalid or there is
-    no matching icon, raise an `AssetError`.
+    load the icon from its icon set if necessary. If the icon name is invalid or
+    there is no matching icon, raise an `AssetError`.
     """
 
     # Normalize the icon name
     icon_name = normalize_icon_name(icon_name)
 
-    # Already cached?
+    # Explicitly registered icons take precedence
     try:
         return cached_icons[icon_name]
     except KeyError:
         pass
 
-    # Get the path to the icon's SVG file
-    svg_path = _get_icon_svg_path(icon_name)
+    # Load the icon from its icon set
+    icon_set, name, variant = parse_icon_name(icon_name)
+    return _load_icon_svg(icon_set, name, variant)
 
-    # Read the SVG file
-    try:
-        svg_string = svg_path.read_text()
-    except FileNotFoundError:
-        # Figure out which part of the name is the problem to show a
-        # descriptive error message
-        icon_set, icon_name, variant = parse_icon_name(icon_name)
 
-        icon_set_dir = _icon_set_extraction_dir(icon_set)
+def _iter_icons_in_set(icon_set: str) -> t.Iterable[tuple[str, str | None]]:
+    """
+    Given the name of an icon set, list all icon names and variants in that
+    set. Raises a `KeyError` if no icon set with the given name has been
+    registered.
+    """
+    archive = _get_zip_archive(icon_set)
 
-        if not icon_set_dir.exists():
-            raise AssetError(
-                f"Unknown icon set `{icon_set}`. Known icon sets are: `{'`, `'.join(icon_set_archives.keys())}`"
-            ) from None
+    # Indexed archives can be listed without extracting anything
+    if archive is not None:
+        for member_name in archive.namelist():
+            # Only care for SVG files
+            if not member_name.endswith(".svg"):
+                continue
 
-        raise AssetError(
-            f"There is no icon named `{icon_name}` in the `{icon_set}` icon set"
-        ) from None
+            parts = member_name.split("/")
+
+            if len(parts) == 2:
+                yield parts[1].removesuffix(".svg"), None
+            elif len(parts) == 3:
+                yield parts[2].removesuffix(".svg"), parts[1]
 
-    # Cache the icon
-    cached_icons[icon_name] = svg_string
+        return
 
-    # Done
-    return svg_string
+    # Other archives are listed from the extracted files
+    for variant_name, path in _get_variant_directories(icon_set):
+        for icon_path in path.iterdir():
+            # Only care for SVG files
+            if icon_path.is_dir() or icon_path.suffix != ".svg":
+                continue
+
+            yield icon_path.stem, variant_name
 
 
 def _get_variant_directories(
@@ -232,8 +311,12 @@ def all_variants_in_set(icon_set: str) -> t.Iterable[str | None]:
     Given the name of an icon set, list the names of all variants in that
     set.
     """
-    for name, _ in _get_variant_directories(icon_set):
-        yield name
+    seen: set[str | None] = set()
+
+    for _, variant_name in _iter_icons_in_set(icon_set):
+        if variant_name not in seen:
+            seen.add(variant_name)
+            yield variant_name
 
 
 def all_icons_in_set(
@@ -250,24 +333,21 @@ def all_icons_in_set(
 
     `KeyError`: if there is not icon set or variant with the given name.
     """
-    # Find all available variants. This will also extract the icon set if
-    # necessary.
-    variants = dict(_get_variant_directories(icon_set))
+    # Find all icons. This will also extract the icon set if necessary.
+    icons = list(_iter_icons_in_set(icon_set))
 
-    # Apply the variant filter. Any `KeyError` is propagated.
+    # Apply the variant filter
     if variant is not None:
-        variants = {variant: variants[variant]}
+        icons = [
+            (icon_name, variant_name)
+            for icon_name, variant_name in icons
+            if variant_name == variant
+        ]
 
-    # Iterate over all variants
-    for variant_name, path in variants.items():
-        for icon_path in path.iterdir():
-            # Only care for SVG files
-            if icon_path.is_dir() or icon_path.suffix != ".svg":
-                continue
+        if not icons:
+            raise KeyError(variant)
 
-            # Yield
-            icon_name = icon_path.stem
-            yield icon_name, variant_name
+    yield from icons
 
 
 def register_icon_set(
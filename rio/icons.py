@@ -19,7 +19,7 @@ def register_icon_set(
 
     There must not already be a set with the given name.
 
-    The icon set is a `.tar.xz` compressed archive and must contain exactly one
+    The icon set is a `.zip` or `.tar.xz` archive and must contain exactly one
     directory, which must be named identically to the icon set. Files located in
     the root of that directory can be accessed as `"icon_set/icon_name"`. Files
     located in a subdirectory can be accessed as `"icon_set/icon_name:variant"`.
@@ -38,8 +38,8 @@ def register_icon_set(
     `set_name`: The name of the new icon set. This will be used to access
         the icons.
 
-    `set_archive_path`: The path to the `.tar.xz` archive containing the
-        icon set.
+    `set_archive_path`: The path to the `.zip` or `.tar.xz` archive
+        containing the icon set.
     """
     if set_name in icon_registry.icon_set_archives:
         raise ValueError(f"There is already an icon set named `{set_name}`")
@@ -0,0 +1,404 @@
+"""
+Serves downscaled and recompressed versions of raster images.
+
+`rio.Image` advertises a set of variants of its image, each at a different
+width, and lets the browser pick the one matching the image's size on screen.
+Variants are encoded in the most efficient format the browser supports (AVIF,
+WebP or JPEG) in a pool of worker threads, and kept in a bounded in-memory
+cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import concurrent.futures
+import io
+import logging
+import os
+import threading
+import typing as t
+from pathlib import Path
+
+import PIL.Image
+import PIL.ImageOps
+
+from . import assets
+
+__all__ = [
+    "VARIANT_WIDTHS",
+    "get_original_width",
+    "ImagePipeline",
+    "IMAGE_PIPELINE",
+]
+
+
+# The widths of the variants offered to the browser, in pixels. Only these
+# widths are generated, so that the number of variants per image is bounded.
+VARIANT_WIDTHS = (320, 640, 960, 1280, 1920, 2560, 3840)
+
+# Magic numbers of image formats which can be resized. Animated formats such
+# as GIF are deliberately excluded, since resizing them would lose the
+# animation.
+_RESIZABLE_SIGNATURES = (
+    b"\x89PNG\r\n\x1a\n",
+    b"\xff\xd8\xff",  # JPEG
+    b"BM",  # BMP
+    b"II*\x00",  # TIFF (little endian)
+    b"MM\x00*",  # TIFF (big endian)
+)
+
+_RESIZABLE_SUFFIXES = {
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".bmp",
+    ".tif",
+    ".tiff",
+    ".webp",
+}
+
+# Output formats, from most to least preferred, as (MIME type, Pillow format,
+# encoder options)
+_OUTPUT_FORMATS: list[tuple[str, str, dict[str, t.Any]]] = [
+    ("image/avif", "AVIF", {"quality": 60}),
+    ("image/webp", "WEBP", {"quality": 80, "method": 4}),
+    ("image/jpeg", "JPEG", {"quality": 82, "optimize": True}),
+]
+
+_MAX_CACHE_ENTRIES = 16 * 1024
+
+# The widths of images whose variants have been advertised, by asset id.
+# `None` if the image can't be read.
+_original_widths: collections.OrderedDict[str, int | None] = (
+    collections.OrderedDict()
+)
+
+# EXIF orientations which swap the image's width and height
+_TRANSPOSING_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def is_resizable(asset: assets.Asset) -> bool:
+    """
+    Returns whether the pipeline can create variants of the given asset.
+    """
+    if isinstance(asset, assets.BytesAsset):
+        return bytes(asset.data[:8]).startswith(_RESIZABLE_SIGNATURES) or (
+            asset.data[:4] == b"RIFF" and asset.data[8:12] == b"WEBP"
+        )
+
+    if isinstance(asset, assets.PathAsset):
+        return asset.path.suffix.lower() in _RESIZABLE_SUFFIXES
+
+    return False
+
+
+def _get_displayed_size(image: PIL.Image.Image) -> tuple[int, int]:
+    """
+    Returns the size of the image as it will be displayed, taking EXIF
+    rotation into account.
+    """
+    orientation = image.getexif().get(0x0112)
+    width, height = image.size
+
+    if orientation in _TRANSPOSING_ORIENTATIONS:
+        return height, width
+
+    return width, height
+
+
+def get_original_width(asset: assets.Asset) -> int | None:
+    """
+    Returns the displayed width of the (resizable) image, in pixels, or `None`
+    if it can't be read. Only the image's header is read, and the result is
+    cached.
+    """
+    assert isinstance(asset, (assets.BytesAsset, assets.PathAsset)), asset
+    key = asset.secret_id
+
+    try:
+        width = _original_widths[key]
+    except KeyError:
+        pass
+    else:
+        _original_widths.move_to_end(key)
+        return width
+
+    if isinstance(asset, assets.BytesAsset):
+        source = io.BytesIO(asset.data)
+    else:
+        source = asset.path
+
+    try:
+        with PIL.Image.open(source) as image:
+            width = _get_displayed_size(image)[0]
+    except (OSError, ValueError, PIL.Image.DecompressionBombError):
+        width = None
+
+    _original_widths[key] = width
+
+    if len(_original_widths) > _MAX_CACHE_ENTRIES:
+        _original_widths.popitem(last=False)
+
+    return width
+
+
+def _get_supported_formats() -> list[tuple[str, str, dict[str, t.Any]]]:
+    PIL.Image.init()
+
+    return [
+        output_format
+        for output_format in _OUTPUT_FORMATS
+        if output_format[1] in PIL.Image.SAVE
+    ]
+
+
+def choose_format(accept_header: str) -> str:
+    """
+    Returns the MIME type of the best output format which is supported by both
+    Pillow and the browser, based on the request's `Accept` header.
+    """
+    accepted = {
+        media_range.split(";")[0].strip().lower()
+        for media_range in accept_header.split(",")
+    }
+
+    for mime_type, _, _ in _get_supported_formats():
+        if mime_type in accepted or mime_type == "image/jpeg":
+            return mime_type
+
+    return "image/jpeg"
+
+
+def _encode_variant(
+    source: bytes | Path,
+    width: int,
+    mime_type: str,
+) -> tuple[bytes, str] | None:
+    """
+    Downscales the image to the given width and encodes it in the given
+    format. Returns `None` if the image is already at most that wide, in which
+    case the original should be served.
+
+    This is CPU heavy and should be run in a worker thread.
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)  # type: ignore
+
+    with PIL.Image.open(source) as image:
+        orientation = image.getexif().get(0x0112)
+        displayed_width, displayed_height = _get_displayed_size(image)
+
+        if displayed_width <= width:
+            return None
+
+        height = max(1, round(displayed_height * width / displayed_width))
+
+        # JPEGs can be decoded at a reduced size, which is much faster than
+        # decoding the full image and scaling it down afterwards
+        if orientation in _TRANSPOSING_ORIENTATIONS:
+            image.draft(image.mode, (height, width))
+        else:
+            image.draft(image.mode, (width, height))
+
+        transposed = PIL.ImageOps.exif_transpose(image)
+
+    has_alpha = transposed.mode in ("RGBA", "LA", "PA") or (
+        "transparency" in transposed.info
+    )
+    transposed = transposed.convert("RGBA" if has_alpha else "RGB")
+    resized = transposed.resize((width, height), PIL.Image.Resampling.LANCZOS)
+
+    # JPEG can't store transparency. Fall back to PNG in that case.
+    for candidate_mime_type, pil_format, options in _get_supported_formats():
+        if candidate_mime_type != mime_type:
+            continue
+
+        if has_alpha and pil_format == "JPEG":
+            break
+
+        result = io.BytesIO()
+        resized.save(result, format=pil_format, **options)
+        return result.getvalue(), candidate_mime_type
+
+    result = io.BytesIO()
+    resized.save(result, format="PNG", optimize=True)
+    return result.getvalue(), "image/png"
+
+
+class ImagePipeline:
+    """
+    Creates and caches downscaled variants of images.
+
+    ## Parameters
+
+    `max_cache_size`: The maximum combined size of all cached variants, in
+        bytes. Once exceeded, the least recently used variants are evicted.
+
+    `max_workers`: How many images can be encoded simultaneously. Defaults to
+        the number of CPU cores, up to a maximum of 4.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_cache_size: int = 64 * 1024 * 1024,
+        max_workers: int | None = None,
+    ) -> None:
+        self.max_cache_size = max_cache_size
+
+        if max_workers is None:
+            max_workers = min(4, os.cpu_count() or 1)
+
+        self.max_workers = max_workers
+
+        # Created when first needed, so importing rio doesn't spawn threads
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+        # Cached variants, ordered from least to most recently used. `None`
+        # means that the original image should be served.
+        self._cache: collections.OrderedDict[
+            tuple[str, int, str], tuple[bytes, str] | None
+        ] = collections.OrderedDict()
+        self._cache_size = 0
+
+        # Variants which are currently being encoded. Concurrent requests for
+        # the same variant share the result.
+        self._pending: dict[
+            tuple[str, int, str], asyncio.Future[tuple[bytes, str] | None]
+        ] = {}
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="rio-image-pipeline",
+                )
+
+            return self._executor
+
+    async def get_variant(
+        self,
+        asset: assets.HostedAsset,
+        width: int,
+        accept_header: str,
+    ) -> tuple[bytes, str] | None:
+        """
+        Returns the image data and MIME type of the variant of the asset with
+        the given width. Returns `None` if the original asset should be served
+        instead, e.g. because it isn't a resizable image, isn't any larger
+        than the requested width, or because the width isn't one of the
+        `VARIANT_WIDTHS`.
+        """
+        if width not in VARIANT_WIDTHS or not is_resizable(asset):
+            return None
+
+        mime_type = choose_format(accept_header)
+        key = (asset.secret_id, width, mime_type)
+
+        try:
+            result = self._cache[key]
+        except KeyError:
+            pass
+        else:
+            self._cache.move_to_end(key)
+            return result
+
+        # Is somebody else already encoding this variant?
+        future = self._pending.get(key)
+
+        if (
+            future is None
+            or future.get_loop() is not asyncio.get_running_loop()
+        ):
+            future = asyncio.ensure_future(
+                self._create_variant(key, asset, width, mime_type)
+            )
+            self._pending[key] = future
+
+            def forget_future(_: asyncio.Future) -> None:
+                if self._pending.get(key) is future:
+                    del self._pending[key]
+
+            future.add_done_callback(forget_future)
+
+        return await asyncio.shield(future)
+
+    async def _create_variant(
+        self,
+        key: tuple[str, int, str],
+        asset: assets.HostedAsset,
+        width: int,
+        mime_type: str,
+    ) -> tuple[bytes, str] | None:
+        # Files are read in the worker, so that the event loop doesn't block
+        if isinstance(asset, assets.PathAsset):
+            source = asset.path
+        else:
+            source = bytes(await asset.fetch_as_bytes())
+
+        loop = asyncio.get_running_loop()
+
+        try:
+            result = await loop.run_in_executor(
+                self._get_executor(),
+                _encode_variant,
+                source,
+                width,
+                mime_type,
+            )
+        except (OSError, ValueError, PIL.Image.DecompressionBombError) as error:
+            logging.warning(
+                f"Could not create a {width}px variant of {asset!r}, serving"
+                f" the original instead: {error}"
+            )
+            result = None
+
+        # If the variant ended up larger than the original, there's no point
+        # in serving it
+        if result is not None and isinstance(asset, assets.BytesAsset):
+            if len(result[0]) >= len(asset.data):
+                result = None
+
+        self._store(key, result)
+        return result
+
+    def _store(
+        self,
+        key: tuple[str, int, str],
+        result: tuple[bytes, str] | None,
+    ) -> None:
+        size = 0 if result is None else len(result[0])
+
+        if size > self.max_cache_size:
+            return
+
+        previous = self._cache.pop(key, None)
+        if previous is not None:
+            self._cache_size -= len(previous[0])
+
+        self._cache[key] = result
+        self._cache_size += size
+
+        # Entries that say "serve the original" take up (almost) no space, but
+        # shouldn't accumulate forever either, hence the limit on their count
+        while (
+            self._cache_size > self.max_cache_size
+            or len(self._cache) > _MAX_CACHE_ENTRIES
+        ):
+            _, evicted = self._cache.popitem(last=False)
+
+            if evicted is not None:
+                self._cache_size -= len(evicted[0])
+
+    def clear(self) -> None:
+        """
+        Removes all cached variants.
+        """
+        self._cache.clear()
+        self._cache_size = 0
+
+
+IMAGE_PIPELINE = ImagePipeline()
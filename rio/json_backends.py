@@ -0,0 +1,173 @@
+"""
+Encodes and decodes the JSON messages exchanged with the client.
+
+Every message the server sends (most notably the component states) has to be
+encoded as JSON, and every message the client sends has to be decoded. By
+default this is done by Python's built-in `json` module. Apps can instead opt
+into `orjson`, which does the same work considerably faster, via the
+`json_backend` parameter of `rio.App`.
+
+Both backends encode NumPy scalars and arrays as their plain Python
+equivalents, so components can be passed values straight from NumPy (or
+pandas) without converting them first.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import sys
+import typing as t
+
+from uniserde import Jsonable
+
+__all__ = [
+    "JsonBackend",
+    "JsonBackendName",
+    "STDLIB_JSON_BACKEND",
+    "get_json_backend",
+]
+
+
+JsonBackendName = t.Literal["stdlib", "orjson"]
+
+
+@dataclasses.dataclass(frozen=True)
+class JsonBackend:
+    """
+    A way of encoding and decoding JSON.
+
+    `dumps` must raise a `TypeError` if a value can't be encoded, and `loads`
+    must raise a `json.JSONDecodeError` if the input isn't valid JSON. That's
+    what the RPC layer expects.
+    """
+
+    name: str
+    dumps: t.Callable[[Jsonable], str]
+    loads: t.Callable[[str], Jsonable]
+
+
+# Maps types which the JSON encoders don't know about to functions converting
+# them into something they do know. Filled in as the types are encountered.
+_CONVERTERS: dict[type, t.Callable[[t.Any], Jsonable]] = {}
+
+
+def _find_converter(cls: type) -> t.Callable[[t.Any], Jsonable] | None:
+    # Only look for NumPy types if NumPy has actually been imported. Since
+    # this happens when a type is first encountered (rather than once), NumPy
+    # may be imported at any time, even after the app has started.
+    numpy = sys.modules.get("numpy")
+
+    if numpy is not None:
+        # Converting scalars to the equivalent Python type directly is much
+        # faster than going through `.item()`
+        for numpy_type, python_type in (
+            (numpy.floating, float),
+            (numpy.integer, int),
+            (numpy.bool_, bool),
+            (numpy.str_, str),
+        ):
+            if issubclass(cls, numpy_type):
+                return python_type
+
+        if issubclass(cls, numpy.generic):
+            return numpy.generic.item
+
+        if issubclass(cls, numpy.ndarray):
+            return numpy.ndarray.tolist
+
+    return None
+
+
+def _encode_special_types(obj: object) -> Jsonable:
+    """
+    Converts values which the JSON encoders don't know about. Called by the
+    encoders for every value they can't handle themselves.
+    """
+    cls = type(obj)
+
+    try:
+        converter = _CONVERTERS[cls]
+    except KeyError:
+        converter = _find_converter(cls)
+
+        if converter is None:
+            raise TypeError(
+                f"Can't serialize {obj!r} of type {cls} as JSON"
+            ) from None
+
+        _CONVERTERS[cls] = converter
+
+    return converter(obj)
+
+
+def _stdlib_dumps(data: Jsonable) -> str:
+    return json.dumps(data, default=_encode_special_types)
+
+
+STDLIB_JSON_BACKEND = JsonBackend(
+    name="stdlib",
+    dumps=_stdlib_dumps,
+    loads=json.loads,
+)
+
+
+def _create_orjson_backend() -> JsonBackend | None:
+    try:
+        import orjson  # type: ignore
+    except ImportError:
+        return None
+
+    # Component ids are used as keys, and must be converted to strings just
+    # like the built-in `json` module does
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(data: Jsonable) -> str:
+        return orjson.dumps(
+            data,
+            default=_encode_special_types,
+            option=options,
+        ).decode("utf-8")
+
+    # `orjson.JSONDecodeError` is a subclass of `json.JSONDecodeError`, and
+    # `orjson.JSONEncodeError` a subclass of `TypeError`, so no conversion is
+    # needed
+    return JsonBackend(name="orjson", dumps=dumps, loads=orjson.loads)
+
+
+_BACKEND_FACTORIES: dict[str, t.Callable[[], JsonBackend | None]] = {
+    "stdlib": lambda: STDLIB_JSON_BACKEND,
+    "orjson": _create_orjson_backend,
+}
+
+
+def get_json_backend(name: JsonBackendName) -> JsonBackend:
+    """
+    Returns the backend with the given name. If the libraries it requires
+    aren't installed, a warning is logged and the built-in `json` module is
+    used instead.
+
+    ## Raises
+
+    `ValueError`: If there is no backend with the given name.
+    """
+    try:
+        factory = _BACKEND_FACTORIES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown JSON backend {name!r}. Valid backends are:"
+            f" {', '.join(_BACKEND_FACTORIES)}"
+        ) from None
+
+    backend = factory()
+
+    if backend is None:
+        logging.warning(
+            f"The {name!r} JSON backend isn't available because `{name}` isn't"
+            f' installed. Run `pip install "rio-ui[fast-json]"` to install it.'
+            f" Falling back to Python's built-in `json` module."
+        )
+        return STDLIB_JSON_BACKEND
+
+    return backend
@@ -0,0 +1,314 @@
+"""
+Detects code which blocks the event loop.
+
+All sessions of an app share a single event loop. A slow synchronous event
+handler or `build` function therefore doesn't only freeze its own session, but
+every session on the server. The watchdog in this module runs in a separate
+thread, notices when the loop stops responding, and reports what was running at
+the time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import sys
+import threading
+import time
+import traceback
+import typing as t
+from pathlib import Path
+
+import rio
+
+__all__ = [
+    "LoopLagStats",
+    "LoopWatchdog",
+    "TrackedAwaitable",
+]
+
+
+T = t.TypeVar("T")
+
+
+# What the event loop is currently busy with. This is set by the session
+# whenever it calls user code, and read by the watchdog thread to attribute
+# blocking time. It is either
+#
+# - `None`: Nothing in particular (or something that isn't tracked)
+# - `(kind, obj)`: `kind` is a human readable description like "event handler"
+#   and `obj` is the function or component responsible.
+#
+# Only plain assignments are used, so no lock is necessary. Since many
+# coroutines take turns on the loop, this must only be set while the code in
+# question is actually running, i.e. never across an `await`.
+current_activity: tuple[str, object] | None = None
+
+
+class TrackedAwaitable(t.Generic[T]):
+    """
+    Wraps an awaitable, and sets `current_activity` to the given activity
+    whenever the awaitable runs. Time spent suspended, when other code is
+    running on the loop, isn't attributed to it.
+    """
+
+    def __init__(
+        self,
+        awaitable: t.Awaitable[T],
+        activity: tuple[str, object],
+    ) -> None:
+        self._awaitable = awaitable
+        self._activity = activity
+
+    def __await__(self) -> t.Generator[t.Any, t.Any, T]:
+        global current_activity
+
+        iterator = self._awaitable.__await__()
+        value_to_send: t.Any = None
+        error_to_throw: BaseException | None = None
+
+        while True:
+            # Run the awaitable until it suspends again
+            previous_activity = current_activity
+            current_activity = self._activity
+
+            try:
+                if error_to_throw is None:
+                    yielded = iterator.send(value_to_send)
+                else:
+                    yielded = iterator.throw(error_to_throw)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                current_activity = previous_activity
+
+            # Pass whatever it's waiting for on to the event loop
+            try:
+                value_to_send = yield yielded
+            except GeneratorExit:
+                iterator.close()  # type: ignore
+                raise
+            except BaseException as error:
+                value_to_send = None
+                error_to_throw = error
+            else:
+                error_to_throw = None
+
+
+def describe_activity(activity: tuple[str, object] | None) -> str:
+    """
+    Returns a human readable description of the given activity.
+
+    This is called from the watchdog thread and must therefore not access any
+    observable attributes, since that would interfere with the session's
+    dependency tracking.
+    """
+    if activity is None:
+        return "unknown code"
+
+    kind, obj = activity
+
+    if isinstance(obj, rio.Component):
+        return f"{kind} of `{type(obj).__qualname__}` (id {obj._id_})"
+
+    name = getattr(obj, "__qualname__", None) or type(obj).__qualname__
+    return f"{kind} `{name}`"
+
+
+@dataclasses.dataclass(frozen=True)
+class LoopLagStats:
+    """
+    Statistics about how often and for how long the event loop was blocked.
+
+    ## Attributes
+
+    `blocked_count`: How many times the loop was blocked for longer than the
+        watchdog's threshold.
+
+    `total_blocked_time`: The combined duration of all those blocks, in
+        seconds.
+
+    `max_blocked_time`: The duration of the longest block, in seconds.
+
+    `blocked_time_by_activity`: The combined duration of all blocks, in
+        seconds, grouped by whatever was running at the time.
+    """
+
+    blocked_count: int
+    total_blocked_time: float
+    max_blocked_time: float
+    blocked_time_by_activity: dict[str, float]
+
+
+class LoopWatchdog:
+    """
+    Monitors an event loop from a background thread and reports whenever it is
+    blocked for too long.
+
+    ## Parameters
+
+    `threshold`: How long (in seconds) the loop has to be unresponsive before
+        it's considered blocked.
+
+    `check_interval`: How often (in seconds) the loop is checked.
+
+    `warning_interval`: Warnings about the same activity are logged at most
+        this often (in seconds), to avoid flooding the log.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: float = 0.25,
+        check_interval: float = 0.1,
+        warning_interval: float = 10,
+    ) -> None:
+        self.threshold = threshold
+        self.check_interval = check_interval
+        self.warning_interval = warning_interval
+
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._stats_lock = threading.Lock()
+
+        self._blocked_count = 0
+        self._total_blocked_time = 0.0
+        self._max_blocked_time = 0.0
+        self._blocked_time_by_activity = dict[str, float]()
+        self._last_warning_times = dict[str, float]()
+
+    def start(self) -> None:
+        """
+        Starts monitoring the running event loop. Must be called from within
+        the loop.
+        """
+        if self._thread is not None:
+            if not self._stop_event.is_set():
+                return
+
+            # The thread of a previous run may still be winding down. Wait for
+            # it, so there's never more than one watchdog at a time.
+            self._thread.join()
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(asyncio.get_running_loop(), threading.get_ident()),
+            name="Rio event loop watchdog",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops monitoring. This doesn't wait for the watchdog thread to exit.
+        """
+        self._stop_event.set()
+
+    def stats(self) -> LoopLagStats:
+        """
+        Returns statistics about all blocks detected so far.
+        """
+        with self._stats_lock:
+            return LoopLagStats(
+                blocked_count=self._blocked_count,
+                total_blocked_time=self._total_blocked_time,
+                max_blocked_time=self._max_blocked_time,
+                blocked_time_by_activity=dict(self._blocked_time_by_activity),
+            )
+
+    def _run(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        loop_thread_id: int,
+    ) -> None:
+        while not self._stop_event.wait(self.check_interval):
+            responded = threading.Event()
+            started_at = time.monotonic()
+
+            try:
+                loop.call_soon_threadsafe(responded.set)
+            except RuntimeError:
+                # The loop has been closed
+                return
+
+            if responded.wait(self.threshold):
+                continue
+
+            # The loop is blocked. Find out what it's doing *now*, while the
+            # offending code is still running.
+            activity = describe_activity(current_activity)
+            frame = sys._current_frames().get(loop_thread_id)
+
+            if frame is None:
+                stack = []
+            else:
+                stack = traceback.extract_stack(frame)
+
+            # Wait until the loop responds again, so the duration is known
+            while not responded.wait(self.check_interval):
+                if self._stop_event.is_set():
+                    return
+
+            self._report(activity, time.monotonic() - started_at, stack)
+
+    def _report(
+        self,
+        activity: str,
+        duration: float,
+        stack: traceback.StackSummary | list[traceback.FrameSummary],
+    ) -> None:
+        with self._stats_lock:
+            self._blocked_count += 1
+            self._total_blocked_time += duration
+            self._max_blocked_time = max(self._max_blocked_time, duration)
+            self._blocked_time_by_activity[activity] = (
+                self._blocked_time_by_activity.get(activity, 0) + duration
+            )
+
+            # Don't flood the log if the same thing keeps happening
+            now = time.monotonic()
+            last_warning_time = self._last_warning_times.get(activity)
+
+            if (
+                last_warning_time is not None
+                and now - last_warning_time < self.warning_interval
+            ):
+                return
+
+            self._last_warning_times[activity] = now
+
+        # Point at the innermost frame that isn't part of the standard library
+        # or Rio itself, since that's most likely the culprit
+        location = ""
+        for frame_summary in reversed(stack):
+            if _is_user_code(frame_summary.filename):
+                location = (
+                    f" (at {frame_summary.filename}:{frame_summary.lineno})"
+                )
+                break
+
+        rio._logger.warning(
+            f"The event loop was blocked for {duration:.2f}s by"
+            f" {activity}{location}. No other session could be served in the"
+            f" meantime. Consider making the code `async`, or decorate"
+            f" synchronous event handlers with `@rio.event.run_in_thread`."
+        )
+
+        if stack:
+            rio._logger.debug(
+                "Stack of the blocked event loop:\n"
+                + "".join(traceback.format_list(stack))
+            )
+
+
+_NON_USER_CODE_DIRS = (
+    str(Path(rio.__file__).parent),
+    sys.prefix,
+    sys.base_prefix,
+    sys.exec_prefix,
+)
+
+
+def _is_user_code(file_name: str) -> bool:
+    return not file_name.startswith(_NON_USER_CODE_DIRS)
@@ -0,0 +1,355 @@
+"""
+Renders Markdown and highlights source code on the server.
+
+By default `rio.Markdown` and `rio.CodeBlock` are rendered by every client.
+Apps with `render_markdown_on_server=True` instead render them once, on the
+server, and send the resulting HTML. Since the same texts are typically
+displayed to many users, the HTML is kept in an app-wide cache, keyed by a
+hash of the input.
+
+The generated HTML matches what the client would have produced: Raw HTML in
+the Markdown source is escaped rather than passed through, unsafe link targets
+(such as `javascript:` URLs) are dropped, and highlighted code uses the same
+CSS classes as the client's highlighter.
+
+All of this requires `markdown-it-py` and `Pygments` to be installed. If they
+aren't available, the clients render the text themselves, as usual.
+"""
+
+from __future__ import annotations
+
+import collections
+import hashlib
+import html
+import logging
+import typing as t
+
+__all__ = [
+    "MarkdownRenderer",
+    "MARKDOWN_RENDERER",
+]
+
+
+# Languages that the client's highlighter doesn't recognize either, but treats
+# as plain text
+_LANGUAGE_ALIASES = {
+    "none": "text",
+    "null": "text",
+    "plain": "text",
+    "plaintext": "text",
+}
+
+# Maps Pygments token types to the CSS classes of highlight.js, which the
+# client's stylesheets are written for. Token types that aren't listed here
+# use the class of their closest listed parent, if any.
+_TOKEN_CLASSES = {
+    ("Comment",): "hljs-comment",
+    ("Comment", "Preproc"): "hljs-meta",
+    ("Comment", "PreprocFile"): "hljs-string",
+    ("Keyword",): "hljs-keyword",
+    ("Keyword", "Constant"): "hljs-literal",
+    ("Keyword", "Type"): "hljs-type",
+    ("Name", "Attribute"): "hljs-attr",
+    ("Name", "Builtin"): "hljs-built_in",
+    ("Name", "Builtin", "Pseudo"): "hljs-variable language_",
+    ("Name", "Class"): "hljs-title class_",
+    ("Name", "Constant"): "hljs-variable constant_",
+    ("Name", "Decorator"): "hljs-meta",
+    ("Name", "Entity"): "hljs-symbol",
+    ("Name", "Exception"): "hljs-title class_",
+    ("Name", "Function"): "hljs-title function_",
+    ("Name", "Label"): "hljs-symbol",
+    ("Name", "Tag"): "hljs-name",
+    ("Name", "Variable"): "hljs-variable",
+    ("Literal",): "hljs-literal",
+    ("Literal", "Number"): "hljs-number",
+    ("Literal", "String"): "hljs-string",
+    ("Literal", "String", "Escape"): "hljs-char escape_",
+    ("Literal", "String", "Interpol"): "hljs-subst",
+    ("Literal", "String", "Regex"): "hljs-regexp",
+    ("Literal", "String", "Symbol"): "hljs-symbol",
+    ("Operator",): "hljs-operator",
+    ("Operator", "Word"): "hljs-keyword",
+    ("Generic", "Deleted"): "hljs-deletion",
+    ("Generic", "Emph"): "hljs-emphasis",
+    ("Generic", "Heading"): "hljs-section",
+    ("Generic", "Inserted"): "hljs-addition",
+    ("Generic", "Strong"): "hljs-strong",
+    ("Generic", "Subheading"): "hljs-section",
+}
+
+_warned_about_missing_dependencies = False
+
+
+def _renderer_is_available() -> bool:
+    """
+    Returns whether `markdown-it-py` and `Pygments` are installed. Warns once
+    if they aren't.
+    """
+    global _warned_about_missing_dependencies
+
+    try:
+        import markdown_it  # type: ignore  # noqa: F401
+        import pygments  # type: ignore  # noqa: F401
+    except ImportError:
+        if not _warned_about_missing_dependencies:
+            _warned_about_missing_dependencies = True
+            logging.warning(
+                "Markdown is rendered by the clients because `markdown-it-py`"
+                " and `Pygments` aren't installed. Run"
+                """ `pip install "rio-ui[markdown]"` to render it on the"""
+                " server."
+            )
+
+        return False
+
+    return True
+
+
+def _strip_code(code: str) -> str:
+    """
+    Strips empty leading lines and any trailing whitespace from the code, just
+    like the client does. Leading whitespace on the first line is kept, so the
+    indentation stays intact.
+    """
+    return code.lstrip("\n").rstrip()
+
+
+def _find_lexer(language: str) -> t.Any | None:
+    """
+    Returns the Pygments lexer for the given language, or `None` if the
+    language isn't known.
+    """
+    import pygments.lexers
+    import pygments.util
+
+    language = _LANGUAGE_ALIASES.get(language.lower(), language)
+
+    try:
+        return pygments.lexers.get_lexer_by_name(language)
+    except pygments.util.ClassNotFound:
+        return None
+
+
+def _get_lexer(language: str | None, code: str) -> t.Any:
+    """
+    Returns the Pygments lexer for the given language. If the language is
+    `None` or unknown, it is guessed from the code.
+    """
+    import pygments.lexers
+    import pygments.util
+
+    if language is not None:
+        lexer = _find_lexer(language)
+
+        if lexer is not None:
+            return lexer
+
+    try:
+        return pygments.lexers.guess_lexer(code)
+    except pygments.util.ClassNotFound:
+        return pygments.lexers.get_lexer_by_name("text")
+
+
+def _optional_key(value: str | None) -> str:
+    # Distinguishes `None` from every string, including the empty one
+    return "" if value is None else f"={value}"
+
+
+def _get_token_class(token_type: t.Any) -> str | None:
+    while token_type:
+        try:
+            return _TOKEN_CLASSES[tuple(token_type)]
+        except KeyError:
+            token_type = token_type.parent
+
+    return None
+
+
+def _highlight(code: str, lexer: t.Any) -> str:
+    """
+    Highlights the code, returning HTML with the same CSS classes as the
+    client's highlighter would use.
+    """
+    chunks: list[str] = []
+    current_class: str | None = None
+    current_text: list[str] = []
+
+    def flush() -> None:
+        text = html.escape("".join(current_text), quote=False)
+
+        if current_class is None:
+            chunks.append(text)
+        else:
+            chunks.append(f'<span class="{current_class}">{text}</span>')
+
+    # Adjacent tokens with the same class are merged into a single element
+    for token_type, value in lexer.get_tokens(code):
+        css_class = _get_token_class(token_type)
+
+        if css_class != current_class and current_text:
+            flush()
+            current_text.clear()
+
+        current_class = css_class
+        current_text.append(value)
+
+    if current_text:
+        flush()
+
+    # Pygments always ends the output with a newline
+    return "".join(chunks).removesuffix("\n")
+
+
+def _get_language_name(lexer: t.Any) -> str:
+    # Plain text isn't worth a label
+    if lexer.name == "Text only":
+        return ""
+
+    return lexer.name
+
+
+def _create_markdown_parser() -> t.Any:
+    import markdown_it
+
+    # Like the client, stick to CommonMark, and escape any raw HTML
+    parser = markdown_it.MarkdownIt("commonmark", {"html": False})
+
+    def render_code_block(self, tokens, idx, options, env) -> str:
+        token = tokens[idx]
+        language = token.info.strip().split(maxsplit=1)[0] if token.info else ""
+        code = _strip_code(token.content)
+        lexer = _get_lexer(language or env["default_language"], code)
+
+        return (
+            f'<pre data-language-name="{html.escape(_get_language_name(lexer))}">'
+            f"{_highlight(code, lexer)}</pre>\n"
+        )
+
+    def render_code_inline(self, tokens, idx, options, env) -> str:
+        code = tokens[idx].content
+        default_language = env["default_language"]
+
+        # Inline code is too short to reliably guess its language, so it's only
+        # highlighted if a (known) default language was given
+        if default_language is not None:
+            lexer = _find_lexer(default_language)
+
+            if lexer is not None:
+                return f"<code>{_highlight(code, lexer)}</code>"
+
+        return f"<code>{html.escape(code, quote=False)}</code>"
+
+    parser.add_render_rule("fence", render_code_block)
+    parser.add_render_rule("code_block", render_code_block)
+    parser.add_render_rule("code_inline", render_code_inline)
+
+    return parser
+
+
+class MarkdownRenderer:
+    """
+    Renders Markdown and source code to HTML, and caches the results.
+
+    The cache is bounded by the total size of the HTML it holds. Once that's
+    exceeded, the least recently used results are evicted.
+    """
+
+    def __init__(self, *, max_cache_size: int = 32 * 1024 * 1024) -> None:
+        self.max_cache_size = max_cache_size
+
+        # Created when first needed, so importing rio doesn't import the
+        # optional dependencies
+        self._markdown_parser: t.Any = None
+
+        # Rendered HTML, ordered from least to most recently used
+        self._cache: collections.OrderedDict[str, tuple[str, str]] = (
+            collections.OrderedDict()
+        )
+        self._cache_size = 0
+
+    def _get_cached(
+        self,
+        key_parts: tuple[str, ...],
+        render: t.Callable[[], tuple[str, str]],
+    ) -> tuple[str, str]:
+        hasher = hashlib.sha256()
+
+        for part in key_parts:
+            hasher.update(part.encode("utf-8", "surrogatepass"))
+            hasher.update(b"\0")
+
+        key = hasher.hexdigest()
+
+        try:
+            result = self._cache[key]
+        except KeyError:
+            pass
+        else:
+            self._cache.move_to_end(key)
+            return result
+
+        result = render()
+        self._cache[key] = result
+        self._cache_size += len(result[0])
+
+        while self._cache_size > self.max_cache_size and len(self._cache) > 1:
+            _, (evicted_html, _) = self._cache.popitem(last=False)
+            self._cache_size -= len(evicted_html)
+
+        return result
+
+    def render_markdown(
+        self,
+        text: str,
+        default_language: str | None,
+    ) -> str | None:
+        """
+        Converts the Markdown text to HTML. Code blocks are highlighted and
+        become `<pre>` elements, with the name of their language in the
+        `data-language-name` attribute.
+
+        Returns `None` if the required dependencies aren't installed.
+        """
+        if not _renderer_is_available():
+            return None
+
+        def render() -> tuple[str, str]:
+            if self._markdown_parser is None:
+                self._markdown_parser = _create_markdown_parser()
+
+            result = self._markdown_parser.render(
+                text,
+                {"default_language": default_language},
+            )
+            return result, ""
+
+        return self._get_cached(
+            ("markdown", _optional_key(default_language), text),
+            render,
+        )[0]
+
+    def render_code(
+        self,
+        code: str,
+        language: str | None,
+    ) -> tuple[str, str] | None:
+        """
+        Highlights the code. Returns the resulting HTML, and the name of the
+        language to display. If no language is given, it is guessed.
+
+        Returns `None` if the required dependencies aren't installed.
+        """
+        if not _renderer_is_available():
+            return None
+
+        def render() -> tuple[str, str]:
+            stripped_code = _strip_code(code)
+            lexer = _get_lexer(language, stripped_code)
+
+            return _highlight(stripped_code, lexer), _get_language_name(lexer)
+
+        return self._get_cached(("code", _optional_key(language), code), render)
+
+
+MARKDOWN_RENDERER = MarkdownRenderer()
@@ -22,8 +22,6 @@ if t.TYPE_CHECKING:
 
 _IS_INITIALIZED = False
 
-T = t.TypeVar("T")
-
 
 FLOAT_TYPES = ()
 INT_TYPES = ()
@@ -36,10 +34,6 @@ PLOTLY_GRAPH_TYPES: tuple[type[plotly.graph_objects.Figure], ...] = ()
 MATPLOTLIB_GRAPH_TYPES: tuple[type, ...] = ()
 MATPLOTLIB_AXES_TYPES: tuple[type[matplotlib.axes.Axes], ...] = ()
 
-# This is a mapping of "weird" types to the "canonical" type, like `{np.int8:
-# int}`
-TYPE_NORMALIZERS: dict[type[T], t.Callable[[T], T]] = {}  # type: ignore
-
 
 def initialize(force: bool = False) -> None:
     """
@@ -96,13 +90,3 @@ def initialize(force: bool = False) -> None:
         MATPLOTLIB_GRAPH_TYPES = (
             matplotlib.figure.Figure,
         ) + MATPLOTLIB_AXES_TYPES
-
-    # Populate our mapping of type normalizers
-    for canonical_type, weird_types in (
-        (str, STR_TYPES),
-        (bool, BOOL_TYPES),
-        (int, INT_TYPES),
-        (float, FLOAT_TYPES),
-    ):
-        for weird_type in weird_types:
-            TYPE_NORMALIZERS[weird_type] = canonical_type  # type: ignore
@@ -23,13 +23,24 @@ class ObservableContainer:
         self._affected_sessions: set[rio.Session] = set()
 
     def _mark_as_accessed(self):
-        if global_state.currently_building_session is None:
+        if (
+            global_state.currently_building_session is None
+            or global_state.handler_thread_state.event_loop is not None
+        ):
             return
 
         global_state.accessed_objects.add(self)
         self._affected_sessions.add(global_state.currently_building_session)
 
     def _mark_as_changed(self) -> None:
+        # Event handlers running in worker threads must leave the sessions'
+        # bookkeeping to the event loop
+        loop = global_state.handler_thread_state.event_loop
+
+        if loop is not None:
+            loop.call_soon_threadsafe(self._mark_as_changed)
+            return
+
         for session in self._affected_sessions:
             session._changed_objects.add(self)
             session._refresh_required_event.set()
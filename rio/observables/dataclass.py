@@ -181,6 +181,7 @@ class DataclassProperty(ObservableProperty["Dataclass"]):
         if (
             global_state.currently_building_session is not None
             and instance is not None
+            and global_state.handler_thread_state.event_loop is None
         ):
             self._affected_sessions.add(global_state.currently_building_session)
 
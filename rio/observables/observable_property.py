@@ -83,7 +83,14 @@ class ObservableProperty(abc.ABC, t.Generic[T]):
         if instance is None:
             return self
 
-        global_state.accessed_attributes[instance].add(self.name)
+        # Keep track of which attributes `build` functions depend on. Event
+        # handlers running in worker threads are never part of a build, even if
+        # the event loop happens to be building something at the same time.
+        if (
+            global_state.currently_building_session is not None
+            and global_state.handler_thread_state.event_loop is None
+        ):
+            global_state.accessed_attributes[instance].add(self.name)
 
         # Otherwise get the value assigned to the property in the component
         # instance
@@ -100,6 +107,14 @@ class ObservableProperty(abc.ABC, t.Generic[T]):
         return value
 
     def _on_value_change(self, instance: T, /) -> None:
+        # Event handlers running in worker threads must leave the sessions'
+        # bookkeeping to the event loop
+        loop = global_state.handler_thread_state.event_loop
+
+        if loop is not None:
+            loop.call_soon_threadsafe(self._on_value_change, instance)
+            return
+
         for session in self._get_affected_sessions(instance):
             session._changed_attributes[instance].add(self.name)
             session._refresh_required_event.set()
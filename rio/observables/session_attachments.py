@@ -23,18 +23,33 @@ class SessionAttachments:
         return typ in self._attachments
 
     def __getitem__(self, typ: type[T]) -> T:
-        global_state.accessed_items[self._session].add(typ)
+        if (
+            global_state.currently_building_session is not None
+            and global_state.handler_thread_state.event_loop is None
+        ):
+            global_state.accessed_items[self._session].add(typ)
 
         try:
             return self._attachments[typ]  # type: ignore
         except KeyError:
             raise KeyError(typ) from None
 
+    def _mark_as_changed(self, typ: type) -> None:
+        # Event handlers running in worker threads must leave the session's
+        # bookkeeping to the event loop
+        loop = global_state.handler_thread_state.event_loop
+
+        if loop is not None:
+            loop.call_soon_threadsafe(self._mark_as_changed, typ)
+            return
+
+        self._session._changed_items[self._session].add(typ)
+        self._session._refresh_required_event.set()
+
     def _add(self, value: object, synchronize: bool) -> None:
         cls = type(value)
 
-        self._session._changed_items[self._session].add(cls)
-        self._session._refresh_required_event.set()
+        self._mark_as_changed(cls)
 
         # If the value isn't a UserSettings instance, just assign it and we're
         # done
@@ -78,8 +93,7 @@ class SessionAttachments:
         # Remove the attachment, propagating any `KeyError`
         old_value = self._attachments.pop(typ)
 
-        self._session._changed_items[self._session].add(typ)
-        self._session._refresh_required_event.set()
+        self._mark_as_changed(typ)
 
         # User settings need special care
         if not isinstance(old_value, user_settings_module.UserSettings):
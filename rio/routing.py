@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import abc
+import ast
+import asyncio
+import collections
 import dataclasses
 import functools
 import logging
+import threading
 import typing as t
 import warnings
 from pathlib import Path
@@ -194,6 +198,19 @@ class ComponentPage:
         The callback should return `None` if the user is allowed to access
         the page, or a string or `rio.URL` if the user should be redirected
         to a different page.
+
+    `keep_alive`: Whether `PageView`s with `keep_alive` enabled may keep this
+        page around after navigating away from it. Set this to `False` for
+        pages which should always be built from scratch, e.g. because they
+        display data that must be current.
+
+    `prefetch`: What Rio may do ahead of time when the user is likely to visit
+        this page soon, e.g. because they're hovering over a `rio.Link` to it.
+        With `"build"` (the default), the page's guard is called and its
+        components are built, except for any components with `on_populate`
+        handlers. `"populate"` also builds those components, which runs their
+        `on_populate` handlers even if the user never actually visits the
+        page. `"never"` disables prefetching for this page.
     """
 
     name: str
@@ -206,6 +223,8 @@ class ComponentPage:
     )
     guard: t.Callable[[rio.GuardEvent], None | rio.URL | str] | None = None
     meta_tags: dict[str, str] = dataclasses.field(default_factory=dict)
+    keep_alive: bool = True
+    prefetch: t.Literal["never", "build", "populate"] = "build"
 
     # This is used to allow users to order pages when using the `rio.page`
     # decorator. It's not public, but simply a convenient place to store this.
@@ -224,6 +243,14 @@ class ComponentPage:
         # Verify and parse the URL
         vars(self)["_url_pattern"] = url_pattern.UrlPattern(self.url_segment)
 
+        # Pages which haven't been imported yet don't have a `build` function
+        # to inspect. Their parsers are fetched once they are imported.
+        if isinstance(self.build, _LazyPageBuild):
+            vars(self)["_url_parameter_parsers"] = _LazyUrlParameterParsers(
+                self.build.module
+            )
+            return
+
         # Verify the `build` function and prepare the parsers for the URL
         # parameters
         try:
@@ -463,9 +490,197 @@ def _get_parser_for_annotation(
     ) from None
 
 
+class RoutingTable:
+    """
+    Finds the pages matching a URL path, without trying every page in turn.
+
+    Pages are indexed by the first segment of their URL pattern. Looking up a
+    path only tests the pages whose first segment is the same as the path's,
+    plus any pages whose first segment is a path parameter. Candidates are
+    still tested in the order they were defined in, so the result is the same
+    as when testing all pages one after another. Child pages are compiled into
+    tables of their own, when they're first needed.
+
+    Results are memoized per path, since the same URLs tend to be visited over
+    and over again.
+    """
+
+    def __init__(
+        self,
+        pages: t.Iterable[ComponentPage | Redirect],
+        *,
+        max_cached_paths: int = 1024,
+    ) -> None:
+        self.pages = list(pages)
+        self.max_cached_paths = max_cached_paths
+
+        # Maps lowercase first segments to the indices of the pages starting
+        # with them. Matching is case insensitive.
+        self._pages_by_first_segment: dict[str, list[int]] = {}
+
+        # The indices of pages which can't be found by their first segment,
+        # because it is a path parameter (or contains non-ASCII characters,
+        # whose case-insensitive comparison is best left to the regex engine)
+        self._dynamic_pages: list[int] = []
+
+        for index, page in enumerate(self.pages):
+            first_segment = page.url_segment.partition("/")[0]
+
+            if first_segment.startswith("{") or not first_segment.isascii():
+                self._dynamic_pages.append(index)
+            else:
+                self._pages_by_first_segment.setdefault(
+                    first_segment.lower(), []
+                ).append(index)
+
+        self._cached_matches: collections.OrderedDict[
+            str, tuple[tuple[ComponentPage | Redirect, dict[str, object]], ...]
+        ] = collections.OrderedDict()
+
+    def is_compiled_from(
+        self,
+        pages: t.Sequence[ComponentPage | Redirect],
+    ) -> bool:
+        """
+        Returns whether this table was compiled from exactly these pages, in
+        this order.
+        """
+        # Pages only compare equal to themselves, so this is a cheap identity
+        # check
+        if not isinstance(pages, list):
+            pages = list(pages)
+
+        return pages == self.pages
+
+    def match(
+        self,
+        path: str,
+    ) -> list[tuple[ComponentPage | Redirect, dict[str, object]]]:
+        """
+        Returns the pages that would be active when navigating to the given
+        path, along with the path arguments for each of them. The path must
+        not start with a slash.
+        """
+        try:
+            matches = self._cached_matches[path]
+        except KeyError:
+            matches = tuple(self._match_uncached(path))
+
+            self._cached_matches[path] = matches
+
+            if len(self._cached_matches) > self.max_cached_paths:
+                self._cached_matches.popitem(last=False)
+        else:
+            self._cached_matches.move_to_end(path)
+
+        # Hand out copies, so callers can't modify the cached results
+        return [
+            (page, dict(path_arguments)) for page, path_arguments in matches
+        ]
+
+    def _candidates(self, path: str) -> t.Iterable[int]:
+        first_segment = path.partition("/")[0]
+
+        if not first_segment.isascii():
+            return range(len(self.pages))
+
+        static_pages = self._pages_by_first_segment.get(
+            first_segment.lower(), []
+        )
+
+        if not self._dynamic_pages:
+            return static_pages
+
+        if not static_pages:
+            return self._dynamic_pages
+
+        return sorted(static_pages + self._dynamic_pages)
+
+    def _match_uncached(
+        self,
+        path: str,
+    ) -> list[tuple[ComponentPage | Redirect, dict[str, object]]]:
+        assert not path.startswith("/"), path
+
+        # Get the first matching page
+        for index in self._candidates(path):
+            page = self.pages[index]
+
+            did_match, raw_path_arguments, remainder = page._url_pattern.match(
+                path
+            )
+
+            if not did_match:
+                continue
+
+            # Try parsing the path arguments
+            if isinstance(page, ComponentPage):
+                try:
+                    path_arguments = {
+                        name: page._url_parameter_parsers[name].parse(value)
+                        for name, value in raw_path_arguments.items()
+                    }
+                except ValueError:
+                    continue
+
+            else:
+                path_arguments = raw_path_arguments
+
+            break
+
+        # No matching page found
+        else:
+            return []
+
+        # Remember this page
+        path_arguments = t.cast(dict[str, object], path_arguments)
+        active_pages: list[
+            tuple[ComponentPage | Redirect, dict[str, object]]
+        ] = [
+            (page, path_arguments),
+        ]
+
+        # Recurse into the children
+        if isinstance(page, ComponentPage) and page.children:
+            active_pages += _get_routing_table(page.children)._match_uncached(
+                remainder
+            )
+
+        return active_pages
+
+
+# Compiled routing tables, keyed by the `id` of the page sequence they were
+# compiled from. Since ids can be reused, and lists can be modified in place,
+# each table is double-checked against the pages before it is used.
+_ROUTING_TABLES: collections.OrderedDict[int, RoutingTable] = (
+    collections.OrderedDict()
+)
+_MAX_ROUTING_TABLES = 64
+
+
+def _get_routing_table(
+    pages: t.Sequence[ComponentPage | Redirect],
+) -> RoutingTable:
+    """
+    Returns a routing table for the given pages, compiling it if necessary.
+    """
+    key = id(pages)
+    table = _ROUTING_TABLES.get(key)
+
+    if table is None or not table.is_compiled_from(pages):
+        table = RoutingTable(pages)
+        _ROUTING_TABLES[key] = table
+
+        if len(_ROUTING_TABLES) > _MAX_ROUTING_TABLES:
+            _ROUTING_TABLES.popitem(last=False)
+
+    _ROUTING_TABLES.move_to_end(key)
+    return table
+
+
 def _get_active_page_instances(
     *,
-    available_pages: t.Iterable[rio.ComponentPage | rio.Redirect],
+    available_pages: t.Sequence[rio.ComponentPage | rio.Redirect],
     remaining_path: str,
 ) -> list[
     tuple[
@@ -480,54 +695,12 @@ def _get_active_page_instances(
     - Page (ComponentPage / Redirect) that would be active
     - The path arguments passed to that page
 
-    The path is a string rather than URL, so matching can be done efficiently
-    and the function can recurse on it. The path string must not start with a
-    slash.
+    The path is a string rather than URL, so matching can be done efficiently.
+    The path string must not start with a slash.
     """
     assert not remaining_path.startswith("/"), remaining_path
 
-    # Get the first matching page
-    for page in available_pages:
-        did_match, raw_path_arguments, remainder = page._url_pattern.match(
-            remaining_path
-        )
-
-        if not did_match:
-            continue
-
-        # Try parsing the path arguments
-        if isinstance(page, rio.ComponentPage):
-            try:
-                path_arguments = {
-                    name: page._url_parameter_parsers[name].parse(value)
-                    for name, value in raw_path_arguments.items()
-                }
-            except ValueError:
-                continue
-
-        else:
-            path_arguments = raw_path_arguments
-
-        break
-
-    # No matching page found
-    else:
-        return []
-
-    # Remember this page
-    path_arguments = t.cast(dict[str, object], path_arguments)
-    active_pages = [
-        (page, path_arguments),
-    ]
-
-    # Recurse into the children
-    if isinstance(page, rio.ComponentPage):
-        active_pages += _get_active_page_instances(
-            available_pages=page.children,
-            remaining_path=remainder,
-        )
-
-    return active_pages
+    return _get_routing_table(available_pages).match(remaining_path)
 
 
 @t.final
@@ -730,6 +903,8 @@ def page(
     guard: t.Callable[[GuardEvent], None | rio.URL | str] | None = None,
     meta_tags: dict[str, str] | None = None,
     order: int | None = None,
+    keep_alive: bool = True,
+    prefetch: t.Literal["never", "build", "populate"] = "build",
 ) -> t.Callable[[C], C]:
     """
     This decorator creates a page (complete with URL, icon, etc) that displays
@@ -785,6 +960,12 @@ def page(
 
     `order`: An int that controls the order of this page relative to its
         siblings. Similar to the `name`, this is relevant for navigation bars.
+
+    `keep_alive`: Whether `PageView`s with `keep_alive` enabled may keep this
+        page around after navigating away from it.
+
+    `prefetch`: What Rio may do ahead of time when the user is likely to visit
+        this page soon. See `rio.ComponentPage` for details.
     """
 
     def decorator(build: C) -> C:
@@ -808,6 +989,8 @@ def page(
             icon=icon,
             guard=guard,
             meta_tags=meta_tags or {},
+            keep_alive=keep_alive,
+            prefetch=prefetch,
         )
 
         # The component page has a field specifically so this decorator can
@@ -840,9 +1023,20 @@ def auto_detect_pages(
     directory: Path,
     *,
     package: str | None = None,
+    lazy: bool = False,
 ) -> list[rio.ComponentPage]:
+    """
+    Creates pages for all python files in the given directory, and their
+    sub-pages for any sub-directories.
+
+    If `lazy` is `True`, the files aren't imported right away. Instead, the
+    page's name, URL segment etc. are read from the `@rio.page` decorator
+    without executing any code, and the file is only imported once the page
+    is needed. Files which can't be analyzed this way are imported right
+    away.
+    """
     # Find all pages using the iterator method
-    pages = _auto_detect_pages_iter(directory, package=package)
+    pages = _auto_detect_pages_iter(directory, package=package, lazy=lazy)
 
     # Sort them, ignoring any user-specified ordering for now
     pages = sorted(pages, key=_page_sort_key)
@@ -859,6 +1053,7 @@ def _auto_detect_pages_iter(
     directory: Path,
     *,
     package: str | None = None,
+    lazy: bool = False,
 ) -> t.Iterable[rio.ComponentPage]:
     try:
         contents = list(directory.iterdir())
@@ -872,16 +1067,47 @@ def _auto_detect_pages_iter(
         ):
             continue
 
-        yield _page_from_python_file(file_path, package)
+        yield _page_from_python_file(file_path, package, lazy=lazy)
 
 
 def _page_from_python_file(
-    file_path: Path, package: str | None
+    file_path: Path,
+    package: str | None,
+    *,
+    lazy: bool = False,
 ) -> ComponentPage:
     module_name = file_path.stem
     if package is not None:
         module_name = package + "." + module_name
 
+    page = None
+
+    if lazy:
+        page = _lazy_page_from_python_file(file_path, module_name)
+
+    if page is None:
+        page = _import_page_from_python_file(file_path, module_name)
+
+    # Add sub-pages, if any
+    sub_pages = t.cast(list, page.children)
+    sub_pages.clear()  # Avoid duplicate entries if this function is called twice
+    sub_pages += auto_detect_pages(
+        file_path.with_suffix(""),
+        package=module_name,
+        lazy=lazy,
+    )
+
+    return page
+
+
+def _import_page_from_python_file(
+    file_path: Path,
+    module_name: str,
+) -> ComponentPage:
+    """
+    Imports the given file and returns the page defined in it. If that isn't
+    possible, a page displaying an error is returned instead.
+    """
     try:
         module = path_imports.import_from_path(
             file_path,
@@ -946,17 +1172,225 @@ def _page_from_python_file(
                 error_details="No component in this file was decorated with `@rio.page(...)`",
             )
 
-    # Add sub-pages, if any
-    sub_pages = t.cast(list, page.children)
-    sub_pages.clear()  # Avoid duplicate entries if this function is called twice
-    sub_pages += auto_detect_pages(
-        file_path.with_suffix(""),
-        package=module_name,
+    return page
+
+
+# The `@rio.page` arguments which can be read without importing the file
+_STATIC_PAGE_ARGUMENTS = {
+    "url_segment",
+    "name",
+    "icon",
+    "meta_tags",
+    "order",
+    "keep_alive",
+    "prefetch",
+}
+
+
+def _lazy_page_from_python_file(
+    file_path: Path,
+    module_name: str,
+) -> ComponentPage | None:
+    """
+    Creates a page for the given file without importing it, by statically
+    analyzing the `@rio.page` decorator in it. The file is imported once the
+    page is first built, or its guard or URL parameters are needed.
+
+    Returns `None` if the file can't be analyzed with certainty, for example
+    because the decorator's arguments aren't literals. Such files must be
+    imported right away.
+    """
+    # Files with problems are imported right away, so that the usual warnings
+    # are displayed
+    if file_path.stem == "__init__":
+        return None
+
+    try:
+        tree = ast.parse(file_path.read_bytes(), filename=str(file_path))
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    # Find the decorated class or function
+    candidates = list[tuple[str, ast.Call]]()
+
+    for node in tree.body:
+        if not isinstance(
+            node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+        ):
+            continue
+
+        for decorator in node.decorator_list:
+            if not isinstance(decorator, ast.Call):
+                continue
+
+            func = decorator.func
+            if (
+                isinstance(func, ast.Attribute)
+                and isinstance(func.value, ast.Name)
+                and func.value.id == "rio"
+                and func.attr == "page"
+            ) or (isinstance(func, ast.Name) and func.id == "page"):
+                candidates.append((node.name, decorator))
+
+    if len(candidates) != 1:
+        return None
+
+    build_name, decorator = candidates[0]
+
+    if decorator.args:
+        return None
+
+    # Read the decorator's arguments
+    arguments = dict[str, t.Any]()
+    has_guard = False
+
+    for keyword in decorator.keywords:
+        if keyword.arg == "guard":
+            has_guard = not (
+                isinstance(keyword.value, ast.Constant)
+                and keyword.value.value is None
+            )
+            continue
+
+        if keyword.arg not in _STATIC_PAGE_ARGUMENTS:
+            return None
+
+        try:
+            arguments[keyword.arg] = ast.literal_eval(keyword.value)
+        except ValueError:
+            return None
+
+    # Apply the same defaults as `@rio.page`
+    name = arguments.get("name")
+    if name is None:
+        name = convert_case(build_name, "snake").replace("_", " ").title()
+
+    url_segment = arguments.get("url_segment")
+    if url_segment is None:
+        url_segment = convert_case(build_name, "kebab").lower()
+
+    module = _LazyPageModule(file_path, module_name, build_name)
+
+    page = ComponentPage(
+        name=name,
+        url_segment=url_segment,
+        build=_LazyPageBuild(module),
+        icon=arguments.get("icon", DEFAULT_ICON),
+        guard=module.call_guard if has_guard else None,
+        meta_tags=arguments.get("meta_tags") or {},
+        keep_alive=arguments.get("keep_alive", True),
+        prefetch=arguments.get("prefetch", "build"),
     )
+    page.__dict__["_page_order_"] = arguments.get("order")
 
     return page
 
 
+class _LazyPageModule:
+    """
+    A python file containing a page, which is imported when first needed.
+    """
+
+    def __init__(self, file_path: Path, module_name: str, build_name: str):
+        self.file_path = file_path
+        self.module_name = module_name
+        self.build_name = build_name
+
+        # Pages may be imported from a worker thread, when pre-warming
+        self._lock = threading.Lock()
+        self._page: ComponentPage | None = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._page is not None
+
+    def load(self) -> ComponentPage:
+        """
+        Imports the file, if that hasn't happened yet, and returns the page
+        defined in it.
+        """
+        with self._lock:
+            if self._page is None:
+                self._page = _import_page_from_python_file(
+                    self.file_path, self.module_name
+                )
+
+            return self._page
+
+    def call_guard(self, event: GuardEvent) -> None | rio.URL | str:
+        guard = self.load().guard
+
+        if guard is None:
+            return None
+
+        return guard(event)
+
+
+class _LazyPageBuild:
+    """
+    Stands in for the `build` function of a page that hasn't been imported
+    yet.
+    """
+
+    def __init__(self, module: _LazyPageModule) -> None:
+        self.module = module
+
+        # Error messages refer to build functions by name
+        self.__name__ = self.__qualname__ = module.build_name
+
+    def __call__(self, *args: t.Any, **kwargs: t.Any) -> rio.Component:
+        return self.module.load().build(*args, **kwargs)
+
+
+class _LazyUrlParameterParsers(t.Mapping[str, "UrlParameterParser"]):
+    """
+    The URL parameter parsers of a page that hasn't been imported yet.
+    """
+
+    def __init__(self, module: _LazyPageModule) -> None:
+        self.module = module
+
+    def __getitem__(self, name: str) -> UrlParameterParser:
+        try:
+            return self.module.load()._url_parameter_parsers[name]
+        except KeyError:
+            # If the file couldn't be imported, the error page is displayed
+            # for any value
+            if isinstance(self.module.load().build, functools.partial):
+                return FuncParser(str)
+
+            raise
+
+    def __iter__(self) -> t.Iterator[str]:
+        return iter(self.module.load()._url_parameter_parsers)
+
+    def __len__(self) -> int:
+        return len(self.module.load()._url_parameter_parsers)
+
+
+def _iter_lazy_modules(
+    pages: t.Iterable[ComponentPage | Redirect],
+) -> t.Iterator[_LazyPageModule]:
+    for page in pages:
+        if not isinstance(page, ComponentPage):
+            continue
+
+        if isinstance(page.build, _LazyPageBuild):
+            yield page.build.module
+
+        yield from _iter_lazy_modules(page.children)
+
+
+async def prewarm_pages(pages: t.Iterable[ComponentPage | Redirect]) -> None:
+    """
+    Imports all pages which haven't been imported yet, one after another, in
+    a worker thread.
+    """
+    for module in _iter_lazy_modules(pages):
+        if not module.is_loaded:
+            await asyncio.to_thread(module.load)
+
+
 def _error_page_from_file_name(
     file_path: Path, error_summary: str, error_details: str
 ) -> ComponentPage:
@@ -8,7 +8,7 @@ import collections.abc
 import enum
 import functools
 import inspect
-import json
+import operator
 import types
 import typing as t
 
@@ -19,9 +19,13 @@ from uniserde import Jsonable, JsonDoc
 
 import rio
 
-from . import color, fills, inspection, maybes, session
+from . import color, fills, inspection, json_backends, session, text_style
 from .components import fundamental_component
 from .observables.dataclass import class_local_fields
+from .observables.observable_property import (
+    AttributeBinding,
+    ObservableProperty,
+)
 from .self_serializing import SelfSerializing
 
 __all__ = [
@@ -41,10 +45,43 @@ json_serde = uniserde.JsonSerde.new_camel_case()
 
 Serializer = t.Callable[["session.Session", T], Jsonable]
 
+# Serializes the given properties of a component. See
+# `get_component_serializer`.
+ComponentSerializer = t.Callable[["rio.Component", t.Iterable[str]], JsonDoc]
+
 
 FILL_LIKES = {*t.get_args(fills._FillLike), None, type(None)}
 
 
+# Values of these types are interned, i.e. only sent to the client once per
+# session, if they're assigned to a style, fill or colorset attribute. See
+# `Session._intern_style`.
+STYLE_TYPES = (text_style.TextStyle, fills.Fill, color.Color)
+
+# How many styles a session interns before starting over
+MAX_INTERNED_STYLES = 4096
+
+# The attributes which every serialized component includes, in the order
+# they're unpacked in `_compile_layout_serializer`
+_LAYOUT_ATTRIBUTE_NAMES = (
+    "key",
+    "accessibility_role",
+    "min_width",
+    "min_height",
+    "grow_x",
+    "grow_y",
+    "align_x",
+    "align_y",
+    "margin",
+    "margin_x",
+    "margin_y",
+    "margin_left",
+    "margin_top",
+    "margin_right",
+    "margin_bottom",
+)
+
+
 def _float_or_zero(obj: object) -> float:
     try:
         return float(obj)  # type: ignore
@@ -52,36 +89,11 @@ def _float_or_zero(obj: object) -> float:
         return 0
 
 
-def _serialize_special_types(obj: object) -> Jsonable:
-    try:
-        func = maybes.TYPE_NORMALIZERS[type(obj)]
-    except KeyError:
-        raise TypeError(
-            f"Can't serialize {obj!r} of type {type(obj)} as JSON"
-        ) from None
-
-    return func(obj)  # type: ignore
-
-
-def _get_margin(*margins: float | None) -> float:
-    for margin in margins:
-        if margin is not None:
-            return margin
-
-    return 0
-
-
 def serialize_json(data: Jsonable) -> str:
     """
     Like `json.dumps`, but can also serialize numpy types.
     """
-    try:
-        return json.dumps(data, default=_serialize_special_types)
-    except TypeError:
-        # Re-initialize the maybes, someone probably imported numpy/pandas after
-        # the app was started
-        maybes.initialize(force=True)
-        return json.dumps(data, default=_serialize_special_types)
+    return json_backends.STDLIB_JSON_BACKEND.dumps(data)
 
 
 def serialize_and_host_component(
@@ -94,101 +106,352 @@ def serialize_and_host_component(
     Non-fundamental components must have been built, and their output cached in
     the session.
     """
-    result: JsonDoc = {
-        "_python_type_": type(component).__name__,
-        "_rio_internal_": component._rio_internal_,
-        "key": component.key,
-        "accessibility_role": component.accessibility_role,
-        # SCROLLING-REWORK "_scroll_": [component.scroll_x, component.scroll_y],
-    }
+    serialize = get_component_serializer(type(component))
+    return serialize(component, properties_to_serialize)
 
-    # Accessing state properties is pretty slow, so we'll store these in local
-    # variables
-    min_width = component.min_width
-    min_height = component.min_height
 
-    # MAX-SIZE-BRANCH max_width = component.max_width
-    # MAX-SIZE-BRANCH max_height = component.max_height
+@functools.lru_cache(maxsize=None)
+def get_component_serializer(
+    cls: t.Type[rio.Component],
+) -> ComponentSerializer:
+    """
+    Returns a function which serializes components of the given class. See
+    `serialize_and_host_component`.
+
+    This runs for every component in every refresh, so the function is
+    specialized for the class: Everything that only depends on the class is
+    worked out up front, attributes are read without going through their
+    descriptors, and values that are already valid JSON are sent without
+    calling a serializer.
+    """
+    serialize_layout = _compile_layout_serializer(cls)
+    reports_resize = rio.event.EventTag.ON_RESIZE in cls._rio_event_handlers_
 
-    grow_x = component.grow_x
-    grow_y = component.grow_y
+    # If it's a fundamental component, serialize its state because JS needs it.
+    # For non-fundamental components, there's no reason to send the state to
+    # the frontend.
+    if issubclass(cls, fundamental_component.FundamentalComponent):
+        serialize_state = _compile_state_serializer(cls)
 
-    margin_x = component.margin_x
-    margin_y = component.margin_y
-    margin = component.margin
+        def serialize(
+            component: rio.Component,
+            properties_to_serialize: t.Iterable[str],
+        ) -> JsonDoc:
+            result = serialize_layout(component)
+            serialize_state(component, properties_to_serialize, result)
 
-    # Add layout properties, in a more succinct way than sending them separately
-    result["_margin_"] = (
-        _get_margin(component.margin_left, margin_x, margin),
-        _get_margin(component.margin_top, margin_y, margin),
-        _get_margin(component.margin_right, margin_x, margin),
-        _get_margin(component.margin_bottom, margin_y, margin),
-    )
-    # The width/height can be floats or strings, but they could also be numpy
-    # floats or numpy strings. We could check `isinstance(width,
-    # maybes.STR_TYPES)`, but that would give incorrect output if numpy was
-    # imported after the app was launched. I think the easiest solution is to
-    # simply try converting it to a float, and if that fails, default to 0.
-    # (Although that has the side effect of treating strings like `"1.5"` as
-    # numbers.)
-    result["_min_size_"] = (
-        _float_or_zero(min_width),
-        _float_or_zero(min_height),
+            if reports_resize:
+                result["_report_resize_"] = True
+
+            return result
+
+    # Dialog containers are a special case. These must be high-level on the
+    # Python side, so that their children can correctly track their builder, but
+    # they must be low-level on the JS side, so that they can run custom code.
+    #
+    # TODO: Builders have been replaced by parents. Can this code be simplified now?
+    #
+    # -> Pretend it's a fundamental component
+    elif issubclass(cls, rio.components.dialog_container.DialogContainer):
+
+        def serialize(
+            component: rio.Component,
+            properties_to_serialize: t.Iterable[str],
+        ) -> JsonDoc:
+            assert isinstance(
+                component, rio.components.dialog_container.DialogContainer
+            ), component
+
+            result = serialize_layout(component)
+            result["_type_"] = "DialogContainer-builtin"
+            result["content"] = component._build_data_.build_result._id_  # type: ignore
+            result.update(component.serialize())
+
+            if reports_resize:
+                result["_report_resize_"] = True
+
+            return result
+
+    else:
+
+        def serialize(
+            component: rio.Component,
+            properties_to_serialize: t.Iterable[str],
+        ) -> JsonDoc:
+            result = serialize_layout(component)
+
+            # Take care to add underscores to any properties here, as the
+            # user-defined state is also added and could clash
+            result["_type_"] = "HighLevelComponent-builtin"
+            result["_child_"] = component._build_data_.build_result._id_  # type: ignore
+
+            if reports_resize:
+                result["_report_resize_"] = True
+
+            return result
+
+    return serialize
+
+
+def _reads_directly(cls: type, attribute_name: str) -> bool:
+    """
+    Returns whether the attribute can be read straight from the instance's
+    `__dict__`, rather than through its descriptor. Observable properties only
+    track reads while components are being built, which never overlaps with
+    serialization.
+    """
+    descriptor = inspect.getattr_static(cls, attribute_name, None)
+
+    return (
+        isinstance(descriptor, ObservableProperty)
+        and type(descriptor).__get__ is ObservableProperty.__get__
     )
-    # MAX-SIZE-BRANCH result["_max_size_"] = (
-    # MAX-SIZE-BRANCH     _float_if_not_none(max_width),
-    # MAX-SIZE-BRANCH     _float_if_not_none(max_height),
-    # MAX-SIZE-BRANCH )
-    result["_align_"] = (
-        component.align_x,
-        component.align_y,
+
+
+def _compile_layout_serializer(
+    cls: t.Type[rio.Component],
+) -> t.Callable[[rio.Component], JsonDoc]:
+    """
+    Returns a function which serializes the attributes every component has,
+    in a more succinct way than sending them separately.
+    """
+    get_layout_values = operator.itemgetter(*_LAYOUT_ATTRIBUTE_NAMES)
+    reads_directly = all(
+        _reads_directly(cls, name) for name in _LAYOUT_ATTRIBUTE_NAMES
     )
-    result["_grow_"] = (grow_x, grow_y)
+    python_type = cls.__name__
 
-    # If it's a fundamental component, serialize its state because JS needs it.
-    # For non-fundamental components, there's no reason to send the state to
-    # the frontend.
-    if isinstance(component, fundamental_component.FundamentalComponent):
+    def read_layout_values(component: rio.Component) -> tuple:
+        if reads_directly:
+            try:
+                values = get_layout_values(vars(component))
+            except KeyError:
+                pass
+            else:
+                if AttributeBinding not in map(type, values):
+                    return values
+
+        return tuple(
+            getattr(component, name) for name in _LAYOUT_ATTRIBUTE_NAMES
+        )
+
+    def serialize_layout(component: rio.Component) -> JsonDoc:
+        (
+            key,
+            accessibility_role,
+            min_width,
+            min_height,
+            grow_x,
+            grow_y,
+            align_x,
+            align_y,
+            margin,
+            margin_x,
+            margin_y,
+            margin_left,
+            margin_top,
+            margin_right,
+            margin_bottom,
+        ) = read_layout_values(component)
+
+        # The more specific margins take precedence over the general ones
+        if margin is None:
+            margin = 0
+
+        if margin_x is None:
+            margin_x = margin
+
+        if margin_y is None:
+            margin_y = margin
+
+        return {
+            "_python_type_": python_type,
+            "_rio_internal_": component._rio_internal_,
+            "key": key,
+            "accessibility_role": accessibility_role,
+            # SCROLLING-REWORK "_scroll_": [component.scroll_x, component.scroll_y],
+            "_margin_": (
+                margin_x if margin_left is None else margin_left,
+                margin_y if margin_top is None else margin_top,
+                margin_x if margin_right is None else margin_right,
+                margin_y if margin_bottom is None else margin_bottom,
+            ),
+            # The width/height can be floats or strings, but they could also
+            # be numpy floats or numpy strings. We could check
+            # `isinstance(width, maybes.STR_TYPES)`, but that would give
+            # incorrect output if numpy was imported after the app was
+            # launched. I think the easiest solution is to simply try
+            # converting it to a float, and if that fails, default to 0.
+            # (Although that has the side effect of treating strings like
+            # `"1.5"` as numbers.)
+            "_min_size_": (
+                _float_or_zero(min_width),
+                _float_or_zero(min_height),
+            ),
+            # MAX-SIZE-BRANCH "_max_size_": (
+            # MAX-SIZE-BRANCH     _float_if_not_none(component.max_width),
+            # MAX-SIZE-BRANCH     _float_if_not_none(component.max_height),
+            # MAX-SIZE-BRANCH ),
+            "_align_": (align_x, align_y),
+            "_grow_": (grow_x, grow_y),
+        }
+
+    return serialize_layout
+
+
+def _compile_state_serializer(
+    cls: t.Type[fundamental_component.FundamentalComponent],
+) -> t.Callable[
+    [fundamental_component.FundamentalComponent, t.Iterable[str], JsonDoc],
+    None,
+]:
+    """
+    Returns a function which adds the state of a fundamental component to its
+    serialized form.
+    """
+    serializers = get_attribute_serializers(cls)
+
+    # For each attribute: The serializer to use, or `None` if the value is
+    # sent as-is, whether the value may be a style worth interning, and
+    # whether it can be read directly from the instance's `__dict__`
+    attribute_plans: dict[str, tuple[Serializer | None, bool, bool]] = {
+        name: (
+            None if serializer is _serialize_basic_json_value else serializer,
+            _may_serialize_style(serializer),
+            _reads_directly(cls, name),
+        )
+        for name, serializer in serializers.items()
+    }
+
+    unique_id = cls._unique_id_
+    appendable_attributes = cls._appendable_attributes_
+
+    def serialize_state(
+        component: fundamental_component.FundamentalComponent,
+        properties_to_serialize: t.Iterable[str],
+        result: JsonDoc,
+    ) -> None:
         sess = component.session
-        serializers = get_attribute_serializers(type(component))
+        component_vars = vars(component)
 
         for name in properties_to_serialize:
             try:
-                serializer = serializers[name]
+                serializer, may_be_style, reads_directly = attribute_plans[name]
             except KeyError:
                 # This happens for properties inherited from Component, like
                 # `margin` or `min_width`
                 continue
 
-            result[name] = serializer(sess, getattr(component, name))
+            if reads_directly:
+                try:
+                    value = component_vars[name]
+                except KeyError:
+                    value = getattr(component, name)
+                else:
+                    if type(value) is AttributeBinding:
+                        value = value.get_value()
+            else:
+                value = getattr(component, name)
+
+            if serializer is None:
+                result[name] = value
+            elif may_be_style and isinstance(value, STYLE_TYPES):
+                result[name] = sess._intern_style(
+                    (serializer, value),
+                    functools.partial(serializer, sess, value),
+                )
+            else:
+                result[name] = serializer(sess, value)
 
         # Encode any internal additional state. Doing it this late allows the
         # custom serialization to overwrite automatically generated values.
-        result["_type_"] = component._unique_id_
+        result["_type_"] = unique_id
         result.update(component._custom_serialize_())
 
-    # Dialog containers are a special case. These must be high-level on the
-    # Python side, so that their children can correctly track their builder, but
-    # they must be low-level on the JS side, so that they can run custom code.
-    #
-    # TODO: Builders have been replaced by parents. Can this code be simplified now?
-    #
-    # -> Pretend it's a fundamental component
-    elif isinstance(component, rio.components.dialog_container.DialogContainer):
-        result["_type_"] = "DialogContainer-builtin"
-        result["content"] = component._build_data_.build_result._id_  # type: ignore
-        result.update(component.serialize())
+        if appendable_attributes:
+            _send_appended_suffixes(
+                component,
+                result,
+                properties_to_serialize,
+                serializers,
+            )
 
-    else:
-        # Take care to add underscores to any properties here, as the
-        # user-defined state is also added and could clash
-        result["_type_"] = "HighLevelComponent-builtin"
-        result["_child_"] = component._build_data_.build_result._id_  # type: ignore
+        # Send along any styles which are referenced for the first time
+        if sess._new_style_definitions:
+            result["_styles_"] = sess._new_style_definitions
+            sess._new_style_definitions = {}
+
+    return serialize_state
+
+
+def _may_serialize_style(serializer: Serializer) -> bool:
+    """
+    Returns whether the values passed to the serializer may be styles, which
+    should be interned rather than serialized over and over.
+    """
+    if isinstance(serializer, functools.partial):
+        if serializer.func is not _serialize_optional:
+            return False
+
+        serializer = serializer.keywords["serializer"]
+
+    return serializer in (
+        _serialize_style,
+        _serialize_fill_like,
+        _serialize_colorset,
+    )
+
+
+def _send_appended_suffixes(
+    component: fundamental_component.FundamentalComponent,
+    result: JsonDoc,
+    properties_to_serialize: t.Iterable[str],
+    serializers: t.Mapping[str, Serializer],
+) -> None:
+    """
+    Replaces the values of the component's `_appendable_attributes_` with just
+    their new suffix, if they have only grown since they were last sent. This
+    keeps streaming text into a component from sending the whole text over
+    and over.
+    """
+    values_sent_to_client = component._get_values_sent_to_client()
+
+    # If all properties are being sent, the client is creating the component
+    # from scratch and needs the complete values
+    is_complete: bool | None = None
+    appended: dict[str, str] = {}
+
+    for name in component._appendable_attributes_:
+        value = result.get(name)
+
+        # Custom serialization may have replaced the value
+        if not isinstance(value, str):
+            continue
+
+        previous_value = values_sent_to_client.get(name)
+        values_sent_to_client[name] = value
 
-    if rio.event.EventTag.ON_RESIZE in component._rio_event_handlers_:
-        result["_report_resize_"] = True
+        if (
+            previous_value is None
+            or len(value) <= len(previous_value)
+            or not value.startswith(previous_value)
+        ):
+            continue
+
+        if is_complete is None:
+            is_complete = all(
+                property_name in properties_to_serialize
+                for property_name in serializers
+            )
+
+        if is_complete:
+            continue
+
+        appended[name] = value[len(previous_value) :]
+        del result[name]
 
-    return result
+    if appended:
+        result["_appended_"] = appended
 
 
 @functools.lru_cache(maxsize=None)
@@ -241,6 +504,14 @@ def _serialize_self_serializing(
     return obj._serialize(sess)
 
 
+def _serialize_style(
+    sess: session.Session, style: text_style.TextStyle | fills.Fill
+) -> Jsonable:
+    # Like `_serialize_self_serializing`, but marks the value as a style, so
+    # it gets interned
+    return style._serialize(sess)
+
+
 def _serialize_child_component(
     sess: session.Session, component: rio.Component
 ) -> Jsonable:
@@ -303,6 +574,10 @@ def _get_serializer_for_annotation(
     # Python 3.10 crashes if you try `issubclass(list[str], SelfSerializing)`,
     # so we must make absolutely sure the annotation isn't a generic type
     if inspect.isclass(annotation) and not args:
+        # Styles
+        if issubclass(annotation, (text_style.TextStyle, fills.Fill)):
+            return _serialize_style
+
         # Self-Serializing
         if issubclass(annotation, SelfSerializing):
             return _serialize_self_serializing
@@ -340,6 +615,11 @@ def _get_serializer_for_annotation(
             serializer = _get_serializer_for_annotation(type_)
             if serializer is None:
                 return None
+
+            # `None` is valid JSON as well
+            if serializer is _serialize_basic_json_value:
+                return serializer
+
             return functools.partial(_serialize_optional, serializer=serializer)
 
         # Fills
@@ -7,9 +7,7 @@ import inspect
 import json
 import logging
 import pathlib
-import random
 import shutil
-import string
 import time
 import traceback
 import typing as t
@@ -35,6 +33,7 @@ from . import (
     fills,
     global_state,
     inspection,
+    loop_watchdog,
     nice_traceback,
     routing,
     serialization,
@@ -69,6 +68,40 @@ class WontSerialize(Exception):
     pass
 
 
+class _RefreshRequiredEvent(asyncio.Event):
+    """
+    An `asyncio.Event` which can also be set from event handlers running in
+    worker threads. In that case the call is forwarded to the event loop.
+    """
+
+    def set(self) -> None:
+        loop = global_state.handler_thread_state.event_loop
+
+        if loop is None:
+            super().set()
+        else:
+            loop.call_soon_threadsafe(super().set)
+
+
+def _call_in_handler_thread(
+    loop: asyncio.AbstractEventLoop,
+    handler: t.Callable[..., object],
+    args: tuple[object, ...],
+    kwargs: dict[str, object],
+) -> object:
+    """
+    Calls an event handler decorated with `rio.event.run_in_thread`. This runs
+    in a worker thread.
+    """
+    thread_state = global_state.handler_thread_state
+    thread_state.event_loop = loop
+
+    try:
+        return handler(*args, **kwargs)
+    finally:
+        thread_state.event_loop = None
+
+
 class Session(unicall.Unicall, metaclass=RioDataclassMeta):
     """
     Represents a single client connection to the app.
@@ -222,7 +255,8 @@ class Session(unicall.Unicall, metaclass=RioDataclassMeta):
                 receive=self.__receive_message,
                 serde=serialization.json_serde,
                 parameter_format="list",
-                json_dumps=serialization.serialize_json,
+                json_dumps=app_server_.app._json_backend.dumps,
+                json_loads=app_server_.app._json_backend.loads,
             )
         )
 
@@ -267,7 +301,7 @@ class Session(unicall.Unicall, metaclass=RioDataclassMeta):
         # this possible, we need to create a background task that waits for a
         # component to become dirty. It can do that by waiting for this event,
         # which is triggered by our observables.
-        self._refresh_required_event = asyncio.Event()
+        self._refresh_required_event = _RefreshRequiredEvent()
 
         # Store the app server
         self._app_server = app_server_
@@ -356,6 +390,24 @@ class Session(unicall.Unicall, metaclass=RioDataclassMeta):
             inspection.get_child_component_containing_attribute_names_for_builtin_components()
         )
 
+        # Styles (such as `TextStyle`s and fills) tend to be shared by many
+        # components. Each one is only sent to the client once, and afterwards
+        # referenced by its id. This maps styles to their ids, or to `None` if
+        # they aren't worth interning.
+        self._interned_style_ids: dict[t.Hashable, int | None] = {}
+
+        # Styles which have been assigned an id, but haven't been sent to the
+        # client yet
+        self._new_style_definitions: dict[int, uniserde.Jsonable] = {}
+
+        # The component whose state is currently being serialized, if any
+        self._component_being_serialized: rio.Component | None = None
+
+        # How many placeholders have been serialized in place of values that
+        # are still being prepared. Styles containing a placeholder mustn't be
+        # interned, or the client would keep displaying it.
+        self._placeholder_count = 0
+
         # Boolean indicating whether this session has already been closed.
         self._was_closed = False
 
@@ -419,6 +471,32 @@ class Session(unicall.Unicall, metaclass=RioDataclassMeta):
         # references.
         self._refresh_lock = asyncio.Lock()
 
+        # State updates received from the frontend are applied in batches,
+        # followed by a single refresh. Updates which arrive while a batch is
+        # being processed are merged (per component) into the next batch.
+        #
+        # `_pending_state_update_batch` is the batch that new updates are
+        # added to, or `None` if no batch is waiting. `_latest_state_update_batch`
+        # is the most recently started batch, which the next one has to wait for.
+        self._pending_component_state_updates: dict[int, dict[str, t.Any]] = {}
+        self._pending_state_update_batch: (
+            asyncio.Task[dict[int, Exception]] | None
+        ) = None
+        self._latest_state_update_batch: (
+            asyncio.Task[dict[int, Exception]] | None
+        ) = None
+
+        # Cleared while a time-sliced refresh is in progress (see
+        # `App.refresh_time_slice`). Input from the client waits for this, so
+        # it can't modify components while they're only partially rebuilt.
+        self._refresh_is_committed = asyncio.Event()
+        self._refresh_is_committed.set()
+
+        # The task which is preparing the page the user is likely to visit
+        # next, if any. Only one page is prefetched at a time, so starting a new
+        # prefetch cancels the previous one.
+        self._prefetch_task: asyncio.Task[None] | None = None
+
         # A dict of {build_function: error_message}. This is cleared at
         # the start of every refresh, and tracks which build functions failed.
         # Used for unit testing.
@@ -878,7 +956,23 @@ window.resizeTo(screen.availWidth, screen.availHeight);
         # _can_ optionally be awaited for backwards compatibility, but prints
         # warning when that is done.
         try:
-            result = handler(*args, **kwargs)
+            if getattr(handler, "_rio_run_in_thread_", False):
+                await self._call_event_handler_in_thread(
+                    handler, *args, **kwargs
+                )
+                return
+
+            # Let the watchdog know who's responsible if the loop gets
+            # blocked. This is only set while the handler is actually running,
+            # not while it's suspended.
+            activity = ("event handler", handler)
+            previous_activity = loop_watchdog.current_activity
+            loop_watchdog.current_activity = activity
+
+            try:
+                result = handler(*args, **kwargs)
+            finally:
+                loop_watchdog.current_activity = previous_activity
 
             try:
                 result._rio_force_refresh_skip_await  # type: ignore
@@ -887,17 +981,38 @@ window.resizeTo(screen.availWidth, screen.availHeight);
             else:
                 return
 
-            # **Intentionally** call the user code outside of the `try` block.
-            # This way it doesn't show up in any user tracebacks. `hasattr` is
-            # also a valid option here, but doesn't allow for refactoring.
+            # **Intentionally** call the user code outside of the `try`
+            # block. This way it doesn't show up in any user tracebacks.
+            # `hasattr` is also a valid option here, but doesn't allow for
+            # refactoring.
             if inspect.isawaitable(result):
-                await result
+                await loop_watchdog.TrackedAwaitable(result, activity)
 
         # Display and discard exceptions
         except Exception as error:
             revel.error("Exception in event handler:")
             nice_traceback.print_exception(error)
 
+    async def _call_event_handler_in_thread(
+        self, handler: t.Callable[P, object], *args: P.args, **kwargs: P.kwargs
+    ) -> None:
+        """
+        Calls a synchronous event handler in a worker thread, so it doesn't
+        block the event loop.
+
+        While the handler is running, this session isn't refreshed. Otherwise
+        `build` functions could observe (and the session would have to
+        serialize) state that the handler is still in the middle of changing.
+        """
+        async with self._refresh_lock:
+            await asyncio.to_thread(
+                _call_in_handler_thread,
+                asyncio.get_running_loop(),
+                handler,
+                args,
+                kwargs,
+            )
+
     def _call_event_handler_sync(
         self, handler: utils.EventHandler[P], *args: P.args, **kwargs: P.kwargs
     ) -> None:
@@ -910,15 +1025,32 @@ window.resizeTo(screen.availWidth, screen.availHeight);
         if handler is None:
             return
 
+        # Handlers which must run in a worker thread can't be waited for.
+        # Treat them like async handlers.
+        if getattr(handler, "_rio_run_in_thread_", False):
+            result = self._call_event_handler(handler, *args, **kwargs)
+
         # Try to call the event handler synchronously
-        try:
-            result = handler(*args, **kwargs)
+        else:
+            previous_activity = loop_watchdog.current_activity
+            loop_watchdog.current_activity = ("event handler", handler)
 
-        # Display and discard exceptions
-        except Exception:
-            revel.error("Exception in event handler:")
-            traceback.print_exc()
-            return
+            try:
+                result = handler(*args, **kwargs)
+
+            # Display and discard exceptions
+            except Exception:
+                revel.error("Exception in event handler:")
+                traceback.print_exc()
+                return
+
+            finally:
+                loop_watchdog.current_activity = previous_activity
+
+            if inspect.isawaitable(result):
+                result = loop_watchdog.TrackedAwaitable(
+                    result, ("event handler", handler)
+                )
 
         if not inspect.isawaitable(result):
             return
@@ -984,6 +1116,19 @@ window.resizeTo(screen.availWidth, screen.availHeight);
         `name`: An optional name for the task. Assigning descriptive names can
             be helpful when debugging.
         """
+        # Event handlers running in worker threads can't create tasks
+        # themselves. Have the event loop do it.
+        loop = global_state.handler_thread_state.event_loop
+
+        if loop is not None:
+
+            async def create_task_in_loop() -> asyncio.Task[T]:
+                return self.create_task(coro, name=name)
+
+            return asyncio.run_coroutine_threadsafe(
+                create_task_in_loop(), loop
+            ).result()
+
         task = asyncio.create_task(coro, name=name)
 
         self._running_tasks.add(task)
@@ -1065,6 +1210,9 @@ window.resizeTo(screen.availWidth, screen.availHeight);
 
         del target_url, target_url_absolute
 
+        # Whatever was being prefetched is no longer needed
+        self._cancel_prefetch()
+
         # Is this one of the app's pages, or a full URL to another site? If
         # navigating to another site, let the browser handle the navigation.
         #
@@ -1134,6 +1282,144 @@ window.location.href = {json.dumps(str(active_page_url))};
                 name="Extension page change worker",
             )
 
+    def _prefetch(self, target_url: rio.URL | str) -> None:
+        """
+        Prepares the page at the given URL in the background, because the user
+        is likely to navigate there soon. If they do, the page can be displayed
+        without having to build it first.
+
+        Any previous prefetch which hasn't finished yet is cancelled.
+        """
+        self._cancel_prefetch()
+
+        self._prefetch_task = self.create_task(
+            self._prefetch_worker(self._make_url_absolute(target_url)),
+            name=f"Prefetch `{target_url}`",
+        )
+
+    def _cancel_prefetch(self) -> None:
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+            self._prefetch_task = None
+
+    async def _prefetch_worker(self, target_url_absolute: rio.URL) -> None:
+        # Give pending navigations and refreshes a chance to go first. Prefetching
+        # is only useful if it doesn't delay anything the user is waiting for.
+        await asyncio.sleep(0)
+
+        # Building components must not interleave with a refresh
+        async with self._refresh_lock:
+            try:
+                active_page_instances_and_path_arguments, active_page_url = (
+                    routing.check_page_guards(self, target_url_absolute)
+                )
+            except routing.NavigationFailed:
+                return
+
+            # External URLs can't be prefetched
+            if active_page_instances_and_path_arguments is None:
+                return
+
+            # Only the first page that differs from the currently displayed ones
+            # has to be built. Everything above it stays the same, and anything
+            # below it will be built by the new page's own `PageView`s.
+            for level, (page, path_arguments) in enumerate(
+                active_page_instances_and_path_arguments
+            ):
+                if level >= len(
+                    self._active_page_instances_and_path_arguments
+                ) or self._active_page_instances_and_path_arguments[level] != (
+                    page,
+                    path_arguments,
+                ):
+                    break
+            else:
+                # This page is already being displayed
+                return
+
+            if page.prefetch == "never":
+                return
+
+            # Find a `PageView` that would display the page
+            level_cache: dict[rio.Component, int] = {}
+
+            for page_view in self._page_views:
+                if (
+                    page_view._level == level
+                    and page_view._get_component_tree_level_(level_cache) > 0
+                ):
+                    break
+            else:
+                return
+
+            page_component = page_view._prefetch_page(
+                page, path_arguments, active_page_url.query
+            )
+
+            if page_component is None:
+                return
+
+            # Nested `PageView`s determine their level by walking up the tree.
+            # Temporarily attach the page to its future `PageView` so they find
+            # it, but detach it again afterwards, so that refreshes don't
+            # mistake it for being mounted.
+            page_component._weak_parent_ = weakref.ref(page_view)
+
+            try:
+                self._build_detached_subtree(
+                    page_component,
+                    run_on_populate=page.prefetch == "populate",
+                )
+            finally:
+                page_component._weak_parent_ = fake_dead_weakref
+
+    def _build_detached_subtree(
+        self,
+        root: rio.Component,
+        *,
+        run_on_populate: bool,
+    ) -> None:
+        """
+        Builds the given component and all components it creates, even though
+        they aren't part of the component tree yet. Once they're mounted they
+        don't have to be built again, unless their state changes in the
+        meantime.
+
+        Unless `run_on_populate` is `True`, components with `on_populate`
+        handlers (and their children) are left unbuilt, since their handlers
+        must only run once the component is actually displayed. They are built
+        as usual once they're mounted.
+        """
+        queue = [root]
+
+        while queue:
+            component = queue.pop()
+
+            if component._build_data_ is not None:
+                continue
+
+            if (
+                not run_on_populate
+                and not isinstance(
+                    component, fundamental_component.FundamentalComponent
+                )
+                and not component._on_populate_triggered_
+                and component._rio_event_handlers_[
+                    rio.event.EventTag.ON_POPULATE
+                ]
+            ):
+                continue
+
+            # Freshly created components have all of their attributes marked as
+            # changed. They're being built right now, so that no longer matters.
+            self._changed_attributes.pop(component, None)
+
+            self._build_component(component)
+            self._newly_created_components.discard(component)
+
+            assert component._build_data_ is not None
+            queue.extend(component._build_data_.direct_children)
+
     def open_url_in_browser(self, url: rio.URL | str) -> None:
         """
         Opens the given URL in the user's browser.
@@ -1169,15 +1455,7 @@ window.location.href = {json.dumps(str(active_page_url))};
         except KeyError:
             pass
 
-        # Generate a random name for the font
-        while True:
-            font_name = "".join(
-                random.choice(string.ascii_letters) for _ in range(10)
-            )
-
-            if font_name not in self._registered_font_names.values():
-                break
-
+        font_name = self._app_server.get_font_name(font)
         self._registered_font_names[font] = font_name
         self.create_task(
             self._register_font_assets_and_remote_font(font, font_name)
@@ -1426,6 +1704,13 @@ window.location.href = {json.dumps(str(active_page_url))};
         await asyncio.gather(*tasks)
 
     def _save_settings_soon(self) -> None:
+        # This may be called from event handlers running in worker threads
+        loop = global_state.handler_thread_state.event_loop
+
+        if loop is not None:
+            loop.call_soon_threadsafe(self._save_settings_soon)
+            return
+
         if self._settings_save_task is None:
             self._settings_save_task = self.create_task(
                 self.__wait_and_save_settings()
@@ -1810,6 +2095,48 @@ a.remove();
 """
         )
 
+    def _intern_style(
+        self,
+        key: t.Hashable,
+        serialize: t.Callable[[], uniserde.Jsonable],
+    ) -> uniserde.Jsonable:
+        """
+        Serializes a style which is likely shared by many components. The first
+        time, its JSON is queued to be sent to the client. Afterwards, the
+        style is only serialized as a reference to it.
+
+        Styles which don't serialize to a JSON object are small enough to be
+        sent as-is.
+        """
+        try:
+            style_id = self._interned_style_ids[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable, so it can't be interned
+            return serialize()
+        else:
+            if style_id is None:
+                return serialize()
+
+            return {"_style_": style_id}
+
+        placeholder_count = self._placeholder_count
+        value = serialize()
+
+        if self._placeholder_count != placeholder_count:
+            return value
+
+        if not isinstance(value, dict):
+            self._interned_style_ids[key] = None
+            return value
+
+        style_id = len(self._interned_style_ids)
+        self._interned_style_ids[key] = style_id
+        self._new_style_definitions[style_id] = value
+
+        return {"_style_": style_id}
+
     def _serialize_fill(
         self, fill: fills._FillLike | None
     ) -> uniserde.Jsonable:
@@ -1821,6 +2148,32 @@ a.remove();
 
         return fill._serialize(self)
 
+    def _serialize_placeholder(
+        self,
+        preparation: asyncio.Future[object],
+        placeholder: uniserde.Jsonable,
+    ) -> uniserde.Jsonable:
+        """
+        Serializes a placeholder for a value which is still being prepared in
+        the background, and sends the component currently being serialized to
+        the client again once `preparation` is done.
+        """
+        self._placeholder_count += 1
+        component = self._component_being_serialized
+
+        if component is not None:
+
+            async def resend_when_prepared() -> None:
+                await asyncio.shield(preparation)
+                component._mark_all_properties_as_changed_()
+
+            self.create_task(
+                resend_when_prepared(),
+                name=f"Resend {component} once it is prepared",
+            )
+
+        return placeholder
+
     def _host_and_get_fill_as_css_variables(
         self, fill: text_style._TextFill
     ) -> dict[str, str]:
@@ -1854,6 +2207,34 @@ a.remove();
             "backdrop-filter": "none",
         }
 
+    def _get_theme_css_values(self, thm: theme.Theme) -> dict[str, str]:
+        """
+        Like `_calculate_theme_css_values`, but reuses the result for the app's
+        own themes, which are shared by almost all sessions.
+        """
+        app_themes = self._app_server.app._theme
+
+        if not isinstance(app_themes, tuple):
+            app_themes = (app_themes,)
+
+        if not any(thm is app_theme for app_theme in app_themes):
+            return self._calculate_theme_css_values(thm)
+
+        cache = self._app_server._theme_css_cache
+
+        try:
+            _, variables, fonts = cache[id(thm)]
+        except KeyError:
+            variables = self._calculate_theme_css_values(thm)
+            cache[id(thm)] = (thm, variables, _get_theme_fonts(thm))
+        else:
+            # The variables reference fonts by name, so they still have to be
+            # registered with this session's client
+            for font in fonts:
+                self._register_font(font)
+
+        return variables
+
     def _calculate_theme_css_values(self, thm: theme.Theme) -> dict[str, str]:
         """
         Determines and returns all CSS values that should be applied to a HTML
@@ -1976,7 +2357,7 @@ a.remove();
         self._theme = thm
 
         # Get all CSS values to apply
-        variables = self._calculate_theme_css_values(thm)
+        variables = self._get_theme_css_values(thm)
 
         # Update the variables client-side
         await self._remote_apply_theme(
@@ -2962,10 +3343,15 @@ a.remove();
         global_state.accessed_attributes.clear()
         global_state.accessed_items.clear()
 
+        previous_activity = loop_watchdog.current_activity
+        loop_watchdog.current_activity = ("`build`", component)
+
         build_result = utils.safe_build(
             component.build, component._rio_internal_
         )
 
+        loop_watchdog.current_activity = previous_activity
+
         accessed_attrs = [
             (obj, set(attrs))
             for obj, attrs in global_state.accessed_attributes.items()
@@ -3067,6 +3453,63 @@ a.remove();
         its component tree. Those components are NOT included in the function's
         result.
         """
+        steps = self._iter_refresh_steps()
+
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value
+
+    async def _refresh_in_slices(
+        self,
+        time_slice: float,
+    ) -> tuple[
+        dict[rio.Component, set[str]],
+        t.Iterable[rio.Component],
+        t.Iterable[rio.Component],
+    ]:
+        """
+        Same as `_refresh_sync`, but yields to the event loop whenever building
+        has taken longer than `time_slice` seconds, so that a huge refresh
+        doesn't stall all other sessions.
+
+        The caller must hold the refresh lock and keep
+        `_refresh_is_committed` cleared until the results have been sent, so
+        that no input from the client is processed in between.
+        """
+        steps = self._iter_refresh_steps()
+        deadline = time.perf_counter() + time_slice
+
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value
+
+            if time.perf_counter() >= deadline:
+                await asyncio.sleep(0)
+                deadline = time.perf_counter() + time_slice
+
+    def _iter_refresh_steps(
+        self,
+    ) -> t.Generator[
+        None,
+        None,
+        tuple[
+            dict[rio.Component, set[str]],
+            t.Iterable[rio.Component],
+            t.Iterable[rio.Component],
+        ],
+    ]:
+        """
+        Performs a refresh, yielding after each component that was built. The
+        result is returned once the generator is exhausted.
+
+        Nothing is sent to the client here, so the client never sees a
+        partially built tree, regardless of whether the caller pauses between
+        steps.
+        """
 
         # Keep track of all components which are visited. These have changed
         # somehow and thus must be sent to the client.
@@ -3113,6 +3556,8 @@ a.remove();
                 assert component._build_data_ is not None
                 all_children_new.update(component._build_data_.direct_children)
 
+                yield
+
                 # There is a possibility that a component's build data isn't
                 # up to date because it wasn't in the tree when the last build
                 # was scheduled. Find such components and queue them for a
@@ -3246,59 +3691,107 @@ a.remove();
 
         # For why this lock is here see its creation in `__init__`
         async with self._refresh_lock:
-            # Clear the dict of crashed build functions
-            self._crashed_build_functions.clear()
+            time_slice = self.app._refresh_time_slice
 
-            while True:
-                # Refresh and get a set of all components which have been
-                # visited
+            if time_slice is None:
+                await self._refresh_locked(None)
+                return
+
+            # Input from the client must not modify components while the
+            # refresh is paused. Hold it back until the changes have been sent.
+            self._refresh_is_committed.clear()
+
+            try:
+                await self._refresh_locked(time_slice)
+            finally:
+                self._refresh_is_committed.set()
+
+    async def _wait_until_refresh_is_committed(self) -> None:
+        if not self._refresh_is_committed.is_set():
+            await self._refresh_is_committed.wait()
+
+    async def _wait_until_input_is_applied(self) -> None:
+        """
+        Waits until all component state updates received so far have been
+        applied, and any time-sliced refresh has been committed.
+
+        State updates are applied in batches, so without this, messages that
+        arrive after a state update (e.g. a button press right after typing)
+        could be handled before the update, and see stale values.
+        """
+        batch = self._latest_state_update_batch
+
+        if batch is not None and not batch.done():
+            # Errors are reported to the caller of `_component_state_update`,
+            # not here
+            await asyncio.wait([batch])
+
+        await self._wait_until_refresh_is_committed()
+
+    async def _refresh_locked(self, time_slice: float | None) -> None:
+        """
+        The body of `_refresh`. The caller must hold the refresh lock.
+        """
+        # Clear the dict of crashed build functions
+        self._crashed_build_functions.clear()
+
+        while True:
+            # Refresh and get a set of all components which have been
+            # visited
+            if time_slice is None:
                 (
                     component_properties_to_serialize,
                     mounted_components,
                     unmounted_components,
                 ) = self._refresh_sync()
+            else:
+                (
+                    component_properties_to_serialize,
+                    mounted_components,
+                    unmounted_components,
+                ) = await self._refresh_in_slices(time_slice)
 
-                # Avoid sending empty messages
-                if not component_properties_to_serialize:
-                    return
+            # Avoid sending empty messages
+            if not component_properties_to_serialize:
+                return
 
-                # Serialize all components which need to be sent to the client
-                await self._update_component_states(
-                    component_properties_to_serialize
-                )
+            # Serialize all components which need to be sent to the client
+            await self._update_component_states(
+                component_properties_to_serialize
+            )
 
-                # Trigger the `on_unmount` event
-                #
-                # Notes:
-                # - All events are triggered only after the client has been
-                #   notified of the changes. This way, if the event handlers
-                #   trigger another client message themselves, any referenced
-                #   components will already exist
-                for component in unmounted_components:
-                    # Trigger the event
-                    for handler, _ in component._rio_event_handlers_[
-                        rio.event.EventTag.ON_UNMOUNT
-                    ]:
-                        self._call_event_handler_sync(handler, component)
-
-                # Trigger the `on_mount` event
-                #
-                # Notes:
-                # - See the note on running after notifying the client above
-                # - This function enlarges the set of watched components. The
-                #   `on_unmount` event handler iterates over that set. By
-                #   processing that handler first it only needs to process a
-                #   smaller set
-                for component in mounted_components:
-                    # Trigger the event
-                    for handler, _ in component._rio_event_handlers_[
-                        rio.event.EventTag.ON_MOUNT
-                    ]:
-                        self._call_event_handler_sync(handler, component)
-
-                # If there were any synchronous `on_mount` or `on_unmount`
-                # handlers, we must immediately refresh again. So we'll simply
-                # loop until there are no more dirty components.
+            # Trigger the `on_unmount` event
+            #
+            # Notes:
+            # - All events are triggered only after the client has been
+            #   notified of the changes. This way, if the event handlers
+            #   trigger another client message themselves, any referenced
+            #   components will already exist
+            for component in unmounted_components:
+                # Trigger the event
+                for handler, _ in component._rio_event_handlers_[
+                    rio.event.EventTag.ON_UNMOUNT
+                ]:
+                    self._call_event_handler_sync(handler, component)
+
+            # Trigger the `on_mount` event
+            #
+            # Notes:
+            # - See the note on running after notifying the client above
+            # - This function enlarges the set of watched components. The
+            #   `on_unmount` event handler iterates over that set. By
+            #   processing that handler first it only needs to process a
+            #   smaller set
+            for component in mounted_components:
+                # Trigger the event
+                for handler, _ in component._rio_event_handlers_[
+                    rio.event.EventTag.ON_MOUNT
+                ]:
+                    self._call_event_handler_sync(handler, component)
+
+            # If there were any synchronous `on_mount` or `on_unmount`
+            # handlers, we must immediately refresh again. So we'll simply
+            # loop until there are no more dirty components.
 
     async def _update_component_states(
         self,
@@ -3324,13 +3817,22 @@ a.remove();
         for task in tasks:
             await task
 
+        # Don't let the interned styles grow without bounds. The ids are
+        # reused, so the client overwrites its old styles as well.
+        if len(self._interned_style_ids) > serialization.MAX_INTERNED_STYLES:
+            self._interned_style_ids.clear()
+
         # Serialize the component states
-        delta_states: dict[int, uniserde.JsonDoc] = {
-            component._id_: serialization.serialize_and_host_component(
-                component, props
-            )
-            for component, props in component_properties_to_send.items()
-        }
+        delta_states: dict[int, uniserde.JsonDoc] = {}
+
+        try:
+            for component, props in component_properties_to_send.items():
+                self._component_being_serialized = component
+                delta_states[component._id_] = (
+                    serialization.serialize_and_host_component(component, props)
+                )
+        finally:
+            self._component_being_serialized = None
 
         # Check whether the root component needs replacing. Take care to never
         # send the high level root component. JS only cares about the
@@ -3356,6 +3858,7 @@ a.remove();
 
     async def _send_all_components_on_reconnect(self) -> None:
         self._initialized_html_components.clear()
+        self._interned_style_ids.clear()
 
         # For why this lock is here see its creation in `__init__`
         async with self._refresh_lock:
@@ -3817,34 +4320,122 @@ a.remove();
         component_id: int,
         delta_state: t.Any,
     ) -> None:
-        # Get the component
+        # Fast interactions like typing or dragging a slider produce a flood of
+        # state updates. Refreshing after each one would waste a lot of time,
+        # so instead the updates are queued up and applied in batches. Updates
+        # to the same component are merged, so only the latest value of each
+        # property survives.
+        self._pending_component_state_updates.setdefault(
+            component_id, {}
+        ).update(delta_state)
+
+        batch = self._pending_state_update_batch
+
+        if batch is None:
+            batch = self.create_task(
+                self._apply_component_state_update_batch(
+                    self._latest_state_update_batch
+                ),
+                name="Apply component state updates",
+            )
+            self._pending_state_update_batch = batch
+            self._latest_state_update_batch = batch
+
+        # Wait until the update has been applied, so that messages are still
+        # processed in order. If anything went wrong with this particular
+        # component, re-raise the error here.
+        errors = await asyncio.shield(batch)
+
         try:
-            component = self._weak_components_by_id[component_id]
+            raise errors[component_id]
         except KeyError:
-            logging.warning(
-                f"Received delta state {delta_state} for unknown component {component_id}. (The component might have been deleted in the meantime.)"
-            )
-            return
+            pass
 
-        assert isinstance(
-            component, fundamental_component.FundamentalComponent
-        ), component
+    async def _apply_component_state_update_batch(
+        self,
+        previous_batch: asyncio.Task[dict[int, Exception]] | None,
+    ) -> dict[int, Exception]:
+        """
+        Applies all queued component state updates and refreshes the session
+        once. Returns any exceptions that occurred, by component ID.
+        """
+        # Only one batch is processed at a time. Any updates that arrive in the
+        # meantime accumulate in this batch.
+        if previous_batch is not None:
+            await asyncio.wait([previous_batch])
+
+        # Give messages which have already arrived a chance to join the batch
+        await asyncio.sleep(0)
+
+        # Don't modify components in the middle of a time-sliced refresh
+        await self._wait_until_refresh_is_committed()
+
+        # Take ownership of the queued updates. Anything arriving from now on
+        # goes into the next batch.
+        self._pending_state_update_batch = None
+        updates = self._pending_component_state_updates
+        self._pending_component_state_updates = {}
+
+        errors: dict[int, Exception] = {}
+        applied_updates: list[
+            tuple[
+                int,
+                fundamental_component.FundamentalComponent,
+                dict[str, t.Any],
+            ]
+        ] = []
+
+        # Update all components' states before running any event handlers.
+        # Handlers may yield to the event loop, which could start another
+        # time-sliced refresh, so the remaining updates couldn't be applied
+        # safely anymore.
+        for component_id, delta_state in updates.items():
+            # Get the component
+            try:
+                component = self._weak_components_by_id[component_id]
+            except KeyError:
+                logging.warning(
+                    f"Received delta state {delta_state} for unknown component {component_id}. (The component might have been deleted in the meantime.)"
+                )
+                continue
+
+            assert isinstance(
+                component, fundamental_component.FundamentalComponent
+            ), component
+
+            # Update the component's state
+            try:
+                component._validate_delta_state_from_frontend(delta_state)
+                component._apply_delta_state_from_frontend(delta_state)
+            except Exception as error:
+                errors[component_id] = error
+            else:
+                applied_updates.append((component_id, component, delta_state))
 
-        # Update the component's state
-        component._validate_delta_state_from_frontend(delta_state)
-        component._apply_delta_state_from_frontend(delta_state)
-        await component._call_event_handlers_for_delta_state(delta_state)
+        # Now let the components react to their new state
+        for component_id, component, delta_state in applied_updates:
+            try:
+                await component._call_event_handlers_for_delta_state(
+                    delta_state
+                )
+            except Exception as error:
+                errors[component_id] = error
 
-        # Trigger a refresh. The component itself doesn't need to rebuild, but
-        # other components with a attribute binding to the changed values might.
+        # Trigger a refresh. The components themselves don't need to rebuild,
+        # but other components with a attribute binding to the changed values
+        # might.
         await self._refresh()
 
+        return errors
+
     @unicall.local(name="componentMessage")
     async def _component_message(
         self,
         component_id: int,
         payload: t.Any,
     ) -> None:
+        await self._wait_until_input_is_applied()
+
         # Get the component
         try:
             component = self._weak_components_by_id[component_id]
@@ -3859,6 +4450,8 @@ a.remove();
 
     @unicall.local(name="dialogClosed")
     async def _dialog_closed(self, dialog_root_component_id: int) -> None:
+        await self._wait_until_input_is_applied()
+
         # Fetch and remove the dialog itself, while still not succumbing to
         # network lag
         try:
@@ -3893,6 +4486,8 @@ a.remove();
 
     @unicall.local(name="openUrl")
     async def _open_url(self, url: str) -> None:
+        await self._wait_until_input_is_applied()
+
         # Case: Running as website
         #
         # If running in a browser, JS can take care of changing the URL or
@@ -3936,6 +4531,8 @@ a.remove();
         Called by the client when the page changes. (This happens when the user
         presses the "back" button in the browser.)
         """
+        await self._wait_until_input_is_applied()
+
         self.navigate_to(
             new_url,
             # Since the URL change originated in the browser, it's actually
@@ -3952,6 +4549,8 @@ a.remove();
         """
         Called by the client when the window is resized.
         """
+        await self._wait_until_input_is_applied()
+
         # Update the stored window size
         self.window_width = new_width
         self.window_height = new_height
@@ -3974,6 +4573,8 @@ a.remove();
         """
         Called by the client when a component is resized.
         """
+        await self._wait_until_input_is_applied()
+
         component = self._weak_components_by_id.get(component_id)
         if component:
             resize_event = rio.ComponentResizeEvent(new_width, new_height)
@@ -4179,3 +4780,21 @@ def add_children(components: t.Iterable[rio.Component]) -> set[rio.Component]:
             queue.append(child)
 
     return result
+
+
+def _get_theme_fonts(thm: theme.Theme) -> tuple[rio.Font, ...]:
+    """
+    Returns all fonts referenced by the CSS variables of the given theme.
+    """
+    fonts = [thm.font, thm.monospace_font]
+
+    for style in (
+        thm.heading1_style,
+        thm.heading2_style,
+        thm.heading3_style,
+        thm.text_style,
+    ):
+        if style.font is not None:
+            fonts.append(style.font)
+
+    return tuple(fonts)
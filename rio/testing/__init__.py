@@ -1,3 +1,4 @@
 from .base_client import *
 from .browser_client import *
 from .dummy_client import *
+from .load_test import *
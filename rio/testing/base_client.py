@@ -145,19 +145,40 @@ class BaseClient(abc.ABC):
     def _last_component_state_changes(
         self,
     ) -> t.Mapping[rio.Component, t.Mapping[str, object]]:
-        for message in reversed(self._received_messages):
-            if message["method"] == "updateComponentStates":
-                delta_states: dict = message["params"]["delta_states"]  # type: ignore
-                return {
-                    self.session._weak_components_by_id[
-                        int(component_id)
-                    ]: delta
-                    for component_id, delta in delta_states.items()
-                    if int(component_id)
-                    != self.session._high_level_root_component._id_
-                }
-
-        return {}
+        # Interned styles may have been defined in any earlier message, so
+        # collect them all, just like the client does
+        interned_styles: dict[int, object] = {}
+        last_delta_states: dict | None = None
+
+        for message in self._received_messages:
+            if message["method"] != "updateComponentStates":
+                continue
+
+            last_delta_states = message["params"]["delta_states"]  # type: ignore
+
+            for delta in last_delta_states.values():  # type: ignore
+                for style_id, style in delta.get("_styles_", {}).items():
+                    interned_styles[int(style_id)] = style
+
+        if last_delta_states is None:
+            return {}
+
+        def resolve(delta: dict) -> dict:
+            return {
+                name: interned_styles[value["_style_"]]
+                if isinstance(value, dict) and "_style_" in value
+                else value
+                for name, value in delta.items()
+                if name != "_styles_"
+            }
+
+        return {
+            self.session._weak_components_by_id[int(component_id)]: resolve(
+                delta
+            )
+            for component_id, delta in last_delta_states.items()
+            if int(component_id) != self.session._high_level_root_component._id_
+        }
 
     def _get_build_output(
         self,
@@ -0,0 +1,733 @@
+"""
+Simulates many concurrent users of an app, to find out how much load a server
+can handle.
+
+Each simulated user gets its own session and runs a script of interactions
+(clicks, text input, navigation) against it. Sessions either talk to the app
+in-process, or over real websockets to a local uvicorn server. Afterwards, a
+`LoadTestReport` summarizes refresh latencies, traffic and resource usage.
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import contextlib
+import dataclasses
+import json
+import os
+import re
+import sys
+import time
+import typing as t
+
+import starlette.datastructures
+import typing_extensions as te
+from uniserde import JsonDoc
+
+import rio
+import rio.app_server
+
+from .. import arequests, data_models, serialization
+from ..components.fundamental_component import FundamentalComponent
+from ..transports import AbstractTransport, TransportClosedIntentionally
+from ..utils import choose_free_port
+from .base_client import BaseClient
+
+__all__ = [
+    "LoadTestClient",
+    "LoadTestReport",
+    "run_load_test",
+]
+
+
+# Some servers treat clients differently if they look like crawlers, so
+# pretend to be a regular browser
+_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko)"
+    " Chrome/130.0.0.0 Safari/537.36"
+)
+
+_SESSION_TOKEN_PATTERN = re.compile(r'SESSION_TOKEN\s*=\s*"([^"]+)"')
+
+
+@dataclasses.dataclass(frozen=True)
+class LoadTestReport:
+    """
+    The results of a load test.
+
+    ## Attributes
+
+    `session_count`: How many sessions were simulated.
+
+    `failed_session_count`: How many of those sessions didn't complete their
+        script, e.g. because the script raised an exception.
+
+    `interaction_count`: How many interactions were performed, across all
+        sessions.
+
+    `refresh_latencies`: How long it took (in seconds) from each interaction
+        until the server sent the resulting changes to the client. Interactions
+        which didn't lead to any changes aren't included.
+
+    `messages_per_interaction`: How many messages the server sent to the
+        client per interaction, on average.
+
+    `bytes_per_interaction`: How many bytes the server sent to the client per
+        interaction, on average.
+
+    `cpu_time_per_session`: The CPU time (in seconds) used by the process
+        during the test, divided by the number of sessions. The simulated
+        clients run in the same process, so this includes their overhead as
+        well.
+
+    `rss_per_session`: How much the process' resident memory grew (in bytes)
+        during the test, divided by the number of sessions. `None` if the
+        memory usage can't be determined on this platform.
+
+    `duration`: How long the entire test took, in seconds.
+
+    `errors`: Descriptions of the errors which made sessions fail.
+    """
+
+    session_count: int
+    failed_session_count: int
+    interaction_count: int
+    refresh_latencies: tuple[float, ...]
+    messages_per_interaction: float
+    bytes_per_interaction: float
+    cpu_time_per_session: float
+    rss_per_session: float | None
+    duration: float
+    errors: tuple[str, ...]
+
+    def latency_percentile(self, percentile: float) -> float:
+        """
+        Returns the given percentile (0 to 100) of the refresh latencies, in
+        seconds. Returns `nan` if no refreshes were measured.
+        """
+        if not self.refresh_latencies:
+            return float("nan")
+
+        latencies = sorted(self.refresh_latencies)
+        index = round(percentile / 100 * (len(latencies) - 1))
+        return latencies[index]
+
+    @property
+    def p50(self) -> float:
+        return self.latency_percentile(50)
+
+    @property
+    def p95(self) -> float:
+        return self.latency_percentile(95)
+
+    @property
+    def p99(self) -> float:
+        return self.latency_percentile(99)
+
+    def format(self) -> str:
+        """
+        Returns a human readable summary of the report.
+        """
+        if self.rss_per_session is None:
+            rss = "unknown"
+        else:
+            rss = f"{self.rss_per_session / 1024:.0f} KiB"
+
+        lines = [
+            f"Sessions:            {self.session_count}"
+            f" ({self.failed_session_count} failed)",
+            f"Interactions:        {self.interaction_count}"
+            f" in {self.duration:.2f}s",
+            f"Refresh latency:     p50 {self.p50 * 1000:.1f} ms,"
+            f" p95 {self.p95 * 1000:.1f} ms, p99 {self.p99 * 1000:.1f} ms",
+            f"Per interaction:     {self.messages_per_interaction:.1f}"
+            f" messages, {self.bytes_per_interaction:.0f} bytes",
+            f"Per session:         {self.cpu_time_per_session * 1000:.1f} ms"
+            f" CPU, {rss} RSS",
+        ]
+
+        for error in self.errors:
+            lines.append(f"Error: {error}")
+
+        return "\n".join(lines)
+
+
+class LoadTestClient(BaseClient):
+    """
+    A simulated user, as passed to load test scripts.
+
+    In addition to inspecting the session's components (just like a
+    `DummyClient`), scripts can interact with them. Interactions are sent to
+    the session the same way a browser would send them, and their latency is
+    measured.
+    """
+
+    def __post_init__(self) -> None:
+        self._shared_app_server: rio.app_server.AbstractAppServer | None = None
+
+        # How long to wait for the server to respond to an interaction
+        self.refresh_timeout = 5.0
+
+        # Statistics. Only traffic caused by interactions is counted, not
+        # the initial page load.
+        self.interaction_count = 0
+        self.refresh_latencies = list[float]()
+        self.received_message_count = 0
+        self.received_byte_count = 0
+
+    async def _get_app_server(self) -> rio.app_server.AbstractAppServer:
+        assert self._shared_app_server is not None
+        return self._shared_app_server
+
+    def _receive_message(self, message: str) -> None:
+        """
+        Called for every message sent by the server.
+        """
+        parsed_message = json.loads(message)
+
+        self.received_message_count += 1
+        self.received_byte_count += len(message.encode())
+
+        self._process_sent_message(parsed_message)
+
+        # Pretend that requests were successful
+        if "id" in parsed_message:
+            self._send_nowait(
+                {
+                    "jsonrpc": "2.0",
+                    "id": parsed_message["id"],
+                    "result": None,
+                }
+            )
+
+    @abc.abstractmethod
+    def _send_nowait(self, message: JsonDoc) -> None:
+        """
+        Sends a message to the server, without waiting for it to be delivered.
+        """
+        raise NotImplementedError
+
+    async def _send(self, message: JsonDoc) -> None:
+        self._send_nowait(message)
+
+    async def _interact(
+        self,
+        method: str,
+        params: JsonDoc,
+        *,
+        wait_for_refresh: bool,
+    ) -> None:
+        self._refresh_completed.clear()
+        started_at = time.perf_counter()
+
+        await self._send(
+            {
+                "jsonrpc": "2.0",
+                "method": method,
+                "params": params,
+            }
+        )
+        self.interaction_count += 1
+
+        if not wait_for_refresh:
+            return
+
+        try:
+            await asyncio.wait_for(
+                self._refresh_completed.wait(),
+                timeout=self.refresh_timeout,
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"The server didn't respond to `{method}` within"
+                f" {self.refresh_timeout} seconds. If this interaction doesn't"
+                f" change anything, pass `wait_for_refresh=False`."
+            ) from None
+
+        self.refresh_latencies.append(time.perf_counter() - started_at)
+
+    async def send_component_message(
+        self,
+        component: rio.Component,
+        payload: JsonDoc,
+        *,
+        wait_for_refresh: bool = True,
+    ) -> None:
+        """
+        Sends a message to the given component, as its frontend counterpart
+        would.
+        """
+        await self._interact(
+            "componentMessage",
+            {
+                "component_id": component._id_,
+                "payload": payload,
+            },
+            wait_for_refresh=wait_for_refresh,
+        )
+
+    async def update_component_state(
+        self,
+        component: rio.Component,
+        delta_state: JsonDoc,
+        *,
+        wait_for_refresh: bool = True,
+    ) -> None:
+        """
+        Changes attributes of the given component, as if the user had changed
+        them in the browser (e.g. by dragging a slider).
+        """
+        await self._interact(
+            "componentStateUpdate",
+            {
+                "component_id": component._id_,
+                "delta_state": delta_state,
+            },
+            wait_for_refresh=wait_for_refresh,
+        )
+
+    async def click(
+        self,
+        component: rio.Component,
+        *,
+        wait_for_refresh: bool = True,
+    ) -> None:
+        """
+        Clicks the given component. High level components like `rio.Button` are
+        clicked by clicking the fundamental component they're built from.
+        """
+        while not isinstance(component, FundamentalComponent):
+            component = self._get_build_output(component)
+
+        await self.send_component_message(
+            component,
+            {"type": "press"},
+            wait_for_refresh=wait_for_refresh,
+        )
+
+    async def enter_text(
+        self,
+        component: rio.Component,
+        text: str,
+        *,
+        confirm: bool = False,
+        wait_for_refresh: bool = True,
+    ) -> None:
+        """
+        Replaces the text of a text input, as if the user had typed it. If
+        `confirm` is `True`, the input is also confirmed, as if the user had
+        pressed enter.
+        """
+        while not isinstance(component, FundamentalComponent):
+            component = self._get_build_output(component)
+
+        await self.send_component_message(
+            component,
+            {
+                "type": "confirm" if confirm else "change",
+                "text": text,
+            },
+            wait_for_refresh=wait_for_refresh,
+        )
+
+    async def navigate_to(
+        self,
+        url: str,
+        *,
+        wait_for_refresh: bool = True,
+    ) -> None:
+        """
+        Navigates to the given URL, as if the user had clicked a link to it.
+        """
+        await self._interact(
+            "openUrl",
+            {"url": url},
+            wait_for_refresh=wait_for_refresh,
+        )
+
+
+class _InProcessTransport(AbstractTransport):
+    """
+    Connects a `LoadTestClient` directly to its session, without any network
+    in between.
+    """
+
+    def __init__(self, client: _InProcessLoadTestClient) -> None:
+        super().__init__()
+
+        self._client = client
+        self._incoming_messages = asyncio.Queue[str | None]()
+
+    @te.override
+    async def send_if_possible(self, message: str) -> None:
+        if not self.is_closed:
+            self._client._receive_message(message)
+
+    @te.override
+    async def receive(self) -> str:
+        message = await self._incoming_messages.get()
+
+        if message is None:
+            raise TransportClosedIntentionally()
+
+        return message
+
+    @te.override
+    async def close(self) -> None:
+        self._incoming_messages.put_nowait(None)
+        self.closed_event.set()
+
+    def put(self, message: JsonDoc) -> None:
+        self._incoming_messages.put_nowait(json.dumps(message))
+
+
+class _InProcessLoadTestClient(LoadTestClient):
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self._transport = _InProcessTransport(self)
+
+    def _send_nowait(self, message: JsonDoc) -> None:
+        self._transport.put(message)
+
+    async def _create_session(self) -> rio.Session:
+        assert self._app_server is not None
+
+        url = str(rio.URL("http://load.test") / self._active_url.lstrip("/"))
+
+        return await self._app_server.create_session(
+            initial_message=data_models.InitialClientMessage.from_defaults(
+                url=url,
+                user_settings=self._user_settings,
+            ),
+            transport=self._transport,
+            client_ip="localhost",
+            client_port=12345,
+            http_headers=starlette.datastructures.Headers(
+                {"user-agent": _USER_AGENT}
+            ),
+            cookies=self._cookies,
+        )
+
+
+class _WebsocketLoadTestClient(LoadTestClient):
+    def __post_init__(self) -> None:
+        super().__post_init__()
+
+        self._port = 0
+        self._websocket: t.Any = None
+        self._receive_task: asyncio.Task[None] | None = None
+
+        # Keeps the tasks created by `_send_nowait` from being garbage
+        # collected
+        self._send_tasks = set[asyncio.Task[None]]()
+
+    def _send_nowait(self, message: JsonDoc) -> None:
+        assert self._websocket is not None
+
+        task = asyncio.create_task(self._websocket.send(json.dumps(message)))
+        self._send_tasks.add(task)
+        task.add_done_callback(self._send_tasks.discard)
+
+    async def _send(self, message: JsonDoc) -> None:
+        assert self._websocket is not None
+        await self._websocket.send(json.dumps(message))
+
+    async def _create_session(self) -> rio.Session:
+        import websockets
+
+        app_server = self._app_server
+        assert isinstance(app_server, rio.app_server.FastapiServer)
+
+        # Load the page, just like a browser would. The HTML contains the
+        # session token.
+        base_url = f"localhost:{self._port}"
+        response = await arequests.request(
+            "get",
+            f"http://{base_url}/{self._active_url.lstrip('/')}",
+            headers={
+                "accept": "text/html",
+                "user-agent": _USER_AGENT,
+            },
+        )
+
+        match = _SESSION_TOKEN_PATTERN.search(response.read().decode())
+        assert match is not None, "The page doesn't contain a session token"
+        session_token = match.group(1)
+
+        # Connect and introduce ourselves
+        self._websocket = await websockets.connect(
+            f"ws://{base_url}/rio/ws?session_token={session_token}",
+            max_size=None,
+        )
+
+        initial_message = data_models.InitialClientMessage.from_defaults(
+            url=f"http://{base_url}/{self._active_url.lstrip('/')}",
+            user_settings=self._user_settings,
+        )
+        await self._websocket.send(
+            json.dumps(serialization.json_serde.as_json(initial_message))
+        )
+
+        self._receive_task = asyncio.create_task(self._receive_messages())
+
+        # The session exists as soon as the server has sent its first update
+        await self._refresh_completed.wait()
+        return app_server._active_session_tokens[session_token]
+
+    async def _receive_messages(self) -> None:
+        import websockets
+
+        try:
+            async for message in self._websocket:
+                self._receive_message(message)
+        except websockets.ConnectionClosed:
+            pass
+
+    async def __aexit__(self, *_) -> None:
+        if self._websocket is not None:
+            await self._websocket.close()
+
+        if self._receive_task is not None:
+            await self._receive_task
+
+        await super().__aexit__()
+
+
+async def run_load_test(
+    app: rio.App,
+    script: t.Callable[[LoadTestClient], t.Awaitable[None]],
+    *,
+    sessions: int = 10,
+    transport: t.Literal["in-process", "websocket"] = "in-process",
+    ramp_up: float = 0,
+    active_url: str = "/",
+    refresh_timeout: float = 5,
+) -> LoadTestReport:
+    """
+    Simulates many users of an app at once, and reports how well the app
+    copes.
+
+    Each simulated user connects to the app, runs the `script` and
+    disconnects again. The script is an async function receiving a
+    `LoadTestClient`, which it can use to find components and interact with
+    them:
+
+    ```python
+    async def script(client: rio.testing.LoadTestClient) -> None:
+        await client.enter_text(client.get_component(rio.TextInput), "Hello")
+        await client.click(client.get_component(rio.Button))
+        await client.navigate_to("/about")
+
+
+    report = await rio.testing.run_load_test(app, script, sessions=100)
+    print(report.format())
+    ```
+
+    ## Parameters
+
+    `app`: The app to test.
+
+    `script`: The interactions to perform in every session.
+
+    `sessions`: How many users to simulate.
+
+    `transport`: How the simulated users connect to the app. `"in-process"`
+        passes messages directly to the sessions, which measures the cost of
+        the app itself. `"websocket"` starts a local uvicorn server and talks
+        to it over real websockets, which also includes the cost of
+        serialization and the network stack.
+
+    `ramp_up`: Sessions are started evenly spread out over this many seconds,
+        rather than all at once.
+
+    `active_url`: The URL each user initially visits.
+
+    `refresh_timeout`: How long (in seconds) to wait for the server to respond
+        to an interaction before the session is considered failed.
+    """
+    if sessions < 1:
+        raise ValueError("At least one session is required")
+
+    if transport not in ("in-process", "websocket"):
+        raise ValueError(f"Invalid transport: {transport!r}")
+
+    async with contextlib.AsyncExitStack() as exit_stack:
+        if transport == "in-process":
+            client_type = _InProcessLoadTestClient
+            app_server = rio.app_server.TestingServer(app)
+            port = 0
+        else:
+            client_type = _WebsocketLoadTestClient
+            app_server, port = await exit_stack.enter_async_context(
+                _serve_with_uvicorn(app)
+            )
+
+        clients = list[LoadTestClient]()
+        errors = list[str]()
+
+        async def run_session(index: int) -> bool:
+            await asyncio.sleep(ramp_up * index / sessions)
+
+            client = client_type(app, active_url=active_url)
+            client._shared_app_server = app_server
+            client.refresh_timeout = refresh_timeout
+
+            if isinstance(client, _WebsocketLoadTestClient):
+                client._port = port
+
+            clients.append(client)
+
+            try:
+                async with client:
+                    # Only count traffic caused by the script
+                    client.received_message_count = 0
+                    client.received_byte_count = 0
+
+                    await script(client)
+            except Exception as error:
+                errors.append(
+                    f"Session {index}: {type(error).__name__}: {error}"
+                )
+                return False
+
+            return True
+
+        # Sample the memory usage in the background, since sessions come and go
+        # throughout the test
+        initial_rss = _get_rss()
+        peak_rss = initial_rss
+
+        async def sample_rss() -> None:
+            nonlocal peak_rss
+
+            while True:
+                await asyncio.sleep(0.05)
+                rss = _get_rss()
+
+                if rss is not None and peak_rss is not None:
+                    peak_rss = max(peak_rss, rss)
+
+        rss_sampler = asyncio.create_task(sample_rss())
+        started_at = time.perf_counter()
+        initial_cpu_time = time.process_time()
+
+        try:
+            results = await asyncio.gather(
+                *(run_session(index) for index in range(sessions))
+            )
+        finally:
+            cpu_time = time.process_time() - initial_cpu_time
+            duration = time.perf_counter() - started_at
+            rss_sampler.cancel()
+
+    interaction_count = sum(client.interaction_count for client in clients)
+    divisor = max(interaction_count, 1)
+
+    if initial_rss is None or peak_rss is None:
+        rss_per_session = None
+    else:
+        rss_per_session = max(peak_rss - initial_rss, 0) / sessions
+
+    return LoadTestReport(
+        session_count=sessions,
+        failed_session_count=results.count(False),
+        interaction_count=interaction_count,
+        refresh_latencies=tuple(
+            latency
+            for client in clients
+            for latency in client.refresh_latencies
+        ),
+        messages_per_interaction=sum(
+            client.received_message_count for client in clients
+        )
+        / divisor,
+        bytes_per_interaction=sum(
+            client.received_byte_count for client in clients
+        )
+        / divisor,
+        cpu_time_per_session=cpu_time / sessions,
+        rss_per_session=rss_per_session,
+        duration=duration,
+        errors=tuple(errors),
+    )
+
+
+@contextlib.asynccontextmanager
+async def _serve_with_uvicorn(
+    app: rio.App,
+) -> t.AsyncIterator[tuple[rio.app_server.FastapiServer, int]]:
+    """
+    Serves the app on a free port of localhost for the duration of the
+    context. Yields the app server and the port.
+    """
+    import uvicorn
+
+    server_is_ready_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    def set_server_ready_event() -> None:
+        loop.call_soon_threadsafe(server_is_ready_event.set)
+
+    app_server = rio.app_server.FastapiServer(
+        app,
+        debug_mode=False,
+        running_in_window=False,
+        internal_on_app_start=set_server_ready_event,
+        base_url=None,
+    )
+
+    port = choose_free_port("localhost")
+    uvicorn_server = uvicorn.Server(
+        uvicorn.Config(
+            app_server,
+            host="localhost",
+            port=port,
+            log_level="critical",
+        )
+    )
+
+    serve_task = asyncio.create_task(uvicorn_server.serve())
+
+    try:
+        # Wait until uvicorn accepts connections, or crashes
+        while not (server_is_ready_event.is_set() and uvicorn_server.started):
+            if serve_task.done():
+                serve_task.result()
+                raise RuntimeError("The uvicorn server exited unexpectedly")
+
+            await asyncio.sleep(0.01)
+
+        yield app_server, port
+    finally:
+        uvicorn_server.should_exit = True
+        await serve_task
+
+
+def _get_rss() -> int | None:
+    """
+    Returns the current resident memory of this process in bytes, or `None` if
+    it can't be determined.
+    """
+    # Linux
+    try:
+        with open("/proc/self/statm") as file:
+            resident_pages = int(file.read().split()[1])
+
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    # Other unixes only report the peak, which is good enough for our purposes
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # macOS reports bytes, everybody else kilobytes
+    if sys.platform == "darwin":
+        return max_rss
+
+    return max_rss * 1024
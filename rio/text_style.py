@@ -68,6 +68,8 @@ class Font(SelfSerializing):
         bold: pathlib.Path | bytes | None = None,
         italic: pathlib.Path | bytes | None = None,
         bold_italic: pathlib.Path | bytes | None = None,
+        *,
+        subsets: t.Iterable[str] = (),
     ):
         """
         ## Parameters
@@ -79,7 +81,22 @@ class Font(SelfSerializing):
         `italic`: The italic font file.
 
         `bold_italic`: The bold and italic font file.
+
+        `subsets`: Splits the font files into several smaller ones, each
+            covering only part of the font's characters. Browsers only download
+            the parts a page actually uses. Each subset is either a name like
+            `"latin"`, `"latin-ext"`, `"cyrillic"`, `"cyrillic-ext"`,
+            `"greek"`, `"greek-ext"` or `"vietnamese"`, or a CSS unicode range
+            such as `"U+0000-00FF"`. Characters not covered by any subset are
+            kept in an extra file, so none are lost. This requires `fontTools`
+            to be installed, otherwise the font files are served unchanged.
         """
+        from . import font_optimization
+
+        # Make sure the subsets are valid. This raises a `ValueError` if not.
+        self._subsets = tuple(subsets)
+        font_optimization.resolve_subsets(self._subsets)
+
         self._faces = [FontFace(Asset.new(regular), "", {})]
 
         if bold is not None:
@@ -243,11 +260,24 @@ class Font(SelfSerializing):
     ROBOTO_MONO: t.ClassVar[Font]
 
 
+# The subsets the predefined fonts are split into. Together they cover most of
+# the Roboto glyphs, so browsers rarely need more than one or two files.
+_ROBOTO_SUBSETS = (
+    "latin",
+    "latin-ext",
+    "cyrillic",
+    "cyrillic-ext",
+    "greek",
+    "greek-ext",
+    "vietnamese",
+)
+
 Font.ROBOTO = Font(
     regular=utils.RIO_ASSETS_DIR / "fonts/Roboto/Roboto-Regular.ttf",
     bold=utils.RIO_ASSETS_DIR / "fonts/Roboto/Roboto-Bold.ttf",
     italic=utils.RIO_ASSETS_DIR / "fonts/Roboto/Roboto-Italic.ttf",
     bold_italic=utils.RIO_ASSETS_DIR / "fonts/Roboto/Roboto-BoldItalic.ttf",
+    subsets=_ROBOTO_SUBSETS,
 )
 
 Font.ROBOTO_MONO = Font(
@@ -256,6 +286,7 @@ Font.ROBOTO_MONO = Font(
     italic=utils.RIO_ASSETS_DIR / "fonts/Roboto Mono/RobotoMono-Italic.ttf",
     bold_italic=utils.RIO_ASSETS_DIR
     / "fonts/Roboto Mono/RobotoMono-BoldItalic.ttf",
+    subsets=_ROBOTO_SUBSETS,
 )
 
 
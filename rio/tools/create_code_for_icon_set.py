@@ -2,6 +2,7 @@ import collections
 import contextlib
 import sys
 import tarfile
+import zipfile
 from pathlib import Path
 
 import introspection
@@ -60,6 +61,23 @@ def collect_icons(archive_file: str) -> dict[str, list[str]]:
     # Map icons to their variants
     icons = collections.defaultdict[str, list[str]](list)
 
+    # Indexed archives list their files directly
+    if archive_file.endswith(".zip"):
+        with zipfile.ZipFile(archive_file) as archive:
+            for member in archive.infolist():
+                # Skip directories and anything that isn't an icon
+                if member.is_dir() or not member.filename.endswith(".svg"):
+                    continue
+
+                (icon_set_name, *variant, icon_file) = member.filename.split(
+                    "/"
+                )
+                icons[Path(icon_file).stem].append(
+                    variant[0] if variant else ""
+                )
+
+        return icons
+
     with tarfile.open(archive_file) as archive:
         for member in archive.getmembers():
             try:
@@ -8,6 +8,7 @@ import os
 import re
 import secrets
 import socket
+import tempfile
 import typing as t
 from io import BytesIO, StringIO
 from pathlib import Path
@@ -22,6 +23,7 @@ import rio
 from . import deprecations
 
 __all__ = [
+    "ByteRangeSource",
     "EventHandler",
     "FileInfo",
     "ImageLike",
@@ -362,6 +364,62 @@ class FileInfo:
         raise ValueError("Invalid type. Expected 'r' or 'rb'.")
 
 
+@dataclasses.dataclass(frozen=True)
+class ByteRangeSource:
+    """
+    A file which is read piece by piece, rather than all at once.
+
+    Components like `rio.MediaPlayer` and `rio.PdfViewer` usually receive their
+    file as a path, URL or `bytes`. If the file lives somewhere else, such as
+    an object storage bucket or a database, loading it into memory in its
+    entirety just to display it would be wasteful. A `ByteRangeSource` instead
+    tells Rio how large the file is, and how to read any part of it. Browsers
+    then only request the parts they need - e.g. the pages of a PDF which are
+    being looked at, or the part of a video the user has skipped to.
+
+    Sources which compare equal are served under the same URL. Pass the same
+    function every time (e.g. a method of an object that you keep around),
+    rather than a new `lambda`, so the file isn't reloaded whenever the
+    component is rebuilt.
+
+
+    ## Attributes
+
+    `size_in_bytes`: The total size of the file, in bytes.
+
+    `read_range`: An async function which receives a start and end offset
+        and returns the bytes in between. The start is inclusive and the end
+        exclusive, just like in a slice.
+
+
+    ## Examples
+
+    Plays a video from memory, one chunk at a time:
+
+    ```python
+    VIDEO_DATA = bytes(1024)
+
+
+    async def read_video(start: int, end: int) -> bytes:
+        return VIDEO_DATA[start:end]
+
+
+    rio.MediaPlayer(
+        rio.ByteRangeSource(len(VIDEO_DATA), read_video),
+        media_type="video/mp4",
+    )
+    ```
+
+
+    ## Metadata
+
+    `experimental`: True
+    """
+
+    size_in_bytes: int
+    read_range: t.Callable[[int, int], t.Awaitable[bytes]]
+
+
 def url_relative_to_base(base: URL, other: URL) -> URL:
     """
     Returns `other` as a relative URL to `base`. Raises a `ValueError` if
@@ -608,6 +666,26 @@ def is_python_script(path: Path) -> bool:
     return path.suffix in (".py", ".pyc", ".pyd", ".pyo", ".pyw")
 
 
+def write_file_atomically(path: Path, data: bytes | bytearray) -> None:
+    """
+    Writes the data to the given path, making sure that other threads and
+    processes never see a partially written file. Missing parent directories
+    are created.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
 def normalize_file_extension(suffix: str) -> str:
     """
     Brings different notations for file extensions into the same form.
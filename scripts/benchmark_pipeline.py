@@ -0,0 +1,802 @@
+"""
+Benchmarks for the core refresh pipeline: building, reconciling and
+serializing components, encoding messages as JSON, converting table data, and
+serving many sessions at once.
+
+Every benchmark runs a synthetic app and times one operation repeatedly. The
+results can be saved as JSON and compared against a previous run, which makes
+it possible to attach numbers to changes to these hot paths, and to catch
+regressions in CI:
+
+    python scripts/benchmark_pipeline.py --save baseline.json
+    # ... make changes ...
+    python scripts/benchmark_pipeline.py --compare baseline.json
+
+When comparing, the script exits with a non-zero status if any benchmark got
+slower than the threshold allows. Only the fastest round of each benchmark is
+compared, since it's the least affected by noise from other processes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import gc
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import typing as t
+from pathlib import Path
+
+import introspection
+
+import rio
+import rio.testing
+from rio import global_state, json_backends, serialization
+from rio.components import dialog_container, fundamental_component
+from rio.components.table import _data_to_columnar
+from rio.session import find_components_for_reconciliation
+
+# A benchmark is an async context manager. Entering it sets up the app, and it
+# yields the operation to time.
+Benchmark = t.Callable[
+    [],
+    t.AsyncContextManager[t.Callable[[], t.Awaitable[None]]],
+]
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+class SkipBenchmark(Exception):
+    pass
+
+
+def benchmark(
+    name: str,
+) -> t.Callable[[t.Callable[[], t.AsyncIterator[t.Any]]], Benchmark]:
+    def decorator(
+        function: t.Callable[[], t.AsyncIterator[t.Any]],
+    ) -> Benchmark:
+        BENCHMARKS[name] = contextlib.asynccontextmanager(function)
+        return BENCHMARKS[name]
+
+    return decorator
+
+
+# Synthetic apps
+
+
+class Node(rio.Component):
+    depth: int
+    label: str
+
+    def build(self) -> rio.Component:
+        if self.depth == 0:
+            return rio.Text(self.label)
+
+        return rio.Container(Node(self.depth - 1, self.label))
+
+
+class DeepTree(rio.Component):
+    label: str = "a"
+
+    def build(self) -> rio.Component:
+        return Node(200, self.label)
+
+
+class Row(rio.Component):
+    text: str
+
+    def build(self) -> rio.Component:
+        return rio.Row(
+            rio.Icon("material/star"),
+            rio.Text(self.text, grow_x=True),
+            rio.Button("Remove"),
+            spacing=1,
+        )
+
+
+class WideList(rio.Component):
+    items: list[str] = []
+
+    def build(self) -> rio.Component:
+        return rio.ScrollContainer(
+            rio.Column(*[Row(item, key=item) for item in self.items]),
+        )
+
+
+class Counter(rio.Component):
+    value: int = 0
+
+    def build(self) -> rio.Component:
+        return rio.Text(str(self.value))
+
+
+class ManyCounters(rio.Component):
+    def build(self) -> rio.Component:
+        return rio.Column(*[Counter() for _ in range(2000)])
+
+
+class Clicker(rio.Component):
+    clicks: int = 0
+
+    def build(self) -> rio.Component:
+        return rio.Column(
+            rio.Text(f"Clicked {self.clicks} times"),
+            rio.Button("Click me", on_press=self._on_press),
+            *[rio.Text(f"Line {index}") for index in range(100)],
+        )
+
+    def _on_press(self) -> None:
+        self.clicks += 1
+
+
+CELL_STYLE = rio.TextStyle(font_size=0.9, fill=rio.Color.from_hex("#334455"))
+HEADER_STYLE = rio.TextStyle(font_size=1.1, font_weight="bold")
+
+
+class Cell(rio.Component):
+    row: int
+    column: int
+
+    def build(self) -> rio.Component:
+        return rio.Rectangle(
+            content=rio.Text(
+                f"{self.row}:{self.column}",
+                style=HEADER_STYLE if self.row == 0 else CELL_STYLE,
+                margin=0.5,
+            ),
+            fill=rio.Color.from_hex("#f0f0f0"),
+            hover_fill=rio.Color.from_hex("#e0e0e0"),
+            corner_radius=0.2,
+        )
+
+
+class StyledTable(rio.Component):
+    def build(self) -> rio.Component:
+        return rio.Grid(
+            *[[Cell(row, column) for column in range(8)] for row in range(250)],
+            row_spacing=0.2,
+            column_spacing=0.2,
+        )
+
+
+class NumpyDashboard(rio.Component):
+    def build(self) -> rio.Component:
+        import numpy as np
+
+        values = np.linspace(0, 1, 2000, dtype=np.float32)
+
+        return rio.Column(
+            *[
+                rio.Row(
+                    rio.Slider(
+                        value=value,
+                        minimum=np.float32(0),
+                        maximum=np.float32(1),
+                    ),
+                    rio.ProgressBar(progress=value),
+                )
+                for value in values
+            ]
+        )
+
+
+async def refresh(client: rio.testing.DummyClient) -> None:
+    # Calling `_refresh` directly (rather than waiting for the session to
+    # notice the change) keeps scheduling noise out of the measurement
+    await client.session._refresh()
+
+
+@benchmark("refresh/deep-tree")
+async def bench_deep_tree() -> t.AsyncIterator[t.Any]:
+    """
+    Rebuilds a 200 levels deep tree of components.
+    """
+    async with rio.testing.DummyClient(DeepTree) as client:
+        root = client.get_component(DeepTree)
+
+        async def run() -> None:
+            root.label = "b" if root.label == "a" else "a"
+            await refresh(client)
+
+        yield run
+
+
+@benchmark("refresh/wide-list-replace")
+async def bench_wide_list_replace() -> t.AsyncIterator[t.Any]:
+    """
+    Replaces a list of 1000 rows with a different one.
+    """
+    lists = [
+        [f"Item {index}" for index in range(1000)],
+        [f"Item {index}" for index in range(500, 1500)],
+    ]
+
+    async with rio.testing.DummyClient(lambda: WideList(lists[0])) as client:
+        root = client.get_component(WideList)
+        iteration = 0
+
+        async def run() -> None:
+            nonlocal iteration
+            iteration += 1
+
+            root.items = lists[iteration % 2]
+            await refresh(client)
+
+        yield run
+
+
+@benchmark("refresh/small-update")
+async def bench_small_update() -> t.AsyncIterator[t.Any]:
+    """
+    Changes a single component among 2000 siblings.
+    """
+    async with rio.testing.DummyClient(ManyCounters) as client:
+        counters = list(client.get_components(Counter))
+        iteration = 0
+
+        async def run() -> None:
+            nonlocal iteration
+            iteration += 1
+
+            counters[iteration % len(counters)].value += 1
+            await refresh(client)
+
+        yield run
+
+
+@benchmark("reconcile/wide-list")
+async def bench_reconcile() -> t.AsyncIterator[t.Any]:
+    """
+    Pairs up the components of two builds of a 1000 row list.
+    """
+    items = [f"Item {index}" for index in range(1000)]
+
+    async with rio.testing.DummyClient() as client:
+        session = client.session
+
+        # Components can only be created while a session is building
+        global_state.currently_building_session = session
+
+        try:
+            old_build = rio.Column(*[Row(item) for item in items])
+            new_build = rio.Column(*[Row(item) for item in items])
+        finally:
+            global_state.currently_building_session = None
+
+        async def run() -> None:
+            for _ in find_components_for_reconciliation(
+                old_build, new_build, {}, {}
+            ):
+                pass
+
+        yield run
+
+
+@benchmark("serialize/wide-list")
+async def bench_serialize() -> t.AsyncIterator[t.Any]:
+    """
+    Serializes every property of all components in a 1000 row list.
+    """
+    items = [f"Item {index}" for index in range(1000)]
+
+    async with rio.testing.DummyClient(lambda: WideList(items)) as client:
+        components = list(client.get_components())
+        properties = {
+            type_: list(
+                serialization.get_all_serializable_property_names(type_)
+            )
+            for type_ in {type(component) for component in components}
+        }
+
+        async def run() -> None:
+            for component in components:
+                serialization.serialize_and_host_component(
+                    component, properties[type(component)]
+                )
+
+        yield run
+
+
+def serialize_generically(
+    component: rio.Component,
+    properties_to_serialize: t.Iterable[str],
+) -> dict[str, t.Any]:
+    """
+    The way components were serialized before the serializers were specialized
+    for each class. Used to make sure the specialized serializers produce the
+    same results.
+    """
+    result: dict[str, t.Any] = {
+        "_python_type_": type(component).__name__,
+        "_rio_internal_": component._rio_internal_,
+        "key": component.key,
+        "accessibility_role": component.accessibility_role,
+    }
+
+    def get_margin(*margins: float | None) -> float:
+        for margin in margins:
+            if margin is not None:
+                return margin
+
+        return 0
+
+    margin_x = component.margin_x
+    margin_y = component.margin_y
+    margin = component.margin
+
+    result["_margin_"] = (
+        get_margin(component.margin_left, margin_x, margin),
+        get_margin(component.margin_top, margin_y, margin),
+        get_margin(component.margin_right, margin_x, margin),
+        get_margin(component.margin_bottom, margin_y, margin),
+    )
+    result["_min_size_"] = (
+        serialization._float_or_zero(component.min_width),
+        serialization._float_or_zero(component.min_height),
+    )
+    result["_align_"] = (component.align_x, component.align_y)
+    result["_grow_"] = (component.grow_x, component.grow_y)
+
+    if isinstance(component, fundamental_component.FundamentalComponent):
+        sess = component.session
+        serializers = serialization.get_attribute_serializers(type(component))
+
+        for name in properties_to_serialize:
+            try:
+                serializer = serializers[name]
+            except KeyError:
+                continue
+
+            value = getattr(component, name)
+
+            if isinstance(value, serialization.STYLE_TYPES):
+                result[name] = sess._intern_style(
+                    (serializer, value),
+                    functools.partial(serializer, sess, value),
+                )
+            else:
+                result[name] = serializer(sess, value)
+
+        result["_type_"] = component._unique_id_
+        result.update(component._custom_serialize_())
+
+        if component._appendable_attributes_:
+            serialization._send_appended_suffixes(
+                component,
+                result,
+                properties_to_serialize,
+                serializers,
+            )
+    elif isinstance(component, dialog_container.DialogContainer):
+        result["_type_"] = "DialogContainer-builtin"
+        result["content"] = component._build_data_.build_result._id_  # type: ignore
+        result.update(component.serialize())
+    else:
+        result["_type_"] = "HighLevelComponent-builtin"
+        result["_child_"] = component._build_data_.build_result._id_  # type: ignore
+
+    if rio.event.EventTag.ON_RESIZE in component._rio_event_handlers_:
+        result["_report_resize_"] = True
+
+    return result
+
+
+@benchmark("serialize/styled-table")
+async def bench_serialize_styled_table() -> t.AsyncIterator[t.Any]:
+    """
+    Serializes every property of all components in a table of 2000 styled
+    cells.
+    """
+    async with rio.testing.DummyClient(StyledTable) as client:
+        components = list(client.get_components())
+        properties = {
+            type_: list(
+                serialization.get_all_serializable_property_names(type_)
+            )
+            for type_ in {type(component) for component in components}
+        }
+
+        # Make sure the specialized serializers agree with the generic ones.
+        # All styles have already been sent to the client, so both only produce
+        # references to them.
+        for component in components:
+            expected = serialize_generically(
+                component, properties[type(component)]
+            )
+            actual = serialization.serialize_and_host_component(
+                component, properties[type(component)]
+            )
+            assert json.dumps(actual) == json.dumps(expected), (
+                component,
+                actual,
+                expected,
+            )
+
+        async def run() -> None:
+            for component in components:
+                serialization.serialize_and_host_component(
+                    component, properties[type(component)]
+                )
+
+        yield run
+
+
+def _build_numpy_normalizers() -> dict[type, t.Callable[[t.Any], t.Any]]:
+    import numpy as np
+
+    normalizers: dict[type, t.Callable[[t.Any], t.Any]] = {}
+
+    for canonical_type, base_type in (
+        (float, np.floating),
+        (int, np.integer),
+        (bool, np.bool_),
+        (str, np.str_),
+    ):
+        for weird_type in introspection.iter_subclasses(base_type):
+            normalizers[weird_type] = canonical_type
+
+    return normalizers
+
+
+def dumps_with_normalizers(data: t.Any) -> str:
+    """
+    The way messages were encoded before the JSON backends existed, which
+    looked up a normalizer for every value the `json` module couldn't handle
+    itself. Used to make sure the backends produce the same results.
+    """
+    normalizers = _build_numpy_normalizers()
+
+    def normalize(obj: object) -> t.Any:
+        try:
+            func = normalizers[type(obj)]
+        except KeyError:
+            raise TypeError(
+                f"Can't serialize {obj!r} of type {type(obj)} as JSON"
+            ) from None
+
+        return func(obj)
+
+    return json.dumps(data, default=normalize)
+
+
+def decoded_json_agrees(a: t.Any, b: t.Any) -> bool:
+    """
+    Compares decoded JSON. `orjson` encodes 32 bit floats with just as many
+    digits as they need, so floats only have to match to within that precision.
+    """
+    if isinstance(a, float) and isinstance(b, float):
+        return math.isclose(a, b, rel_tol=1e-7)
+
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(
+            decoded_json_agrees(a[key], b[key]) for key in a
+        )
+
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(map(decoded_json_agrees, a, b))
+
+    return a == b
+
+
+async def capture_message(build: t.Callable[[], rio.Component]) -> t.Any:
+    """
+    Returns the `updateComponentStates` message containing every component of
+    the app, just like the one sent when a session starts.
+    """
+    async with rio.testing.DummyClient(build) as client:
+        delta_states = {
+            component._id_: serialization.serialize_and_host_component(
+                component,
+                serialization.get_all_serializable_property_names(
+                    type(component)
+                ),
+            )
+            for component in client.get_components()
+        }
+
+    return {
+        "jsonrpc": "2.0",
+        "method": "updateComponentStates",
+        "params": {
+            "delta_states": delta_states,
+            "root_component_id": None,
+        },
+    }
+
+
+def get_json_backend(
+    name: json_backends.JsonBackendName,
+) -> json_backends.JsonBackend:
+    backend = json_backends._BACKEND_FACTORIES[name]()
+
+    if backend is None:
+        raise SkipBenchmark(f"{name} isn't installed")
+
+    return backend
+
+
+def register_json_benchmarks(
+    payload_name: str,
+    build: t.Callable[[], rio.Component],
+    requirement: str | None = None,
+) -> None:
+    """
+    Registers benchmarks for encoding and decoding a message containing every
+    component of the app, for each JSON backend.
+    """
+
+    async def capture_checked_message(
+        backend: json_backends.JsonBackend,
+    ) -> t.Any:
+        if requirement is not None:
+            try:
+                __import__(requirement)
+            except ImportError:
+                raise SkipBenchmark(f"{requirement} isn't installed") from None
+
+        message = await capture_message(build)
+
+        # Make sure the backend agrees with the way messages used to be
+        # encoded
+        assert decoded_json_agrees(
+            json.loads(backend.dumps(message)),
+            json.loads(dumps_with_normalizers(message)),
+        ), backend.name
+
+        return message
+
+    for backend_name in t.get_args(json_backends.JsonBackendName):
+
+        @benchmark(f"json/dumps-{payload_name}-{backend_name}")
+        async def bench_dumps(
+            backend_name: json_backends.JsonBackendName = backend_name,
+        ) -> t.AsyncIterator[t.Any]:
+            backend = get_json_backend(backend_name)
+            message = await capture_checked_message(backend)
+
+            async def run() -> None:
+                backend.dumps(message)
+
+            yield run
+
+        @benchmark(f"json/loads-{payload_name}-{backend_name}")
+        async def bench_loads(
+            backend_name: json_backends.JsonBackendName = backend_name,
+        ) -> t.AsyncIterator[t.Any]:
+            backend = get_json_backend(backend_name)
+            encoded = backend.dumps(await capture_checked_message(backend))
+
+            async def run() -> None:
+                backend.loads(encoded)
+
+            yield run
+
+
+register_json_benchmarks("styled-table", StyledTable)
+register_json_benchmarks("numpy-dashboard", NumpyDashboard, "numpy")
+
+
+@benchmark("table/columnar-rows")
+async def bench_table_rows() -> t.AsyncIterator[t.Any]:
+    """
+    Converts 10,000 rows of mixed-type table data to columns.
+    """
+    rows = [
+        (index, f"Name {index}", index * 1.5, index % 2 == 0, None)
+        for index in range(10_000)
+    ]
+
+    async def run() -> None:
+        _data_to_columnar(rows, "%Y-%m-%d")
+
+    yield run
+
+
+@benchmark("table/columnar-dataframe")
+async def bench_table_dataframe() -> t.AsyncIterator[t.Any]:
+    """
+    Converts a 10,000 row pandas DataFrame to columns.
+    """
+    try:
+        import pandas
+    except ImportError:
+        raise SkipBenchmark("pandas isn't installed") from None
+
+    data_frame = pandas.DataFrame(
+        {
+            "id": range(10_000),
+            "name": [f"Name {index}" for index in range(10_000)],
+            "price": [index * 1.5 for index in range(10_000)],
+            "available": [index % 2 == 0 for index in range(10_000)],
+        }
+    )
+
+    async def run() -> None:
+        _data_to_columnar(data_frame, "%Y-%m-%d")
+
+    yield run
+
+
+@benchmark("sessions/concurrent")
+async def bench_concurrent_sessions() -> t.AsyncIterator[t.Any]:
+    """
+    Connects 20 sessions at once, each of which clicks a button a few times.
+    """
+    app = rio.App(build=Clicker)
+
+    async def script(client: rio.testing.LoadTestClient) -> None:
+        for _ in range(3):
+            await client.click(client.get_component(rio.Button))
+
+    async def run() -> None:
+        # The sessions compete for the same event loop, so responses can take
+        # a while
+        report = await rio.testing.run_load_test(
+            app,
+            script,
+            sessions=20,
+            refresh_timeout=60,
+        )
+        assert not report.errors, report.errors
+
+    yield run
+
+
+# Harness
+
+
+async def run_benchmark(
+    benchmark: Benchmark,
+    *,
+    rounds: int,
+    min_round_time: float,
+) -> dict[str, float | int]:
+    """
+    Runs the benchmark for the given number of rounds. Each round repeats the
+    operation until at least `min_round_time` seconds have passed. Returns
+    statistics about the time per operation.
+    """
+    async with benchmark() as operation:
+        # Warm up, and figure out how many iterations make up a round
+        started_at = time.perf_counter()
+        await operation()
+        duration = time.perf_counter() - started_at
+
+        iterations = max(1, int(min_round_time / max(duration, 1e-9)))
+        timings = list[float]()
+
+        for _ in range(rounds):
+            # Garbage collection pauses are a big source of noise
+            gc.collect()
+            gc.disable()
+
+            try:
+                started_at = time.perf_counter()
+
+                for _ in range(iterations):
+                    await operation()
+
+                duration = time.perf_counter() - started_at
+            finally:
+                gc.enable()
+
+            timings.append(duration / iterations)
+
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "max": max(timings),
+        "iterations": iterations,
+        "rounds": rounds,
+    }
+
+
+def format_duration(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:8.1f} µs"
+
+    if seconds < 1:
+        return f"{seconds * 1e3:8.2f} ms"
+
+    return f"{seconds:8.2f} s "
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "filter",
+        nargs="?",
+        default="",
+        help="Only run benchmarks whose name contains this string",
+    )
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--min-round-time",
+        type=float,
+        default=0.2,
+        help="How long each round should take at least, in seconds",
+    )
+    parser.add_argument(
+        "--save",
+        type=Path,
+        help="Write the results to this JSON file",
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        help="Compare the results to a JSON file written by `--save`",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="When comparing, fail if a benchmark got slower by this factor",
+    )
+    args = parser.parse_args()
+
+    baseline: dict[str, dict[str, float]] = {}
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())["results"]
+
+    results: dict[str, dict[str, float | int]] = {}
+    regressions = list[str]()
+
+    for name, benchmark in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+
+        try:
+            result = await run_benchmark(
+                benchmark,
+                rounds=args.rounds,
+                min_round_time=args.min_round_time,
+            )
+        except SkipBenchmark as error:
+            print(f"{name:36} skipped: {error}")
+            continue
+
+        results[name] = result
+        line = (
+            f"{name:36} {format_duration(result['min'])}"
+            f"  (median {format_duration(result['median']).strip()})"
+        )
+
+        if name in baseline:
+            ratio = result["min"] / baseline[name]["min"]
+            line += f"  {ratio:5.2f}x baseline"
+
+            if ratio > args.threshold:
+                line += "  REGRESSION"
+                regressions.append(name)
+
+        print(line)
+
+    if args.save is not None:
+        args.save.write_text(
+            json.dumps(
+                {
+                    "python": sys.version,
+                    "platform": platform.platform(),
+                    "rio": rio.__version__,
+                    "results": results,
+                },
+                indent=4,
+            )
+        )
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) got slower: {regressions}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
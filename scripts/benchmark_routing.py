@@ -0,0 +1,156 @@
+"""
+Measures how long it takes to find the active pages for a URL, in an app with
+many pages.
+
+Compares the compiled routing table against testing every page in turn, both
+for the first lookup of a path and for repeated lookups.
+"""
+
+import random
+import timeit
+import typing as t
+
+import rio
+import rio.routing
+
+SECTION_COUNT = 50
+PAGES_PER_SECTION = 10
+LOOKUPS = 20_000
+
+
+class Placeholder(rio.Component):
+    def build(self) -> rio.Component:
+        return rio.Text("")
+
+
+def build_item_page(item_id: int) -> rio.Component:
+    return Placeholder()
+
+
+def make_pages() -> list[rio.ComponentPage | rio.Redirect]:
+    pages: list[rio.ComponentPage | rio.Redirect] = []
+
+    for section_index in range(SECTION_COUNT):
+        children = [
+            rio.ComponentPage(
+                name=f"Page {page_index}",
+                url_segment=f"page-{page_index}",
+                build=Placeholder,
+            )
+            for page_index in range(PAGES_PER_SECTION)
+        ]
+        children.append(
+            rio.ComponentPage(
+                name="Item",
+                url_segment="{item_id}",
+                build=build_item_page,
+            )
+        )
+
+        pages.append(
+            rio.ComponentPage(
+                name=f"Section {section_index}",
+                url_segment=f"section-{section_index}",
+                build=Placeholder,
+                children=children,
+            )
+        )
+
+    pages.append(rio.Redirect(url_segment="old-home", target="/"))
+    return pages
+
+
+def match_linearly(
+    pages: t.Iterable[rio.ComponentPage | rio.Redirect],
+    path: str,
+) -> list[tuple[rio.ComponentPage | rio.Redirect, dict[str, object]]]:
+    """
+    The way pages were matched before the routing table existed.
+    """
+    for page in pages:
+        did_match, raw_arguments, remainder = page._url_pattern.match(path)
+
+        if not did_match:
+            continue
+
+        if isinstance(page, rio.ComponentPage):
+            try:
+                arguments = {
+                    name: page._url_parameter_parsers[name].parse(value)
+                    for name, value in raw_arguments.items()
+                }
+            except ValueError:
+                continue
+        else:
+            arguments = dict(raw_arguments)
+
+        result = [(page, t.cast(dict[str, object], arguments))]
+
+        if isinstance(page, rio.ComponentPage):
+            result += match_linearly(page.children, remainder)
+
+        return result
+
+    return []
+
+
+def main() -> None:
+    pages = make_pages()
+
+    rng = random.Random(0)
+    paths = [
+        f"section-{rng.randrange(SECTION_COUNT)}/"
+        + rng.choice(
+            [
+                f"page-{rng.randrange(PAGES_PER_SECTION)}",
+                str(rng.randrange(10)),
+            ]
+        )
+        for _ in range(LOOKUPS)
+    ]
+
+    # Make sure both implementations agree
+    for path in paths[:1000]:
+        expected = match_linearly(pages, path)
+        actual = rio.routing._get_active_page_instances(
+            available_pages=pages,
+            remaining_path=path,
+        )
+        assert actual == expected, (path, actual, expected)
+
+    def run_linear() -> None:
+        for path in paths:
+            match_linearly(pages, path)
+
+    def run_uncached() -> None:
+        table = rio.routing.RoutingTable(pages)
+
+        for path in paths:
+            table._match_uncached(path)
+
+    def run_cached() -> None:
+        for path in paths:
+            rio.routing._get_active_page_instances(
+                available_pages=pages,
+                remaining_path=path,
+            )
+
+    print(
+        f"{len(pages)} top-level pages, {SECTION_COUNT * PAGES_PER_SECTION}"
+        f" nested pages, {LOOKUPS} lookups of {len(set(paths))} distinct paths"
+    )
+
+    for name, function in [
+        ("Linear scan", run_linear),
+        ("Routing table", run_uncached),
+        ("Routing table + memoization", run_cached),
+    ]:
+        duration = min(timeit.repeat(function, number=1, repeat=5))
+        print(
+            f"{name:30} {duration * 1000:8.1f} ms"
+            f"  ({duration / LOOKUPS * 1_000_000:6.2f} µs per lookup)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,14 @@
 """
 This file reads all bootstrap icons from their GitHub repository and packs them
-into a `.tar.xz` archive that can be used by Rio as icon set.
+into a `.zip` archive that can be used by Rio as icon set.
 
 The repository is expected to be available locally already - this script does
 not clone it.
 """
 
-import tarfile
 import tempfile
 import typing as t
+import zipfile
 from pathlib import Path
 from xml.etree import ElementTree as ET
 
@@ -53,8 +53,8 @@ def build_icon_set(
     Helper function for building Rio compatible icon sets.
 
     This function reads a list of SVG files, postprocesses them to fit Rio's
-    requirements and dumps them into a compressed archive, again matching Rio's
-    expectations.
+    requirements and dumps them into an indexed `.zip` archive, again matching
+    Rio's expectations.
 
     Depending on how exactly your input SVGs are structured, this may not be
     enough. Feel free to adapt the function to your exact files.
@@ -64,7 +64,7 @@ def build_icon_set(
     `input_files`: An iterable over the paths to the SVG files to process.
         (`Path.glob` is your friend here)
 
-    `output_path`: The path to the `.tar.xz` archive to write the icon set to.
+    `output_path`: The path to the `.zip` archive to write the icon set to.
 
     `set_name`: The name of the icon set. This will be used to access the icons.
 
@@ -155,8 +155,16 @@ def build_icon_set(
         # Compress the temporary directory
         revel.print_chapter("Compressing files")
 
-        with tarfile.open(output_path, "w:xz") as out_file:
-            out_file.add(tmp_dir, arcname=set_name)
+        with zipfile.ZipFile(output_path, "w") as out_file:
+            for icon_path in sorted(tmp_dir.rglob("*.svg")):
+                # Use a fixed timestamp, so that the output doesn't change if
+                # the icons don't
+                info = zipfile.ZipInfo(
+                    f"{set_name}/{icon_path.relative_to(tmp_dir).as_posix()}",
+                    date_time=(1980, 1, 1, 0, 0, 0),
+                )
+                info.compress_type = zipfile.ZIP_DEFLATED
+                out_file.writestr(info, icon_path.read_bytes(), compresslevel=9)
 
     revel.print_chapter(None)
     revel.success(
@@ -181,7 +189,7 @@ if __name__ == "__main__":
     #         / "500"
     #         / "rounded"
     #     ).glob("*.svg"),
-    #     output_path=PROJECT_DIR / "material.tar.xz",
+    #     output_path=PROJECT_DIR / "material.zip",
     #     set_name="material",
     #     limit=None,
     # )
@@ -193,7 +201,7 @@ if __name__ == "__main__":
         input_files=(PROJECT_DIR / "thirdparty" / "bootstrap" / "icons").glob(
             "*.svg"
         ),
-        output_path=PROJECT_DIR / "bootstrap.tar.xz",
+        output_path=PROJECT_DIR / "bootstrap.zip",
         set_name="bootstrap",
         limit=None,
     )
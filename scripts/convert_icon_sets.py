@@ -0,0 +1,81 @@
+"""
+Converts `.tar.xz` icon set archives into indexed `.zip` archives.
+
+`.tar.xz` archives are compressed as a whole, so Rio has to extract the entire
+icon set to the cache directory before it can read a single icon. `.zip`
+archives compress each file separately and contain an index of all files,
+allowing Rio to read individual icons straight from the archive.
+
+By default this converts all icon sets shipped with Rio. Alternatively, pass the
+paths of the archives to convert as arguments.
+"""
+
+import sys
+import tarfile
+import zipfile
+from pathlib import Path
+
+import revel
+
+PROJECT_DIR = Path(__file__).absolute().parent.parent
+ICON_SETS_DIR = PROJECT_DIR / "rio" / "assets" / "icon_sets"
+
+
+def convert_icon_set(
+    input_path: Path,
+    output_path: Path,
+) -> None:
+    """
+    Converts a single `.tar.xz` icon set archive into a `.zip` archive with the
+    same directory layout.
+
+    ## Parameters
+
+    `input_path`: The path to the `.tar.xz` archive to read.
+
+    `output_path`: The path to the `.zip` archive to write the icon set to.
+    """
+    # Read all icons in archive order. Seeking around in a `.tar.xz` file is
+    # very slow, since it has to be decompressed from the start each time.
+    icons: dict[str, bytes] = {}
+
+    with tarfile.open(input_path, "r:xz") as in_file:
+        for member in in_file:
+            if not member.isfile():
+                continue
+
+            file = in_file.extractfile(member)
+            assert file is not None, member
+            icons[member.name] = file.read()
+
+    # Write them sorted by name so that the output is deterministic
+    with zipfile.ZipFile(output_path, "w") as out_file:
+        for name in sorted(icons):
+            # Use a fixed timestamp, so that the output doesn't change if the
+            # icons don't
+            info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            out_file.writestr(info, icons[name], compresslevel=9)
+
+    revel.print(
+        f"{input_path.name} -> {output_path.name} ({len(icons)} icon(s))"
+    )
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        input_paths = [Path(arg) for arg in sys.argv[1:]]
+    else:
+        input_paths = sorted(ICON_SETS_DIR.glob("*.tar.xz"))
+
+    for input_path in input_paths:
+        output_path = input_path.with_name(
+            input_path.name.removesuffix(".tar.xz") + ".zip"
+        )
+        convert_icon_set(input_path, output_path)
+
+    revel.success("[bold]Done![/]")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
+import asyncio
 import json
+import urllib.parse
 
 import pytest
 
+import rio
 import rio.arequests as arequests
 
 
@@ -44,3 +47,300 @@ def test_request() -> None:
     assert response_json["headers"]["content-type"] == "application/json"
     assert response_json["headers"]["content-length"] == "14"
     assert response_json["args"] == {"foo": "bar"}
+
+
+class _StandInServer:
+    """
+    A minimal HTTP/1.1 server for testing the asynchronous client without
+    relying on the internet.
+    """
+
+    def __init__(self) -> None:
+        self.connection_count = 0
+        self.request_count = 0
+        self.active_requests = 0
+        self.max_active_requests = 0
+
+        # The request targets as sent by the client. Proxies receive the entire
+        # URL.
+        self.targets: list[str] = []
+
+        self._server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def __aenter__(self) -> "_StandInServer":
+        self._server = await asyncio.start_server(
+            self._handle_connection, "127.0.0.1", 0
+        )
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        assert self._server is not None
+        self._server.close()
+
+    async def _handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        self.connection_count += 1
+
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    return
+
+                request_line, *header_lines = head.decode().split("\r\n")
+                method, target, _ = request_line.split(" ")
+                self.targets.append(target)
+
+                # Act as a proxy as well. Tunnels aren't supported though.
+                if method == "CONNECT":
+                    writer.write(b"HTTP/1.1 403 Forbidden\r\n\r\n")
+                    return
+
+                path = urllib.parse.urlsplit(target).path
+                headers = {
+                    name.strip().lower(): value.strip()
+                    for name, _, value in (
+                        line.partition(":") for line in header_lines if line
+                    )
+                }
+                body = await reader.readexactly(
+                    int(headers.get("content-length", "0"))
+                )
+
+                self.request_count += 1
+                self.active_requests += 1
+                self.max_active_requests = max(
+                    self.max_active_requests, self.active_requests
+                )
+
+                try:
+                    keep_alive = await self._respond(
+                        writer, method, path, headers, body
+                    )
+                finally:
+                    self.active_requests -= 1
+
+                await writer.drain()
+
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        method: str,
+        path: str,
+        headers: dict[str, str],
+        body: bytes,
+    ) -> bool:
+        def send(
+            status: str,
+            content: bytes,
+            extra_headers: str = "",
+        ) -> None:
+            writer.write(
+                f"HTTP/1.1 {status}\r\ncontent-length: {len(content)}\r\n{extra_headers}\r\n".encode()
+                + content
+            )
+
+        if path == "/hello":
+            send("200 OK", b"Hello, World!")
+        elif path == "/chunked":
+            writer.write(
+                b"HTTP/1.1 200 OK\r\ntransfer-encoding: chunked\r\n\r\n"
+                b"5\r\nHello\r\n8\r\n, World!\r\n0\r\n\r\n"
+            )
+        elif path == "/redirect":
+            send("302 Found", b"", "location: /hello\r\n")
+        elif path == "/echo":
+            send(
+                "200 OK",
+                json.dumps(
+                    {
+                        "method": method,
+                        "body": body.decode(),
+                        "content-type": headers.get("content-type"),
+                    }
+                ).encode(),
+                "content-type: application/json\r\n",
+            )
+        elif path == "/slow":
+            await asyncio.sleep(0.2)
+            send("200 OK", b"slow")
+        elif path == "/close":
+            send("200 OK", b"bye", "connection: close\r\n")
+            return False
+        elif path == "/drop":
+            # Close the connection without responding
+            return False
+        else:
+            send("404 Not Found", b"")
+
+        return True
+
+
+async def test_async_request_reuses_connections() -> None:
+    async with _StandInServer() as server:
+        async with arequests.HttpClient() as client:
+            for _ in range(5):
+                response = await client.request("get", server.url + "/hello")
+                assert response.status_code == 200
+                assert response.read() == b"Hello, World!"
+                assert response.headers["content-length"] == "13"
+
+        assert server.connection_count == 1
+
+
+async def test_async_request_doesnt_reuse_closed_connections() -> None:
+    async with _StandInServer() as server:
+        async with arequests.HttpClient() as client:
+            for _ in range(3):
+                response = await client.request("get", server.url + "/close")
+                assert response.read() == b"bye"
+
+        assert server.connection_count == 3
+
+
+async def test_async_request_chunked_streaming() -> None:
+    async with _StandInServer() as server:
+        async with arequests.HttpClient() as client:
+            async with client.stream(
+                "get", server.url + "/chunked"
+            ) as response:
+                chunks = [chunk async for chunk in response.iter_bytes()]
+
+            assert b"".join(chunks) == b"Hello, World!"
+
+            # The connection must be usable after a chunked response
+            response = await client.request("get", server.url + "/hello")
+            assert response.read() == b"Hello, World!"
+
+        assert server.connection_count == 1
+
+
+async def test_async_request_follows_redirects() -> None:
+    async with _StandInServer() as server:
+        response = await arequests.request("get", server.url + "/redirect")
+        assert response.read() == b"Hello, World!"
+
+
+async def test_async_request_json() -> None:
+    async with _StandInServer() as server:
+        response = await arequests.request(
+            "post",
+            server.url + "/echo",
+            json={"foo": "bar"},
+        )
+
+        assert response.json() == {
+            "method": "POST",
+            "body": '{"foo": "bar"}',
+            "content-type": "application/json",
+        }
+
+
+async def test_async_request_error_status() -> None:
+    async with _StandInServer() as server:
+        with pytest.raises(arequests.HttpError) as error_info:
+            await arequests.request("get", server.url + "/does-not-exist")
+
+        assert error_info.value.status_code == 404
+
+
+async def test_async_request_connection_limit() -> None:
+    async with _StandInServer() as server:
+        async with arequests.HttpClient(max_connections_per_host=2) as client:
+            responses = await asyncio.gather(
+                *[client.request("get", server.url + "/slow") for _ in range(6)]
+            )
+
+        assert all(response.read() == b"slow" for response in responses)
+        assert server.max_active_requests == 2
+        assert server.connection_count == 2
+
+
+async def test_async_request_timeout() -> None:
+    async with _StandInServer() as server:
+        async with arequests.HttpClient(read_timeout=0.05) as client:
+            with pytest.raises(arequests.HttpError) as error_info:
+                await client.request("get", server.url + "/slow")
+
+        assert error_info.value.status_code is None
+
+
+async def test_async_request_doesnt_resend_non_idempotent_requests() -> None:
+    async with _StandInServer() as server:
+        async with arequests.HttpClient() as client:
+            await client.request("get", server.url + "/hello")
+
+            # The reused connection is closed without a response. It isn't
+            # known whether the server has acted on the request, so it mustn't
+            # be sent again.
+            with pytest.raises(arequests.HttpError):
+                await client.request("post", server.url + "/drop")
+
+            assert server.request_count == 2
+
+            # Idempotent requests are retried on a fresh connection
+            await client.request("get", server.url + "/hello")
+
+            with pytest.raises(arequests.HttpError):
+                await client.request("get", server.url + "/drop")
+
+            assert server.request_count == 5
+
+
+async def test_async_request_uses_proxy(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async with _StandInServer() as proxy:
+        monkeypatch.setenv("HTTP_PROXY", proxy.url)
+        monkeypatch.setenv("HTTPS_PROXY", proxy.url)
+        monkeypatch.delenv("NO_PROXY", raising=False)
+        monkeypatch.delenv("no_proxy", raising=False)
+
+        async with arequests.HttpClient() as client:
+            # Plain HTTP requests are forwarded by the proxy
+            response = await client.request(
+                "get", "http://example.invalid/hello"
+            )
+            assert response.read() == b"Hello, World!"
+            assert proxy.targets == ["http://example.invalid/hello"]
+
+            # HTTPS requests are tunneled through it
+            with pytest.raises(arequests.HttpError, match="403"):
+                await client.request("get", "https://example.invalid/hello")
+
+            assert proxy.targets[-1] == "example.invalid:443"
+
+            # Hosts can be excluded from proxying
+            monkeypatch.setenv("NO_PROXY", "example.invalid")
+
+            with pytest.raises(arequests.HttpError):
+                await client.request("get", "http://example.invalid/hello")
+
+            assert len(proxy.targets) == 2
+
+
+async def test_url_asset_deduplicates_concurrent_fetches() -> None:
+    async with _StandInServer() as server:
+        asset = rio.assets.Asset.new(rio.URL(server.url + "/slow"))
+
+        results = await asyncio.gather(
+            *[asset.fetch_as_bytes() for _ in range(5)]
+        )
+
+        assert results == [b"slow"] * 5
+        assert server.request_count == 1
@@ -0,0 +1,190 @@
+import contextlib
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from rio import arequests
+from rio.asset_cache import AssetCache
+
+
+class _FakeStreamingResponse:
+    def __init__(self, content: bytes, headers: dict[str, str]) -> None:
+        self.headers = headers
+        self._content = content
+
+    async def read(self) -> bytes:
+        return self._content
+
+
+class _FakeOrigin:
+    """
+    Stands in for `arequests.request` and `arequests.stream`, serving a fixed
+    set of files and keeping track of how often they were requested.
+    """
+
+    def __init__(self) -> None:
+        self.files: dict[str, tuple[bytes, dict[str, str]]] = {}
+        self.download_count = 0
+        self.revalidation_count = 0
+
+    async def request(self, method, url, **kwargs) -> arequests.HttpResponse:
+        self.download_count += 1
+
+        try:
+            content, headers = self.files[url]
+        except KeyError:
+            raise arequests.HttpError(
+                method=method, url=url, status_code=404, message="Not Found"
+            )
+
+        return arequests.HttpResponse(
+            status_code=200, headers=headers, content=content
+        )
+
+    @contextlib.asynccontextmanager
+    async def stream(self, method, url, *, headers, **kwargs):
+        self.revalidation_count += 1
+
+        content, response_headers = self.files[url]
+
+        if headers.get("if-none-match") == response_headers.get("etag"):
+            raise arequests.HttpError(
+                method=method, url=url, status_code=304, message="Not Modified"
+            )
+
+        yield _FakeStreamingResponse(content, response_headers)
+
+
+@pytest.fixture
+def origin(monkeypatch: pytest.MonkeyPatch) -> _FakeOrigin:
+    origin = _FakeOrigin()
+    monkeypatch.setattr(arequests, "request", origin.request)
+    monkeypatch.setattr(arequests, "stream", origin.stream)
+    return origin
+
+
+async def test_hits_and_misses(tmp_path: Path, origin: _FakeOrigin) -> None:
+    origin.files["https://example.com/a"] = (
+        b"hello",
+        {"content-type": "text/plain; charset=latin-1"},
+    )
+    cache = AssetCache(tmp_path / "cache")
+
+    assert await cache.read("https://example.com/a") == (b"hello", "latin-1")
+    assert await cache.read("https://example.com/a") == (b"hello", "latin-1")
+
+    assert origin.download_count == 1
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert (stats.entry_count, stats.size) == (1, 5)
+
+    # A new cache instance picks up the entries stored on disk
+    cache = AssetCache(tmp_path / "cache")
+    assert await cache.read("https://example.com/a") == (b"hello", "latin-1")
+    assert origin.download_count == 1
+
+    with pytest.raises(ValueError):
+        await cache.read("https://example.com/missing")
+
+
+async def test_lru_eviction(tmp_path: Path, origin: _FakeOrigin) -> None:
+    for name in "abc":
+        origin.files[f"https://example.com/{name}"] = (b"x" * 10, {})
+
+    cache = AssetCache(tmp_path, max_size=25)
+
+    await cache.get("https://example.com/a")
+    await cache.get("https://example.com/b")
+    await cache.get("https://example.com/a")
+    await cache.get("https://example.com/c")
+
+    # `b` was the least recently used entry
+    assert not cache.path_for("https://example.com/b").exists()
+    assert cache.path_for("https://example.com/a").exists()
+    assert cache.path_for("https://example.com/c").exists()
+
+    stats = cache.stats()
+    assert (stats.entry_count, stats.size, stats.evictions) == (2, 20, 1)
+
+
+async def test_idle_entries_are_evicted(
+    tmp_path: Path, origin: _FakeOrigin
+) -> None:
+    origin.files["https://example.com/a"] = (b"a", {})
+    await AssetCache(tmp_path).get("https://example.com/a")
+
+    # Pretend the entry was last used a long time ago
+    path = AssetCache(tmp_path).path_for("https://example.com/a")
+    long_ago = time.time() - 3600
+    os.utime(path, (long_ago, long_ago))
+
+    cache = AssetCache(tmp_path, max_idle_time=60)
+    assert cache.stats().entry_count == 0
+    assert not path.exists()
+
+
+async def test_revalidation(tmp_path: Path, origin: _FakeOrigin) -> None:
+    origin.files["https://example.com/a"] = (
+        b"a",
+        {"etag": '"v1"', "cache-control": "no-cache"},
+    )
+    cache = AssetCache(tmp_path)
+
+    await cache.read("https://example.com/a")
+    assert await cache.read("https://example.com/a") == (b"a", None)
+    assert (origin.download_count, origin.revalidation_count) == (1, 1)
+    assert cache.stats().revalidations == 1
+
+    # Once the file changes, the revalidation response is used, rather than
+    # downloading the file again
+    origin.files["https://example.com/a"] = (
+        b"b",
+        {"etag": '"v2"', "cache-control": "no-cache"},
+    )
+    assert await cache.read("https://example.com/a") == (b"b", None)
+    assert (origin.download_count, origin.revalidation_count) == (1, 2)
+    assert cache.path_for("https://example.com/a").read_bytes() == b"b"
+
+
+async def test_no_store(tmp_path: Path, origin: _FakeOrigin) -> None:
+    origin.files["https://example.com/a"] = (
+        b"secret",
+        {"cache-control": "private, no-store"},
+    )
+    cache = AssetCache(tmp_path)
+
+    assert await cache.read("https://example.com/a") == (b"secret", None)
+    assert not cache.path_for("https://example.com/a").exists()
+    assert cache.stats().entry_count == 0
+
+    # Data that isn't stored is still available from a single download
+    entry, data = await cache.fetch("https://example.com/a")
+    assert data == b"secret"
+    assert not entry.path.exists()
+    assert origin.download_count == 2
+
+
+async def test_prewarm_and_purge(tmp_path: Path, origin: _FakeOrigin) -> None:
+    origin.files["https://example.com/a"] = (b"a", {})
+    origin.files["https://example.com/b"] = (b"b", {})
+    cache = AssetCache(tmp_path)
+
+    await cache.prewarm(
+        [
+            "https://example.com/a",
+            "https://example.com/b",
+            "https://example.com/missing",
+        ]
+    )
+    assert cache.stats().entry_count == 2
+
+    await cache.purge("https://example.com/a")
+    assert not cache.path_for("https://example.com/a").exists()
+    assert cache.stats().entry_count == 1
+
+    await cache.purge()
+    assert cache.stats().entry_count == 0
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,44 @@
+import gc
+from pathlib import Path
+
+import rio
+from rio import assets
+from rio.assets import Asset, AssetRegistry
+
+
+def test_assets_are_deduplicated() -> None:
+    data = b"x" * 1000
+    asset = Asset.new(data, "text/plain")
+
+    assert Asset.new(data, "text/plain") is asset
+    assert Asset.new(bytes(data), "text/plain") is asset
+    assert Asset.new(data, "text/html") is not asset
+
+    path_asset = Asset.new(Path("foo.png"))
+    assert Asset.new(Path("foo.png")) is path_asset
+
+    url = rio.URL("https://example.com/foo.png")
+    assert Asset.new(url, rehost=True) is not Asset.new(url)
+
+    # Mutable data can't be deduplicated
+    mutable_data = bytearray(data)
+    assert Asset.new(mutable_data) is not Asset.new(mutable_data)
+
+
+def test_registry_holds_assets_weakly() -> None:
+    registry = AssetRegistry()
+    data = b"y" * 1000
+    asset = assets.BytesAsset(data)
+
+    registry.add(data, (data, None), None, asset)
+    assert registry.get(data, (data, None), None) is asset
+    assert registry.stats() == assets.AssetRegistryStats(
+        asset_count=1,
+        bytes_held=1000,
+    )
+
+    del asset
+    gc.collect()
+
+    assert registry.get(data, (data, None), None) is None
+    assert registry.stats().asset_count == 0
@@ -338,3 +338,28 @@ async def test_binding_to_differently_named_attribute():
         text_input.text = "hi"
 
         assert "foo" in test_client.session._changed_attributes[root_component]
+
+
+async def test_bound_values_are_sent_to_client() -> None:
+    class BoundMargin(rio.Component):
+        text: str = "hello"
+        margin_size: float = 1
+
+        def build(self) -> rio.Component:
+            return rio.Text(self.bind().text, margin=self.bind().margin_size)
+
+    async with rio.testing.DummyClient(BoundMargin) as test_client:
+        root_component = test_client.get_component(BoundMargin)
+        text_component = test_client.get_component(rio.Text)
+
+        delta = test_client._last_component_state_changes[text_component]
+        assert delta["text"] == "hello"
+        assert delta["_margin_"] == [1, 1, 1, 1]
+
+        root_component.text = "bye"
+        root_component.margin_size = 2
+        await test_client.wait_for_refresh()
+
+        delta = test_client._last_component_state_changes[text_component]
+        assert delta["text"] == "bye"
+        assert delta["_margin_"] == [2, 2, 2, 2]
@@ -0,0 +1,82 @@
+import fastapi
+import pytest
+import starlette.requests
+
+import rio
+from rio import assets, byte_serving
+
+
+def _make_request(range_header: str | None) -> fastapi.Request:
+    headers = []
+
+    if range_header is not None:
+        headers.append((b"range", range_header.encode()))
+
+    return starlette.requests.Request(
+        {"type": "http", "method": "GET", "headers": headers}
+    )
+
+
+@pytest.mark.parametrize(
+    "range_header,expected",
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=10-", (10, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        ("bytes=900-5000", (900, 999)),
+    ],
+)
+def test_parse_range_header(
+    range_header: str,
+    expected: tuple[int, int],
+) -> None:
+    assert byte_serving.parse_range_header(range_header, 1000) == expected
+
+
+def test_parse_unsatisfiable_range_header() -> None:
+    with pytest.raises(fastapi.HTTPException):
+        byte_serving.parse_range_header("bytes=1000-", 1000)
+
+
+async def test_byte_range_source_is_read_in_chunks() -> None:
+    data = bytes(range(256)) * 16
+    requested_ranges: list[tuple[int, int]] = []
+
+    async def read_range(start: int, end: int) -> bytes:
+        requested_ranges.append((start, end))
+        return data[start:end]
+
+    source = rio.ByteRangeSource(len(data), read_range)
+
+    # Equal sources share an asset, and thus a URL
+    asset = assets.Asset.new(source, "video/mp4")
+    assert isinstance(asset, assets.ByteRangeAsset)
+    assert (
+        assets.Asset.new(
+            rio.ByteRangeSource(len(data), read_range), "video/mp4"
+        )
+        is asset
+    )
+
+    response = byte_serving.range_requests_response(
+        _make_request("bytes=1000-2999"),
+        source,
+        media_type="video/mp4",
+    )
+
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 1000-2999/{len(data)}"
+    assert response.headers["content-length"] == "2000"
+
+    body = b"".join(
+        [
+            chunk
+            async for chunk in byte_serving.send_source_range_requests(
+                source, 1000, 2999, chunk_size=1500
+            )
+        ]
+    )
+
+    assert body == data[1000:3000]
+    assert requested_ranges == [(1000, 2500), (2500, 3000)]
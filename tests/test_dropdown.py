@@ -0,0 +1,220 @@
+import asyncio
+
+import rio
+import rio.testing
+
+
+async def test_option_provider_pages() -> None:
+    queries: list[tuple[str, int, int]] = []
+    selected_values: list[int] = []
+
+    async def find_numbers(
+        search: str,
+        start: int,
+        count: int,
+    ) -> rio.DropdownOptionPage[int]:
+        queries.append((search, start, count))
+        matches = [n for n in range(10_000) if search in str(n)]
+
+        return rio.DropdownOptionPage(
+            options={str(n): n for n in matches[start : start + count]},
+            total_count=len(matches),
+        )
+
+    def build() -> rio.Component:
+        return rio.Dropdown(
+            find_numbers,
+            on_change=lambda event: selected_values.append(event.value),
+        )
+
+    async with rio.testing.DummyClient(build) as test_client:
+        dropdown_component = test_client.get_component(rio.Dropdown)
+        assert dropdown_component.selected_value is None
+
+        # None of the options are sent up front
+        state = test_client._last_component_state_changes[dropdown_component]
+        assert state["optionNames"] == []
+        assert state["optionPage"] is None
+
+        # Only the last of several quick requests reaches the provider
+        for request_id, search in enumerate(["1", "12", "123"]):
+            await test_client.session._component_message(
+                dropdown_component._id_,
+                {
+                    "type": "fetchOptions",
+                    "search": search,
+                    "start": 0,
+                    "count": 5,
+                    "requestId": request_id,
+                },
+            )
+
+        await test_client.wait_for_refresh()
+
+        assert queries == [("123", 0, 5)]
+
+        state = test_client._last_component_state_changes[dropdown_component]
+        assert state["optionPage"] == {
+            "requestId": 2,
+            "search": "123",
+            "start": 0,
+            "optionNames": ["123", "1123", "1230", "1231", "1232"],
+            "totalCount": 20,
+        }
+
+        # Selections are resolved using the fetched pages
+        await test_client.session._component_message(
+            dropdown_component._id_, {"name": "1231"}
+        )
+        assert dropdown_component.selected_value == 1231
+        assert selected_values == [1231]
+
+        # Unknown names are ignored
+        await test_client.session._component_message(
+            dropdown_component._id_, {"name": "42"}
+        )
+        assert dropdown_component.selected_value == 1231
+
+        # Cached pages aren't requested again
+        await test_client.session._component_message(
+            dropdown_component._id_,
+            {
+                "type": "fetchOptions",
+                "search": "123",
+                "start": 0,
+                "count": 5,
+                "requestId": 3,
+            },
+        )
+        await test_client.wait_for_refresh()
+
+        assert queries == [("123", 0, 5)]
+        state = test_client._last_component_state_changes[dropdown_component]
+        assert state["optionPage"]["requestId"] == 3
+        assert state["selectedName"] == "1231"
+
+
+async def test_method_option_provider_survives_parent_rebuild() -> None:
+    queries: list[tuple[str, int, int]] = []
+
+    class Parent(rio.Component):
+        unrelated: int = 0
+
+        def find_numbers(
+            self,
+            search: str,
+            start: int,
+            count: int,
+        ) -> rio.DropdownOptionPage[int]:
+            queries.append((search, start, count))
+
+            return rio.DropdownOptionPage(
+                options={str(n): n for n in range(start, start + count)},
+                total_count=100,
+            )
+
+        def build(self) -> rio.Component:
+            return rio.Column(
+                rio.Dropdown(self.find_numbers),
+                rio.Text(str(self.unrelated)),
+            )
+
+    async with rio.testing.DummyClient(Parent) as test_client:
+        parent = test_client.get_component(Parent)
+        dropdown_component = test_client.get_component(rio.Dropdown)
+
+        fetch_message = {
+            "type": "fetchOptions",
+            "search": "",
+            "start": 0,
+            "count": 5,
+            "requestId": 0,
+        }
+
+        await test_client.session._component_message(
+            dropdown_component._id_, fetch_message
+        )
+        await test_client.wait_for_refresh()
+        assert queries == [("", 0, 5)]
+
+        # Rebuilding the parent creates a new bound method, which is still the
+        # same provider
+        parent.unrelated += 1
+        await test_client.wait_for_refresh()
+
+        await test_client.session._component_message(
+            dropdown_component._id_, {"name": "3"}
+        )
+        assert dropdown_component.selected_value == 3
+
+        # The fetched pages are still cached
+        await test_client.session._component_message(
+            dropdown_component._id_, {**fetch_message, "requestId": 1}
+        )
+        await test_client.wait_for_refresh()
+        assert queries == [("", 0, 5)]
+
+
+async def test_closure_option_provider_answers_requests() -> None:
+    class Parent(rio.Component):
+        unrelated: int = 0
+
+        def build(self) -> rio.Component:
+            # A new function on every build
+            def find_numbers(
+                search: str,
+                start: int,
+                count: int,
+            ) -> rio.DropdownOptionPage[int]:
+                return rio.DropdownOptionPage(
+                    options={str(n): n for n in range(start, start + count)},
+                    total_count=100,
+                )
+
+            return rio.Column(
+                rio.Dropdown(find_numbers),
+                rio.Text(str(self.unrelated)),
+            )
+
+    async with rio.testing.DummyClient(Parent) as test_client:
+        parent = test_client.get_component(Parent)
+        dropdown_component = test_client.get_component(rio.Dropdown)
+
+        await test_client.session._component_message(
+            dropdown_component._id_,
+            {
+                "type": "fetchOptions",
+                "search": "",
+                "start": 0,
+                "count": 5,
+                "requestId": 0,
+            },
+        )
+
+        # Rebuild the parent while the request is still being debounced
+        await asyncio.sleep(0.05)
+        assert dropdown_component._option_page is None
+
+        parent.unrelated += 1
+        await test_client.wait_for_refresh()
+
+        # The request is still answered, by the new provider
+        async def wait_for_page() -> None:
+            while dropdown_component._option_page is None:
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(wait_for_page(), timeout=5)
+
+        assert dropdown_component._option_page["requestId"] == 0
+        assert dropdown_component._option_page["optionNames"] == [
+            "0",
+            "1",
+            "2",
+            "3",
+            "4",
+        ]
+
+        await test_client.session._component_message(
+            dropdown_component._id_, {"name": "3"}
+        )
+        assert dropdown_component.selected_value == 3
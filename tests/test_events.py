@@ -1,6 +1,9 @@
 import asyncio
+import threading
 import typing as t
 
+import pytest
+
 import rio.testing
 from rio.debug.layouter import Layouter
 
@@ -303,3 +306,52 @@ async def test_size_observer_reports_content_dimensions():
         event = resize_event_recorder.recorded_events[-1]
         assert event.width == recorder_layout.allocated_outer_width
         assert event.height == recorder_layout.allocated_outer_height
+
+
+async def test_run_in_thread():
+    loop_thread = threading.get_ident()
+    handler_started = threading.Event()
+    may_finish = threading.Event()
+
+    class DemoComponent(rio.Component):
+        text: str = "before"
+        handler_thread: int | None = None
+
+        @rio.event.run_in_thread
+        def on_press(self) -> None:
+            self.handler_thread = threading.get_ident()
+            handler_started.set()
+            may_finish.wait()
+            self.text = "after"
+
+        def build(self) -> rio.Component:
+            return rio.Button(self.text, on_press=self.on_press)
+
+    async with rio.testing.DummyClient(DemoComponent) as test_client:
+        component = test_client.get_component(DemoComponent)
+        button = test_client.get_component(rio.Button)
+
+        task = asyncio.create_task(test_client.click_component(button))
+
+        # The event loop must remain responsive while the handler is running
+        await asyncio.to_thread(handler_started.wait)
+        await asyncio.sleep(0.05)
+        assert not task.done()
+
+        refresh = asyncio.create_task(test_client.wait_for_refresh())
+        await asyncio.sleep(0)
+
+        may_finish.set()
+        await task
+        await refresh
+
+        assert component.handler_thread not in (None, loop_thread)
+        assert button.content == "after"
+
+
+def test_run_in_thread_rejects_async_functions():
+    async def handler() -> None:
+        pass
+
+    with pytest.raises(TypeError):
+        rio.event.run_in_thread(handler)
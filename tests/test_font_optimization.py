@@ -0,0 +1,71 @@
+import pytest
+
+import rio
+from rio import font_optimization
+
+
+def test_parse_unicode_range() -> None:
+    assert font_optimization.parse_unicode_range("U+0041") == {0x41}
+    assert font_optimization.parse_unicode_range("U+0041-0043, u+0131") == {
+        0x41,
+        0x42,
+        0x43,
+        0x131,
+    }
+    assert font_optimization.parse_unicode_range("U+4?") == set(
+        range(0x40, 0x50)
+    )
+
+    with pytest.raises(ValueError):
+        font_optimization.parse_unicode_range("0041-0043")
+
+
+def test_format_unicode_range() -> None:
+    assert (
+        font_optimization.format_unicode_range([0x43, 0x41, 0x42, 0x131])
+        == "U+0041-0043, U+0131"
+    )
+
+    # Formatting and parsing must round-trip
+    for unicode_range in font_optimization.UNICODE_RANGES.values():
+        code_points = font_optimization.parse_unicode_range(unicode_range)
+        formatted = font_optimization.format_unicode_range(code_points)
+        assert font_optimization.parse_unicode_range(formatted) == code_points
+
+
+def test_invalid_subset() -> None:
+    with pytest.raises(ValueError):
+        rio.Font(rio.Font.ROBOTO._faces[0].file.path, subsets=["klingon"])  # type: ignore
+
+
+async def test_optimize_font_face() -> None:
+    pytest.importorskip("fontTools")
+    pytest.importorskip("brotli")
+
+    original_face = rio.Font.ROBOTO._faces[0]
+
+    optimized_faces = await font_optimization.optimize_font_face(
+        original_face,
+        subsets=["latin", "cyrillic"],
+    )
+
+    # Latin, cyrillic, and a face for all the remaining glyphs
+    assert len(optimized_faces) == 3
+
+    covered_code_points = set[int]()
+
+    for face in optimized_faces:
+        assert face.file.media_type == "font/woff2"
+        assert face.file_meta == 'format("woff2")'
+
+        data = await face.file.fetch_as_bytes()
+        assert data.startswith(b"wOF2")
+
+        covered_code_points |= font_optimization.parse_unicode_range(
+            face.descriptors["unicode-range"]
+        )
+
+    # No characters may be lost
+    assert ord("A") in covered_code_points
+    assert ord("Ж") in covered_code_points
+    assert ord("ⁿ") in covered_code_points
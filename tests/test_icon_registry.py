@@ -0,0 +1,63 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import rio
+from rio import icon_registry
+
+
+def _write_zip_icon_set(path: Path, set_name: str) -> None:
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(f"{set_name}/foo.svg", "<svg>foo</svg>")
+        archive.writestr(f"{set_name}/fill/foo.svg", "<svg>foo fill</svg>")
+        archive.writestr(f"{set_name}/bar.svg", "<svg>bar</svg>")
+
+
+def test_builtin_icon_sets_are_indexed() -> None:
+    for icon_set in icon_registry.all_icon_sets():
+        assert icon_registry.icon_set_archives[icon_set].suffix == ".zip"
+
+    svg = icon_registry.get_icon_svg("material/castle")
+    assert svg.startswith("<svg")
+
+    # Names without a set refer to the material icon set
+    assert icon_registry.get_icon_svg("castle") == svg
+
+    # Legacy names with dashes are still supported
+    assert icon_registry.get_icon_svg(
+        "material/arrow-back"
+    ) == icon_registry.get_icon_svg("material/arrow_back")
+
+
+def test_zip_icon_set(tmp_path: Path) -> None:
+    archive_path = tmp_path / "zip-test-set.zip"
+    _write_zip_icon_set(archive_path, "zip_test_set")
+    icon_registry.register_icon_set("zip_test_set", archive_path)
+
+    assert icon_registry.get_icon_svg("zip_test_set/foo") == "<svg>foo</svg>"
+    assert (
+        icon_registry.get_icon_svg("zip_test_set/foo:fill")
+        == "<svg>foo fill</svg>"
+    )
+
+    assert set(icon_registry.all_variants_in_set("zip_test_set")) == {
+        None,
+        "fill",
+    }
+    assert set(icon_registry.all_icons_in_set("zip_test_set")) == {
+        ("foo", None),
+        ("foo", "fill"),
+        ("bar", None),
+    }
+    assert list(
+        icon_registry.all_icons_in_set("zip_test_set", variant="fill")
+    ) == [("foo", "fill")]
+
+    with pytest.raises(rio.AssetError):
+        icon_registry.get_icon_svg("zip_test_set/baz")
+
+
+def test_unknown_icon_set() -> None:
+    with pytest.raises(rio.AssetError):
+        icon_registry.get_icon_svg("this_set_does_not_exist/foo")
@@ -0,0 +1,281 @@
+import asyncio
+import io
+import typing as t
+from pathlib import Path
+
+import PIL.Image
+
+import rio
+import rio.testing
+from rio import assets, image_pipeline
+from rio.image_pipeline import ImagePipeline
+
+
+def _make_image(
+    width: int,
+    height: int,
+    *,
+    format: str = "PNG",
+    mode: str = "RGB",
+) -> bytes:
+    image = PIL.Image.linear_gradient("L").convert(mode).resize((width, height))
+    file = io.BytesIO()
+    image.save(file, format=format)
+    return file.getvalue()
+
+
+def _size_of(data: bytes) -> tuple[int, int]:
+    with PIL.Image.open(io.BytesIO(data)) as image:
+        return image.size
+
+
+async def test_variant_is_downscaled() -> None:
+    asset = assets.BytesAsset(_make_image(2000, 1000))
+    pipeline = ImagePipeline()
+
+    variant = await pipeline.get_variant(asset, 640, "image/webp,*/*")
+    assert variant is not None
+
+    data, media_type = variant
+    assert media_type == "image/webp"
+    assert _size_of(data) == (640, 320)
+
+    # The second request is answered from the cache
+    assert await pipeline.get_variant(asset, 640, "image/webp,*/*") is variant
+
+
+async def test_format_negotiation() -> None:
+    asset = assets.BytesAsset(_make_image(2000, 1000))
+    pipeline = ImagePipeline()
+
+    variant = await pipeline.get_variant(asset, 320, "*/*")
+    assert variant is not None
+    assert variant[1] == "image/jpeg"
+
+    # JPEG doesn't support transparency
+    transparent_asset = assets.BytesAsset(_make_image(2000, 1000, mode="RGBA"))
+    variant = await pipeline.get_variant(transparent_asset, 320, "*/*")
+    assert variant is not None
+    assert variant[1] == "image/png"
+
+
+async def test_original_is_served_if_not_larger(tmp_path: Path) -> None:
+    pipeline = ImagePipeline()
+
+    small_asset = assets.BytesAsset(_make_image(300, 200))
+    assert await pipeline.get_variant(small_asset, 640, "image/webp") is None
+
+    # Only the advertised widths are created
+    path = tmp_path / "image.jpg"
+    path.write_bytes(_make_image(2000, 1000, format="JPEG"))
+    path_asset = assets.PathAsset(path)
+    assert await pipeline.get_variant(path_asset, 500, "image/webp") is None
+    assert await pipeline.get_variant(path_asset, 960, "image/webp") is not None
+
+    svg_asset = assets.BytesAsset(b"<svg></svg>", "image/svg+xml")
+    assert await pipeline.get_variant(svg_asset, 640, "image/webp") is None
+
+
+async def test_cache_is_bounded() -> None:
+    # Noise doesn't compress well, so the variants are large
+    file = io.BytesIO()
+    PIL.Image.effect_noise((4000, 2000), 64).save(file, format="PNG")
+    asset = assets.BytesAsset(file.getvalue())
+
+    pipeline = ImagePipeline(max_cache_size=200_000)
+
+    for width in image_pipeline.VARIANT_WIDTHS:
+        await pipeline.get_variant(asset, width, "image/webp")
+
+    assert 0 < pipeline._cache_size <= 200_000
+    assert len(pipeline._cache) < len(image_pipeline.VARIANT_WIDTHS)
+
+
+async def test_image_advertises_variants() -> None:
+    image_data = _make_image(2000, 1000)
+    small_image_data = _make_image(300, 200)
+
+    async with rio.testing.DummyClient(
+        lambda: rio.Column(
+            rio.Image(image_data),
+            rio.Image(small_image_data),
+            rio.Image(rio.URL("x.png")),
+        )
+    ) as test_client:
+        raster_image, small_image, url_image = test_client.get_components(
+            rio.Image
+        )
+
+        # Only variants smaller than the original are offered, followed by the
+        # original itself
+        state = test_client._last_component_state_changes[raster_image]
+        srcset = state["imageSrcset"]
+        assert [width for _, width in srcset] == [  # type: ignore
+            320,
+            640,
+            960,
+            1280,
+            1920,
+            2000,
+        ]
+        assert srcset[-1][0] == state["imageUrl"]  # type: ignore
+
+        state = test_client._last_component_state_changes[small_image]
+        assert state["imageSrcset"] is None
+
+        state = test_client._last_component_state_changes[url_image]
+        assert state["imageSrcset"] is None
+
+
+async def test_image_is_prepared_in_background() -> None:
+    pil_image = PIL.Image.linear_gradient("L").resize((300, 200))
+
+    async with rio.testing.DummyClient(
+        lambda: rio.Image(pil_image)
+    ) as test_client:
+        image = test_client.get_component(rio.Image)
+
+        # The image is encoded in a worker thread, so the first update is sent
+        # without a URL
+        state = test_client._last_component_state_changes[image]
+        assert state["imageUrl"] is None
+
+        # Once the image is ready, its URL is sent
+        async def wait_for_url() -> None:
+            while (
+                test_client._last_component_state_changes[image].get("imageUrl")
+                is None
+            ):
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(wait_for_url(), timeout=5)
+
+        asset = image._get_image_asset()
+        assert isinstance(asset, assets.BytesAsset)
+        assert asset.media_type == "image/png"
+        assert _size_of(bytes(asset.data)) == (300, 200)
+
+
+async def test_image_fill_is_prepared_in_background() -> None:
+    pil_image = PIL.Image.linear_gradient("L").resize((300, 200))
+    fill = rio.ImageFill(pil_image)
+
+    async with rio.testing.DummyClient(
+        lambda: rio.Rectangle(fill=fill)
+    ) as test_client:
+        rectangle = test_client.get_component(rio.Rectangle)
+
+        def sent_fill() -> t.Any:
+            changes = test_client._last_component_state_changes
+            return changes.get(rectangle, {}).get("fill")
+
+        # The image is encoded in a worker thread. Until then, the rectangle
+        # is transparent.
+        assert sent_fill() == {"type": "solid", "color": [0, 0, 0, 0]}
+
+        async def wait_for_image() -> None:
+            while sent_fill() is None or sent_fill()["type"] != "image":
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(wait_for_image(), timeout=5)
+
+        asset = fill._get_image_asset()
+        assert isinstance(asset, assets.BytesAsset)
+        assert sent_fill()["imageUrl"] == asset._serialize(test_client.session)
+
+
+async def test_pil_images_are_compared_by_identity(monkeypatch) -> None:
+    class Parent(rio.Component):
+        image: PIL.Image.Image = PIL.Image.new("RGB", (30, 20))
+
+        def build(self) -> rio.Component:
+            return rio.Image(self.image)
+
+    async with rio.testing.DummyClient(Parent) as test_client:
+        parent = test_client.get_component(Parent)
+        image = test_client.get_component(rio.Image)
+        image._get_image_asset()
+
+        # Comparing the pixels would block the event loop
+        def fail(self: PIL.Image.Image, other: object) -> bool:
+            raise AssertionError("PIL images were compared by value")
+
+        monkeypatch.setattr(PIL.Image.Image, "__eq__", fail)
+
+        new_image = PIL.Image.new("RGB", (30, 20))
+        parent.image = new_image
+        await test_client.wait_for_refresh()
+
+        assert image._get_image_asset() is None
+        assert image._image_for_cached_asset is new_image
+
+
+async def test_failed_image_preparation_is_reported(monkeypatch) -> None:
+    def fail(image: PIL.Image.Image) -> bytes:
+        raise ValueError("Can't encode this image")
+
+    monkeypatch.setattr(assets, "_encode_image_as_png", fail)
+
+    pil_image = PIL.Image.new("RGB", (30, 20))
+    fill = rio.ImageFill(PIL.Image.new("RGB", (30, 20)))
+    errors = list[str]()
+
+    async with rio.testing.DummyClient(
+        lambda: rio.Column(
+            rio.Image(pil_image, on_error=lambda: errors.append("image")),
+            rio.Rectangle(fill=fill),
+        )
+    ) as test_client:
+        image = test_client.get_component(rio.Image)
+        rectangle = test_client.get_component(rio.Rectangle)
+
+        async def wait_for_failure() -> None:
+            while (
+                not errors
+                or fill._preparation is None
+                or not fill._preparation.done()
+            ):
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(wait_for_failure(), timeout=5)
+
+        # Let the client receive the outcome
+        await asyncio.sleep(0.05)
+
+        # The image displays an error, and the fill stays transparent
+        assert errors == ["image"]
+        assert image._custom_serialize_()["imageFailed"] is True
+
+        assert fill._serialize(test_client.session) == {
+            "type": "solid",
+            "color": (0, 0, 0, 0),
+        }
+
+        # No more attempts are made to send the fill again
+        test_client._received_messages.clear()
+        rectangle.corner_radius = 1
+        await test_client.wait_for_refresh()
+        await asyncio.sleep(0.05)
+
+        assert [
+            message["method"]
+            for message in test_client._received_messages
+            if message["method"] == "updateComponentStates"
+        ] == ["updateComponentStates"]
+
+
+async def test_large_data_is_hashed_in_background(monkeypatch) -> None:
+    monkeypatch.setattr(assets, "BACKGROUND_HASHING_SIZE", 100)
+
+    asset = assets.BytesAsset(b"x" * 1000)
+    assert not asset.is_prepared
+
+    await asset.prepare()
+    assert asset.is_prepared
+    assert asset.secret_id.startswith("b-")
+
+    # Random ids don't need any hashing at all
+    monkeypatch.setattr(assets, "RANDOM_ID_SIZE", 500)
+    asset = assets.BytesAsset(b"y" * 1000)
+    assert asset.is_prepared
+    assert asset.secret_id.startswith("r-")
@@ -0,0 +1,62 @@
+import json
+
+import numpy as np
+import pytest
+
+import rio
+import rio.testing
+from rio import json_backends
+
+
+@pytest.fixture(params=["stdlib", "orjson"])
+def backend(request: pytest.FixtureRequest) -> json_backends.JsonBackend:
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+
+    return json_backends.get_json_backend(request.param)
+
+
+def test_backends_encode_the_same_json(
+    backend: json_backends.JsonBackend,
+) -> None:
+    data = {
+        1: (np.int64(3), np.float32(0.5), np.bool_(True)),
+        "array": np.array([[1, 2], [3, 4]], dtype=np.uint8),
+        "text": np.str_("ünïcödé"),
+    }
+
+    assert json.loads(backend.dumps(data)) == {  # type: ignore
+        "1": [3, 0.5, True],
+        "array": [[1, 2], [3, 4]],
+        "text": "ünïcödé",
+    }
+
+
+def test_backends_raise_the_expected_errors(
+    backend: json_backends.JsonBackend,
+) -> None:
+    with pytest.raises(TypeError):
+        backend.dumps({"value": object()})  # type: ignore
+
+    with pytest.raises(json.JSONDecodeError):
+        backend.loads("{not json")
+
+
+def test_unknown_backend() -> None:
+    with pytest.raises(ValueError):
+        json_backends.get_json_backend("yaml")  # type: ignore
+
+
+async def test_app_with_orjson_backend() -> None:
+    pytest.importorskip("orjson")
+
+    app = rio.App(
+        build=lambda: rio.ProgressBar(np.float32(0.25)),
+        json_backend="orjson",
+    )
+
+    async with rio.testing.DummyClient(app) as client:
+        progress_bar = client.get_component(rio.ProgressBar)
+        assert client._last_component_state_changes[progress_bar][
+            "progress"
+        ] == pytest.approx(0.25)
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+
+from rio import loop_watchdog
+from rio.loop_watchdog import LoopWatchdog
+
+
+def _block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def test_blocking_is_detected(caplog: pytest.LogCaptureFixture) -> None:
+    watchdog = LoopWatchdog(threshold=0.05, check_interval=0.01)
+    watchdog.start()
+
+    try:
+        await asyncio.sleep(0.05)
+
+        loop_watchdog.current_activity = ("event handler", _block_the_loop)
+        with caplog.at_level(logging.WARNING):
+            _block_the_loop(0.3)
+            loop_watchdog.current_activity = None
+
+            # Give the watchdog a chance to notice that the loop is responsive
+            # again
+            await asyncio.sleep(0.1)
+    finally:
+        watchdog.stop()
+
+    stats = watchdog.stats()
+    assert stats.blocked_count >= 1
+    assert stats.max_blocked_time >= 0.25
+    assert list(stats.blocked_time_by_activity) == [
+        "event handler `_block_the_loop`"
+    ]
+
+    assert "_block_the_loop" in caplog.text
+    assert "test_loop_watchdog.py" in caplog.text
+
+
+async def test_responsive_loop_is_not_reported() -> None:
+    watchdog = LoopWatchdog(threshold=0.1, check_interval=0.01)
+    watchdog.start()
+
+    try:
+        await asyncio.sleep(0.3)
+    finally:
+        watchdog.stop()
+
+    assert watchdog.stats().blocked_count == 0
+
+
+async def test_suspended_coroutines_are_not_blamed() -> None:
+    activities_while_running: list[object] = []
+
+    async def handler() -> None:
+        activities_while_running.append(loop_watchdog.current_activity)
+        await asyncio.sleep(0.4)
+        activities_while_running.append(loop_watchdog.current_activity)
+
+    async def run_handler() -> None:
+        await loop_watchdog.TrackedAwaitable(
+            handler(), ("event handler", handler)
+        )
+
+    watchdog = LoopWatchdog(threshold=0.05, check_interval=0.01)
+    watchdog.start()
+
+    try:
+        task = asyncio.create_task(run_handler())
+
+        # Block the loop while the handler is suspended
+        await asyncio.sleep(0.05)
+        assert loop_watchdog.current_activity is None
+        _block_the_loop(0.2)
+
+        await task
+        await asyncio.sleep(0.1)
+    finally:
+        watchdog.stop()
+
+    assert activities_while_running == [("event handler", handler)] * 2
+    assert list(watchdog.stats().blocked_time_by_activity) == ["unknown code"]
+
+
+async def test_restart_doesnt_run_two_watchdogs() -> None:
+    watchdog = LoopWatchdog(threshold=0.1, check_interval=0.01)
+
+    watchdog.start()
+    watchdog.stop()
+    watchdog.start()
+
+    try:
+        watchdog_threads = [
+            thread
+            for thread in threading.enumerate()
+            if thread.name == "Rio event loop watchdog"
+        ]
+        assert len(watchdog_threads) == 1
+    finally:
+        watchdog.stop()
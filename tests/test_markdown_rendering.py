@@ -0,0 +1,74 @@
+import rio
+import rio.testing
+from rio.markdown_rendering import MarkdownRenderer
+
+
+def test_markdown_is_sanitized() -> None:
+    renderer = MarkdownRenderer()
+
+    html = renderer.render_markdown(
+        "<script>alert(1)</script> [link](javascript:alert(1))",
+        None,
+    )
+    assert html is not None
+    assert "<script>" not in html
+    assert "href" not in html
+
+
+def test_code_is_highlighted() -> None:
+    renderer = MarkdownRenderer()
+
+    html = renderer.render_markdown("```python\nreturn 1\n```", None)
+    assert html == (
+        '<pre data-language-name="Python">'
+        '<span class="hljs-keyword">return</span> '
+        '<span class="hljs-number">1</span></pre>\n'
+    )
+
+    # Inline code is only highlighted if there's a default language
+    assert renderer.render_markdown("`return`", None) == (
+        "<p><code>return</code></p>\n"
+    )
+    assert renderer.render_markdown("`return`", "python") == (
+        '<p><code><span class="hljs-keyword">return</span></code></p>\n'
+    )
+
+    assert renderer.render_code("\n\nreturn 1\n  ", "py") == (
+        '<span class="hljs-keyword">return</span> '
+        '<span class="hljs-number">1</span>',
+        "Python",
+    )
+
+
+def test_cache_is_bounded() -> None:
+    renderer = MarkdownRenderer(max_cache_size=100)
+
+    first = renderer.render_markdown("a" * 40, None)
+    assert renderer.render_markdown("a" * 40, None) is first
+
+    renderer.render_markdown("b" * 40, None)
+    renderer.render_markdown("c" * 40, None)
+
+    assert renderer._cache_size <= 100
+    assert renderer.render_markdown("a" * 40, None) is not first
+
+
+async def test_components_are_rendered_on_server() -> None:
+    def build() -> rio.Component:
+        return rio.Column(
+            rio.Markdown("**bold**"),
+            rio.CodeBlock("print(1)", language="python"),
+        )
+
+    app = rio.App(build=build, render_markdown_on_server=True)
+
+    async with rio.testing.DummyClient(app) as test_client:
+        markdown = test_client.get_component(rio.Markdown)
+        state = test_client._last_component_state_changes[markdown]
+        assert state["html"] == "<p><strong>bold</strong></p>\n"
+        assert state["text"] is None
+
+        code_block = test_client.get_component(rio.CodeBlock)
+        state = test_client._last_component_state_changes[code_block]
+        assert state["languageName"] == "Python"
+        assert state["code"] is None
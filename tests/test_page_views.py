@@ -1,6 +1,27 @@
+import typing as t
+
 import rio.testing
 
 
+class CountingPage(rio.Component):
+    populate_count: int = 0
+
+    @rio.event.on_populate
+    async def _on_populate(self) -> None:
+        self.populate_count += 1
+
+    def build(self) -> rio.Component:
+        return rio.Text(f"populated {self.populate_count} times")
+
+
+class BuildCountingPage(rio.Component):
+    build_count: t.ClassVar[int] = 0
+
+    def build(self) -> rio.Component:
+        BuildCountingPage.build_count += 1
+        return rio.Text("Details")
+
+
 async def test_one_page_view() -> None:
     def build():
         return rio.Column(
@@ -52,3 +73,171 @@ async def test_nested_page_views() -> None:
     async with rio.testing.DummyClient(app) as test_client:
         # Make sure the Spacer (which is located on the innermost page) exists
         test_client.get_component(rio.Spacer)
+
+
+async def test_kept_alive_pages_are_reused() -> None:
+    def build_item_page(item_id: int) -> rio.Component:
+        return CountingPage(key="item")
+
+    app = rio.App(
+        build=lambda: rio.PageView(keep_alive=2),
+        pages=[
+            rio.ComponentPage(
+                name="Home",
+                url_segment="",
+                build=CountingPage,
+            ),
+            rio.ComponentPage(
+                name="Item",
+                url_segment="{item_id}",
+                build=build_item_page,
+            ),
+            rio.ComponentPage(
+                name="Live",
+                url_segment="live",
+                build=CountingPage,
+                keep_alive=False,
+            ),
+        ],
+    )
+
+    async with rio.testing.DummyClient(app) as test_client:
+
+        async def navigate_to(url: str) -> CountingPage:
+            test_client.session.navigate_to(url)
+            await test_client.wait_for_refresh()
+            return test_client.get_component(CountingPage)
+
+        home_page = test_client.get_component(CountingPage)
+
+        # Pages of the same type with different parameters are kept
+        # separately
+        item_page_1 = await navigate_to("/1")
+        item_page_2 = await navigate_to("/2")
+        assert item_page_2 is not item_page_1
+
+        # Navigating back reuses the page as it was
+        assert await navigate_to("/1") is item_page_1
+        assert item_page_1.populate_count == 1
+
+        # Only the two most recently visited pages are kept
+        assert await navigate_to("/") is not home_page
+        assert await navigate_to("/1") is item_page_1
+
+        # Pages can opt out
+        live_page = await navigate_to("/live")
+        await navigate_to("/1")
+        assert await navigate_to("/live") is not live_page
+
+
+async def test_hovered_links_are_prefetched() -> None:
+    app = rio.App(
+        build=rio.PageView,
+        pages=[
+            rio.ComponentPage(
+                name="Home",
+                url_segment="",
+                build=lambda: rio.Column(
+                    rio.Link("Details", "/details"),
+                    rio.Link("Populated", "/populated"),
+                ),
+            ),
+            rio.ComponentPage(
+                name="Details",
+                url_segment="details",
+                build=BuildCountingPage,
+            ),
+            rio.ComponentPage(
+                name="Populated",
+                url_segment="populated",
+                build=CountingPage,
+            ),
+        ],
+    )
+
+    async with rio.testing.DummyClient(app) as test_client:
+        session = test_client.session
+        details_link, populated_link = test_client.get_components(rio.Link)
+
+        async def hover(link: rio.Link) -> None:
+            await link._on_message_({"type": "prefetch"})
+            assert session._prefetch_task is not None
+            await session._prefetch_task
+
+        # Hovering builds the page ahead of time
+        BuildCountingPage.build_count = 0
+        await hover(details_link)
+        assert BuildCountingPage.build_count == 1
+
+        # Clicking the link displays the prefetched page without building it
+        # again
+        session.navigate_to("/details")
+        await test_client.wait_for_refresh()
+        assert BuildCountingPage.build_count == 1
+        assert test_client.get_component(rio.Text).text == "Details"
+
+        session.navigate_to("/")
+        await test_client.wait_for_refresh()
+        _, populated_link = test_client.get_components(rio.Link)
+
+        # Components with `on_populate` handlers aren't built until they're
+        # actually displayed
+        await hover(populated_link)
+        page_view = test_client.get_component(rio.PageView)
+        (prefetched_page,) = page_view._prefetched_pages.values()
+        assert isinstance(prefetched_page, CountingPage)
+        assert prefetched_page._build_data_ is None
+        assert prefetched_page.populate_count == 0
+
+        session.navigate_to("/populated")
+        await test_client.wait_for_refresh()
+        assert test_client.get_component(CountingPage) is prefetched_page
+        assert prefetched_page.populate_count == 1
+
+
+async def test_pages_that_werent_prefetched_are_built_normally() -> None:
+    app = rio.App(
+        build=rio.PageView,
+        pages=[
+            rio.ComponentPage(
+                name="Home",
+                url_segment="",
+                build=lambda: rio.Link("Details", "/details"),
+            ),
+            rio.ComponentPage(
+                name="Details",
+                url_segment="details",
+                build=BuildCountingPage,
+            ),
+            rio.ComponentPage(
+                name="Populated",
+                url_segment="populated",
+                build=CountingPage,
+            ),
+        ],
+    )
+
+    async with rio.testing.DummyClient(app) as test_client:
+        session = test_client.session
+        page_view = test_client.get_component(rio.PageView)
+
+        link = test_client.get_component(rio.Link)
+        await link._on_message_({"type": "prefetch"})
+        assert session._prefetch_task is not None
+        await session._prefetch_task
+        assert len(page_view._prefetched_pages) == 1
+
+        # Another page is displayed directly, rather than being wrapped in a
+        # container to keep it apart from the previous one
+        session.navigate_to("/populated")
+        await test_client.wait_for_refresh()
+
+        assert page_view._build_data_ is not None
+        assert isinstance(page_view._build_data_.build_result, CountingPage)
+
+        # The prefetched page is still kept apart
+        session.navigate_to("/details")
+        await test_client.wait_for_refresh()
+
+        assert isinstance(page_view._build_data_.build_result, rio.Container)
+        assert not page_view._prefetched_pages
@@ -1,5 +1,6 @@
 import asyncio
 import dataclasses
+import json
 import typing as t
 
 import pytest
@@ -574,3 +575,310 @@ async def test_switch_between_existing_fundamental_containers():
         tabs.active_tab_index = 0
         await client.wait_for_refresh()
         assert text0 in client._last_updated_components
+
+
+async def test_state_updates_from_frontend_are_batched():
+    """
+    Dragging a slider or typing produces many state updates in quick
+    succession. These should be merged, and cause only a single refresh.
+    """
+    change_values = list[float]()
+
+    class Parent(rio.Component):
+        value: float = 0
+
+        def build(self) -> rio.Component:
+            return rio.Column(
+                rio.Slider(
+                    value=self.bind().value,
+                    maximum=10,
+                    on_change=lambda event: change_values.append(event.value),
+                ),
+                rio.Text(str(self.value)),
+            )
+
+    async with rio.testing.DummyClient(Parent) as test_client:
+        parent_component = test_client.get_component(Parent)
+        slider = test_client.get_component(rio.Slider)
+
+        test_client._received_messages.clear()
+
+        for value in range(1, 6):
+            test_client._recorder_transport.queue_response(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "componentStateUpdate",
+                    "params": {
+                        "component_id": slider._id_,
+                        "delta_state": {"value": value},
+                    },
+                }
+            )
+
+        await test_client.wait_for_refresh()
+
+        assert parent_component.value == 5
+        assert change_values == [5]
+        assert test_client.get_component(rio.Text).text == "5"
+
+        assert [
+            message["method"] for message in test_client._received_messages
+        ] == ["updateComponentStates"]
+
+
+async def test_state_updates_are_applied_before_later_messages():
+    """
+    Batching state updates must not reorder input. A button pressed right
+    after moving a slider has to see the slider's new value.
+    """
+    from rio.components.button import _ButtonInternal
+
+    pressed_values = list[float]()
+
+    class Parent(rio.Component):
+        value: float = 0
+
+        def build(self) -> rio.Component:
+            return rio.Column(
+                rio.Slider(value=self.bind().value, maximum=10),
+                rio.Button(
+                    "Submit",
+                    on_press=lambda: pressed_values.append(self.value),
+                ),
+            )
+
+    async with rio.testing.DummyClient(Parent) as test_client:
+        slider = test_client.get_component(rio.Slider)
+        button = test_client.get_component(_ButtonInternal)
+
+        test_client._recorder_transport.queue_response(
+            {
+                "jsonrpc": "2.0",
+                "method": "componentStateUpdate",
+                "params": {
+                    "component_id": slider._id_,
+                    "delta_state": {"value": 7},
+                },
+            }
+        )
+        test_client._recorder_transport.queue_response(
+            {
+                "jsonrpc": "2.0",
+                "method": "componentMessage",
+                "params": {
+                    "component_id": button._id_,
+                    "payload": {"type": "press"},
+                },
+            }
+        )
+
+        async def wait_for_press() -> None:
+            while not pressed_values:
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(wait_for_press(), timeout=5)
+
+        assert pressed_values == [7]
+
+
+async def test_batched_state_updates_dont_interleave_with_refreshes() -> None:
+    """
+    Event handlers for the first update in a batch may yield to the event loop
+    and let a time-sliced refresh start. The remaining updates must have been
+    applied before that happens.
+    """
+    second_switch_was_on = list[bool]()
+    switches = list[rio.Switch]()
+
+    class Parent(rio.Component):
+        count: int = 0
+
+        def build(self) -> rio.Component:
+            return rio.Column(
+                rio.Switch(on_change=self._on_first_change),
+                rio.Switch(),
+                *[rio.Text(str(index)) for index in range(self.count)],
+            )
+
+        async def _on_first_change(self, event: rio.SwitchChangeEvent) -> None:
+            self.count = 300
+
+            while self.session._refresh_is_committed.is_set():
+                await asyncio.sleep(0)
+
+            second_switch_was_on.append(switches[1].is_on)
+
+    app = rio.App(build=Parent, refresh_time_slice=0)
+
+    async with rio.testing.DummyClient(app) as test_client:
+        switches.extend(test_client.get_components(rio.Switch))
+
+        for switch in switches:
+            test_client._recorder_transport.queue_response(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "componentStateUpdate",
+                    "params": {
+                        "component_id": switch._id_,
+                        "delta_state": {"is_on": True},
+                    },
+                }
+            )
+
+        async def wait_for_handler() -> None:
+            while not second_switch_was_on:
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(wait_for_handler(), timeout=5)
+
+        assert second_switch_was_on == [True]
+
+
+async def test_time_sliced_refresh() -> None:
+    pressed_during_refresh = list[bool]()
+
+    class ItemList(rio.Component):
+        count: int = 1
+
+        def build(self) -> rio.Component:
+            return rio.Column(
+                rio.Button("Press me", on_press=self._on_press),
+                *[rio.Text(str(index)) for index in range(self.count)],
+            )
+
+        def _on_press(self) -> None:
+            pressed_during_refresh.append(
+                not self.session._refresh_is_committed.is_set()
+            )
+
+    app = rio.App(build=ItemList, refresh_time_slice=0)
+
+    async with rio.testing.DummyClient(app) as test_client:
+        item_list = test_client.get_component(ItemList)
+        button = test_client.get_component(rio.Button)
+        test_client._received_messages.clear()
+
+        # Keep track of how often the event loop gets to run other code during
+        # the refresh
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker = asyncio.create_task(tick())
+
+        item_list.count = 200
+
+        while test_client.session._refresh_is_committed.is_set():
+            await asyncio.sleep(0)
+
+        # Input arriving in the middle of the refresh is held back until the
+        # changes have been sent
+        await test_client.session._component_message(
+            test_client._get_build_output(button)._id_, {"type": "press"}
+        )
+        assert pressed_during_refresh == [False]
+
+        ticker.cancel()
+        assert ticks > 10
+
+        # The client still receives all changes at once
+        assert [
+            message["method"]
+            for message in test_client._received_messages
+            if message["method"] == "updateComponentStates"
+        ] == ["updateComponentStates"]
+        # (One of the texts is the button's label)
+        assert len(list(test_client.get_components(rio.Text))) == 201
+
+
+async def test_appended_text_is_sent_as_suffix() -> None:
+    class Chat(rio.Component):
+        response: str = "Hello"
+
+        def build(self) -> rio.Component:
+            return rio.Column(
+                rio.Text(self.response),
+                rio.Markdown(self.response),
+                rio.MultiLineTextInput(self.response),
+            )
+
+    component_types = (rio.Text, rio.Markdown, rio.MultiLineTextInput)
+
+    async with rio.testing.DummyClient(Chat) as test_client:
+        chat = test_client.get_component(Chat)
+
+        chat.response += " world"
+        await test_client.wait_for_refresh()
+
+        for component_type in component_types:
+            component = test_client.get_component(component_type)
+            delta = test_client._last_component_state_changes[component]
+            assert "text" not in delta
+            assert delta["_appended_"] == {"text": " world"}
+
+        # Text that doesn't just grow is sent in full
+        chat.response = "Bye"
+        await test_client.wait_for_refresh()
+
+        for component_type in component_types:
+            component = test_client.get_component(component_type)
+            delta = test_client._last_component_state_changes[component]
+            assert delta["text"] == "Bye"
+            assert "_appended_" not in delta
+
+        # Suffixes are relative to the text the user has typed
+        text_input = test_client.get_component(rio.MultiLineTextInput)
+        text_input._apply_delta_state_from_frontend({"text": "Bye!"})
+
+        text_input.text = "Bye!!"
+        await test_client.wait_for_refresh()
+
+        delta = test_client._last_component_state_changes[text_input]
+        assert delta["_appended_"] == {"text": "!"}
+
+
+async def test_shared_styles_are_sent_once() -> None:
+    style = rio.TextStyle(font_size=3, fill=rio.Color.RED)
+
+    def build() -> rio.Component:
+        return rio.Column(
+            *[rio.Text(f"Cell {index}", style=style) for index in range(50)]
+        )
+
+    async with rio.testing.DummyClient(build) as test_client:
+        serialized_style = json.loads(
+            json.dumps(style._serialize(test_client.session))
+        )
+
+        [message] = [
+            message
+            for message in test_client._received_messages
+            if message["method"] == "updateComponentStates"
+        ]
+        delta_states = message["params"]["delta_states"]  # type: ignore
+
+        texts = list(test_client.get_components(rio.Text))
+        style_id = delta_states[str(texts[0]._id_)]["style"]["_style_"]
+
+        # The style is defined once, and referenced by every text
+        definitions = [
+            delta["_styles_"][str(style_id)]
+            for delta in delta_states.values()
+            if str(style_id) in delta.get("_styles_", {})
+        ]
+        assert definitions == [serialized_style]
+
+        for text in texts:
+            assert delta_states[str(text._id_)]["style"] == {
+                "_style_": style_id
+            }
+
+        # The test client resolves the references, just like a real client
+        for text in texts:
+            delta = test_client._last_component_state_changes[text]
+            assert delta["style"] == serialized_style
@@ -1,4 +1,7 @@
+import sys
+import textwrap
 import typing as t
+from pathlib import Path
 
 import pytest
 
@@ -263,3 +266,137 @@ async def test_redirect_offsite() -> None:
 
     assert active_pages_and_path_arguments is None
     assert absolute_url_after_redirects == external_url
+
+
+def test_routing_table() -> None:
+    def build_user_page(user_id: int):
+        return FakeComponent()
+
+    def build_file_page(file_path: str):
+        return FakeComponent()
+
+    settings = rio.ComponentPage(
+        name="Settings",
+        url_segment="settings",
+        build=FakeComponent,
+    )
+    profile = rio.ComponentPage(
+        name="Profile",
+        url_segment="",
+        build=FakeComponent,
+    )
+    user = rio.ComponentPage(
+        name="User",
+        url_segment="{user_id}",
+        build=build_user_page,
+        children=[profile, settings],
+    )
+    about = rio.ComponentPage(
+        name="About",
+        url_segment="about",
+        build=FakeComponent,
+    )
+    files = rio.ComponentPage(
+        name="Files",
+        url_segment="files/{file_path:path}",
+        build=build_file_page,
+    )
+    pages = [user, about, files]
+
+    def match(path: str) -> list:
+        return rio.routing._get_active_page_instances(
+            available_pages=pages,
+            remaining_path=path,
+        )
+
+    # Static segments are found regardless of their casing
+    assert match("About") == [(about, {})]
+    assert match("files/a/b.txt") == [(files, {"file_path": "a/b.txt"})]
+
+    # Parameters are tried in definition order, along with static segments
+    assert match("12/settings") == [(user, {"user_id": 12}), (settings, {})]
+    assert match("12") == [(user, {"user_id": 12}), (profile, {})]
+    assert match("nope") == []
+
+    # Results are memoized, but callers get their own copies
+    first_result = match("12")
+    first_result[0][1]["user_id"] = 13
+    assert match("12") == [(user, {"user_id": 12}), (profile, {})]
+
+    # Changes to the list of pages are picked up
+    pages.insert(0, rio.Redirect(url_segment="about", target="/"))
+    assert match("about") == [(pages[0], {})]
+
+
+async def test_lazy_page_imports(tmp_path: Path) -> None:
+    (tmp_path / "lazy_test_profile.py").write_text(
+        textwrap.dedent(
+            """
+            import rio
+
+            IMPORTED = True
+
+            def guard(event):
+                return "/login"
+
+            @rio.page(name="My Profile", guard=guard, order=1)
+            class ProfilePage(rio.Component):
+                def build(self):
+                    return rio.Text("profile")
+            """
+        )
+    )
+    (tmp_path / "lazy_test_item.py").write_text(
+        textwrap.dedent(
+            """
+            import rio
+
+            @rio.page(url_segment="{item_id}")
+            def item_page(item_id: int):
+                return rio.Text(f"item {item_id}")
+            """
+        )
+    )
+    (tmp_path / "lazy_test_login.py").write_text(
+        textwrap.dedent(
+            """
+            import rio
+
+            URL_SEGMENT = "login"
+
+            # Not a literal, so this file must be imported right away
+            @rio.page(url_segment=URL_SEGMENT)
+            class LoginPage(rio.Component):
+                def build(self):
+                    return rio.Text("login")
+            """
+        )
+    )
+
+    pages = rio.routing.auto_detect_pages(tmp_path, lazy=True)
+    pages_by_name = {page.name: page for page in pages}
+
+    profile_page = pages_by_name["My Profile"]
+    item_page = pages_by_name["Item Page"]
+    assert profile_page.url_segment == "profile-page"
+    assert profile_page._page_order_ == 1
+    assert profile_page.guard is not None
+    assert pages_by_name["Login Page"].url_segment == "login"
+
+    assert "lazy_test_login" in sys.modules
+    assert "lazy_test_profile" not in sys.modules
+    assert "lazy_test_item" not in sys.modules
+
+    # Matching a path parameter imports the page, to find out its type
+    assert rio.routing._get_active_page_instances(
+        available_pages=pages,
+        remaining_path="12",
+    ) == [(item_page, {"item_id": 12})]
+    assert "lazy_test_item" in sys.modules
+    assert "lazy_test_profile" not in sys.modules
+
+    # Pre-warming imports the remaining pages
+    await rio.routing.prewarm_pages(pages)
+    assert "lazy_test_profile" in sys.modules
+
+    assert profile_page.guard(t.cast(rio.GuardEvent, None)) == "/login"
@@ -81,3 +81,30 @@ async def test_url_for_user_asset():
             pass
         else:
             raise AssertionError("Image has failed to load")
+
+
+async def test_app_theme_css_is_shared() -> None:
+    app_theme = rio.Theme.from_colors()
+    app = rio.App(build=rio.Spacer, theme=app_theme)
+
+    async with rio.testing.DummyClient(app) as client:
+        session = client.session
+        app_server = session._app_server
+
+        # The CSS for the app's theme was computed when the session was created
+        _, variables, fonts = app_server._theme_css_cache[id(app_theme)]
+        assert session._get_theme_css_values(app_theme) is variables
+
+        # Fonts have the same name in every session
+        assert fonts
+        for font in fonts:
+            assert session._register_font(font) == app_server.get_font_name(
+                font
+            )
+
+        # Custom themes aren't cached
+        custom_theme = rio.Theme.from_colors(primary_color=rio.Color.RED)
+        assert session._get_theme_css_values(custom_theme) is not (
+            session._get_theme_css_values(custom_theme)
+        )
+        assert id(custom_theme) not in app_server._theme_css_cache
@@ -1,3 +1,5 @@
+import pytest
+
 import rio.testing
 
 
@@ -35,3 +37,51 @@ async def test_rebuild_resets_crashed_build_functions():
         await test_client.wait_for_refresh()
 
         assert not test_client.crashed_build_functions
+
+
+async def test_load_test():
+    class CounterComponent(rio.Component):
+        count: int = 0
+        text: str = ""
+
+        def build(self) -> rio.Component:
+            return rio.Column(
+                rio.Text(f"{self.count} {self.text}"),
+                rio.TextInput(self.bind().text),
+                rio.Button("Increment", on_press=self._increment),
+            )
+
+        def _increment(self) -> None:
+            self.count += 1
+
+    async def script(client: rio.testing.LoadTestClient) -> None:
+        await client.click(client.get_component(rio.Button))
+        await client.click(client.get_component(rio.Button))
+        await client.enter_text(client.get_component(rio.TextInput), "hi")
+
+        counter = client.get_component(CounterComponent)
+        assert counter.count == 2
+        assert counter.text == "hi"
+
+    report = await rio.testing.run_load_test(
+        rio.App(build=CounterComponent),
+        script,
+        sessions=5,
+    )
+
+    assert report.errors == ()
+    assert report.failed_session_count == 0
+    assert report.interaction_count == 15
+    assert len(report.refresh_latencies) == 15
+    assert 0 < report.p50 <= report.p95 <= report.p99
+    assert report.messages_per_interaction >= 1
+    assert report.bytes_per_interaction > 0
+
+
+def test_load_test_client_requires_send_nowait():
+    class IncompleteClient(rio.testing.LoadTestClient):
+        async def _create_session(self) -> rio.Session:
+            raise NotImplementedError
+
+    with pytest.raises(TypeError, match="_send_nowait"):
+        IncompleteClient()  # type: ignore
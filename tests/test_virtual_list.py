@@ -0,0 +1,59 @@
+import rio
+import rio.testing
+from rio.components.virtual_list import _VirtualListInternal
+
+
+async def test_only_visible_items_are_built() -> None:
+    built_indices: list[int] = []
+
+    def build_item(index: int) -> rio.Component:
+        built_indices.append(index)
+        return rio.Text(str(index), key=index)
+
+    def build() -> rio.Component:
+        return rio.VirtualList(item_count=10_000, build_item=build_item)
+
+    async with rio.testing.DummyClient(build) as test_client:
+        assert built_indices == list(range(50))
+
+        internal = test_client.get_component(_VirtualListInternal)
+        built_indices.clear()
+
+        await test_client.session._component_message(
+            internal._id_,
+            {"type": "visibleRange", "start": 500, "end": 520},
+        )
+        await test_client.wait_for_refresh()
+
+        assert built_indices == list(range(500, 520))
+        assert internal.first_index == 500
+        assert [text.text for text in internal.children] == [
+            str(index) for index in range(500, 520)
+        ]
+
+
+async def test_collapsed_tree_items_are_built_lazily() -> None:
+    build_count = 0
+
+    class Leaf(rio.Component):
+        def build(self) -> rio.Component:
+            nonlocal build_count
+            build_count += 1
+            return rio.Text("leaf")
+
+    def build() -> rio.Component:
+        return rio.TreeView(
+            rio.SimpleTreeItem(
+                "root",
+                children=[rio.CustomTreeItem(Leaf())],
+            ),
+        )
+
+    async with rio.testing.DummyClient(build) as test_client:
+        assert build_count == 0
+
+        root = test_client.get_component(rio.SimpleTreeItem)
+        root.is_expanded = True
+        await test_client.wait_for_refresh()
+
+        assert build_count == 1